@@ -5,3 +5,7 @@ class AuthenticationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'authentication'
     verbose_name = 'Authentication'
+
+    def ready(self):
+        """Import signals when app is ready."""
+        import authentication.signals  # noqa: F401
@@ -0,0 +1,253 @@
+"""
+Asynchronous, batched audit log writer.
+
+Request paths (login, logout, token refresh, password and email changes,
+privacy actions) record audit events with AuditLog.log_event(). Instead
+of an INSERT on every request, events are appended to a Redis stream
+with a single XADD, and a Celery task drains the stream into
+auth_audit_log with bulk_create batches.
+
+Delivery is at least once:
+- Events are read through a consumer group and only acknowledged after
+  their batch is committed. Entries left pending by a crashed consumer
+  are reclaimed (XAUTOCLAIM) once they have been idle for
+  AUDIT_LOG_CLAIM_IDLE_MS.
+- Each event carries its AuditLog primary key, and batches are written
+  with ignore_conflicts, so redelivered events never duplicate rows.
+
+Queueing is off unless AUDIT_LOG_ASYNC is True: only the Celery beat
+task drains the stream, so turn it on only where a Celery worker and
+beat run alongside the web processes.
+
+Events are written synchronously instead when:
+- their risk level is 'critical', so they are in the database before the
+  request completes
+- AUDIT_LOG_ASYNC is False (the default), or no Redis is configured
+  (AUDIT_LOG_REDIS_URL, falling back to REDIS_URL)
+- the XADD fails, so a Redis outage never loses events
+
+Run by Celery:
+- flush_audit_log: every few seconds, drains the stream
+- on worker shutdown: one final drain
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+STREAM_KEY = 'audit:events'
+CONSUMER_GROUP = 'audit-writers'
+
+# Risk levels that are never queued
+SYNC_RISK_LEVELS = {'critical'}
+
+# AuditLog fields carried by a queued event
+EVENT_FIELDS = (
+    'id', 'user_id', 'event_type', 'description', 'ip_address',
+    'user_agent', 'session_id', 'timestamp', 'success', 'risk_level',
+    'metadata',
+)
+
+
+class AuditLogWriter:
+    """Queue audit events in a Redis stream and write them in batches."""
+
+    def __init__(self):
+        self._client = None
+        self._client_url = None
+        self._lock = threading.Lock()
+        self.consumer = f"{socket.gethostname()}:{os.getpid()}"
+
+    @property
+    def enabled(self) -> bool:
+        """Whether events are queued rather than written synchronously."""
+        return bool(getattr(settings, 'AUDIT_LOG_ASYNC', False) and self._redis_url())
+
+    @property
+    def batch_size(self) -> int:
+        """Events written per INSERT (AUDIT_LOG_BATCH_SIZE, 500)."""
+        return getattr(settings, 'AUDIT_LOG_BATCH_SIZE', 500)
+
+    def record(self, **fields):
+        """
+        Record an audit event.
+
+        Args:
+            **fields: AuditLog field values (user or user_id, event_type,
+                description, ip_address, user_agent, session_id, success,
+                risk_level, metadata)
+
+        Returns:
+            AuditLog: The event, saved if it was written synchronously
+        """
+        from .models import AuditLog
+
+        user = fields.pop('user', None)
+        if user is not None:
+            fields['user_id'] = user.pk
+        fields.setdefault('timestamp', timezone.now())
+        fields.setdefault('metadata', {})
+        entry = AuditLog(**fields)
+
+        if entry.risk_level in SYNC_RISK_LEVELS or not self.enabled:
+            entry.save(force_insert=True)
+            return entry
+
+        try:
+            self._get_client().xadd(
+                STREAM_KEY, {'event': json.dumps(self._serialize(entry))})
+        except Exception as e:
+            logger.warning(f"Audit event queue unavailable, writing inline: {e}")
+            entry.save(force_insert=True)
+
+        return entry
+
+    def flush(self, max_batches: Optional[int] = None) -> int:
+        """
+        Write queued events to the database.
+
+        Reclaims events left pending by other consumers first, then
+        reads new events until the stream is drained.
+
+        Args:
+            max_batches: Stop after this many batches (default: drain)
+
+        Returns:
+            Number of events written
+        """
+        if not self.enabled:
+            return 0
+
+        client = self._get_client()
+        self._ensure_group(client)
+        claim_idle = getattr(settings, 'AUDIT_LOG_CLAIM_IDLE_MS', 60000)
+
+        written = 0
+        batches = 0
+        claim_from = '0-0'
+        while max_batches is None or batches < max_batches:
+            entries = []
+            if claim_from is not None:
+                claim_from, entries = self._claim(client, claim_from, claim_idle)
+            if not entries:
+                response = client.xreadgroup(
+                    CONSUMER_GROUP, self.consumer, {STREAM_KEY: '>'},
+                    count=self.batch_size)
+                entries = response[0][1] if response else []
+            if not entries:
+                break
+
+            written += self._write(client, entries)
+            batches += 1
+
+        if written:
+            logger.info(f"Audit log flush: {written} events written")
+        return written
+
+    def pending(self) -> int:
+        """Number of events queued or in flight."""
+        if not self.enabled:
+            return 0
+        return self._get_client().xlen(STREAM_KEY)
+
+    def _write(self, client, entries: List[Tuple]) -> int:
+        """Insert one batch, then acknowledge and delete its entries."""
+        from .models import AuditLog, User
+
+        logs = []
+        for entry_id, data in entries:
+            try:
+                logs.append(AuditLog(**self._deserialize(data[b'event'])))
+            except Exception as e:
+                # Unparseable entries would be redelivered forever
+                logger.error(f"Dropping malformed audit event {entry_id}: {e}")
+
+        # Keep events of users deleted (or never committed) since they
+        # were queued, without the foreign key
+        user_ids = {log.user_id for log in logs if log.user_id}
+        existing = set(User.objects.filter(
+            pk__in=user_ids).values_list('pk', flat=True)) if user_ids else set()
+        for log in logs:
+            if log.user_id and log.user_id not in existing:
+                log.metadata = {**log.metadata, 'deleted_user_id': str(log.user_id)}
+                log.user_id = None
+
+        AuditLog.objects.bulk_create(logs, ignore_conflicts=True)
+
+        entry_ids = [entry_id for entry_id, _ in entries]
+        client.xack(STREAM_KEY, CONSUMER_GROUP, *entry_ids)
+        client.xdel(STREAM_KEY, *entry_ids)
+        return len(logs)
+
+    def _claim(self, client, start: str, min_idle_time: int):
+        """
+        Reclaim events another consumer read but never acknowledged.
+
+        Returns:
+            Tuple of (next start ID or None when done, entries)
+        """
+        next_start, entries = client.xautoclaim(
+            STREAM_KEY, CONSUMER_GROUP, self.consumer,
+            min_idle_time=min_idle_time, start_id=start,
+            count=self.batch_size)[:2]
+        if isinstance(next_start, bytes):
+            next_start = next_start.decode()
+        return (None if next_start == '0-0' else next_start), entries
+
+    @staticmethod
+    def _ensure_group(client):
+        """Create the consumer group (and stream) if needed."""
+        try:
+            client.xgroup_create(STREAM_KEY, CONSUMER_GROUP, id='0', mkstream=True)
+        except Exception as e:
+            if 'BUSYGROUP' not in str(e):
+                raise
+
+    @staticmethod
+    def _serialize(entry) -> Dict:
+        """Convert an unsaved AuditLog to JSON-safe values."""
+        event = {name: getattr(entry, name) for name in EVENT_FIELDS}
+        event['id'] = str(entry.id)
+        event['user_id'] = str(entry.user_id) if entry.user_id else None
+        event['timestamp'] = entry.timestamp.isoformat()
+        return event
+
+    @staticmethod
+    def _deserialize(raw: bytes) -> Dict:
+        """Convert a queued event back to AuditLog field values."""
+        event = json.loads(raw)
+        event['id'] = uuid.UUID(event['id'])
+        if event['user_id']:
+            event['user_id'] = uuid.UUID(event['user_id'])
+        event['timestamp'] = datetime.fromisoformat(event['timestamp'])
+        return event
+
+    def _redis_url(self) -> Optional[str]:
+        return (getattr(settings, 'AUDIT_LOG_REDIS_URL', None) or
+                getattr(settings, 'REDIS_URL', None))
+
+    def _get_client(self):
+        """Get a Redis client for the configured URL, created once per process."""
+        url = self._redis_url()
+        with self._lock:
+            if self._client is None or self._client_url != url:
+                import redis
+
+                self._client = redis.Redis.from_url(
+                    url, socket_connect_timeout=1, socket_timeout=2)
+                self._client_url = url
+        return self._client
+
+
+audit_writer = AuditLogWriter()
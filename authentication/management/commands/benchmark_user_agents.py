@@ -0,0 +1,125 @@
+"""
+Django management command for benchmarking user agent parsing.
+
+Compares uncached ua-parser throughput against the memoized
+DeviceFingerprinter path over a corpus of real user agent strings.
+
+Usage:
+    python manage.py benchmark_user_agents
+    python manage.py benchmark_user_agents --iterations 5000
+    python manage.py benchmark_user_agents --corpus user_agents.txt
+"""
+
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from authentication.utils.sessions import DeviceFingerprinter, UserAgentCache
+
+
+# Real-world user agents seen on login, token refresh and session listing
+DEFAULT_CORPUS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15',
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_2 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Mobile/15E148 Safari/604.1',
+    'Mozilla/5.0 (iPad; CPU OS 16_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.6 Mobile/15E148 Safari/604.1',
+    'Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.6099.144 Mobile Safari/537.36',
+    'Mozilla/5.0 (Linux; Android 13; SM-S918B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Mobile Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.2210.91',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 16_7_4 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) CriOS/120.0.6099.119 Mobile/15E148 Safari/604.1',
+    'Mozilla/5.0 (Linux; Android 10; K) AppleWebKit/537.36 (KHTML, like Gecko) SamsungBrowser/23.0 Chrome/115.0.0.0 Mobile Safari/537.36',
+    'VineyardGroupFellowship/1.4.2 (iPhone; iOS 17.2; Scale/3.00)',
+    'okhttp/4.12.0',
+    'Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)',
+    'curl/8.4.0',
+    'python-requests/2.31.0',
+]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark cached vs uncached user agent parsing'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=2000,
+            help='Number of lookups per run'
+        )
+        parser.add_argument(
+            '--corpus',
+            type=str,
+            help='Optional file with one user agent string per line'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed for the lookup sequence'
+        )
+
+    def handle(self, *args, **options):
+        corpus = self.load_corpus(options.get('corpus'))
+        iterations = options['iterations']
+
+        rng = random.Random(options['seed'])
+        sequence = [rng.choice(corpus) for _ in range(iterations)]
+
+        self.stdout.write(self.style.SUCCESS(
+            f'🚀 Benchmarking {iterations} lookups over {len(corpus)} user agents'))
+
+        # Uncached baseline: parse and scan every time
+        baseline = DeviceFingerprinter(ua_cache=UserAgentCache(shared=False))
+        start = time.perf_counter()
+        for user_agent in sequence:
+            baseline._parse_device_info(user_agent)
+            baseline._detect_suspicious_agent(user_agent)
+        uncached_time = time.perf_counter() - start
+
+        # Memoized path: the in-process LRU only, so results are not
+        # skewed by cache backend latency
+        ua_cache = UserAgentCache(shared=False)
+        fingerprinter = DeviceFingerprinter(ua_cache=ua_cache)
+        start = time.perf_counter()
+        for user_agent in sequence:
+            fingerprinter.parse_device_info(user_agent)
+            fingerprinter.detect_suspicious_agent(user_agent)
+        cached_time = time.perf_counter() - start
+
+        stats = ua_cache.get_stats()
+
+        self.stdout.write(
+            f"{'Mode':<12} {'Total (ms)':>12} {'Per lookup (µs)':>17} {'Lookups/s':>12}")
+        self.stdout.write('-' * 56)
+        for label, elapsed in (('uncached', uncached_time), ('cached', cached_time)):
+            self.stdout.write(
+                f"{label:<12} {elapsed * 1000:>12.2f} "
+                f"{elapsed / iterations * 1_000_000:>17.2f} "
+                f"{iterations / elapsed if elapsed else 0:>12.0f}"
+            )
+
+        speedup = uncached_time / cached_time if cached_time else 0
+        self.stdout.write('')
+        self.stdout.write(
+            f"Hit rate: {stats['hit_rate']:.2%} "
+            f"({stats['hits']} hits, {stats['misses']} misses)")
+        self.stdout.write(self.style.SUCCESS(f'Speedup: {speedup:.1f}x'))
+
+    def load_corpus(self, path):
+        """Load user agents from a file, or fall back to the built-in corpus."""
+        if not path:
+            return DEFAULT_CORPUS
+
+        try:
+            with open(path, encoding='utf-8') as corpus_file:
+                corpus = [line.strip() for line in corpus_file if line.strip()]
+        except OSError as e:
+            raise CommandError(f'Could not read corpus file: {e}')
+
+        if not corpus:
+            raise CommandError('Corpus file is empty')
+        return corpus
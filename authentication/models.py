@@ -272,7 +272,7 @@ class UserSession(models.Model):
         self.save(update_fields=['is_active'])
 
         # Create audit log entry
-        AuditLog.objects.create(
+        AuditLog.log_event(
             user=self.user,
             event_type='session_terminated',
             description=f'Session terminated: {reason or "manual_deactivation"}',
@@ -427,6 +427,8 @@ class UserSession(models.Model):
         Returns:
             Dictionary with cleanup statistics
         """
+        from .utils.sessions import session_profile_store
+
         # Find sessions with blacklisted tokens
         blacklisted_jtis = TokenBlacklist.objects.filter(
             expires_at__gt=timezone.now()
@@ -435,8 +437,6 @@ class UserSession(models.Model):
         blacklisted_sessions = cls.objects.filter(
             refresh_token_jti__in=blacklisted_jtis
         )
-        blacklisted_count = blacklisted_sessions.count()
-        blacklisted_sessions.update(is_active=False)
 
         # Find very old sessions (>90 days)
         old_cutoff = timezone.now() - timezone.timedelta(days=90)
@@ -444,8 +444,6 @@ class UserSession(models.Model):
             created_at__lt=old_cutoff,
             is_active=True
         )
-        old_count = old_sessions.count()
-        old_sessions.update(is_active=False)
 
         # Find inactive sessions (>30 days)
         inactive_cutoff = timezone.now() - timezone.timedelta(days=30)
@@ -453,8 +451,16 @@ class UserSession(models.Model):
             last_activity_at__lt=inactive_cutoff,
             is_active=True
         )
-        inactive_count = inactive_sessions.count()
-        inactive_sessions.update(is_active=False)
+
+        user_ids = set()
+        counts = []
+        for sessions in (blacklisted_sessions, old_sessions, inactive_sessions):
+            user_ids.update(sessions.values_list('user_id', flat=True).distinct())
+            counts.append(sessions.update(is_active=False))
+        blacklisted_count, old_count, inactive_count = counts
+
+        # Bulk updates bypass signals, so drop the cached session profiles
+        session_profile_store.invalidate_many(user_ids)
 
         return {
             'blacklisted_sessions': blacklisted_count,
@@ -717,8 +723,9 @@ class AuditLog(models.Model):
     user_agent = models.TextField(blank=True)
     session_id = models.CharField(max_length=40, blank=True)
 
-    # Event metadata
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Event metadata (set when the event happens, not when a queued
+    # event is written)
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
     success = models.BooleanField(
         help_text="Whether the action was successful"
     )
@@ -760,9 +767,14 @@ class AuditLog(models.Model):
                   user_agent="", session_id="", success=True, risk_level='low',
                   metadata=None):
         """
-        Convenience method to create audit log entries.
+        Record an audit log entry.
+
+        Events are queued and written in batches by the audit writer;
+        critical events are written immediately (see authentication.audit).
         """
-        return cls.objects.create(
+        from .audit import audit_writer
+
+        return audit_writer.record(
             user=user,
             event_type=event_type,
             description=description,
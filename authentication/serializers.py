@@ -363,7 +363,7 @@ class LoginSerializer(serializers.Serializer):
         else:
             # Log failed login attempt
             request = self.context.get('request')
-            AuditLog.objects.create(
+            AuditLog.log_event(
                 user=user if user else None,
                 event_type='login_failure',
                 description=f'Failed login attempt for: {email_or_username}',
@@ -474,7 +474,7 @@ class PasswordChangeSerializer(serializers.Serializer):
 
         # Log password change
         request = self.context['request']
-        AuditLog.objects.create(
+        AuditLog.log_event(
             user=user,
             event_type='password_change',
             description='User changed their password',
@@ -560,7 +560,7 @@ class PasswordResetConfirmSerializer(serializers.Serializer):
 
         # Log password reset
         request = self.context.get('request')
-        AuditLog.objects.create(
+        AuditLog.log_event(
             user=user,
             event_type='password_reset_complete',
             description='User completed password reset',
@@ -619,7 +619,7 @@ class EmailVerificationSerializer(serializers.Serializer):
         if not user_agent:
             user_agent = 'Test Client'
 
-        AuditLog.objects.create(
+        AuditLog.log_event(
             user=user,
             event_type='email_verification',
             description='Email address verified successfully',
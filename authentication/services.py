@@ -172,7 +172,7 @@ class ExchangeTokenService:
         """Log the token exchange attempt for audit purposes."""
         request_meta = request_meta or {}
 
-        AuditLog.objects.create(
+        AuditLog.log_event(
             user=user,
             event_type='security_event',
             description=f'Exchange token {"used" if success else "failed"} for auto-login',
@@ -238,7 +238,7 @@ class AuthenticationService:
         )
 
         # Log successful login
-        AuditLog.objects.create(
+        AuditLog.log_event(
             user=user,
             event_type='login_success',
             description='User logged in successfully',
@@ -313,8 +313,12 @@ class AuthenticationService:
 
             terminated_count = active_sessions.update(is_active=False)
 
+            # Bulk updates bypass signals, so drop the cached session profile
+            from .utils.sessions import session_profile_store
+            session_profile_store.invalidate(user.id)
+
             # Log the logout
-            AuditLog.objects.create(
+            AuditLog.log_event(
                 user=user,
                 event_type='logout_success',
                 description=f'User logged out successfully. Terminated {terminated_count} session(s)',
@@ -342,7 +346,7 @@ class AuthenticationService:
             )
 
             # Log the failure
-            AuditLog.objects.create(
+            AuditLog.log_event(
                 user=user,
                 event_type='logout_failure',
                 description=f'User logout failed: {str(e)}',
@@ -417,7 +421,7 @@ class PasswordService:
             user.save()
 
             # Log the password change
-            AuditLog.objects.create(
+            AuditLog.log_event(
                 user=user,
                 event_type='password_changed',
                 description='User changed their password',
@@ -474,7 +478,7 @@ class SessionService:
             session.save()
 
             # Log the session termination
-            AuditLog.objects.create(
+            AuditLog.log_event(
                 user=user,
                 event_type='session_terminated',
                 description=f'Session {session_id} terminated',
@@ -515,8 +519,12 @@ class SessionService:
 
             terminated_count = sessions.update(is_active=False)
 
+            # Bulk updates bypass signals, so drop the cached session profile
+            from .utils.sessions import session_profile_store
+            session_profile_store.invalidate(user.id)
+
             # Log the bulk session termination
-            AuditLog.objects.create(
+            AuditLog.log_event(
                 user=user,
                 event_type='all_sessions_terminated',
                 description=f'Terminated {terminated_count} sessions',
@@ -590,7 +598,7 @@ class EmailVerificationService:
             send_verification_email(user, str(token.token))
             
             # Log the action
-            AuditLog.objects.create(
+            AuditLog.log_event(
                 user=user,
                 event_type='email_verification_sent',
                 description='Email verification sent',
@@ -605,7 +613,7 @@ class EmailVerificationService:
             logger.error(f"Failed to send verification email for user {user.id}: {e}")
             
             # Log the failure
-            AuditLog.objects.create(
+            AuditLog.log_event(
                 user=user,
                 event_type='email_verification_failed',
                 description=f'Failed to send verification email: {str(e)}',
@@ -642,7 +650,7 @@ class EmailVerificationService:
                 user.save()
                 
                 # Log successful verification
-                AuditLog.objects.create(
+                AuditLog.log_event(
                     user=user,
                     event_type='email_verified',
                     description='Email verified successfully',
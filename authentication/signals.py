@@ -0,0 +1,29 @@
+"""
+Signals for authentication app.
+
+Keeps the cached per-user session profile in step with session changes.
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import UserSession
+from .utils.sessions import session_profile_store
+
+
+# Fields whose changes affect the session profile
+PROFILE_FIELDS = {'refresh_token_jti', 'is_active', 'ip_address',
+                  'device_fingerprint'}
+
+
+@receiver(post_save, sender=UserSession)
+def update_session_profile(sender, instance, created, update_fields=None, **kwargs):
+    """Drop the profile when a session is created, rotated or deactivated."""
+    if created or update_fields is None or PROFILE_FIELDS & set(update_fields):
+        session_profile_store.record_session(instance)
+
+
+@receiver(post_delete, sender=UserSession)
+def invalidate_session_profile(sender, instance, **kwargs):
+    """Drop the cached profile when a session is deleted."""
+    session_profile_store.invalidate(instance.user_id)
@@ -4,6 +4,7 @@ Celery tasks for authentication app.
 Background tasks for:
 - Cleaning up expired tokens
 - Cleaning up expired sessions
+- Writing queued audit log events
 - Security maintenance
 """
 
@@ -144,6 +145,29 @@ def cleanup_old_audit_logs(self):
         raise self.retry(exc=exc, countdown=300)
 
 
+@shared_task(bind=True, max_retries=3)
+def flush_audit_log(self):
+    """
+    Write queued audit log events in batches.
+
+    Runs every few seconds via Celery Beat and once more when a worker
+    shuts down. Events stay pending in the stream until their batch is
+    committed, so a failed run is simply retried.
+
+    Returns:
+        dict: Number of events written
+    """
+    try:
+        from .audit import audit_writer
+
+        written = audit_writer.flush()
+        return {'written': written, 'status': 'success'}
+
+    except Exception as exc:
+        logger.error(f"Audit log flush failed: {exc}", exc_info=True)
+        raise self.retry(exc=exc, countdown=10)
+
+
 @shared_task(bind=True, max_retries=2)
 def check_password_breach_async(self, user_id: str, password_hash: str):
     """
@@ -0,0 +1,187 @@
+"""
+Tests for the batched audit log writer.
+
+Covers:
+- Synchronous writes without a queue and for critical events
+- Queued events written in batches with their original timestamp
+- At-least-once delivery: reclaiming unacknowledged events and
+  ignoring redelivered ones
+"""
+
+import json
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from ..audit import CONSUMER_GROUP, STREAM_KEY, audit_writer
+from ..models import AuditLog
+from .factories import UserFactory
+
+
+class FakeStream:
+    """In-memory stand-in for the Redis stream commands the writer uses."""
+
+    def __init__(self):
+        self.entries = {}
+        self.pending = {}
+        self.last_delivered = 0
+        self.sequence = 0
+        self.group_created = False
+
+    def xadd(self, key, fields):
+        self.sequence += 1
+        entry_id = f'{self.sequence}-0'.encode()
+        self.entries[entry_id] = {
+            name.encode(): value.encode() for name, value in fields.items()}
+        return entry_id
+
+    def xgroup_create(self, key, group, id='0', mkstream=False):
+        if self.group_created:
+            raise Exception('BUSYGROUP Consumer Group name already exists')
+        self.group_created = True
+
+    def xreadgroup(self, group, consumer, streams, count=None):
+        new = [entry_id for entry_id in self.entries
+               if int(entry_id.split(b'-')[0]) > self.last_delivered][:count]
+        if not new:
+            return []
+        for entry_id in new:
+            self.pending[entry_id] = (consumer, time.monotonic())
+        self.last_delivered = int(new[-1].split(b'-')[0])
+        return [[STREAM_KEY.encode(), [(i, self.entries[i]) for i in new]]]
+
+    def xautoclaim(self, key, group, consumer, min_idle_time, start_id='0-0', count=None):
+        now = time.monotonic()
+        claimed = [
+            entry_id for entry_id, (_, delivered) in self.pending.items()
+            if (now - delivered) * 1000 >= min_idle_time
+        ][:count]
+        for entry_id in claimed:
+            self.pending[entry_id] = (consumer, now)
+        return [b'0-0', [(i, self.entries[i]) for i in claimed], []]
+
+    def xack(self, key, group, *entry_ids):
+        for entry_id in entry_ids:
+            self.pending.pop(entry_id, None)
+
+    def xdel(self, key, *entry_ids):
+        for entry_id in entry_ids:
+            self.entries.pop(entry_id, None)
+
+    def xlen(self, key):
+        return len(self.entries)
+
+
+class SyncAuditLogTest(TestCase):
+    """Test events are written inline when queueing is off."""
+
+    def test_written_immediately(self):
+        """Test log_event inserts the row right away."""
+        user = UserFactory()
+
+        entry = AuditLog.log_event('login_success', user=user, description='Login')
+
+        self.assertTrue(AuditLog.objects.filter(pk=entry.pk, user=user).exists())
+        self.assertEqual(audit_writer.flush(), 0)
+
+    @override_settings(AUDIT_LOG_REDIS_URL='redis://audit-test/0')
+    def test_redis_alone_does_not_queue(self):
+        """Test a configured Redis does not queue events without AUDIT_LOG_ASYNC."""
+        user = UserFactory()
+
+        with patch.object(audit_writer, '_get_client') as get_client:
+            entry = AuditLog.log_event('login_success', user=user, description='Login')
+
+        self.assertTrue(AuditLog.objects.filter(pk=entry.pk).exists())
+        get_client.assert_not_called()
+
+
+@override_settings(
+    AUDIT_LOG_ASYNC=True, AUDIT_LOG_REDIS_URL='redis://audit-test/0', AUDIT_LOG_CLAIM_IDLE_MS=0)
+class QueuedAuditLogTest(TestCase):
+    """Test events are queued and written in batches."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.stream = FakeStream()
+        patcher = patch.object(audit_writer, '_get_client', return_value=self.stream)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = UserFactory()
+
+    def test_events_are_queued_then_flushed(self):
+        """Test events reach the database in one INSERT when flushed."""
+        happened_at = timezone.now() - timedelta(minutes=5)
+        with patch('authentication.audit.timezone.now', return_value=happened_at):
+            AuditLog.log_event('password_change', user=self.user)
+        for i in range(3):
+            AuditLog.log_event(
+                'token_refresh', user=self.user, ip_address='10.0.0.1',
+                metadata={'attempt': i})
+        AuditLog.log_event('logout', description='Anonymous')
+        self.stream.xadd(STREAM_KEY, {'event': '{"broken"'})
+
+        self.assertEqual(AuditLog.objects.count(), 0)
+        self.assertEqual(audit_writer.pending(), 6)
+
+        with CaptureQueriesContext(connection) as queries:
+            written = audit_writer.flush()
+
+        inserts = [q for q in queries if q['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 1)
+        # The malformed event is dropped rather than redelivered forever
+        self.assertEqual(written, 5)
+        self.assertEqual(audit_writer.pending(), 0)
+        self.assertEqual(self.stream.pending, {})
+        self.assertEqual(AuditLog.objects.filter(event_type='token_refresh').count(), 3)
+        password_change = AuditLog.objects.get(event_type='password_change')
+        self.assertEqual(password_change.timestamp, happened_at)
+        self.assertEqual(password_change.user, self.user)
+        self.assertTrue(AuditLog.objects.get(event_type='logout').success)
+
+    def test_critical_events_are_written_synchronously(self):
+        """Test critical events skip the queue."""
+        AuditLog.log_event('account_locked', user=self.user, risk_level='critical')
+
+        self.assertEqual(AuditLog.objects.count(), 1)
+        self.assertEqual(audit_writer.pending(), 0)
+
+    def test_queue_failure_writes_inline(self):
+        """Test a Redis error does not lose the event."""
+        with patch.object(self.stream, 'xadd', side_effect=ConnectionError('down')):
+            AuditLog.log_event('login_failure', user=self.user, success=False)
+
+        self.assertEqual(AuditLog.objects.filter(success=False).count(), 1)
+
+    def test_unacknowledged_events_are_redelivered(self):
+        """Test events read by a crashed consumer are reclaimed once."""
+        entry = AuditLog.log_event('logout', user=self.user)
+        # A consumer read the event and died before acknowledging it
+        self.stream.xreadgroup(CONSUMER_GROUP, 'crashed', {STREAM_KEY: '>'}, count=10)
+        self.assertEqual(self.stream.xreadgroup(
+            CONSUMER_GROUP, 'other', {STREAM_KEY: '>'}, count=10), [])
+
+        self.assertEqual(audit_writer.flush(), 1)
+        self.assertEqual(self.stream.pending, {})
+
+        # A redelivered copy of an already written event is ignored
+        self.stream.xadd(STREAM_KEY, {'event': json.dumps(audit_writer._serialize(entry))})
+        audit_writer.flush()
+        self.assertEqual(AuditLog.objects.filter(pk=entry.pk).count(), 1)
+
+    def test_event_for_missing_user_is_kept(self):
+        """Test events whose user no longer exists are written without it."""
+        AuditLog.log_event('login_success', user=self.user)
+        AuditLog.log_event('logout', user=UserFactory.build())
+
+        self.assertEqual(audit_writer.flush(), 2)
+
+        orphan = AuditLog.objects.get(event_type='logout')
+        self.assertIsNone(orphan.user_id)
+        self.assertIn('deleted_user_id', orphan.metadata)
+        self.assertEqual(AuditLog.objects.get(event_type='login_success').user, self.user)
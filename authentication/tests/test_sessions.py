@@ -0,0 +1,255 @@
+"""
+Tests for session utilities.
+
+Covers user agent parsing, the memoized user agent cache, suspicious
+agent detection and the cached session profile used for risk analysis.
+"""
+
+import uuid
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from ..models import UserSession
+from ..utils.sessions import (
+    DeviceFingerprinter, UserAgentCache, SUSPICIOUS_AGENT_PATTERNS,
+    analyze_new_session, session_profile_store
+)
+from .factories import UserFactory
+
+
+CHROME_UA = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+)
+IPHONE_UA = (
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_2 like Mac OS X) AppleWebKit/605.1.15 '
+    '(KHTML, like Gecko) Version/17.2 Mobile/15E148 Safari/604.1'
+)
+
+
+class TestUserAgentCache(SimpleTestCase):
+    """Test the bounded user agent LRU cache."""
+
+    def setUp(self):
+        self.ua_cache = UserAgentCache(max_size=2, shared=False)
+        self.calls = []
+
+    def compute(self, user_agent):
+        self.calls.append(user_agent)
+        return {'user_agent': user_agent}
+
+    def test_repeated_lookup_is_memoized(self):
+        """Second lookup of the same agent does not recompute."""
+        self.ua_cache.get_or_compute('device', CHROME_UA, self.compute)
+        self.ua_cache.get_or_compute('device', CHROME_UA, self.compute)
+
+        assert self.calls == [CHROME_UA]
+        stats = self.ua_cache.get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['hit_rate'] == 0.5
+
+    def test_kinds_are_cached_separately(self):
+        """Device info and suspicion verdicts use distinct keys."""
+        self.ua_cache.get_or_compute('device', CHROME_UA, self.compute)
+        self.ua_cache.get_or_compute('suspicion', CHROME_UA, self.compute)
+
+        assert len(self.calls) == 2
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Cache never grows beyond its configured size."""
+        self.ua_cache.get_or_compute('device', 'a', self.compute)
+        self.ua_cache.get_or_compute('device', 'b', self.compute)
+        self.ua_cache.get_or_compute('device', 'a', self.compute)
+        self.ua_cache.get_or_compute('device', 'c', self.compute)
+        self.ua_cache.get_or_compute('device', 'a', self.compute)
+        self.ua_cache.get_or_compute('device', 'b', self.compute)
+
+        assert self.calls == ['a', 'b', 'c', 'b']
+        assert self.ua_cache.get_stats()['size'] == 2
+
+    @override_settings(CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    })
+    def test_shared_tier_serves_other_processes(self):
+        """A fresh local cache is filled from the shared tier."""
+        first = UserAgentCache(max_size=10, shared=True)
+        second = UserAgentCache(max_size=10, shared=True)
+        first.get_or_compute('device', IPHONE_UA, self.compute)
+        second.get_or_compute('device', IPHONE_UA, self.compute)
+
+        assert self.calls == [IPHONE_UA]
+        assert second.get_stats()['shared_hits'] == 1
+
+
+class TestDeviceFingerprinter(SimpleTestCase):
+    """Test memoized device parsing and suspicion detection."""
+
+    def setUp(self):
+        self.fingerprinter = DeviceFingerprinter(
+            ua_cache=UserAgentCache(shared=False))
+
+    def test_parse_device_info_matches_uncached_parse(self):
+        """Cached results are identical to a direct parse."""
+        expected = self.fingerprinter._parse_device_info(IPHONE_UA)
+
+        assert self.fingerprinter.parse_device_info(IPHONE_UA) == expected
+        assert self.fingerprinter.parse_device_info(IPHONE_UA) == expected
+        assert expected['device_type'] == 'mobile'
+
+    def test_cached_result_is_not_shared_by_reference(self):
+        """Callers mutating a result do not corrupt the cache."""
+        info = self.fingerprinter.parse_device_info(CHROME_UA)
+        info['device_type'] = 'tampered'
+        suspicion = self.fingerprinter.detect_suspicious_agent('curl/8.4.0')
+        suspicion['reasons'].append('tampered')
+
+        assert self.fingerprinter.parse_device_info(
+            CHROME_UA)['device_type'] == 'desktop'
+        assert 'tampered' not in self.fingerprinter.detect_suspicious_agent(
+            'curl/8.4.0')['reasons']
+
+    def test_browser_agent_is_not_suspicious(self):
+        """Regular browsers match none of the suspicious patterns."""
+        assert self.fingerprinter.is_suspicious(CHROME_UA) is False
+
+    def test_reasons_follow_pattern_order(self):
+        """Each matching pattern is reported once, in declaration order."""
+        result = self.fingerprinter.detect_suspicious_agent(
+            'python-requests/2.31.0 (test crawler)')
+
+        assert result['is_suspicious'] is True
+        assert result['reasons'] == [
+            f'Matches suspicious pattern: {SUSPICIOUS_AGENT_PATTERNS[0]}',
+            f'Matches suspicious pattern: {SUSPICIOUS_AGENT_PATTERNS[2]}',
+            f'Matches suspicious pattern: {SUSPICIOUS_AGENT_PATTERNS[3]}',
+        ]
+
+    def test_overlapping_patterns_are_all_reported(self):
+        """Patterns overlapping another pattern's match are still reported."""
+        result = self.fingerprinter.detect_suspicious_agent(
+            'robotest-agent/1.0 (wgetest)')
+
+        assert result['reasons'] == [
+            f'Matches suspicious pattern: {SUSPICIOUS_AGENT_PATTERNS[0]}',
+            f'Matches suspicious pattern: {SUSPICIOUS_AGENT_PATTERNS[1]}',
+            f'Matches suspicious pattern: {SUSPICIOUS_AGENT_PATTERNS[3]}',
+        ]
+
+    def test_missing_user_agent_is_suspicious(self):
+        """Empty user agents are flagged with medium risk."""
+        result = self.fingerprinter.detect_suspicious_agent('')
+
+        assert result['is_suspicious'] is True
+        assert result['risk_level'] == 'medium'
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+})
+class TestSessionProfileStore(TestCase):
+    """Test the cached per-user session profile."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory()
+        self.factory = RequestFactory()
+
+    def create_session(self, ip_address='10.0.0.1', fingerprint='fp-home'):
+        return UserSession.objects.create(
+            user=self.user,
+            session_key=f"session_{uuid.uuid4().hex[:24]}",
+            refresh_token_jti=str(uuid.uuid4()),
+            device_fingerprint=fingerprint,
+            ip_address=ip_address,
+            user_agent=CHROME_UA,
+            expires_at=timezone.now() + timedelta(days=7)
+        )
+
+    def make_request(self, ip_address):
+        return self.factory.get(
+            '/', REMOTE_ADDR=ip_address, HTTP_USER_AGENT=CHROME_UA)
+
+    def test_cold_start_builds_profile_in_one_query(self):
+        """Missing profiles are rebuilt from a single database query."""
+        self.create_session()
+        self.create_session(ip_address='10.0.0.2')
+        cache.clear()
+
+        with self.assertNumQueries(1):
+            profile = session_profile_store.get_profile(self.user)
+        with self.assertNumQueries(0):
+            session_profile_store.get_profile(self.user)
+
+        assert len(profile['sessions']) == 2
+
+    def test_warm_analysis_does_not_query_database(self):
+        """Risk analysis reads only the cached profile once warm."""
+        self.create_session()
+        session_profile_store.get_profile(self.user)
+
+        with self.assertNumQueries(0):
+            analysis = analyze_new_session(
+                self.user, self.make_request('192.168.1.50'))
+
+        assert 'Login from new IP address' in analysis['warnings']
+        assert analysis['should_require_verification'] is True
+
+    def test_new_and_deactivated_sessions_update_profile(self):
+        """Signals keep a cached profile in step with session changes."""
+        session = self.create_session()
+        session_profile_store.get_profile(self.user)
+
+        self.create_session(ip_address='10.0.0.9')
+        profile = session_profile_store.get_profile(self.user)
+        assert len(profile['sessions']) == 2
+
+        session.deactivate(reason='test')
+        profile = session_profile_store.get_profile(self.user)
+        assert profile['sessions'][str(session.pk)][3] is False
+
+    def test_logout_drops_session_from_profile(self):
+        """Logging out deactivates the session in the cached profile."""
+        refresh = RefreshToken.for_user(self.user)
+        session = self.create_session()
+        UserSession.objects.filter(pk=session.pk).update(refresh_token_jti=str(refresh['jti']))
+        session_profile_store.invalidate(self.user.id)
+        session_profile_store.get_profile(self.user)
+
+        APIClient().post(
+            reverse('authentication:logout'), HTTP_X_REFRESH_TOKEN=str(refresh))
+
+        session.refresh_from_db()
+        assert session.is_active is False
+        profile = session_profile_store.get_profile(self.user)
+        assert profile['sessions'][str(session.pk)][3] is False
+
+    def test_cleanup_drops_sessions_from_profile(self):
+        """Sessions deactivated by cleanup are dropped from cached profiles."""
+        session = self.create_session()
+        UserSession.objects.filter(pk=session.pk).update(
+            last_activity_at=timezone.now() - timedelta(days=40))
+        session_profile_store.get_profile(self.user)
+
+        UserSession.cleanup_invalid_sessions()
+
+        profile = session_profile_store.get_profile(self.user)
+        assert profile['sessions'][str(session.pk)][3] is False
+
+    def test_analysis_is_memoized_per_request(self):
+        """Repeated analysis on the same request is computed once."""
+        self.create_session()
+        request = self.make_request('10.0.0.1')
+
+        first = analyze_new_session(self.user, request)
+        cache.clear()
+        with self.assertNumQueries(0):
+            second = analyze_new_session(self.user, request)
+
+        assert first is second
@@ -20,7 +20,8 @@ from .sessions import (
     is_suspicious_user_agent,
     detect_session_anomalies,
     calculate_session_risk_score,
-    get_session_summary
+    get_session_summary,
+    get_user_agent_cache_stats
 )
 
 from .cookies import (
@@ -59,6 +60,7 @@ __all__ = [
     'detect_session_anomalies',
     'calculate_session_risk_score',
     'get_session_summary',
+    'get_user_agent_cache_stats',
 
     # Cookie utilities
     'set_refresh_token_cookie',
@@ -13,7 +13,6 @@ Created: October 2025
 import secrets
 import hashlib
 import logging
-import threading
 import re
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
@@ -21,7 +20,7 @@ from typing import Optional, Dict, Any
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
-from django.core.mail import EmailMultiAlternatives, send_mail
+from django.core.mail import EmailMultiAlternatives
 from django.template.loader import render_to_string
 from django.urls import reverse
 from django.utils import timezone
@@ -29,6 +28,9 @@ from django.utils.encoding import force_bytes, force_str
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.translation import gettext_lazy as _
 
+from core.circuit_breaker import CircuitBreakerOpen, get_circuit_breaker
+from core.email_dispatch import get_dispatcher, send_email
+
 from ..models import AuditLog
 
 User = get_user_model()
@@ -39,10 +41,11 @@ logger = logging.getLogger(__name__)
 
 def send_email_async(send_func, *args, **kwargs):
     """
-    Send email asynchronously in a background thread to prevent request timeouts.
+    Send email in the background to prevent request timeouts.
 
     This is critical for Railway/production where SMTP connections can be slow
-    and cause HTTP request timeouts (30s limit on Railway).
+    and cause HTTP request timeouts (30s limit on Railway). The call runs on
+    the bounded email worker pool (see core.email_dispatch), not a new thread.
 
     Args:
         send_func: The email send function to call
@@ -51,17 +54,11 @@ def send_email_async(send_func, *args, **kwargs):
     Returns:
         True if email was queued successfully
     """
-    def send_thread():
-        try:
-            send_func(*args, **kwargs)
-            logger.info(f"Async email sent successfully")
-        except Exception as e:
-            logger.error(f"Async email send failed: {e}", exc_info=True)
-
-    thread = threading.Thread(target=send_thread)
-    thread.daemon = True  # Daemon thread won't block program exit
-    thread.start()
+    if not getattr(settings, 'EMAIL_DISPATCH_ASYNC', True):
+        send_func(*args, **kwargs)
+        return True
 
+    get_dispatcher().call(send_func, *args, **kwargs)
     logger.info("Email queued for async sending")
     return True
 
@@ -285,47 +282,8 @@ class EmailVerificationService:
             )
             email.attach_alternative(html_content, "text/html")
 
-            # Send email asynchronously to prevent request timeout
-            import threading
-            from django.core.mail import get_connection
-            import time
-
-            def send_async():
-                start_time = time.time()
-                try:
-                    # Create a new connection with timeout settings
-                    email_timeout = getattr(settings, 'EMAIL_TIMEOUT', 60)
-                    logger.info(f"EMAIL_TIMEOUT setting: {email_timeout}s")
-                    logger.info(
-                        f"EMAIL_HOST: {getattr(settings, 'EMAIL_HOST', 'not set')}")
-                    logger.info(
-                        f"EMAIL_PORT: {getattr(settings, 'EMAIL_PORT', 'not set')}")
-                    logger.info(
-                        f"EMAIL_USE_TLS: {getattr(settings, 'EMAIL_USE_TLS', 'not set')}")
-
-                    logger.info("Creating email connection...")
-                    connection = get_connection(
-                        timeout=email_timeout,
-                        fail_silently=False
-                    )
-                    logger.info("Connection created, attaching to email...")
-                    email.connection = connection
-
-                    logger.info("Sending email...")
-                    email.send(fail_silently=False)
-                    elapsed = time.time() - start_time
-                    logger.info(
-                        f"Email verification sent to: {user.email} (took {elapsed:.2f}s)")
-                except Exception as e:
-                    elapsed = time.time() - start_time
-                    logger.error(
-                        f"Async email send failed for {user.email} after {elapsed:.2f}s: {e}")
-                    import traceback
-                    logger.error(f"Traceback: {traceback.format_exc()}")
-
-            thread = threading.Thread(target=send_async)
-            thread.daemon = True  # Daemon thread won't prevent program exit
-            thread.start()
+            # Send from the email worker pool to prevent request timeout
+            send_email(email)
 
             logger.info(f"Email verification queued for: {user.email}")
             return True
@@ -463,23 +421,24 @@ class PasswordResetEmailService:
                 plain_message = self._generate_fallback_message(context)
                 html_message = None
 
-            # Send email
-            send_mail(
+            # Send from the email worker pool to prevent request timeout
+            email = EmailMultiAlternatives(
                 subject=subject,
-                message=plain_message,
+                body=plain_message,
                 from_email=getattr(
                     settings, 'DEFAULT_FROM_EMAIL', 'noreply@Vineyard Group Fellowship.com'),
-                recipient_list=[user.email],
-                html_message=html_message,
-                fail_silently=False
+                to=[user.email]
             )
+            if html_message:
+                email.attach_alternative(html_message, "text/html")
+            send_email(email)
 
             # Log successful email send
             if request:
-                AuditLog.objects.create(
+                AuditLog.log_event(
                     user=user,
                     event_type='password_reset_email_sent',
-                    description='Password reset email sent successfully',
+                    description='Password reset email queued for delivery',
                     ip_address=request.META.get('REMOTE_ADDR', '127.0.0.1'),
                     user_agent=request.META.get(
                         'HTTP_USER_AGENT', 'Test Client'),
@@ -496,7 +455,7 @@ class PasswordResetEmailService:
         except Exception as e:
             # Log failed email send
             if request:
-                AuditLog.objects.create(
+                AuditLog.log_event(
                     user=user,
                     event_type='password_reset_email_failed',
                     description=f'Password reset email failed: {str(e)}',
@@ -689,14 +648,24 @@ class PasswordSecurityService:
                 pass
 
             # Query HaveIBeenPwned API with k-anonymity (reduced timeout to 2s)
-            response = requests.get(
-                f"https://api.pwnedpasswords.com/range/{prefix}",
-                timeout=timeout,
-                headers={
-                    'User-Agent': 'Vineyard Group Fellowship-PasswordChecker/1.0',
-                    'Add-Padding': 'true'  # Enable padding for better privacy
-                }
-            )
+            def make_request():
+                response = requests.get(
+                    f"https://api.pwnedpasswords.com/range/{prefix}",
+                    timeout=timeout,
+                    headers={
+                        'User-Agent': 'Vineyard Group Fellowship-PasswordChecker/1.0',
+                        'Add-Padding': 'true'  # Enable padding for better privacy
+                    }
+                )
+                if response.status_code >= 500:
+                    response.raise_for_status()
+                return response
+
+            # Shared breaker: while the API is down, skip the 2s wait
+            response = get_circuit_breaker(
+                'pwned_passwords',
+                expected_exceptions=(requests.RequestException,)
+            ).call(make_request)
 
             if response.status_code == 200:
                 # Parse breached password suffixes
@@ -724,6 +693,11 @@ class PasswordSecurityService:
             logger.warning(
                 "Password breach check timed out - allowing registration")
             return False
+        except CircuitBreakerOpen:
+            # Recent failures - fail open without calling the API
+            logger.info(
+                "Password breach check skipped (circuit open) - allowing registration")
+            return False
         except Exception as e:
             # Fail open on ANY error - don't block user registration
             logger.warning(
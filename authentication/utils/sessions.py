@@ -12,10 +12,14 @@ This module provides comprehensive session management functionality with:
 import hashlib
 import logging
 import re
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from user_agents import parse as parse_user_agent
@@ -24,6 +28,153 @@ User = get_user_model()
 logger = logging.getLogger(__name__)
 
 
+# Suspicious user agent patterns, checked in order when building reasons
+SUSPICIOUS_AGENT_PATTERNS = [
+    r'bot|crawler|spider|scraper',
+    r'wget|curl|http',
+    r'python|perl|ruby|php',
+    r'automated|test|phantom'
+]
+
+# Compiled once and searched separately: a single alternation consumes
+# each match, so a pattern overlapping another ('robotest', 'wgetest')
+# would go unreported. Results are cached per user agent, so the extra
+# searches only run on a cache miss.
+SUSPICIOUS_AGENT_REGEXES = [
+    re.compile(pattern) for pattern in SUSPICIOUS_AGENT_PATTERNS
+]
+
+
+class UserAgentCache:
+    """
+    Bounded LRU cache for parsed user agent data.
+
+    Parsing a user agent with ua-parser runs a long regex cascade, and the
+    same handful of agents shows up on every login, token refresh and
+    session listing. Entries are keyed by a hash of the user agent string
+    and can optionally spill to the shared Django cache (Redis) so workers
+    benefit from each other's parses.
+
+    Features:
+    - Thread-safe in-process LRU with a configurable size
+    - Optional shared cache tier (USER_AGENT_CACHE_SHARED)
+    - Hit/miss counters for monitoring
+    """
+
+    SHARED_KEY_PREFIX = 'ua'
+
+    def __init__(self, max_size: int = None, shared: bool = None,
+                 shared_timeout: int = None):
+        """Initialize the user agent cache."""
+        self.max_size = max_size if max_size is not None else getattr(
+            settings, 'USER_AGENT_CACHE_SIZE', 2048)
+        self.shared = shared if shared is not None else getattr(
+            settings, 'USER_AGENT_CACHE_SHARED', False)
+        self.shared_timeout = shared_timeout if shared_timeout is not None else getattr(
+            settings, 'USER_AGENT_CACHE_TIMEOUT', 86400)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(kind: str, user_agent: str) -> str:
+        """
+        Build the cache key for a user agent.
+
+        Args:
+            kind: Kind of cached value ('device' or 'suspicion')
+            user_agent: User agent string
+
+        Returns:
+            Cache key based on a hash of the user agent
+        """
+        digest = hashlib.sha1(
+            (user_agent or '').encode('utf-8', 'replace')).hexdigest()
+        return f"{kind}:{digest}"
+
+    def get_or_compute(self, kind: str, user_agent: str, compute) -> Any:
+        """
+        Return the cached value for a user agent, computing it on a miss.
+
+        Args:
+            kind: Kind of cached value ('device' or 'suspicion')
+            user_agent: User agent string
+            compute: Callable taking the user agent and returning the value
+
+        Returns:
+            Cached or freshly computed value
+        """
+        key = self.make_key(kind, user_agent)
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        value = None
+        if self.shared:
+            try:
+                value = cache.get(f"{self.SHARED_KEY_PREFIX}:{key}")
+            except Exception as e:
+                logger.warning(f"User agent shared cache read failed: {e}")
+
+        if value is not None:
+            with self._lock:
+                self.shared_hits += 1
+        else:
+            value = compute(user_agent)
+            with self._lock:
+                self.misses += 1
+            if self.shared:
+                try:
+                    cache.set(f"{self.SHARED_KEY_PREFIX}:{key}",
+                              value, self.shared_timeout)
+                except Exception as e:
+                    logger.warning(
+                        f"User agent shared cache write failed: {e}")
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+        return value
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache hit-rate statistics.
+
+        Returns:
+            Dictionary with cache counters and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'shared': self.shared,
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.shared_hits) / lookups, 4) if lookups else 0.0
+            }
+
+    def clear(self):
+        """Clear cached entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.shared_hits = 0
+            self.misses = 0
+
+
+user_agent_cache = UserAgentCache()
+
+
 class DeviceFingerprinter:
     """
     Advanced device fingerprinting for session security.
@@ -35,14 +186,11 @@ class DeviceFingerprinter:
     - Browser and OS detection
     """
 
-    def __init__(self):
+    def __init__(self, ua_cache: UserAgentCache = None):
         """Initialize the device fingerprinter."""
-        self.suspicious_patterns = [
-            r'bot|crawler|spider|scraper',
-            r'wget|curl|http',
-            r'python|perl|ruby|php',
-            r'automated|test|phantom'
-        ]
+        self.suspicious_patterns = SUSPICIOUS_AGENT_PATTERNS
+        self.suspicious_regexes = SUSPICIOUS_AGENT_REGEXES
+        self.ua_cache = ua_cache or user_agent_cache
 
     def generate_fingerprint(self, request) -> str:
         """
@@ -77,6 +225,22 @@ class DeviceFingerprinter:
         """
         Parse user agent string to extract device information.
 
+        Results are memoized in the user agent cache.
+
+        Args:
+            user_agent: User agent string
+
+        Returns:
+            Dictionary with parsed device information
+        """
+        device_info = self.ua_cache.get_or_compute(
+            'device', user_agent, self._parse_device_info)
+        return dict(device_info)
+
+    def _parse_device_info(self, user_agent: str) -> Dict[str, Any]:
+        """
+        Parse user agent string without consulting the cache.
+
         Args:
             user_agent: User agent string
 
@@ -193,6 +357,35 @@ class DeviceFingerprinter:
         """
         Detect suspicious user agent patterns.
 
+        Results are memoized in the user agent cache.
+
+        Args:
+            user_agent: User agent string to analyze
+
+        Returns:
+            Dictionary with suspicion analysis
+        """
+        result = self.ua_cache.get_or_compute(
+            'suspicion', user_agent, self._detect_suspicious_agent)
+        return {**result, 'reasons': list(result['reasons'])}
+
+    def is_suspicious(self, user_agent: str) -> bool:
+        """
+        Check whether a user agent appears suspicious.
+
+        Args:
+            user_agent: User agent string to analyze
+
+        Returns:
+            True if user agent appears suspicious
+        """
+        return self.ua_cache.get_or_compute(
+            'suspicion', user_agent, self._detect_suspicious_agent)['is_suspicious']
+
+    def _detect_suspicious_agent(self, user_agent: str) -> Dict[str, Any]:
+        """
+        Detect suspicious user agent patterns without consulting the cache.
+
         Args:
             user_agent: User agent string to analyze
 
@@ -211,14 +404,14 @@ class DeviceFingerprinter:
             result['reasons'].append('Missing user agent')
             return result
 
-        # Check against suspicious patterns
+        # Check against each precompiled suspicious pattern
         user_agent_lower = user_agent.lower()
-        for pattern in self.suspicious_patterns:
-            if re.search(pattern, user_agent_lower):
+        for regex in self.suspicious_regexes:
+            if regex.search(user_agent_lower):
                 result['is_suspicious'] = True
                 result['risk_level'] = 'high'
                 result['reasons'].append(
-                    f'Matches suspicious pattern: {pattern}')
+                    f'Matches suspicious pattern: {regex.pattern}')
 
         # Check for unusual characteristics
         if len(user_agent) < 20:
@@ -234,6 +427,138 @@ class DeviceFingerprinter:
         return result
 
 
+class SessionProfileStore:
+    """
+    Compact per-user session profile kept in the cache (Redis).
+
+    The profile maps each recent session to its IP address, device
+    fingerprint, creation time and active flag, so risk analysis can read
+    everything it needs in a single cache round trip. It is dropped when a
+    session is created, rotated or deactivated, and rebuilt from Postgres
+    with one query on the next read.
+    """
+
+    KEY_PREFIX = 'session_profile'
+
+    def __init__(self, window_days: int = 30, max_entries: int = None,
+                 timeout: int = None):
+        """Initialize the session profile store."""
+        self.window_days = window_days
+        self.max_entries = max_entries if max_entries is not None else getattr(
+            settings, 'SESSION_PROFILE_MAX_ENTRIES', 100)
+        self.timeout = timeout if timeout is not None else getattr(
+            settings, 'SESSION_PROFILE_TIMEOUT', 21600)
+
+    def get_key(self, user_id) -> str:
+        """Generate cache key for a user's session profile."""
+        return f"{self.KEY_PREFIX}:u{user_id}"
+
+    def get_profile(self, user, existing_sessions=None) -> Dict[str, Any]:
+        """
+        Get the session profile for a user.
+
+        Args:
+            user: User object
+            existing_sessions: Optional QuerySet used for the cold-start rebuild
+
+        Returns:
+            Dictionary with a 'sessions' mapping of session id to
+            [ip_address, device_fingerprint, created_ts, is_active]
+        """
+        try:
+            profile = cache.get(self.get_key(user.pk))
+        except Exception as e:
+            logger.warning(f"Session profile read failed: {e}")
+            profile = None
+
+        if profile is None:
+            profile = self.build_profile(user, existing_sessions)
+            self._store(user.pk, profile)
+
+        return profile
+
+    def build_profile(self, user, existing_sessions=None) -> Dict[str, Any]:
+        """
+        Build a session profile from the database in a single query.
+
+        Args:
+            user: User object
+            existing_sessions: Optional QuerySet of the user's sessions
+
+        Returns:
+            Session profile dictionary
+        """
+        if existing_sessions is None:
+            from ..models import UserSession
+            existing_sessions = UserSession.objects.filter(user=user)
+
+        cutoff = timezone.now() - timedelta(days=self.window_days)
+        rows = existing_sessions.filter(
+            created_at__gte=cutoff
+        ).order_by('-created_at').values_list(
+            'id', 'ip_address', 'device_fingerprint', 'created_at', 'is_active'
+        )[:self.max_entries]
+
+        return {
+            'sessions': {
+                str(session_id): [ip, fingerprint, created_at.timestamp(), is_active]
+                for session_id, ip, fingerprint, created_at, is_active in rows
+            }
+        }
+
+    def record_session(self, session):
+        """
+        Drop the cached profile of a session's user after the session changed.
+
+        Editing the cached profile in place is a read-modify-write that
+        concurrent logins interleave, losing sessions; the next read
+        rebuilds it from the database instead. Inside a transaction the
+        profile is dropped again on commit, in case a read rebuilt it
+        before the change was visible.
+
+        Args:
+            session: UserSession instance
+        """
+        user_id = session.user_id
+        self.invalidate(user_id)
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(lambda: self.invalidate(user_id))
+
+    def invalidate(self, user_id):
+        """
+        Drop a user's cached profile, e.g. after bulk session updates.
+
+        Args:
+            user_id: User primary key
+        """
+        try:
+            cache.delete(self.get_key(user_id))
+        except Exception as e:
+            logger.warning(f"Session profile invalidation failed: {e}")
+
+    def invalidate_many(self, user_ids):
+        """
+        Drop the cached profiles of several users in one cache call.
+
+        Args:
+            user_ids: User primary keys
+        """
+        keys = [self.get_key(user_id) for user_id in set(user_ids)]
+        if not keys:
+            return
+        try:
+            cache.delete_many(keys)
+        except Exception as e:
+            logger.warning(f"Session profile invalidation failed: {e}")
+
+    def _store(self, user_id, profile: Dict[str, Any]):
+        """Write a profile to the cache."""
+        try:
+            cache.set(self.get_key(user_id), profile, self.timeout)
+        except Exception as e:
+            logger.warning(f"Session profile write failed: {e}")
+
+
 class SessionSecurityMonitor:
     """
     Security monitoring for user sessions.
@@ -245,24 +570,37 @@ class SessionSecurityMonitor:
     - Suspicious activity detection
     """
 
-    def __init__(self):
+    def __init__(self, profile_store: SessionProfileStore = None):
         """Initialize the session security monitor."""
         self.max_concurrent_sessions = getattr(
             settings, 'MAX_CONCURRENT_SESSIONS', 10)
         self.session_timeout = getattr(settings, 'SESSION_TIMEOUT_HOURS', 24)
+        self.profile_store = profile_store or session_profile_store
 
-    def analyze_session_security(self, user, request, existing_sessions) -> Dict[str, Any]:
+    def analyze_session_security(self, user, request, existing_sessions=None) -> Dict[str, Any]:
         """
         Analyze security aspects of a new session.
 
+        All checks run against the user's cached session profile, and the
+        result is memoized on the request.
+
         Args:
             user: User creating the session
             request: Django request object
-            existing_sessions: QuerySet of existing user sessions
+            existing_sessions: Optional QuerySet of existing user sessions,
+                only queried when the profile is not cached
 
         Returns:
             Dictionary with security analysis
         """
+        return _memoize_on_request(
+            request, 'session_security', user,
+            lambda: self._analyze_session_security(
+                user, request, existing_sessions)
+        )
+
+    def _analyze_session_security(self, user, request, existing_sessions) -> Dict[str, Any]:
+        """Run the security analysis without request memoization."""
         analysis = {
             'risk_level': 'low',
             'warnings': [],
@@ -271,9 +609,11 @@ class SessionSecurityMonitor:
             'should_require_verification': False
         }
 
+        profile = self.profile_store.get_profile(user, existing_sessions)
+        sessions = profile['sessions'].values()
+
         # Check concurrent session count
-        active_sessions_count = existing_sessions.filter(
-            is_active=True).count()
+        active_sessions_count = sum(1 for entry in sessions if entry[3])
         if active_sessions_count >= self.max_concurrent_sessions:
             analysis['risk_level'] = 'high'
             analysis['warnings'].append('Maximum concurrent sessions reached')
@@ -283,23 +623,22 @@ class SessionSecurityMonitor:
         # Check for geographic anomalies
         ip_address = self._get_client_ip(request)
         location_analysis = self._analyze_location_anomaly(
-            user, ip_address, existing_sessions)
+            ip_address, profile)
         if location_analysis['is_anomalous']:
             analysis['risk_level'] = 'medium' if analysis['risk_level'] == 'low' else 'high'
             analysis['warnings'].extend(location_analysis['warnings'])
             analysis['should_require_verification'] = location_analysis['requires_verification']
 
         # Check for device anomalies
-        fingerprinter = DeviceFingerprinter()
-        device_fingerprint = fingerprinter.generate_fingerprint(request)
+        device_fingerprint = device_fingerprinter.generate_fingerprint(request)
         device_analysis = self._analyze_device_anomaly(
-            user, device_fingerprint, existing_sessions)
+            device_fingerprint, profile)
         if device_analysis['is_new_device']:
             analysis['risk_level'] = 'medium' if analysis['risk_level'] == 'low' else analysis['risk_level']
             analysis['warnings'].extend(device_analysis['warnings'])
 
         # Check time-based anomalies
-        time_analysis = self._analyze_time_anomaly(user, existing_sessions)
+        time_analysis = self._analyze_time_anomaly(profile)
         if time_analysis['is_anomalous']:
             analysis['warnings'].extend(time_analysis['warnings'])
 
@@ -322,14 +661,13 @@ class SessionSecurityMonitor:
             ip = request.META.get('REMOTE_ADDR', '')
         return ip
 
-    def _analyze_location_anomaly(self, user, ip_address: str, existing_sessions) -> Dict[str, Any]:
+    def _analyze_location_anomaly(self, ip_address: str, profile: Dict[str, Any]) -> Dict[str, Any]:
         """
         Analyze location-based anomalies.
 
         Args:
-            user: User object
             ip_address: Client IP address
-            existing_sessions: QuerySet of existing sessions
+            profile: User session profile
 
         Returns:
             Dictionary with location analysis
@@ -341,12 +679,11 @@ class SessionSecurityMonitor:
         }
 
         # Get recent session IPs
-        recent_sessions = existing_sessions.filter(
-            created_at__gte=timezone.now() - timedelta(days=7),
-            is_active=True
-        ).values_list('ip_address', flat=True)
-
-        recent_ips = set(recent_sessions)
+        cutoff = (timezone.now() - timedelta(days=7)).timestamp()
+        recent_ips = {
+            ip for ip, _, created_ts, is_active in profile['sessions'].values()
+            if is_active and created_ts >= cutoff
+        }
 
         # Check if this is a completely new IP
         if ip_address not in recent_ips and recent_ips:
@@ -359,14 +696,13 @@ class SessionSecurityMonitor:
 
         return analysis
 
-    def _analyze_device_anomaly(self, user, device_fingerprint: str, existing_sessions) -> Dict[str, Any]:
+    def _analyze_device_anomaly(self, device_fingerprint: str, profile: Dict[str, Any]) -> Dict[str, Any]:
         """
         Analyze device-based anomalies.
 
         Args:
-            user: User object
             device_fingerprint: Device fingerprint
-            existing_sessions: QuerySet of existing sessions
+            profile: User session profile
 
         Returns:
             Dictionary with device analysis
@@ -377,12 +713,12 @@ class SessionSecurityMonitor:
         }
 
         # Get recent device fingerprints
-        recent_fingerprints = set(
-            existing_sessions.filter(
-                created_at__gte=timezone.now() - timedelta(days=30),
-                is_active=True
-            ).values_list('device_fingerprint', flat=True)
-        )
+        cutoff = (timezone.now() - timedelta(days=30)).timestamp()
+        recent_fingerprints = {
+            fingerprint
+            for _, fingerprint, created_ts, is_active in profile['sessions'].values()
+            if is_active and created_ts >= cutoff
+        }
 
         # Check if this is a new device
         if device_fingerprint not in recent_fingerprints and recent_fingerprints:
@@ -391,13 +727,12 @@ class SessionSecurityMonitor:
 
         return analysis
 
-    def _analyze_time_anomaly(self, user, existing_sessions) -> Dict[str, Any]:
+    def _analyze_time_anomaly(self, profile: Dict[str, Any]) -> Dict[str, Any]:
         """
         Analyze time-based anomalies.
 
         Args:
-            user: User object
-            existing_sessions: QuerySet of existing sessions
+            profile: User session profile
 
         Returns:
             Dictionary with time analysis
@@ -408,9 +743,10 @@ class SessionSecurityMonitor:
         }
 
         # Check for rapid successive logins
-        recent_sessions = existing_sessions.filter(
-            created_at__gte=timezone.now() - timedelta(minutes=5)
-        ).count()
+        cutoff = (timezone.now() - timedelta(minutes=5)).timestamp()
+        recent_sessions = sum(
+            1 for entry in profile['sessions'].values() if entry[2] >= cutoff
+        )
 
         if recent_sessions > 3:
             analysis['is_anomalous'] = True
@@ -419,6 +755,33 @@ class SessionSecurityMonitor:
         return analysis
 
 
+def _memoize_on_request(request, name: str, user, compute):
+    """
+    Memoize a per-user computation for the lifetime of a request.
+
+    Args:
+        request: Django request object
+        name: Name of the memoized computation
+        user: User the computation is for
+        compute: Zero-argument callable producing the value
+
+    Returns:
+        Memoized or freshly computed value
+    """
+    memo = getattr(request, '_session_risk_memo', None)
+    if memo is None:
+        memo = {}
+        try:
+            request._session_risk_memo = memo
+        except AttributeError:
+            return compute()
+
+    key = (name, getattr(user, 'pk', None))
+    if key not in memo:
+        memo[key] = compute()
+    return memo[key]
+
+
 class SessionAnalytics:
     """
     Analytics and reporting for user sessions.
@@ -444,7 +807,7 @@ class SessionAnalytics:
         Returns:
             Dictionary with session summary
         """
-        from .models import UserSession
+        from ..models import UserSession
 
         sessions = UserSession.objects.filter(user=user)
         active_sessions = sessions.filter(is_active=True)
@@ -472,6 +835,7 @@ class SessionAnalytics:
         """
         device_types = {}
         unique_devices = set()
+        fingerprinter = DeviceFingerprinter()
 
         for session in sessions:
             # Count unique device fingerprints
@@ -479,7 +843,6 @@ class SessionAnalytics:
 
             # Parse device type from user agent if available
             if session.user_agent:
-                fingerprinter = DeviceFingerprinter()
                 device_info = fingerprinter.parse_device_info(
                     session.user_agent)
                 device_type = device_info.get('device_type', 'unknown')
@@ -526,7 +889,7 @@ class SessionAnalytics:
         Returns:
             Dictionary with security summary
         """
-        from .models import AuditLog
+        from ..models import AuditLog
 
         security_events = AuditLog.objects.filter(
             user=user,
@@ -595,6 +958,7 @@ class SessionAnalytics:
 
 # Utility instances for easy import
 device_fingerprinter = DeviceFingerprinter()
+session_profile_store = SessionProfileStore()
 session_security_monitor = SessionSecurityMonitor()
 session_analytics = SessionAnalytics()
 
@@ -606,15 +970,12 @@ def analyze_new_session(user, request, existing_sessions=None):
     Args:
         user: User object
         request: Django request object
-        existing_sessions: Optional QuerySet of existing sessions
+        existing_sessions: Optional QuerySet of existing sessions, only
+            queried when the user's session profile is not cached
 
     Returns:
         Dictionary with session analysis
     """
-    if existing_sessions is None:
-        from .models import UserSession
-        existing_sessions = UserSession.objects.filter(user=user)
-
     return session_security_monitor.analyze_session_security(user, request, existing_sessions)
 
 
@@ -648,6 +1009,16 @@ def generate_device_fingerprint(request) -> str:
 get_device_fingerprint = generate_device_fingerprint
 
 
+def get_user_agent_cache_stats() -> Dict[str, Any]:
+    """
+    Get hit-rate statistics for the user agent cache.
+
+    Returns:
+        Dictionary with cache counters and hit rate
+    """
+    return user_agent_cache.get_stats()
+
+
 def is_suspicious_user_agent(user_agent: str) -> bool:
     """
     Check if user agent appears suspicious.
@@ -672,6 +1043,14 @@ def detect_session_anomalies(request, user) -> List[str]:
     Returns:
         List of detected anomalies
     """
+    return list(_memoize_on_request(
+        request, 'anomalies', user,
+        lambda: _detect_session_anomalies(request, user)
+    ))
+
+
+def _detect_session_anomalies(request, user) -> List[str]:
+    """Detect session anomalies without request memoization."""
     anomalies = []
 
     # Check for suspicious user agent
@@ -697,6 +1076,14 @@ def calculate_session_risk_score(request, user) -> int:
     Returns:
         Risk score (0-100, higher is riskier)
     """
+    return _memoize_on_request(
+        request, 'risk_score', user,
+        lambda: _calculate_session_risk_score(request, user)
+    )
+
+
+def _calculate_session_risk_score(request, user) -> int:
+    """Calculate the session risk score without request memoization."""
     score = 0
 
     # Check for anomalies
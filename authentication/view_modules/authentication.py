@@ -419,6 +419,11 @@ def logout_view(request):
                     is_active=False
                 )
 
+                # Bulk updates bypass signals, so drop the cached session profile
+                if terminated_count:
+                    from ..utils.sessions import session_profile_store
+                    session_profile_store.invalidate(user.id)
+
                 logger.info(
                     "Session terminated",
                     user_id=str(user.id),
@@ -443,7 +448,7 @@ def logout_view(request):
         # Log logout if we have a user
         client_type = get_client_type(request)
         if user:
-            AuditLog.objects.create(
+            AuditLog.log_event(
                 user=user,
                 event_type='logout_success',
                 description='User logged out successfully',
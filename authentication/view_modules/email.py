@@ -125,7 +125,7 @@ class EmailVerificationView(APIView):
         except ValidationError as e:
             # Log failed verification attempt
             if user:
-                AuditLog.objects.create(
+                AuditLog.log_event(
                     user=user,
                     event_type='email_verification',
                     description=f'Email verification failed: {str(e)}',
@@ -201,7 +201,7 @@ class EmailVerificationView(APIView):
                 )
 
                 # Log successful verification with exchange token generation
-                AuditLog.objects.create(
+                AuditLog.log_event(
                     user=user,
                     event_type='email_verification',
                     description='Email verified successfully with exchange token generated',
@@ -227,7 +227,7 @@ class EmailVerificationView(APIView):
         except ValidationError as e:
             # Log failed verification attempt
             if user:
-                AuditLog.objects.create(
+                AuditLog.log_event(
                     user=user,
                     event_type='email_verification',
                     description=f'Email verification failed (GET): {str(e)}',
@@ -21,6 +21,7 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
 from drf_spectacular.utils import extend_schema, OpenApiResponse
+from core import email_dispatch
 from core.api_tags import APITags, system_health_schema
 import structlog
 
@@ -212,7 +213,8 @@ def check_email_health():
         return {
             'status': 'healthy',
             'response_time_ms': response_time,
-            'details': 'Email service connection successful'
+            'details': 'Email service connection successful',
+            'dispatch': email_dispatch.stats(),
         }
 
     except Exception as e:
@@ -222,7 +224,8 @@ def check_email_health():
         return {
             'status': 'unhealthy',
             'response_time_ms': response_time,
-            'details': f'Email service connection failed: {str(e)[:100]}'
+            'details': f'Email service connection failed: {str(e)[:100]}',
+            'dispatch': email_dispatch.stats(),
         }
 
 
@@ -158,7 +158,7 @@ class RefreshTokenView(APIView):
             came_from_header = request.headers.get('X-Refresh-Token') is not None
             
             # Log token refresh
-            AuditLog.objects.create(
+            AuditLog.log_event(
                 user=user,
                 event_type='token_refreshed',
                 description='Access token refreshed successfully',
@@ -426,7 +426,7 @@ class TokenVerifyView(APIView):
                 }, status=status.HTTP_400_BAD_REQUEST)
 
             # Log successful token verification
-            AuditLog.objects.create(
+            AuditLog.log_event(
                 user=user,
                 event_type='token_verified',
                 description='Access token verified successfully',
@@ -6,9 +6,17 @@ used across the entire project.
 """
 
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
     verbose_name = 'Core'
+
+    def ready(self):
+        # LOGGING has been applied by now; move its handlers' I/O off
+        # request threads
+        if getattr(settings, 'LOG_QUEUE_ENABLED', False):
+            from core.logging import shipping
+            shipping.install()
@@ -0,0 +1,97 @@
+"""
+Bounded in-process pools for background work.
+
+The deployment runs gunicorn only, without Celery workers, so work that
+must happen after a request but not in it (building photo renditions,
+for instance) runs on a BackgroundPool instead: a fixed number of
+threads per process and a bounded number of jobs waiting for them.
+
+- submit() returns as soon as the job is queued; when the pool is full
+  the job runs inline in the caller, so a burst slows requests down
+  rather than piling up threads or jobs
+- each job closes the thread's stale database connections before and
+  after it runs, as request handling does
+- the pool starts on first use in each process, so forked gunicorn
+  workers get their own threads; stop() waits for queued jobs
+
+Jobs still queued when a process is killed outright are lost, so work
+submitted here needs a state to recover from (see the pending photo
+sweep in profiles).
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundPool:
+    """A fixed pool of threads with a bounded number of waiting jobs."""
+
+    def __init__(self, name: str, workers: int = 2, capacity: int = 100):
+        self.name = name
+        self.workers = workers
+        self.capacity = capacity
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.slots: Optional[threading.BoundedSemaphore] = None
+        self.pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def submit(self, func: Callable, *args, **kwargs) -> bool:
+        """
+        Run func(*args, **kwargs) on the pool.
+
+        Runs it inline instead when the pool has no workers or every
+        worker is busy and capacity jobs are waiting.
+
+        Returns:
+            True if the job was queued, False if it ran inline
+        """
+        if self.workers > 0:
+            self._start()
+            if self.slots.acquire(blocking=False):
+                try:
+                    self.executor.submit(self._run, self.slots, func, args, kwargs)
+                    return True
+                except RuntimeError:
+                    # Shut down meanwhile
+                    self.slots.release()
+            logger.warning(f"Background pool {self.name} is full, running inline")
+
+        func(*args, **kwargs)
+        return False
+
+    def stop(self, wait: bool = True) -> None:
+        """Stop accepting jobs and, by default, wait for queued ones."""
+        with self._lock:
+            executor, self.executor = self.executor, None
+        if executor is not None and self.pid == os.getpid():
+            executor.shutdown(wait=wait)
+
+    def _start(self) -> None:
+        """Start the executor in this process, once."""
+        if self.executor is not None and self.pid == os.getpid():
+            return
+        with self._lock:
+            if self.executor is not None and self.pid == os.getpid():
+                return
+            # A forked child inherits the executor but not its threads
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix=self.name)
+            self.slots = threading.BoundedSemaphore(self.workers + self.capacity)
+            self.pid = os.getpid()
+
+    def _run(self, slots, func, args, kwargs) -> None:
+        close_old_connections()
+        try:
+            func(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"Background job in {self.name} failed: {e}", exc_info=True)
+        finally:
+            close_old_connections()
+            slots.release()
@@ -0,0 +1,87 @@
+"""
+Keyset-chunked bulk deletes and updates.
+
+A plain queryset.delete() or .update() over a large table runs as one
+statement in one transaction: delete() first loads every row (and its
+cascades) into memory, and both hold row locks on hot tables until the
+whole statement finishes.
+
+run_in_batches() instead walks the matching rows in primary key order
+and deletes or updates them batch_size at a time, each batch in its own
+short transaction, pausing between batches so other writers get a turn.
+Because every batch commits on its own, an interrupted run leaves the
+rows it already handled done; running it again picks up the rest.
+
+Settings:
+- BULK_BATCH_SIZE: rows per batch (500)
+- BULK_BATCH_PAUSE: seconds to sleep between batches (0.05)
+"""
+
+import time
+from typing import Callable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+
+
+def run_in_batches(
+    queryset,
+    values: Optional[dict] = None,
+    *,
+    batch_size: Optional[int] = None,
+    pause: Optional[float] = None,
+    deadline: Optional[float] = None,
+    before_batch: Optional[Callable[[List], None]] = None,
+) -> Tuple[int, bool]:
+    """
+    Delete the rows of a queryset, or update them, in keyset batches.
+
+    Args:
+        queryset: Rows to delete or update. For updates the filter should
+            exclude rows already updated, so a rerun skips them.
+        values: Field values to update; delete the rows when omitted
+        batch_size: Rows per transaction (default BULK_BATCH_SIZE)
+        pause: Seconds to sleep between batches (default BULK_BATCH_PAUSE)
+        deadline: time.monotonic() value after which no new batch starts
+        before_batch: Called with the primary keys of each batch inside
+            its transaction, before the rows are deleted or updated
+
+    Returns:
+        Tuple of (rows deleted or updated, whether all rows were handled
+        before the deadline)
+    """
+    if batch_size is None:
+        batch_size = getattr(settings, 'BULK_BATCH_SIZE', 500)
+    if pause is None:
+        pause = getattr(settings, 'BULK_BATCH_PAUSE', 0.05)
+
+    model = queryset.model
+    queryset = queryset.order_by('pk')
+    label = model._meta.label
+    total = 0
+    last_pk = None
+
+    while True:
+        if deadline is not None and time.monotonic() >= deadline:
+            return total, False
+
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        pks = list(page.values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return total, True
+
+        with transaction.atomic():
+            if before_batch:
+                before_batch(pks)
+            batch = model._base_manager.filter(pk__in=pks)
+            if values is None:
+                total += batch.delete()[1].get(label, 0)
+            else:
+                total += batch.update(**values)
+
+        if len(pks) < batch_size:
+            return total, True
+
+        last_pk = pks[-1]
+        if pause:
+            time.sleep(pause)
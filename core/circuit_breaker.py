@@ -0,0 +1,340 @@
+"""
+Shared circuit breaker for external providers.
+
+Breaker state lives in the cache (Redis in every deployed environment),
+so all gunicorn workers and Celery processes see the same state: once one
+process has recorded enough failures, every process fails fast instead of
+sending its own slow requests to a provider that is down.
+
+States:
+- CLOSED: Normal operation, requests go through
+- OPEN: Too many failures, requests fail fast until the recovery timeout
+- HALF_OPEN: Recovery timeout expired; exactly one process (elected with an
+  atomic cache.add) sends a probe request while all others keep failing
+  fast. A successful probe closes the breaker, a failed one re-opens it.
+
+Cache keys (per breaker name):
+- circuit:<name>:failures  Atomic failure counter (INCR), expires after
+                           failure_window seconds
+- circuit:<name>:open      Present while OPEN, holds the opening timestamp
+- circuit:<name>:probe     Present while a half-open probe is in flight
+
+If the cache itself is unavailable the breaker fails open (allows calls),
+so a Redis outage never blocks otherwise healthy providers.
+
+Client errors are not provider failures: HTTP callers raise only 5xx
+responses inside the breaker (raise_for_server_error) and 4xx ones after.
+
+Usage:
+    breaker = get_circuit_breaker('bible_api')
+    data = breaker.call(fetch_verse, reference)
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+# Default settings per provider, overridable with the CIRCUIT_BREAKERS setting
+DEFAULT_BREAKERS = {
+    'bible_api': {'failure_threshold': 3, 'recovery_timeout': 60},
+    'esv_api': {'failure_threshold': 3, 'recovery_timeout': 60},
+    'nominatim': {'failure_threshold': 5, 'recovery_timeout': 120},
+    'pwned_passwords': {'failure_threshold': 5, 'recovery_timeout': 300},
+    'email': {'failure_threshold': 5, 'recovery_timeout': 60},
+}
+
+
+class CircuitBreakerOpen(Exception):
+    """Raised when a call is rejected because the circuit is open."""
+
+    def __init__(self, name: str):
+        self.name = name
+        super().__init__(f"Circuit breaker is OPEN for {name}")
+
+
+def raise_for_server_error(response) -> None:
+    """
+    Raise HTTPError for a 5xx response, but not for a 4xx one.
+
+    For use inside breaker calls: a rejected request (unknown resource,
+    bad query) says nothing about the provider's health.
+    """
+    try:
+        response.raise_for_status()
+    except requests.HTTPError as e:
+        if e.response is None or e.response.status_code >= 500:
+            raise
+
+
+class SharedCircuitBreaker:
+    """
+    Circuit breaker whose state is shared across processes via the cache.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: int = 60,
+        failure_window: Optional[int] = None,
+        probe_timeout: Optional[int] = None,
+        expected_exceptions: Tuple = (Exception,),
+    ):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            name: Provider name, shared by every process using the breaker
+            failure_threshold: Failures within the window before opening
+            recovery_timeout: Seconds to stay open before probing
+            failure_window: Seconds failures are counted over
+                (default: recovery_timeout)
+            probe_timeout: Seconds a half-open probe may take before another
+                process may probe (default: recovery_timeout)
+            expected_exceptions: Exceptions counted as provider failures
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.failure_window = failure_window or recovery_timeout
+        self.probe_timeout = probe_timeout or recovery_timeout
+        self.expected_exceptions = expected_exceptions
+
+        self.failures_key = f"circuit:{name}:failures"
+        self.open_key = f"circuit:{name}:open"
+        self.probe_key = f"circuit:{name}:probe"
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Execute function with circuit breaker protection.
+
+        Args:
+            func: Function to execute
+            *args, **kwargs: Function arguments
+
+        Returns:
+            Function result
+
+        Raises:
+            CircuitBreakerOpen: If the circuit is open
+            Exception: Whatever the function raises
+        """
+        allowed, probing, failures = self._acquire()
+        if not allowed:
+            raise CircuitBreakerOpen(self.name)
+
+        try:
+            result = func(*args, **kwargs)
+        except self.expected_exceptions:
+            self.record_failure(probing=probing)
+            raise
+        except BaseException:
+            if probing:
+                self._cache_call(cache.delete, self.probe_key)
+            raise
+
+        if probing or failures:
+            self.record_success(probing=probing)
+        return result
+
+    def record_success(self, probing: bool = False):
+        """
+        Record a successful call, closing the circuit.
+
+        Args:
+            probing: True if the call was the half-open probe
+        """
+        self._cache_call(
+            cache.delete_many,
+            [self.failures_key, self.open_key, self.probe_key]
+        )
+        if probing:
+            logger.info(f"Circuit breaker {self.name} CLOSED after successful probe")
+
+    def record_failure(self, probing: bool = False):
+        """
+        Record a failed call, opening the circuit at the threshold.
+
+        Args:
+            probing: True if the call was the half-open probe
+        """
+        def increment():
+            cache.add(self.failures_key, 0, self.failure_window)
+            return cache.incr(self.failures_key)
+
+        failures = self._cache_call(increment, default=0)
+        if probing or failures >= self.failure_threshold:
+            # Only the process that opens the circuit logs it
+            if self._cache_call(cache.add, self.open_key, time.time(),
+                                self.recovery_timeout, default=False):
+                logger.warning(
+                    f"Circuit breaker {self.name} OPENED after {failures} failures")
+            # Keep the count past the open period so expiry leads to half-open
+            self._cache_call(
+                cache.touch, self.failures_key,
+                self.recovery_timeout + self.failure_window)
+        if probing:
+            self._cache_call(cache.delete, self.probe_key)
+
+    def reset(self):
+        """Close the circuit and clear all counters."""
+        self._cache_call(
+            cache.delete_many,
+            [self.failures_key, self.open_key, self.probe_key]
+        )
+
+    @property
+    def failure_count(self) -> int:
+        """Failures counted in the current window."""
+        return self._cache_call(cache.get, self.failures_key, 0, default=0) or 0
+
+    @property
+    def state(self) -> str:
+        """Current state as seen by all processes."""
+        return self.get_status()['state']
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get the shared breaker state for monitoring.
+
+        Returns:
+            Dict with name, state, failure counts and timings
+        """
+        values = self._cache_call(
+            cache.get_many,
+            [self.failures_key, self.open_key, self.probe_key],
+            default={}
+        )
+        failures = values.get(self.failures_key) or 0
+        opened_at = values.get(self.open_key)
+
+        if opened_at is not None:
+            state = self.OPEN
+        elif failures >= self.failure_threshold:
+            state = self.HALF_OPEN
+        else:
+            state = self.CLOSED
+
+        return {
+            'name': self.name,
+            'state': state,
+            'failure_count': failures,
+            'failure_threshold': self.failure_threshold,
+            'recovery_timeout': self.recovery_timeout,
+            'opened_at': opened_at,
+            'retry_in_seconds': (
+                max(0, round(opened_at + self.recovery_timeout - time.time(), 1))
+                if opened_at is not None else None
+            ),
+            'probe_in_flight': self.probe_key in values,
+        }
+
+    def _acquire(self) -> Tuple[bool, bool, int]:
+        """
+        Decide whether a call may proceed, electing a half-open prober.
+
+        Returns:
+            Tuple of (allowed, probing, failure count)
+        """
+        values = self._cache_call(
+            cache.get_many, [self.failures_key, self.open_key], default=None)
+        if values is None:
+            # Cache unavailable: fail open
+            return True, False, 0
+
+        if self.open_key in values:
+            return False, False, 0
+
+        failures = values.get(self.failures_key) or 0
+        if failures < self.failure_threshold:
+            return True, False, failures
+
+        # Half-open: the first process to add the probe key sends the probe
+        if self._cache_call(cache.add, self.probe_key, True,
+                            self.probe_timeout, default=True):
+            logger.info(f"Circuit breaker {self.name} HALF_OPEN, probing")
+            return True, True, failures
+        return False, False, failures
+
+    def _cache_call(self, func, *args, default=None):
+        """Run a cache operation, returning default if the cache is down."""
+        try:
+            return func(*args)
+        except Exception as e:
+            logger.warning(f"Circuit breaker {self.name} cache error: {e}")
+            return default
+
+
+_breakers: Dict[str, SharedCircuitBreaker] = {}
+# kwargs each registered breaker was created with
+_breaker_kwargs: Dict[str, Dict[str, Any]] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str, **kwargs) -> SharedCircuitBreaker:
+    """
+    Get the process-wide breaker for a provider.
+
+    Settings come from DEFAULT_BREAKERS, then the CIRCUIT_BREAKERS setting,
+    then kwargs. The breaker is created on the first call; later calls may
+    omit kwargs but not pass different ones.
+
+    Args:
+        name: Provider name
+        **kwargs: SharedCircuitBreaker options
+
+    Returns:
+        SharedCircuitBreaker instance
+
+    Raises:
+        ValueError: If kwargs differ from those the breaker was created with
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            options = {
+                **DEFAULT_BREAKERS.get(name, {}),
+                **getattr(settings, 'CIRCUIT_BREAKERS', {}).get(name, {}),
+                **kwargs,
+            }
+            breaker = _breakers[name] = SharedCircuitBreaker(name, **options)
+            _breaker_kwargs[name] = kwargs
+        elif kwargs and kwargs != _breaker_kwargs[name]:
+            raise ValueError(
+                f"Circuit breaker {name} was created with {_breaker_kwargs[name]}, "
+                f"not {kwargs}")
+        return breaker
+
+
+def get_circuit_breaker_states() -> List[Dict[str, Any]]:
+    """
+    Get the state of every known breaker.
+
+    Returns:
+        List of breaker status dicts, sorted by name
+    """
+    configured = getattr(settings, 'CIRCUIT_BREAKERS', {})
+    names = set(DEFAULT_BREAKERS) | set(configured) | set(_breakers)
+
+    states = []
+    for name in sorted(names):
+        # State is shared, so breakers this process has not used yet are
+        # read through a temporary instance instead of being registered
+        breaker = _breakers.get(name) or SharedCircuitBreaker(name, **{
+            **DEFAULT_BREAKERS.get(name, {}),
+            **configured.get(name, {}),
+        })
+        states.append(breaker.get_status())
+    return states
@@ -45,13 +45,13 @@ def csrf_failure_handler(request: HttpRequest, reason: str = "") -> JsonResponse
 
     # Log the CSRF failure for security monitoring
     try:
-        AuditLog.objects.create(
+        AuditLog.log_event(
             user=request.user if request.user.is_authenticated else None,
-            action='csrf_failure',
+            event_type='csrf_failure',
             ip_address=request.META.get('REMOTE_ADDR'),
             user_agent=request.META.get('HTTP_USER_AGENT', ''),
             success=False,
-            details={
+            metadata={
                 'reason': reason,
                 'path': request.path,
                 'method': request.method,
@@ -142,13 +142,13 @@ def get_csrf_token(request: HttpRequest) -> Response:
         csrf_token = get_token(request)
 
         # Log token request for monitoring
-        AuditLog.objects.create(
+        AuditLog.log_event(
             user=request.user if request.user.is_authenticated else None,
-            action='csrf_token_requested',
+            event_type='csrf_token_requested',
             ip_address=request.META.get('REMOTE_ADDR'),
             user_agent=request.META.get('HTTP_USER_AGENT', ''),
             success=True,
-            details={
+            metadata={
                 'method': request.method,
                 'path': request.path,
                 'authenticated': request.user.is_authenticated,
@@ -209,13 +209,13 @@ def rotate_csrf_token(request: HttpRequest) -> Response:
         new_token = get_token(request)
 
         # Log token rotation
-        AuditLog.objects.create(
+        AuditLog.log_event(
             user=request.user if request.user.is_authenticated else None,
-            action='csrf_token_rotated',
+            event_type='csrf_token_rotated',
             ip_address=request.META.get('REMOTE_ADDR'),
             user_agent=request.META.get('HTTP_USER_AGENT', ''),
             success=True,
-            details={
+            metadata={
                 'old_token_present': bool(old_token),
                 'reason': request.data.get('reason', 'manual_rotation'),
                 'rotated_at': timezone.now().isoformat(),
@@ -3,7 +3,9 @@ Custom email backend for SendGrid Web API.
 
 Railway (and many PaaS platforms) block outbound SMTP connections.
 This backend uses SendGrid's official Web API which works reliably
-on all platforms via HTTPS.
+on all platforms via HTTPS. Sends go through the shared 'email' circuit
+breaker, so while SendGrid is down every worker fails fast and callers
+can retry later instead of each waiting on timeouts.
 """
 import logging
 import os
@@ -11,6 +13,8 @@ from django.conf import settings
 from django.core.mail.backends.base import BaseEmailBackend
 from django.core.mail.message import sanitize_address
 
+from core.circuit_breaker import CircuitBreakerOpen, get_circuit_breaker
+
 logger = logging.getLogger('auth')
 
 
@@ -59,6 +63,7 @@ class SendGridWebAPIBackend(BaseEmailBackend):
             return 0
 
         sg = SendGridAPIClient(self.api_key)
+        breaker = get_circuit_breaker('email')
         num_sent = 0
 
         for message in email_messages:
@@ -90,7 +95,9 @@ class SendGridWebAPIBackend(BaseEmailBackend):
                 # Send via Web API
                 logger.info(
                     f"Sending email to {', '.join(message.to)} via SendGrid Web API...")
-                response = sg.send(mail)
+                response = breaker.call(self._send, sg, mail)
+                if isinstance(response, Exception):
+                    raise response
 
                 # Check response status
                 if response.status_code in (200, 201, 202):
@@ -105,9 +112,28 @@ class SendGridWebAPIBackend(BaseEmailBackend):
                     if not self.fail_silently:
                         raise Exception(error_msg)
 
+            except CircuitBreakerOpen as e:
+                logger.warning(f"Email not sent to {', '.join(message.to)}: {e}")
+                if not self.fail_silently:
+                    raise
+
             except Exception as e:
                 logger.error(f"Failed to send email via SendGrid Web API: {e}")
                 if not self.fail_silently:
                     raise
 
         return num_sent
+
+    def _send(self, sg, mail):
+        """
+        Send one message, returning client errors instead of raising them.
+
+        Rejected messages (4xx, e.g. an invalid address) are not provider
+        failures and must not open the circuit breaker.
+        """
+        try:
+            return sg.send(mail)
+        except Exception as e:
+            if 400 <= getattr(e, 'status_code', 0) < 500:
+                return e
+            raise
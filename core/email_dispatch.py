@@ -0,0 +1,420 @@
+"""
+Bounded background delivery for transactional email.
+
+Verification and password reset emails are sent from request handlers,
+where a slow provider would hold up the response. Instead of a thread
+per email, each process has a fixed pool of EMAIL_DISPATCH_WORKERS
+threads draining one bounded queue:
+
+- every worker keeps its own backend connection open between messages
+  (one SMTP session, or one Anymail HTTP session) and closes it after
+  EMAIL_DISPATCH_IDLE_TIMEOUT seconds without mail
+- a worker takes up to EMAIL_DISPATCH_BATCH_SIZE messages at a time and
+  sends them over that connection, one send per message so a failure
+  never resends the others
+- transient failures are retried EMAIL_DISPATCH_MAX_RETRIES times,
+  waiting EMAIL_DISPATCH_RETRY_BACKOFF seconds, doubling each attempt;
+  refused recipients and other 4xx rejections are not retried
+- while the circuit breaker is open a message is set aside until the
+  breaker lets a probe through, up to EMAIL_DISPATCH_MAX_RETRIES times,
+  instead of being dropped
+- when the queue is full, or EMAIL_DISPATCH_ASYNC is False, the message
+  is sent inline in the caller, so a burst slows signups down rather
+  than losing mail
+
+Workers start on first use in each process, so forked gunicorn workers
+get their own. Queued mail is sent before the process exits (the
+worker_exit hook in gunicorn.conf.py and atexit); mail still queued when
+a process is killed outright is lost.
+
+stats() reports queue depth, delivery counts and latency; it is part of
+the email health check.
+
+Settings:
+- EMAIL_DISPATCH_ASYNC: send from the worker pool (True)
+- EMAIL_DISPATCH_WORKERS: worker threads per process (2)
+- EMAIL_DISPATCH_CAPACITY: messages queued before sending inline (500)
+- EMAIL_DISPATCH_BATCH_SIZE: messages taken per connection use (20)
+- EMAIL_DISPATCH_MAX_RETRIES: retries per message (3)
+- EMAIL_DISPATCH_RETRY_BACKOFF: seconds before the first retry (2.0)
+- EMAIL_DISPATCH_IDLE_TIMEOUT: seconds before an idle connection is closed (30)
+"""
+
+import atexit
+import heapq
+import itertools
+import logging
+import os
+import queue
+import smtplib
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.core.mail import get_connection
+
+from core.circuit_breaker import CircuitBreakerOpen, get_circuit_breaker
+
+logger = logging.getLogger(__name__)
+
+# Failures that retrying the same message will not fix, along with HTTP
+# backend errors carrying a 4xx status_code (see _is_permanent)
+PERMANENT_ERRORS = (
+    smtplib.SMTPRecipientsRefused,
+    smtplib.SMTPSenderRefused,
+)
+
+# Queued by stop() to end a worker
+_STOP = object()
+
+
+class EmailDispatcher:
+    """Sends email from a fixed pool of worker threads."""
+
+    def __init__(
+        self,
+        workers: int = 2,
+        capacity: int = 500,
+        batch_size: int = 20,
+        max_retries: int = 3,
+        retry_backoff: float = 2.0,
+        idle_timeout: float = 30.0,
+        backend: Optional[str] = None,
+    ):
+        self.workers = workers
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.idle_timeout = idle_timeout
+        self.backend = backend
+        self.queue: Optional[queue.Queue] = None
+        # (due, sequence, item) heap of messages waiting out an open breaker
+        self._deferred: List = []
+        self._sequence = itertools.count()
+        self.threads: List[threading.Thread] = []
+        self.pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._reset_stats()
+
+    def send(self, message) -> bool:
+        """
+        Queue an EmailMessage for delivery.
+
+        Sends it inline instead when the queue is full; errors from an
+        inline send are raised to the caller.
+
+        Returns:
+            True if the message was queued, False if it was sent inline
+        """
+        return self._submit(message)
+
+    def call(self, func: Callable, *args, **kwargs) -> bool:
+        """
+        Queue a function that sends email itself, like send().
+
+        The function opens its own connection; workers do not open one for it.
+        """
+        return self._submit(lambda: func(*args, **kwargs))
+
+    def stats(self) -> Dict:
+        """Queue depth, delivery counts and latency for this process."""
+        with self._lock:
+            delivered = self._stats['sent'] + self._stats['failed']
+            return {
+                'queued': self.queue.qsize() if self._running() else 0,
+                'capacity': self.capacity,
+                'workers': sum(thread.is_alive() for thread in self.threads),
+                'sent': self._stats['sent'],
+                'failed': self._stats['failed'],
+                'retried': self._stats['retried'],
+                'deferred': self._stats['deferred'],
+                'sent_inline': self._stats['sent_inline'],
+                'connections_opened': self._stats['connections_opened'],
+                'queue_wait_ms_avg': round(
+                    self._stats['wait_total'] * 1000 / delivered, 1) if delivered else 0,
+                'queue_wait_ms_max': round(self._stats['wait_max'] * 1000, 1),
+                'send_ms_avg': round(
+                    self._stats['send_total'] * 1000 / delivered, 1) if delivered else 0,
+            }
+
+    def flush(self) -> None:
+        """Wait until every queued message, including deferred ones, has been handled."""
+        if self._running():
+            self.queue.join()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Send what is queued and end the workers."""
+        with self._lock:
+            if not self._running():
+                return
+            threads, self.threads = self.threads, []
+        try:
+            for _ in threads:
+                self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.error(f"Email dispatch stopped with {self.queue.qsize()} messages unsent")
+            return
+        deadline = time.monotonic() + timeout
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        remaining = self.queue.qsize()
+        if remaining:
+            logger.error(f"Email dispatch stopped with {remaining} messages unsent")
+
+    def _submit(self, job) -> bool:
+        self._start()
+        try:
+            self.queue.put_nowait((job, time.monotonic(), 0))
+            return True
+        except queue.Full:
+            logger.warning(
+                f"Email queue full ({self.capacity} messages), sending inline")
+
+        self._attempt(job, None if callable(job) else get_connection(
+            backend=self.backend, fail_silently=False))
+        with self._lock:
+            self._stats['sent_inline'] += 1
+        return False
+
+    def _running(self) -> bool:
+        return bool(self.threads) and self.pid == os.getpid()
+
+    def _start(self) -> None:
+        """Start the queue and workers in this process, once."""
+        if self._running():
+            return
+        with self._lock:
+            if self._running():
+                return
+            # A forked child inherits the parent's queue but not its threads
+            self.queue = queue.Queue(self.capacity)
+            self._deferred = []
+            self.pid = os.getpid()
+            self._reset_stats()
+            self.threads = [
+                threading.Thread(
+                    target=self._run, args=(self.queue,),
+                    name=f'email-dispatch-{number}', daemon=True)
+                for number in range(self.workers)
+            ]
+            for thread in self.threads:
+                thread.start()
+
+    def _reset_stats(self) -> None:
+        self._stats = {
+            'sent': 0, 'failed': 0, 'retried': 0, 'deferred': 0, 'sent_inline': 0,
+            'connections_opened': 0, 'wait_total': 0.0, 'wait_max': 0.0,
+            'send_total': 0.0,
+        }
+
+    def _run(self, email_queue: queue.Queue) -> None:
+        connection = None
+        while True:
+            batch = self._take_deferred()
+            if not batch:
+                timeout = self._next_wait()
+                try:
+                    batch = [email_queue.get(timeout=timeout)]
+                except queue.Empty:
+                    if timeout >= self.idle_timeout:
+                        connection = self._close(connection)
+                    continue
+            while batch[-1] is not _STOP and len(batch) < self.batch_size:
+                try:
+                    batch.append(email_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            for item in batch:
+                # A deferred message stays an unfinished task until it is handled
+                done = True
+                try:
+                    if item is not _STOP:
+                        connection, done = self._deliver(item, connection)
+                finally:
+                    if done:
+                        email_queue.task_done()
+            if batch[-1] is _STOP:
+                # Last chance for deferred messages before the worker ends
+                for item in self._take_deferred(due_only=False):
+                    try:
+                        connection, _ = self._deliver(item, connection, final=True)
+                    finally:
+                        email_queue.task_done()
+                self._close(connection)
+                return
+
+    def _deliver(self, item, connection, final: bool = False):
+        """
+        Send one queued message, retrying with backoff.
+
+        Returns:
+            Tuple of (connection to reuse, whether the message was handled);
+            not handled means it was deferred until the breaker closes
+        """
+        job, enqueued_at, deferrals = item
+        started = time.monotonic()
+        wait = started - enqueued_at
+
+        sent = False
+        for attempt in range(self.max_retries + 1):
+            try:
+                if connection is None and not callable(job):
+                    connection = self._open()
+                self._attempt(job, connection)
+                sent = True
+                break
+            except CircuitBreakerOpen as e:
+                if not final and deferrals < self.max_retries:
+                    delay = self._breaker_delay(e)
+                    logger.warning(
+                        f"Email to {self._recipients(job)} deferred {delay:.0f}s: {e}")
+                    self._defer((job, enqueued_at, deferrals + 1), delay)
+                    return connection, False
+                logger.error(f"Email not sent to {self._recipients(job)}: {e}")
+                break
+            except Exception as e:
+                if self._is_permanent(e):
+                    logger.error(f"Email not sent to {self._recipients(job)}: {e}")
+                    break
+                # The connection may be what failed; start the next attempt on a new one
+                if not callable(job):
+                    connection = self._close(connection)
+                if attempt == self.max_retries:
+                    logger.error(
+                        f"Email to {self._recipients(job)} failed after "
+                        f"{attempt + 1} attempts: {e}", exc_info=True)
+                    break
+                delay = self.retry_backoff * 2 ** attempt
+                logger.warning(
+                    f"Email to {self._recipients(job)} failed, retrying in {delay:.1f}s: {e}")
+                with self._lock:
+                    self._stats['retried'] += 1
+                time.sleep(delay)
+
+        with self._lock:
+            self._stats['sent' if sent else 'failed'] += 1
+            self._stats['wait_total'] += wait
+            self._stats['wait_max'] = max(self._stats['wait_max'], wait)
+            self._stats['send_total'] += time.monotonic() - started
+        return connection, True
+
+    def _defer(self, item, delay: float) -> None:
+        with self._lock:
+            heapq.heappush(
+                self._deferred, (time.monotonic() + delay, next(self._sequence), item))
+            self._stats['deferred'] += 1
+
+    def _take_deferred(self, due_only: bool = True) -> List:
+        """Remove and return deferred messages that are due (or all of them)."""
+        now = time.monotonic()
+        items = []
+        with self._lock:
+            while self._deferred and (not due_only or self._deferred[0][0] <= now):
+                items.append(heapq.heappop(self._deferred)[2])
+        return items
+
+    def _next_wait(self) -> float:
+        """Seconds to wait for new mail before a deferred message is due."""
+        with self._lock:
+            if not self._deferred:
+                return self.idle_timeout
+            return min(self.idle_timeout,
+                       max(0.0, self._deferred[0][0] - time.monotonic()))
+
+    @staticmethod
+    def _breaker_delay(error: CircuitBreakerOpen) -> float:
+        """Seconds until the open breaker lets a probe through."""
+        status = get_circuit_breaker(error.name).get_status()
+        if status['retry_in_seconds'] is None:
+            return float(status['recovery_timeout'])
+        return float(status['retry_in_seconds'])
+
+    @staticmethod
+    def _is_permanent(error: Exception) -> bool:
+        """Refused recipients, and 4xx rejections from HTTP backends other than rate limits."""
+        if isinstance(error, PERMANENT_ERRORS):
+            return True
+        status_code = getattr(error, 'status_code', None)
+        return isinstance(status_code, int) and 400 <= status_code < 500 and status_code != 429
+
+    @staticmethod
+    def _attempt(job, connection) -> None:
+        if callable(job):
+            job()
+        else:
+            connection.send_messages([job])
+
+    def _open(self):
+        """Open a backend connection that stays open across sends."""
+        connection = get_connection(backend=self.backend, fail_silently=False)
+        connection.open()
+        with self._lock:
+            self._stats['connections_opened'] += 1
+        return connection
+
+    @staticmethod
+    def _close(connection) -> None:
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception as e:
+                logger.warning(f"Closing email connection failed: {e}")
+        return None
+
+    @staticmethod
+    def _recipients(job) -> str:
+        return ', '.join(getattr(job, 'to', None) or ['(callable)'])
+
+
+_dispatcher: Optional[EmailDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher() -> EmailDispatcher:
+    """The process-wide dispatcher, configured from settings."""
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = EmailDispatcher(
+                    workers=getattr(settings, 'EMAIL_DISPATCH_WORKERS', 2),
+                    capacity=getattr(settings, 'EMAIL_DISPATCH_CAPACITY', 500),
+                    batch_size=getattr(settings, 'EMAIL_DISPATCH_BATCH_SIZE', 20),
+                    max_retries=getattr(settings, 'EMAIL_DISPATCH_MAX_RETRIES', 3),
+                    retry_backoff=getattr(settings, 'EMAIL_DISPATCH_RETRY_BACKOFF', 2.0),
+                    idle_timeout=getattr(settings, 'EMAIL_DISPATCH_IDLE_TIMEOUT', 30.0),
+                )
+                atexit.register(_dispatcher.stop)
+    return _dispatcher
+
+
+def send_email(message) -> bool:
+    """
+    Send an EmailMessage from the worker pool.
+
+    Sent inline when EMAIL_DISPATCH_ASYNC is False; errors from an
+    inline send are raised to the caller.
+
+    Returns:
+        True if the message was queued, False if it was sent inline
+    """
+    if not getattr(settings, 'EMAIL_DISPATCH_ASYNC', True):
+        message.send(fail_silently=False)
+        return False
+    return get_dispatcher().send(message)
+
+
+def stats() -> Dict:
+    """Dispatch metrics for this process."""
+    if _dispatcher is None:
+        return {'queued': 0, 'workers': 0, 'sent': 0, 'failed': 0}
+    return _dispatcher.stats()
+
+
+def stop() -> None:
+    """Send queued email and stop the workers (gunicorn worker_exit)."""
+    if _dispatcher is not None:
+        _dispatcher.stop()
@@ -0,0 +1,269 @@
+"""
+Asynchronous log shipping.
+
+The handlers configured in LOGGING format each record (JSON for the
+structured ones) and write it to stdout or a file in whichever thread
+logged it, so a slow sink adds directly to request latency. install()
+moves that work to one background thread per process:
+
+- every handler of the root logger and of the loggers named in LOGGING
+  is replaced by a QueuedHandler, which runs the handler's filters on
+  the original record (so SensitiveDataFilter still sees msg and args
+  apart), snapshots it (merging msg and args) and puts it, with the
+  handler it stands in for, on a bounded queue; it never blocks
+- the LogShipper thread drains the queue in batches and passes each
+  handler its records, writing them to stream and file handlers with
+  one write() and one flush() per batch
+- when the queue is full the oldest record is dropped to make room;
+  drops are counted and reported in a warning once the queue drains
+
+Threads do not survive fork. Under gunicorn --preload the app (and this
+thread) starts in the master, so the post_fork hook in gunicorn.conf.py
+calls restart() in each worker to start a fresh queue and thread; the
+same happens through os.register_at_fork for other forking servers.
+
+Settings:
+- LOG_QUEUE_ENABLED: ship logs from a background thread (False)
+- LOG_QUEUE_CAPACITY: records queued before the oldest is dropped (10000)
+- LOG_QUEUE_BATCH_SIZE: most records written per batch (500)
+"""
+
+import atexit
+import copy
+import logging
+import os
+import queue
+import threading
+from logging.handlers import BaseRotatingHandler
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Queued by stop() to end the shipper thread
+_STOP = object()
+
+
+class DropOldestQueue(queue.Queue):
+    """A bounded queue that makes room for new items by dropping the oldest."""
+
+    def __init__(self, maxsize: int):
+        super().__init__(maxsize)
+        self.dropped = 0
+
+    def offer(self, item) -> None:
+        """Add an item without blocking, dropping the oldest one if full."""
+        with self.mutex:
+            if 0 < self.maxsize <= self._qsize():
+                self._get()
+                self.dropped += 1
+            else:
+                self.unfinished_tasks += 1
+            self._put(item)
+            self.not_empty.notify()
+
+    def take(self, max_items: int) -> List:
+        """Wait for items, then remove and return up to max_items of them."""
+        with self.not_empty:
+            while not self._qsize():
+                self.not_empty.wait()
+            items = []
+            while self._qsize() and len(items) < max_items:
+                items.append(self._get())
+            return items
+
+    def done(self, count: int) -> None:
+        """Mark count taken items as handled (see Queue.join)."""
+        with self.all_tasks_done:
+            self.unfinished_tasks -= count
+            if self.unfinished_tasks <= 0:
+                self.unfinished_tasks = 0
+                self.all_tasks_done.notify_all()
+
+
+class QueuedHandler(logging.Handler):
+    """Stands in for a configured handler, queueing its records for the shipper."""
+
+    def __init__(self, target: logging.Handler, shipper: 'LogShipper'):
+        super().__init__(target.level)
+        self.target = target
+        self.shipper = shipper
+        self.name = target.name
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Copy the record with its message merged, as QueueHandler does, so
+        later changes to mutable args cannot alter what gets written.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # The target's filters run here, before prepare() merges the
+        # args into the message; queueing is thread-safe, so skip the lock
+        if not self.filter(record) or not self.target.filter(record):
+            return False
+        self.emit(record)
+        return True
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.shipper.offer(self.target, self.prepare(record))
+        except Exception:
+            self.handleError(record)
+
+
+class LogShipper:
+    """Writes queued records to their handlers from a background thread."""
+
+    def __init__(self, capacity: int = 10000, batch_size: int = 500):
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.queue: Optional[DropOldestQueue] = None
+        self.thread: Optional[threading.Thread] = None
+        self.pid: Optional[int] = None
+        self.reported_drops = 0
+
+    @property
+    def dropped(self) -> int:
+        """Records dropped because the queue was full."""
+        return self.queue.dropped if self.queue else 0
+
+    def attach(self, loggers: Iterable[logging.Logger]) -> None:
+        """Replace the handlers of loggers with queued stand-ins."""
+        stand_ins: Dict[logging.Handler, QueuedHandler] = {}
+        for log in loggers:
+            handlers = []
+            for handler in log.handlers:
+                if not isinstance(handler, (QueuedHandler, logging.NullHandler)):
+                    if handler not in stand_ins:
+                        stand_ins[handler] = QueuedHandler(handler, self)
+                    handler = stand_ins[handler]
+                handlers.append(handler)
+            log.handlers = handlers
+
+    def start(self) -> None:
+        """Start a new queue and thread in this process."""
+        self.queue = DropOldestQueue(self.capacity)
+        self.reported_drops = 0
+        self.pid = os.getpid()
+        self.thread = threading.Thread(
+            target=self._run, args=(self.queue,), name='log-shipper', daemon=True)
+        self.thread.start()
+
+    def restart(self) -> None:
+        """Start again in a forked child (records queued before the fork are the parent's)."""
+        if self.pid != os.getpid():
+            self.start()
+
+    def offer(self, target: logging.Handler, record: logging.LogRecord) -> None:
+        self.queue.offer((target, record))
+
+    def flush(self) -> None:
+        """Wait until every queued record has been written."""
+        if self.thread is not None and self.thread.is_alive():
+            self.queue.join()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Write out the queue and end the thread."""
+        if self.thread is None or self.pid != os.getpid() or not self.thread.is_alive():
+            return
+        self.queue.offer(_STOP)
+        self.thread.join(timeout)
+
+    def _run(self, log_queue: DropOldestQueue) -> None:
+        while True:
+            items = log_queue.take(self.batch_size)
+            stop = any(item is _STOP for item in items)
+            try:
+                self.write([item for item in items if item is not _STOP])
+            finally:
+                log_queue.done(len(items))
+            self._report_drops(log_queue)
+            if stop:
+                return
+
+    def write(self, items: List) -> None:
+        """Pass records to their handlers, in order, a batch per handler."""
+        batches: Dict[logging.Handler, List[logging.LogRecord]] = {}
+        for target, record in items:
+            batches.setdefault(target, []).append(record)
+        for target, records in batches.items():
+            records = [record for record in records if record.levelno >= target.level]
+            if not records:
+                continue
+            if isinstance(target, logging.StreamHandler) and not isinstance(
+                    target, BaseRotatingHandler):
+                self._write_stream(target, records)
+            else:
+                # Filters already ran in QueuedHandler.handle
+                for record in records:
+                    with target.lock:
+                        target.emit(record)
+
+    @staticmethod
+    def _write_stream(target: logging.StreamHandler, records: List[logging.LogRecord]) -> None:
+        """Format records as the handler would and write them in one go."""
+        lines = []
+        for record in records:
+            try:
+                lines.append(target.format(record) + target.terminator)
+            except Exception:
+                target.handleError(record)
+        if not lines:
+            return
+        with target.lock:
+            try:
+                if target.stream is None:
+                    # FileHandler with delay=True opens on first write
+                    target.stream = target._open()
+                target.stream.write(''.join(lines))
+                target.flush()
+            except Exception:
+                target.handleError(records[-1])
+
+    def _report_drops(self, log_queue: DropOldestQueue) -> None:
+        dropped = log_queue.dropped
+        if dropped > self.reported_drops and not log_queue.qsize():
+            logger.warning(
+                f"Log queue full: dropped {dropped - self.reported_drops} records "
+                f"({dropped} since start)")
+            self.reported_drops = dropped
+
+
+_shipper: Optional[LogShipper] = None
+
+
+def install() -> LogShipper:
+    """Move the configured handlers' I/O to a background thread (once per process)."""
+    global _shipper
+    if _shipper is not None:
+        return _shipper
+
+    shipper = LogShipper(
+        capacity=getattr(settings, 'LOG_QUEUE_CAPACITY', 10000),
+        batch_size=getattr(settings, 'LOG_QUEUE_BATCH_SIZE', 500),
+    )
+    names = [''] + list(getattr(settings, 'LOGGING', {}).get('loggers', {}))
+    shipper.attach(logging.getLogger(name) for name in names)
+    shipper.start()
+
+    atexit.register(shipper.stop)
+    os.register_at_fork(after_in_child=shipper.restart)
+    _shipper = shipper
+    return shipper
+
+
+def restart() -> None:
+    """Restart the shipper in a forked worker (gunicorn post_fork)."""
+    if _shipper is not None:
+        _shipper.restart()
+
+
+def stop() -> None:
+    """Write out queued records and stop the shipper (gunicorn worker_exit)."""
+    if _shipper is not None:
+        _shipper.stop()
@@ -13,6 +13,7 @@ import logging
 import re
 import uuid
 import traceback
+from functools import lru_cache
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from django.conf import settings
@@ -26,11 +27,27 @@ def get_user_model():
     return get_user_model()
 
 
+# Attributes every LogRecord has; anything else on a record came from extra=
+RECORD_ATTRS = frozenset(
+    logging.LogRecord('', logging.INFO, '', 0, '', (), None).__dict__
+) | {'message', 'asctime'}
+
+
 class SensitiveDataFilter(logging.Filter):
     """
     Filter to remove sensitive data from log records.
 
     Prevents PII leakage by filtering out common sensitive patterns.
+
+    Kept cheap enough for hot paths:
+    - records below the logger's effective level (or the filter's level)
+      are dropped before any work, and a record is scrubbed only once
+      however many handlers it reaches
+    - only the message, its args and the keys passed in extra= are
+      inspected
+    - all patterns run as one combined regex, and only on strings that
+      contain a character the patterns need
+    - scrubbed format strings are cached, since most messages repeat
     """
 
     # Patterns for sensitive data that should be filtered
@@ -62,39 +79,87 @@ class SensitiveDataFilter(logging.Filter):
         'csrf_token', 'session_key', 'secret_key'
     }
 
+    # Every pattern needs one of these: '@' for emails, a digit for phone,
+    # card and SSN numbers, ':' or '=' for credentials and 'eyJ' for JWTs
+    TRIGGER_PATTERN = re.compile(r'[@:=\d]|eyJ')
+
+    # Distinct format strings whose scrubbed form is cached
+    CACHE_SIZE = 1024
+
+    def __init__(self, name='', level=logging.NOTSET):
+        super().__init__(name)
+        self.level = logging._checkLevel(level)
+        self._combined = self._combine_patterns(self.SENSITIVE_PATTERNS)
+        self._filter_format = lru_cache(maxsize=self.CACHE_SIZE)(self._filter_string)
+
+    @staticmethod
+    def _combine_patterns(patterns):
+        """
+        Join the patterns into one alternation of named groups.
+
+        Returns the compiled regex and, for each group, a function giving
+        its replacement (backreferences renumbered to the combined groups).
+        """
+        alternatives = []
+        replacements = {}
+        group = 0
+        for index, (pattern, replacement) in enumerate(patterns):
+            name = f'p{index}'
+            source = pattern.pattern
+            if pattern.flags & re.IGNORECASE:
+                source = f'(?i:{source})'
+            alternatives.append(f'(?P<{name}>{source})')
+            template = re.sub(
+                r'\\(\d)', lambda ref, base=group + 1: f'\\g<{base + int(ref.group(1))}>',
+                replacement)
+            if template == replacement:
+                replacements[name] = lambda match, text=replacement: text
+            else:
+                replacements[name] = lambda match, template=template: match.expand(template)
+            group += pattern.groups + 1
+        return re.compile('|'.join(alternatives)), replacements
+
     def filter(self, record: logging.LogRecord) -> bool:
         """
         Filter sensitive data from log record.
 
         Returns True to allow the record to be logged.
         """
+        if getattr(record, '_sensitive_filtered', False):
+            return True
+        # Records their logger (or this filter) is not enabled for are
+        # dropped before any work rather than scrubbed and then discarded
+        if record.levelno < self.level:
+            return False
+        logger = logging.Logger.manager.loggerDict.get(record.name)
+        if isinstance(logger, logging.Logger) and not logger.isEnabledFor(record.levelno):
+            return False
+
         try:
             # Filter message content
-            if hasattr(record, 'msg') and isinstance(record.msg, str):
-                record.msg = self._filter_string(record.msg)
+            if isinstance(record.msg, str):
+                record.msg = self._filter_format(record.msg)
 
             # Filter arguments
-            if hasattr(record, 'args') and record.args:
-                filtered_args = []
-                for arg in record.args:
-                    if isinstance(arg, str):
-                        filtered_args.append(self._filter_string(arg))
-                    elif isinstance(arg, dict):
-                        filtered_args.append(self._filter_dict(arg))
-                    else:
-                        filtered_args.append(arg)
-                record.args = tuple(filtered_args)
-
-            # Filter any extra attributes
-            for attr_name in dir(record):
-                if not attr_name.startswith('_') and attr_name not in ['name', 'msg', 'args', 'levelno', 'levelname', 'pathname', 'filename', 'module', 'lineno', 'funcName', 'created', 'msecs', 'relativeCreated', 'thread', 'threadName', 'processName', 'process']:
+            if record.args:
+                if isinstance(record.args, dict):
+                    record.args = self._filter_dict(record.args)
+                else:
+                    record.args = tuple(self._filter_value(arg) for arg in record.args)
+
+            # Filter attributes passed in extra=
+            for attr_name in record.__dict__.keys() - RECORD_ATTRS:
+                if attr_name.startswith('_'):
+                    continue
+                if attr_name.lower() in self.SENSITIVE_FIELDS:
+                    setattr(record, attr_name, '[FILTERED]')
+                else:
                     attr_value = getattr(record, attr_name)
-                    if isinstance(attr_value, str):
-                        setattr(record, attr_name,
-                                self._filter_string(attr_value))
-                    elif isinstance(attr_value, dict):
-                        setattr(record, attr_name,
-                                self._filter_dict(attr_value))
+                    filtered = self._filter_value(attr_value)
+                    if filtered is not attr_value:
+                        setattr(record, attr_name, filtered)
+
+            record._sensitive_filtered = True
 
         except Exception:
             # Don't let filtering errors prevent logging
@@ -104,39 +169,42 @@ class SensitiveDataFilter(logging.Filter):
 
     def _filter_string(self, text: str) -> str:
         """Filter sensitive patterns from string."""
-        if not text:
+        if not text or not self.TRIGGER_PATTERN.search(text):
             return text
 
-        filtered_text = text
-        for pattern, replacement in self.SENSITIVE_PATTERNS:
-            filtered_text = pattern.sub(replacement, filtered_text)
-
-        return filtered_text
+        regex, replacements = self._combined
+        return regex.sub(lambda match: replacements[match.lastgroup](match), text)
+
+    def _filter_value(self, value):
+        """Filter a string, dict or list, returning the value itself if unchanged."""
+        if isinstance(value, str):
+            return self._filter_string(value)
+        if isinstance(value, dict):
+            return self._filter_dict(value)
+        if isinstance(value, list):
+            filtered = [self._filter_value(item) for item in value]
+            if all(new is old for new, old in zip(filtered, value)):
+                return value
+            return filtered
+        return value
 
     def _filter_dict(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Filter sensitive fields from dictionary."""
+        """Filter sensitive fields from dictionary (copied only if something changes)."""
         if not isinstance(data, dict):
             return data
 
-        filtered_data = {}
+        filtered_data = None
         for key, value in data.items():
-            if key.lower() in self.SENSITIVE_FIELDS:
-                filtered_data[key] = '[FILTERED]'
-            elif isinstance(value, str):
-                filtered_data[key] = self._filter_string(value)
-            elif isinstance(value, dict):
-                filtered_data[key] = self._filter_dict(value)
-            elif isinstance(value, list):
-                filtered_data[key] = [
-                    self._filter_dict(item) if isinstance(item, dict)
-                    else self._filter_string(item) if isinstance(item, str)
-                    else item
-                    for item in value
-                ]
+            if isinstance(key, str) and key.lower() in self.SENSITIVE_FIELDS:
+                filtered = '[FILTERED]'
             else:
-                filtered_data[key] = value
+                filtered = self._filter_value(value)
+            if filtered is not value:
+                if filtered_data is None:
+                    filtered_data = dict(data)
+                filtered_data[key] = filtered
 
-        return filtered_data
+        return data if filtered_data is None else filtered_data
 
 
 class StructuredFormatter(logging.Formatter):
@@ -0,0 +1,147 @@
+"""
+Management command to benchmark transactional email under a signup burst.
+
+Sends --emails messages as fast as the callers can, through a backend
+that takes --connect-latency-ms to open a connection (SMTP handshake and
+TLS, or an HTTPS session) and --send-latency-ms per message, and reports
+the time per call in the request thread, peak thread count, connections
+opened and the time until every message is sent for:
+- legacy: a new thread per email, each opening its own connection
+- current: EmailDispatcher's fixed worker pool over reused connections
+
+Usage:
+    python manage.py benchmark_email_dispatch
+    python manage.py benchmark_email_dispatch --emails 1000 --workers 4
+"""
+import threading
+import time
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management.base import BaseCommand
+
+from core.email_dispatch import EmailDispatcher
+
+BACKEND = 'core.management.commands.benchmark_email_dispatch.SlowEmailBackend'
+
+
+class SlowEmailBackend(BaseEmailBackend):
+    """Takes connect_latency to open and send_latency per message."""
+
+    connect_latency = 0.0
+    send_latency = 0.0
+    lock = threading.Lock()
+    opened = 0
+    sent = 0
+
+    def __init__(self, fail_silently=False, **kwargs):
+        super().__init__(fail_silently=fail_silently)
+        self.is_open = False
+
+    def open(self):
+        if self.is_open:
+            return False
+        time.sleep(self.connect_latency)
+        self.is_open = True
+        with self.lock:
+            SlowEmailBackend.opened += 1
+        return True
+
+    def close(self):
+        self.is_open = False
+
+    def send_messages(self, email_messages):
+        created = self.open()
+        try:
+            for _ in email_messages:
+                time.sleep(self.send_latency)
+            with self.lock:
+                SlowEmailBackend.sent += len(email_messages)
+            return len(email_messages)
+        finally:
+            if created:
+                self.close()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark thread-per-email vs the email worker pool under a burst'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--emails',
+            type=int,
+            default=500,
+            help='Messages in the burst'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=2,
+            help='Dispatcher worker threads'
+        )
+        parser.add_argument(
+            '--connect-latency-ms',
+            type=float,
+            default=150.0,
+            help='Time to open a backend connection'
+        )
+        parser.add_argument(
+            '--send-latency-ms',
+            type=float,
+            default=20.0,
+            help='Time to send one message'
+        )
+
+    def handle(self, *args, **options):
+        SlowEmailBackend.connect_latency = options['connect_latency_ms'] / 1000
+        SlowEmailBackend.send_latency = options['send_latency_ms'] / 1000
+        count = options['emails']
+        messages = [
+            EmailMessage('Verify your email', 'body', 'noreply@example.com',
+                         [f'member{number}@example.com'])
+            for number in range(count)
+        ]
+
+        self.stdout.write(self.style.SUCCESS(f'🚀 Sending a burst of {count} emails'))
+        self.stdout.write(
+            f"\n{'Run':<10} {'µs/call':>9} {'peak threads':>13} "
+            f"{'connections':>12} {'all sent (s)':>13}")
+        self.stdout.write('-' * 61)
+
+        def legacy_send(message):
+            def send_thread():
+                connection = get_connection(backend=BACKEND)
+                message.connection = connection
+                message.send()
+
+            thread = threading.Thread(target=send_thread)
+            thread.daemon = True
+            thread.start()
+
+        self.measure('legacy', messages, legacy_send)
+
+        dispatcher = EmailDispatcher(
+            workers=options['workers'], capacity=count, backend=BACKEND)
+        self.measure('current', messages, dispatcher.send)
+        dispatcher.stop(timeout=600)
+
+    def measure(self, label, messages, send):
+        """Send every message, then wait for delivery while sampling the thread count."""
+        SlowEmailBackend.opened = 0
+        SlowEmailBackend.sent = 0
+        baseline = threading.active_count()
+
+        start = time.perf_counter()
+        for message in messages:
+            send(message)
+        call_time = time.perf_counter() - start
+
+        peak = threading.active_count()
+        while SlowEmailBackend.sent < len(messages):
+            peak = max(peak, threading.active_count())
+            time.sleep(0.005)
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            f"{label:<10} {call_time * 1e6 / len(messages):>9.1f} "
+            f"{peak - baseline:>13} {SlowEmailBackend.opened:>12} {elapsed:>13.2f}")
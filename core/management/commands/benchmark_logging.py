@@ -0,0 +1,204 @@
+"""
+Management command to benchmark logging throughput with sensitive data filtering.
+
+Logs a mix of records shaped like the application's (repeated format
+strings with args, f-string messages with extra= context dicts, and
+messages carrying an email or a token) through a logger whose handler
+writes structured JSON to a null stream, and times per record:
+- none: the handler without the filter
+- legacy: the filter as it used to be (dir() walk over the record, six
+  re.sub passes per string, dicts copied recursively)
+- current: SensitiveDataFilter
+It also times filter() alone on records below the logger's level, as
+handlers attached to a parent logger receive from more verbose children,
+and the cost to the logging thread when every write to the sink takes
+--sink-latency-ms, written directly or queued for the log shipper.
+
+Usage:
+    python manage.py benchmark_logging
+    python manage.py benchmark_logging --records 200000
+    python manage.py benchmark_logging --sink-latency-ms 2
+"""
+import io
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.logging.shipping import LogShipper
+from core.logging.structured import SensitiveDataFilter, StructuredFormatter
+
+LEGACY_SKIPPED_ATTRS = [
+    'name', 'msg', 'args', 'levelno', 'levelname', 'pathname', 'filename', 'module',
+    'lineno', 'funcName', 'created', 'msecs', 'relativeCreated', 'thread', 'threadName',
+    'processName', 'process',
+]
+
+
+class LegacySensitiveDataFilter(SensitiveDataFilter):
+    """The filter before it was reworked, for comparison."""
+
+    def filter(self, record):
+        try:
+            if hasattr(record, 'msg') and isinstance(record.msg, str):
+                record.msg = self._legacy_string(record.msg)
+            if hasattr(record, 'args') and record.args:
+                record.args = tuple(
+                    self._legacy_string(arg) if isinstance(arg, str)
+                    else self._legacy_dict(arg) if isinstance(arg, dict)
+                    else arg
+                    for arg in record.args)
+            for attr_name in dir(record):
+                if not attr_name.startswith('_') and attr_name not in LEGACY_SKIPPED_ATTRS:
+                    attr_value = getattr(record, attr_name)
+                    if isinstance(attr_value, str):
+                        setattr(record, attr_name, self._legacy_string(attr_value))
+                    elif isinstance(attr_value, dict):
+                        setattr(record, attr_name, self._legacy_dict(attr_value))
+        except Exception:
+            pass
+        return True
+
+    def _legacy_string(self, text):
+        if not text:
+            return text
+        for pattern, replacement in self.SENSITIVE_PATTERNS:
+            text = pattern.sub(replacement, text)
+        return text
+
+    def _legacy_dict(self, data):
+        filtered_data = {}
+        for key, value in data.items():
+            if key.lower() in self.SENSITIVE_FIELDS:
+                filtered_data[key] = '[FILTERED]'
+            elif isinstance(value, str):
+                filtered_data[key] = self._legacy_string(value)
+            elif isinstance(value, dict):
+                filtered_data[key] = self._legacy_dict(value)
+            elif isinstance(value, list):
+                filtered_data[key] = [
+                    self._legacy_dict(item) if isinstance(item, dict)
+                    else self._legacy_string(item) if isinstance(item, str)
+                    else item
+                    for item in value
+                ]
+            else:
+                filtered_data[key] = value
+        return filtered_data
+
+
+class NullStream(io.TextIOBase):
+    """Discards writes, so only formatting and filtering are timed."""
+
+    def __init__(self, latency=0.0):
+        super().__init__()
+        self.latency = latency
+
+    def write(self, text):
+        if self.latency:
+            time.sleep(self.latency)
+        return len(text)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark logging throughput with legacy vs current sensitive data filtering'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--records',
+            type=int,
+            default=50000,
+            help='Records per measurement'
+        )
+        parser.add_argument(
+            '--sink-latency-ms',
+            type=float,
+            default=1.0,
+            help='Time each write to the slow sink takes'
+        )
+
+    def handle(self, *args, **options):
+        count = options['records']
+        self.stdout.write(self.style.SUCCESS(f'🚀 Logging {count} records per run'))
+        self.stdout.write(f"\n{'Run':<26} {'µs/record':>10} {'records/s':>11}")
+        self.stdout.write('-' * 49)
+
+        for label, log_filter in [
+            ('none', None),
+            ('legacy', LegacySensitiveDataFilter()),
+            ('current', SensitiveDataFilter()),
+        ]:
+            logger = self.make_logger(log_filter)
+            self.measure(label, count, lambda i: self.log(logger, i))
+
+        for label, log_filter in [
+            ('legacy (disabled level)', LegacySensitiveDataFilter()),
+            ('current (disabled level)', SensitiveDataFilter()),
+        ]:
+            logging.getLogger('benchmark.logging').setLevel(logging.INFO)
+            records = [
+                logging.LogRecord(
+                    'benchmark.logging', logging.DEBUG, __file__, 1,
+                    'Feed item %s rendered for %s', (i, 'member@example.com'), None)
+                for i in range(count)
+            ]
+            self.measure(label, count, lambda i: log_filter.filter(records[i]))
+
+        latency = options['sink_latency_ms'] / 1000
+        slow_count = min(count, int(2 / latency) if latency else count)
+        self.stdout.write('')
+        logger = self.make_logger(SensitiveDataFilter(), NullStream(latency))
+        self.measure('direct (slow sink)', slow_count, lambda i: self.log(logger, i))
+
+        logger = self.make_logger(SensitiveDataFilter(), NullStream(latency))
+        shipper = LogShipper()
+        shipper.attach([logger])
+        shipper.start()
+        self.measure('queued (slow sink)', slow_count, lambda i: self.log(logger, i))
+        start = time.perf_counter()
+        shipper.stop(timeout=60)
+        self.stdout.write(
+            f"{'':<26} drained in {time.perf_counter() - start:.2f}s, "
+            f"{shipper.dropped} records dropped")
+
+    @staticmethod
+    def make_logger(log_filter, stream=None):
+        """A logger with one structured handler writing to a null stream."""
+        logger = logging.getLogger('benchmark.logging')
+        logger.handlers = []
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        handler = logging.StreamHandler(stream or NullStream())
+        handler.setFormatter(StructuredFormatter())
+        if log_filter is not None:
+            handler.addFilter(log_filter)
+        logger.addHandler(handler)
+        return logger
+
+    @staticmethod
+    def log(logger, i):
+        """Log one record of the application's typical shapes."""
+        kind = i % 4
+        if kind == 0:
+            logger.info('Feed item %s created for group %s', i, i % 50)
+        elif kind == 1:
+            logger.info(f'Photo uploaded for user {i}', extra={
+                'user_id': i, 'operation': 'upload_photo',
+                'details': {'size': 2048, 'content_type': 'image/jpeg'},
+            })
+        elif kind == 2:
+            logger.info('Password reset requested for %s', f'member{i}@example.com')
+        else:
+            logger.info(f'Request completed in {i % 300}ms', extra={
+                'request_path': '/api/v1/feed/', 'request_method': 'GET',
+                'status_code': 200, 'correlation_id': 'c0ffee',
+            })
+
+    def measure(self, label, count, func):
+        """Run func count times, printing time per record and throughput."""
+        start = time.perf_counter()
+        for i in range(count):
+            func(i)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"{label:<26} {elapsed * 1e6 / count:>10.2f} {count / elapsed:>11.0f}")
@@ -0,0 +1,141 @@
+"""
+Management command to benchmark response PII scrubbing.
+
+Builds synthetic JSON feed payloads (members with emails, phone numbers
+and Base64 photos) of 10 KB, 1 MB and 10 MB by default, then times:
+- legacy: decoding the body, six separate re.sub passes and re-encoding,
+  as the security headers middleware used to scrub responses
+- bytes: the single combined pattern run over the raw bytes
+- stream: the same pattern applied to the body in 64 KB chunks, as for
+  streaming responses
+- pii_safe: the middleware with the view marked @pii_safe
+
+Usage:
+    python manage.py benchmark_pii_scrubbing
+    python manage.py benchmark_pii_scrubbing --sizes 100000 5000000 --repeat 5
+"""
+import base64
+import json
+import os
+import re
+import time
+
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from core.security.headers import (
+    PII_PATTERNS,
+    SecurityHeadersMiddleware,
+    pii_safe,
+    scrub_pii,
+    scrub_pii_stream,
+)
+
+LEGACY_PATTERNS = [
+    re.compile(pattern.decode(), re.IGNORECASE if i == 0 else 0)
+    for i, pattern in enumerate(PII_PATTERNS)
+]
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class Command(BaseCommand):
+    help = 'Benchmark legacy vs single-pass response PII scrubbing'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=[10 * 1024, 1024 * 1024, 10 * 1024 * 1024],
+            help='Payload sizes in bytes'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Runs per measurement (the fastest is reported)'
+        )
+
+    def handle(self, *args, **options):
+        self.repeat = options['repeat']
+        middleware = SecurityHeadersMiddleware(lambda request: None)
+        view = pii_safe(lambda request: None)
+        factory = RequestFactory()
+
+        self.stdout.write(self.style.SUCCESS('🚀 Benchmarking response PII scrubbing'))
+        self.stdout.write(
+            f"\n{'Payload':>10} {'Method':<10} {'Time (ms)':>11} {'MB/s':>9} {'Redactions':>11}")
+        self.stdout.write('-' * 55)
+
+        for size in options['sizes']:
+            body = self.build_payload(size)
+            label = self.format_size(len(body))
+
+            def skip():
+                request = factory.get('/api/v1/groups/', HTTP_USER_AGENT='benchmark')
+                middleware.process_request(request)
+                middleware.process_view(request, view, (), {})
+                response = HttpResponse(body, content_type='application/json')
+                return middleware.process_response(request, response).content
+
+            for method, func in (
+                ('legacy', lambda: self.legacy_scrub(body)),
+                ('bytes', lambda: scrub_pii(body)),
+                ('stream', lambda: b''.join(scrub_pii_stream(
+                    body[i:i + STREAM_CHUNK_SIZE]
+                    for i in range(0, len(body), STREAM_CHUNK_SIZE)))),
+                ('pii_safe', skip),
+            ):
+                elapsed, result = self.measure(func)
+                throughput = len(body) / (1024 * 1024) / (elapsed / 1000) if elapsed else 0
+                redactions = result.count(b'[REDACTED]')
+                self.stdout.write(
+                    f"{label:>10} {method:<10} {elapsed:>11.2f} {throughput:>9.1f} {redactions:>11}")
+            self.stdout.write('')
+
+    def measure(self, func):
+        """Run func repeatedly, returning the fastest time in ms and its result."""
+        best = None
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            result = func()
+            elapsed = (time.perf_counter() - start) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    @staticmethod
+    def legacy_scrub(body):
+        """Scrub the way the middleware did before the combined pattern."""
+        content = body.decode('utf-8', errors='ignore')
+        for pattern in LEGACY_PATTERNS:
+            content = pattern.sub('[REDACTED]', content)
+        return content.encode('utf-8')
+
+    @staticmethod
+    def build_payload(size):
+        """Build a JSON group feed of roughly size bytes."""
+        photo = 'data:image/jpeg;base64,' + base64.b64encode(os.urandom(3000)).decode()
+        members = []
+        length = 0
+        i = 0
+        while length < size:
+            member = {
+                'id': i,
+                'name': f'Member {i}',
+                'email': f'member{i}@example.org',
+                'phone': f'+1 555-{i % 1000:03d}-{i % 10000:04d}',
+                'bio': 'Grateful for this group and the people in it. ' * 3,
+                'photo_url': photo if i % 4 == 0 else None,
+            }
+            length += len(json.dumps(member)) + 2
+            members.append(member)
+            i += 1
+        return json.dumps({'count': len(members), 'results': members}).encode('utf-8')
+
+    @staticmethod
+    def format_size(size):
+        if size >= 1024 * 1024:
+            return f'{size / (1024 * 1024):.1f} MB'
+        return f'{size / 1024:.1f} KB'
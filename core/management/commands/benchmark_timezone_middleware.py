@@ -0,0 +1,210 @@
+"""
+Management command to benchmark TimezoneMiddleware per-request overhead.
+
+Builds a mix of requests (mostly Accept-Language, some X-Timezone
+headers, some with neither, from a few hundred client networks) and
+times process_request + process_response per request for:
+- legacy: the middleware's old per-request work, reproduced by
+  rebuilding the language map, calling pytz.timezone and (with GeoIP)
+  opening a new GeoIP2 reader on every request
+- current: TimezoneMiddleware with its memoized resolver
+- current (cold): the same with the resolver cache cleared first
+
+GeoIP runs use the database at GEOIP_PATH when geoip2 is installed, and
+otherwise a stand-in reader that takes --geoip-open-ms to open and
+--geoip-lookup-us per lookup. Each run is repeated and the best is shown.
+
+Usage:
+    python manage.py benchmark_timezone_middleware
+    python manage.py benchmark_timezone_middleware --requests 50000
+    python manage.py benchmark_timezone_middleware --geoip-open-ms 5
+"""
+import random
+import time
+
+from contextlib import nullcontext
+from unittest.mock import patch
+
+import pytz
+from django.conf import settings
+from django.contrib.gis.geoip2 import HAS_GEOIP2
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.utils import timezone
+
+from core.middleware import timezone as timezone_middleware
+from core.middleware.timezone import (
+    COUNTRY_TIMEZONES,
+    LANGUAGE_TIMEZONES,
+    TimezoneMiddleware,
+    resolve_timezone,
+)
+
+LANGUAGES = [
+    'en-US,en;q=0.9', 'en-GB,en;q=0.8', 'nl-NL,nl;q=0.9,en;q=0.8', 'de-DE,de;q=0.9',
+    'fr-FR,fr;q=0.9', 'es-ES', 'pt-BR,pt;q=0.9', 'ja-JP', 'sv-SE', 'it-IT',
+]
+HEADER_TIMEZONES = ['Europe/Amsterdam', 'America/Chicago', 'Asia/Singapore', 'Africa/Lagos']
+COUNTRIES = ['NL', 'US', 'GB', 'DE', 'NG', 'BR', 'JP', 'AU']
+
+
+def simulated_reader(open_seconds, lookup_seconds):
+    """A GeoIP2 stand-in with the given open and lookup costs."""
+
+    def busy(seconds):
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            pass
+
+    class SimulatedGeoIP2:
+        MODE_MMAP = 0
+
+        def __init__(self, *args, **kwargs):
+            busy(open_seconds)
+
+        def country_code(self, ip):
+            busy(lookup_seconds)
+            return COUNTRIES[hash(ip) % len(COUNTRIES)]
+
+    return SimulatedGeoIP2
+
+
+class LegacyTimezoneMiddleware(TimezoneMiddleware):
+    """The middleware's old per-request costs, for comparison."""
+
+    def _get_timezone_from_sources(self, request):
+        meta = request.META
+        header = meta.get('HTTP_X_TIMEZONE') or meta.get('HTTP_X_USER_TIMEZONE')
+        if header:
+            return header
+        language_timezone_map = dict(LANGUAGE_TIMEZONES)
+        accept_language = meta.get('HTTP_ACCEPT_LANGUAGE', '')
+        if accept_language:
+            language_tz = language_timezone_map.get(accept_language.split(',')[0].strip())
+            if language_tz:
+                return language_tz
+        if getattr(settings, 'ENABLE_GEOIP_TIMEZONE', False):
+            return self._legacy_geoip(request)
+        return None
+
+    def _legacy_geoip(self, request):
+        client_ip = self._get_client_ip(request)
+        if not client_ip or self._is_private_ip(client_ip):
+            return None
+        try:
+            country_timezone_map = dict(COUNTRY_TIMEZONES)
+            reader = timezone_middleware.GeoIP2()
+            return country_timezone_map.get(reader.country_code(client_ip))
+        except Exception:
+            return None
+
+    def process_request(self, request):
+        user_timezone = self._get_timezone_from_sources(request)
+        try:
+            tz = pytz.timezone(user_timezone) if user_timezone else pytz.UTC
+        except pytz.exceptions.UnknownTimeZoneError:
+            user_timezone, tz = 'UTC', pytz.UTC
+        timezone.activate(tz)
+        request.user_timezone = user_timezone or 'UTC'
+        request.user_timezone_object = tz
+
+
+class Command(BaseCommand):
+    help = 'Benchmark legacy vs memoized timezone detection per request'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=20000,
+            help='Requests per run'
+        )
+        parser.add_argument(
+            '--networks',
+            type=int,
+            default=300,
+            help='Distinct client /24 networks'
+        )
+        parser.add_argument(
+            '--geoip-open-ms',
+            type=float,
+            default=2.0,
+            help='Time the stand-in GeoIP reader takes to open'
+        )
+        parser.add_argument(
+            '--geoip-lookup-us',
+            type=float,
+            default=20.0,
+            help='Time the stand-in GeoIP reader takes per lookup'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Runs per measurement (the best is shown)'
+        )
+
+    def handle(self, *args, **options):
+        factory = RequestFactory()
+        rng = random.Random(42)
+        requests = []
+        for _ in range(options['requests']):
+            meta = {'REMOTE_ADDR': (
+                f"{rng.randint(11, 99)}.{rng.randrange(options['networks'])}."
+                f"{rng.randint(0, 255)}.{rng.randint(1, 254)}")}
+            kind = rng.random()
+            if kind < 0.6:
+                meta['HTTP_ACCEPT_LANGUAGE'] = rng.choice(LANGUAGES)
+            elif kind < 0.8:
+                meta['HTTP_X_TIMEZONE'] = rng.choice(HEADER_TIMEZONES)
+            requests.append(factory.get('/api/v1/feed/', **meta))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'🚀 Benchmarking timezone detection over {len(requests)} requests'))
+        self.stdout.write(f"\n{'Run':<28} {'µs/request':>11} {'requests/s':>11}")
+        self.stdout.write('-' * 52)
+
+        real_geoip = HAS_GEOIP2 and getattr(settings, 'GEOIP_PATH', None)
+        if real_geoip:
+            geoip_reader = nullcontext()
+        else:
+            self.stdout.write('(GeoIP runs use a simulated reader)')
+            geoip_reader = patch.object(timezone_middleware, 'GeoIP2', simulated_reader(
+                options['geoip_open_ms'] / 1000, options['geoip_lookup_us'] / 1e6))
+
+        runs = [('', {'ENABLE_GEOIP_TIMEZONE': False}, nullcontext())]
+        runs.append((' + geoip', {
+            'ENABLE_GEOIP_TIMEZONE': True,
+            'GEOIP_PATH': getattr(settings, 'GEOIP_PATH', None) or '/geoip',
+        }, geoip_reader))
+        # Legacy GeoIP opens the database per request, so fewer requests suffice
+        geoip_requests = requests[:max(1, len(requests) // 20)]
+
+        for suffix, overrides, reader in runs:
+            with override_settings(**overrides), reader, \
+                    patch.object(timezone_middleware, '_geoip_reader', None):
+                legacy = LegacyTimezoneMiddleware(lambda request: HttpResponse())
+                current = TimezoneMiddleware(lambda request: HttpResponse())
+                run_requests = geoip_requests if suffix else requests
+                self.measure(f'legacy{suffix}', run_requests, legacy, options['repeat'])
+                self.measure(f'current (cold){suffix}', requests, current, 1,
+                             before=resolve_timezone.cache_clear)
+                self.measure(f'current{suffix}', requests, current, options['repeat'])
+
+    def measure(self, label, requests, middleware, repeat, before=None):
+        """Run every request through the middleware, printing the best cost per request."""
+        response = HttpResponse()
+        best = None
+        for _ in range(repeat):
+            if before is not None:
+                before()
+            start = time.perf_counter()
+            for request in requests:
+                middleware.process_request(request)
+                middleware.process_response(request, response)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        self.stdout.write(
+            f"{label:<28} {best * 1e6 / len(requests):>11.2f} "
+            f"{len(requests) / best:>11.0f}")
@@ -6,12 +6,26 @@ for production deployments where Django serves media files directly.
 """
 
 from django.conf import settings
-from django.http import Http404, HttpResponse
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response
 from django.utils.deprecation import MiddlewareMixin
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
 from django.core.files.storage import default_storage
+import logging
 import os
 import mimetypes
-from urllib.parse import unquote
+import re
+from stat import S_ISREG
+from urllib.parse import quote, unquote
+
+logger = logging.getLogger(__name__)
+
+# Names carrying a content hash, e.g. avatar.3f2a9c1b7e4d.webp
+HASHED_NAME_RE = re.compile(r'[._-][0-9a-f]{8,64}\.[A-Za-z0-9]+$')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+RANGE_NOT_SATISFIABLE = 'unsatisfiable'
 
 
 class MediaSecurityMiddleware(MiddlewareMixin):
@@ -31,9 +45,11 @@ class MediaSecurityMiddleware(MiddlewareMixin):
             return response
 
         # Add security headers for media files
+        # (without overriding headers the media response already set, such
+        # as the immutable Cache-Control of content-hashed files)
         if hasattr(settings, 'MEDIA_FILE_SECURITY_HEADERS'):
             for header, value in settings.MEDIA_FILE_SECURITY_HEADERS.items():
-                response[header] = value
+                response.setdefault(header, value)
 
         # Ensure proper content type for images
         if request.path.endswith(('.jpg', '.jpeg', '.png', '.gif', '.webp')):
@@ -51,6 +67,18 @@ class ProductionMediaMiddleware(MiddlewareMixin):
 
     This is used when SERVE_MEDIA_IN_PRODUCTION=True and provides
     a secure way to serve media files before migrating to S3/CDN.
+
+    Files are streamed with FileResponse rather than read into memory,
+    and responses carry an ETag and Last-Modified so browsers revalidate
+    with a 304 instead of downloading the file again. Single byte ranges
+    are served as 206 responses. Names containing a content hash are
+    cached as immutable for a year.
+
+    When a front proxy is configured with MEDIA_SENDFILE_HEADER
+    ('X-Accel-Redirect' for nginx, 'X-Sendfile' for Apache/lighttpd), the
+    response only names the file and the proxy sends it. X-Accel-Redirect
+    points at MEDIA_ACCEL_REDIRECT_PREFIX + the file name, which must be
+    an internal nginx location aliased to MEDIA_ROOT.
     """
 
     def process_request(self, request):
@@ -65,6 +93,9 @@ class ProductionMediaMiddleware(MiddlewareMixin):
         if not serve_media and not settings.DEBUG:
             return None
 
+        if request.method not in ('GET', 'HEAD'):
+            return None
+
         # Get the file path
         file_path = unquote(request.path[len(settings.MEDIA_URL):])
 
@@ -73,43 +104,173 @@ class ProductionMediaMiddleware(MiddlewareMixin):
             raise Http404("Invalid file path")
 
         try:
-            # Check if file exists
+            local_path, size, modified = self._stat(file_path)
+        except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+            raise Http404("File not found")
+        except Exception as e:
+            logger.error(f"Media serving error for {file_path}: {e}")
+            raise Http404("File not found")
+
+        etag = f'"{modified:x}-{size:x}"'
+        headers = self._response_headers(file_path, etag, modified)
+
+        # Answer If-None-Match / If-Modified-Since without touching the file
+        probe = HttpResponse()
+        self._apply_headers(probe, headers)
+        conditional = get_conditional_response(
+            request, etag=etag, last_modified=modified, response=probe)
+        if conditional is not probe:
+            return conditional
+
+        content_type, _ = mimetypes.guess_type(file_path)
+        content_type = content_type or 'application/octet-stream'
+
+        sendfile_header = getattr(settings, 'MEDIA_SENDFILE_HEADER', None)
+        if sendfile_header:
+            response = self._sendfile_response(
+                sendfile_header, file_path, local_path, content_type)
+            if response is not None:
+                self._apply_headers(response, headers)
+                return response
+
+        byte_range = self._requested_range(request, size, etag, modified)
+        if byte_range == RANGE_NOT_SATISFIABLE:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            self._apply_headers(response, headers)
+            return response
+
+        try:
+            file_obj = open(local_path, 'rb') if local_path else default_storage.open(file_path, 'rb')
+        except OSError as e:
+            logger.error(f"Media serving error for {file_path}: {e}")
+            raise Http404("File not found")
+
+        filename = os.path.basename(file_path)
+        if byte_range:
+            start, end = byte_range
+            file_obj.seek(start)
+            response = FileResponse(
+                RangeFile(file_obj, end - start + 1), status=206,
+                content_type=content_type, filename=filename)
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+            response['Content-Length'] = end - start + 1
+        else:
+            response = FileResponse(file_obj, content_type=content_type, filename=filename)
+            response['Content-Length'] = size
+
+        self._apply_headers(response, headers)
+        return response
+
+    def _stat(self, file_path):
+        """
+        Look up a media file without opening it.
+
+        Returns:
+            Tuple of (local filesystem path or None for remote storage,
+            size in bytes, modification time as a Unix timestamp)
+        """
+        try:
+            local_path = default_storage.path(file_path)
+        except NotImplementedError:
             if not default_storage.exists(file_path):
-                raise Http404("File not found")
+                raise FileNotFoundError(file_path)
+            modified = default_storage.get_modified_time(file_path)
+            return None, default_storage.size(file_path), int(modified.timestamp())
 
-            # Get file content and metadata
-            file_obj = default_storage.open(file_path, 'rb')
-            content = file_obj.read()
-            file_obj.close()
+        stat = os.stat(local_path)
+        if not S_ISREG(stat.st_mode):
+            raise IsADirectoryError(file_path)
+        return local_path, stat.st_size, int(stat.st_mtime)
 
-            # Determine content type
-            content_type, _ = mimetypes.guess_type(file_path)
-            if not content_type:
-                content_type = 'application/octet-stream'
+    def _response_headers(self, file_path, etag, modified):
+        """Headers shared by full, partial and 304 responses."""
+        headers = dict(getattr(settings, 'MEDIA_FILE_SECURITY_HEADERS', {}))
+        if HASHED_NAME_RE.search(file_path):
+            # The name changes whenever the content does
+            headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        else:
+            headers.setdefault('Cache-Control', 'public, no-cache')
+        headers['ETag'] = etag
+        headers['Last-Modified'] = http_date(modified)
+        headers['Accept-Ranges'] = 'bytes'
+        return headers
 
-            # Create response
-            response = HttpResponse(content, content_type=content_type)
+    @staticmethod
+    def _apply_headers(response, headers):
+        for header, value in headers.items():
+            response[header] = value
 
-            # Add security headers
-            if hasattr(settings, 'MEDIA_FILE_SECURITY_HEADERS'):
-                for header, value in settings.MEDIA_FILE_SECURITY_HEADERS.items():
-                    response[header] = value
+    def _sendfile_response(self, header, file_path, local_path, content_type):
+        """Hand the file off to the front proxy, or None if it cannot be."""
+        response = HttpResponse(content_type=content_type)
+        if header.lower() == 'x-accel-redirect':
+            prefix = getattr(settings, 'MEDIA_ACCEL_REDIRECT_PREFIX', '/protected-media/')
+            response[header] = prefix.rstrip('/') + '/' + quote(file_path)
+        elif local_path:
+            response[header] = local_path
+        else:
+            return None
 
-            # Add file size header
-            response['Content-Length'] = len(content)
+        filename = os.path.basename(file_path)
+        if filename:
+            response['Content-Disposition'] = content_disposition_header(False, filename)
+        return response
 
-            # Add filename for downloads
-            filename = os.path.basename(file_path)
-            if filename:
-                response['Content-Disposition'] = f'inline; filename="{filename}"'
+    def _requested_range(self, request, size, etag, modified):
+        """
+        Parse a single-range Range header.
 
-            return response
+        Multiple ranges, malformed headers and a stale If-Range are
+        answered with the full file, as RFC 9110 allows.
 
-        except Exception as e:
-            # Log the error in production
-            if not settings.DEBUG:
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.error(f"Media serving error for {file_path}: {e}")
+        Returns:
+            (start, end) inclusive, None for the whole file, or
+            RANGE_NOT_SATISFIABLE
+        """
+        header = request.META.get('HTTP_RANGE', '')
+        match = RANGE_RE.match(header.strip())
+        if not match:
+            return None
 
-            raise Http404("File not found")
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if if_range and if_range != etag and parse_http_date_safe(if_range) != modified:
+            return None
+
+        first, last = match.groups()
+        if not first and not last:
+            return None
+        if not first:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if not length:
+                return RANGE_NOT_SATISFIABLE
+            return max(size - length, 0), size - 1
+
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if last and int(last) < start:
+            return None
+        if start >= size:
+            return RANGE_NOT_SATISFIABLE
+        return start, end
+
+
+class RangeFile:
+    """File-like reader limited to length bytes from the current position."""
+
+    def __init__(self, file_obj, length):
+        self.file_obj = file_obj
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file_obj.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file_obj.close()
@@ -9,19 +9,360 @@ Automatically detects and sets the user's timezone based on:
 
 This ensures all timestamps are displayed in the user's local timezone
 while maintaining UTC storage in the database.
+
+Detection runs on every request, so it is kept cheap:
+- one GeoIP2 reader per process, memory-mapping the database
+- the language and country maps are module constants
+- resolutions are memoized (LRU) on the client's /24 network (/48 for
+  IPv6), Accept-Language and timezone header, and timezone objects on
+  their name
+- the profile timezone is cached per user and on the request's user
 """
 
-import pytz
+import ipaddress
 import logging
+import threading
+from functools import lru_cache
+
+import pytz
+from django.conf import settings
+from django.contrib.gis.geoip2 import GeoIP2
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models.signals import post_delete, post_save
 from django.utils import timezone
 from django.utils.deprecation import MiddlewareMixin
-from django.contrib.gis.geoip2 import GeoIP2
-from django.core.exceptions import ImproperlyConfigured
-from django.conf import settings
 
 
 logger = logging.getLogger(__name__)
 
+# Common language to timezone mappings
+LANGUAGE_TIMEZONES = {
+    # English variants
+    'en-US': 'America/New_York',
+    'en-GB': 'Europe/London',
+    'en-AU': 'Australia/Sydney',
+    'en-CA': 'America/Toronto',
+    'en-NZ': 'Pacific/Auckland',
+    'en-IE': 'Europe/Dublin',
+
+    # Spanish variants
+    'es-ES': 'Europe/Madrid',
+    'es-MX': 'America/Mexico_City',
+    'es-AR': 'America/Buenos_Aires',
+    'es-CL': 'America/Buenos_Aires',
+    'es-CO': 'America/Sao_Paulo',
+
+    # French variants
+    'fr-FR': 'Europe/Paris',
+    'fr-CA': 'America/Toronto',
+    'fr-BE': 'Europe/Amsterdam',
+    'fr-CH': 'Europe/Berlin',
+
+    # German variants
+    'de-DE': 'Europe/Berlin',
+    'de-AT': 'Europe/Berlin',
+    'de-CH': 'Europe/Berlin',
+
+    # Dutch variants
+    'nl-NL': 'Europe/Amsterdam',
+    'nl-BE': 'Europe/Amsterdam',  # Flemish
+
+    # Italian variants
+    'it-IT': 'Europe/Rome',
+    'it-CH': 'Europe/Berlin',
+
+    # Portuguese variants
+    'pt-BR': 'America/Sao_Paulo',
+    'pt-PT': 'Europe/Madrid',
+
+    # Nordic languages
+    'sv-SE': 'Europe/Stockholm',  # Swedish
+    'no-NO': 'Europe/Stockholm',  # Norwegian
+    'da-DK': 'Europe/Stockholm',  # Danish
+    'fi-FI': 'Europe/Stockholm',  # Finnish
+
+    # Other European languages
+    'ru-RU': 'Europe/Moscow',
+    'pl-PL': 'Europe/Berlin',
+    'cs-CZ': 'Europe/Berlin',     # Czech
+    'hu-HU': 'Europe/Berlin',     # Hungarian
+    'sk-SK': 'Europe/Berlin',     # Slovak
+    'sl-SI': 'Europe/Berlin',     # Slovenian
+    'hr-HR': 'Europe/Berlin',     # Croatian
+    'el-GR': 'Europe/Berlin',     # Greek (mapped to Central European)
+
+    # Asian languages
+    'ja-JP': 'Asia/Tokyo',
+    'ko-KR': 'Asia/Seoul',
+    'zh-CN': 'Asia/Shanghai',
+    'zh-TW': 'Asia/Taipei',
+    'zh-HK': 'Asia/Hong_Kong',
+    'hi-IN': 'Asia/Kolkata',
+    'th-TH': 'Asia/Bangkok',
+    'ar-SA': 'Asia/Dubai',
+    'ar-AE': 'Asia/Dubai',
+    'ar-EG': 'Africa/Cairo',
+}
+
+# Map country codes to timezones (comprehensive mapping)
+COUNTRY_TIMEZONES = {
+    # North America
+    'US': 'America/New_York',        # United States (Eastern)
+    'CA': 'America/Toronto',         # Canada (Eastern)
+    'MX': 'America/Mexico_City',     # Mexico
+
+    # Europe
+    'GB': 'Europe/London',           # United Kingdom
+    'IE': 'Europe/Dublin',           # Ireland
+    'FR': 'Europe/Paris',            # France
+    'DE': 'Europe/Berlin',           # Germany
+    'NL': 'Europe/Amsterdam',        # Netherlands
+    # Belgium (same as Netherlands)
+    'BE': 'Europe/Amsterdam',
+    # Luxembourg (same as Netherlands)
+    'LU': 'Europe/Amsterdam',
+    'IT': 'Europe/Rome',             # Italy
+    'ES': 'Europe/Madrid',           # Spain
+    # Portugal (same timezone as Spain)
+    'PT': 'Europe/Madrid',
+    # Switzerland (same as Germany)
+    'CH': 'Europe/Berlin',
+    'AT': 'Europe/Berlin',           # Austria (same as Germany)
+    'SE': 'Europe/Stockholm',        # Sweden
+    'NO': 'Europe/Stockholm',        # Norway (same as Sweden)
+    'DK': 'Europe/Stockholm',        # Denmark (same as Sweden)
+    'FI': 'Europe/Stockholm',        # Finland (same as Sweden)
+    'IS': 'Europe/London',           # Iceland (same as UK)
+    'RU': 'Europe/Moscow',           # Russia (Moscow time)
+    'PL': 'Europe/Berlin',           # Poland (same as Germany)
+    # Czech Republic (same as Germany)
+    'CZ': 'Europe/Berlin',
+    'HU': 'Europe/Berlin',           # Hungary (same as Germany)
+    'SK': 'Europe/Berlin',           # Slovakia (same as Germany)
+    'SI': 'Europe/Berlin',           # Slovenia (same as Germany)
+    'HR': 'Europe/Berlin',           # Croatia (same as Germany)
+    # Greece (but fallback to Berlin if Athens not available)
+    'GR': 'Europe/Athens',
+    'BG': 'Europe/Berlin',           # Bulgaria (same as Germany)
+    'RO': 'Europe/Berlin',           # Romania (same as Germany)
+    'EE': 'Europe/Stockholm',        # Estonia (same as Sweden)
+    'LV': 'Europe/Stockholm',        # Latvia (same as Sweden)
+    'LT': 'Europe/Stockholm',        # Lithuania (same as Sweden)
+    'MT': 'Europe/Rome',             # Malta (same as Italy)
+    # Cyprus (closer to Middle East time)
+    'CY': 'Asia/Dubai',
+
+    # Asia Pacific
+    'JP': 'Asia/Tokyo',              # Japan
+    'KR': 'Asia/Seoul',              # South Korea
+    'CN': 'Asia/Shanghai',           # China
+    'HK': 'Asia/Hong_Kong',          # Hong Kong
+    'TW': 'Asia/Shanghai',           # Taiwan (same as China)
+    'SG': 'Asia/Singapore',          # Singapore
+    'MY': 'Asia/Singapore',          # Malaysia (same as Singapore)
+    'TH': 'Asia/Bangkok',            # Thailand
+    'VN': 'Asia/Bangkok',            # Vietnam (same as Thailand)
+    # Philippines (closer to China time)
+    'PH': 'Asia/Shanghai',
+    # Indonesia (main islands, same as Thailand)
+    'ID': 'Asia/Bangkok',
+    'IN': 'Asia/Kolkata',            # India
+    'PK': 'Asia/Kolkata',            # Pakistan (close to India)
+    'BD': 'Asia/Kolkata',            # Bangladesh (close to India)
+    'LK': 'Asia/Kolkata',            # Sri Lanka (same as India)
+    'AE': 'Asia/Dubai',              # United Arab Emirates
+    'SA': 'Asia/Dubai',              # Saudi Arabia (same as UAE)
+    'QA': 'Asia/Dubai',              # Qatar (same as UAE)
+    'KW': 'Asia/Dubai',              # Kuwait (same as UAE)
+    'BH': 'Asia/Dubai',              # Bahrain (same as UAE)
+    'OM': 'Asia/Dubai',              # Oman (same as UAE)
+    'JO': 'Asia/Dubai',              # Jordan (same as UAE)
+    'IL': 'Asia/Dubai',              # Israel (same as UAE)
+    'TR': 'Europe/Berlin',           # Turkey (same as Germany)
+    'IR': 'Asia/Dubai',              # Iran (close to UAE)
+    'IQ': 'Asia/Dubai',              # Iraq (same as UAE)
+    'AU': 'Australia/Sydney',        # Australia (Eastern)
+    'NZ': 'Pacific/Auckland',        # New Zealand
+
+    # Africa
+    'EG': 'Africa/Cairo',            # Egypt
+    'ZA': 'Africa/Johannesburg',     # South Africa
+    'NG': 'Africa/Cairo',            # Nigeria (same as Egypt)
+    'KE': 'Africa/Cairo',            # Kenya (same as Egypt)
+    'GH': 'Africa/Cairo',            # Ghana (same as Egypt)
+    'ET': 'Africa/Cairo',            # Ethiopia (same as Egypt)
+    'TZ': 'Africa/Cairo',            # Tanzania (same as Egypt)
+    'UG': 'Africa/Cairo',            # Uganda (same as Egypt)
+    'MA': 'Europe/London',           # Morocco (same as UK)
+    'DZ': 'Europe/Paris',            # Algeria (same as France)
+    'TN': 'Europe/Paris',            # Tunisia (same as France)
+    'LY': 'Africa/Cairo',            # Libya (same as Egypt)
+    'SD': 'Africa/Cairo',            # Sudan (same as Egypt)
+
+    # South America
+    'BR': 'America/Sao_Paulo',      # Brazil
+    'AR': 'America/Buenos_Aires',    # Argentina
+    'CL': 'America/Buenos_Aires',    # Chile (same as Argentina)
+    'CO': 'America/Sao_Paulo',      # Colombia (same as Brazil)
+    'PE': 'America/Sao_Paulo',      # Peru (same as Brazil)
+    'VE': 'America/Sao_Paulo',      # Venezuela (same as Brazil)
+    'EC': 'America/Sao_Paulo',      # Ecuador (same as Brazil)
+    'BO': 'America/Sao_Paulo',      # Bolivia (same as Brazil)
+    'UY': 'America/Buenos_Aires',    # Uruguay (same as Argentina)
+    'PY': 'America/Sao_Paulo',      # Paraguay (same as Brazil)
+
+    # Caribbean & Central America
+    'GT': 'America/Mexico_City',     # Guatemala (same as Mexico)
+    'BZ': 'America/Mexico_City',     # Belize (same as Mexico)
+    'SV': 'America/Mexico_City',     # El Salvador (same as Mexico)
+    'HN': 'America/Mexico_City',     # Honduras (same as Mexico)
+    'NI': 'America/Mexico_City',     # Nicaragua (same as Mexico)
+    'CR': 'America/Mexico_City',     # Costa Rica (same as Mexico)
+    'PA': 'America/Mexico_City',     # Panama (same as Mexico)
+    'JM': 'America/New_York',        # Jamaica (same as US Eastern)
+    'CU': 'America/New_York',        # Cuba (same as US Eastern)
+    # Dominican Republic (same as US Eastern)
+    'DO': 'America/New_York',
+    'HT': 'America/New_York',        # Haiti (same as US Eastern)
+    # Trinidad and Tobago (same as US Eastern)
+    'TT': 'America/New_York',
+}
+
+# Distinct (network, Accept-Language, header) resolutions kept per process
+RESOLUTION_CACHE_SIZE = 4096
+
+# The profile default, which users have not chosen
+PROFILE_DEFAULT_TIMEZONE = 'UTC'
+PROFILE_TIMEZONE_CACHE_PREFIX = 'profile_tz'
+PROFILE_TIMEZONE_CACHE_TIMEOUT = 3600
+
+_geoip_reader = None
+_geoip_lock = threading.Lock()
+
+
+def get_geoip_reader():
+    """
+    Get the process-wide GeoIP2 reader.
+
+    The database is memory-mapped, so it is opened once and its pages
+    are shared between workers forked from the same master.
+
+    Returns:
+        GeoIP2 instance, or None if the database cannot be opened
+    """
+    global _geoip_reader
+    if _geoip_reader is None:
+        with _geoip_lock:
+            if _geoip_reader is None:
+                try:
+                    _geoip_reader = GeoIP2(cache=GeoIP2.MODE_MMAP)
+                except Exception as e:
+                    logger.warning(f"GeoIP database unavailable, timezone detection disabled: {e}")
+                    _geoip_reader = False
+    return _geoip_reader or None
+
+
+@lru_cache(maxsize=512)
+def load_timezone(name):
+    """Get a timezone by name, or None if it is unknown."""
+    try:
+        return pytz.timezone(name)
+    except (pytz.exceptions.UnknownTimeZoneError, AttributeError, ValueError):
+        return None
+
+
+def client_network(ip):
+    """
+    The network a client IP is grouped under for GeoIP lookups.
+
+    Returns:
+        The address of the IP's /24 (IPv4) or /48 (IPv6) network, or None
+    """
+    if not ip:
+        return None
+    if ':' not in ip:
+        return ip.rpartition('.')[0] + '.0'
+    try:
+        return str(ipaddress.ip_network(f'{ip}/48', strict=False).network_address)
+    except ValueError:
+        return None
+
+
+def is_private_ip(ip):
+    """Check if IP is private/local."""
+    try:
+        return ipaddress.ip_address(ip).is_private
+    except ValueError:
+        return True
+
+
+def timezone_from_language(accept_language):
+    """Timezone for the first language preference of an Accept-Language header."""
+    if accept_language:
+        primary_lang = accept_language.split(',')[0].strip()
+        return LANGUAGE_TIMEZONES.get(primary_lang)
+    return None
+
+
+def timezone_from_geoip(network):
+    """Timezone for the country of a network address."""
+    if not network or is_private_ip(network):
+        return None
+    reader = get_geoip_reader()
+    if reader is None:
+        return None
+    try:
+        return COUNTRY_TIMEZONES.get(reader.country_code(network))
+    except Exception as e:
+        logger.debug(f"GeoIP timezone detection failed: {e}")
+        return None
+
+
+@lru_cache(maxsize=RESOLUTION_CACHE_SIZE)
+def resolve_timezone(network, accept_language, header):
+    """
+    Timezone name for a request without a profile timezone.
+
+    Args:
+        network: Client network from client_network(), or None to skip GeoIP
+        accept_language: Accept-Language header
+        header: X-Timezone or X-User-Timezone header
+
+    Returns:
+        Timezone name (not validated), or None for the default
+    """
+    if header:
+        return header
+    return timezone_from_language(accept_language) or timezone_from_geoip(network)
+
+
+def invalidate_profile_timezone(user_id):
+    """Forget the cached profile timezone of a user."""
+    try:
+        cache.delete(f"{PROFILE_TIMEZONE_CACHE_PREFIX}:{user_id}")
+    except Exception as e:
+        logger.warning(f"Profile timezone cache invalidation failed: {e}")
+
+
+def _invalidate_on_profile_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or 'timezone' in update_fields:
+        invalidate_profile_timezone(instance.user_id)
+
+
+def _invalidate_on_profile_delete(sender, instance, **kwargs):
+    invalidate_profile_timezone(instance.user_id)
+
+
+# Connected here rather than in the profiles app: only processes that load
+# this middleware cache profile timezones
+post_save.connect(
+    _invalidate_on_profile_save, sender='profiles.UserProfileBasic',
+    dispatch_uid='profile_timezone_save')
+post_delete.connect(
+    _invalidate_on_profile_delete, sender='profiles.UserProfileBasic',
+    dispatch_uid='profile_timezone_delete')
+
 
 class TimezoneMiddleware(MiddlewareMixin):
     """
@@ -43,24 +384,19 @@ class TimezoneMiddleware(MiddlewareMixin):
         user_timezone = self._get_timezone_from_sources(request)
 
         if user_timezone:
-            try:
-                # Validate and activate the timezone
-                tz = pytz.timezone(user_timezone)
+            tz = load_timezone(user_timezone)
+            if tz is not None:
                 timezone.activate(tz)
 
                 # Store in request for later use
                 request.user_timezone = user_timezone
                 request.user_timezone_object = tz
+                return
 
-                logger.debug(
-                    f"Activated timezone: {user_timezone} for request")
+            logger.warning(
+                f"Invalid timezone '{user_timezone}' detected, using default")
 
-            except pytz.exceptions.UnknownTimeZoneError:
-                logger.warning(
-                    f"Invalid timezone '{user_timezone}' detected, using default")
-                self._use_default_timezone(request)
-        else:
-            self._use_default_timezone(request)
+        self._use_default_timezone(request)
 
     def process_response(self, request, response):
         """Clean up timezone activation after request."""
@@ -72,266 +408,70 @@ class TimezoneMiddleware(MiddlewareMixin):
         """Try to determine timezone from various sources in priority order."""
 
         # 1. User profile timezone (highest priority)
-        if hasattr(request, 'user') and request.user.is_authenticated:
-            user_tz = self._get_user_profile_timezone(request.user)
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            user_tz = self._get_user_profile_timezone(user)
             if user_tz:
                 return user_tz
 
-        # 2. X-Timezone header (explicit client setting)
-        header_tz = request.META.get('HTTP_X_TIMEZONE')
-        if header_tz:
-            return header_tz
+        # 2./3. X-Timezone or X-User-Timezone header (explicit client setting)
+        meta = request.META
+        header = meta.get('HTTP_X_TIMEZONE') or meta.get('HTTP_X_USER_TIMEZONE')
+        if header:
+            return resolve_timezone(None, '', header)
 
-        # 3. X-User-Timezone header (alternative)
-        alt_header_tz = request.META.get('HTTP_X_USER_TIMEZONE')
-        if alt_header_tz:
-            return alt_header_tz
+        # 4./5. Accept-Language header, then GeoIP (if enabled)
+        network = None
+        if getattr(settings, 'ENABLE_GEOIP_TIMEZONE', False) and getattr(settings, 'GEOIP_PATH', None):
+            network = client_network(self._get_client_ip(request))
+        return resolve_timezone(network, meta.get('HTTP_ACCEPT_LANGUAGE', ''), None)
 
-        # 4. Accept-Language header (country-based detection)
-        language_tz = self._get_timezone_from_language(request)
-        if language_tz:
-            return language_tz
-
-        # 5. GeoIP detection (if enabled and available)
-        if getattr(settings, 'ENABLE_GEOIP_TIMEZONE', False):
-            geoip_tz = self._get_timezone_from_geoip(request)
-            if geoip_tz:
-                return geoip_tz
+    def _get_user_profile_timezone(self, user):
+        """
+        Get timezone from user's profile if available.
 
-        # 6. Fall back to None (will use system default)
-        return None
+        The profile default (UTC) counts as not chosen. The result is kept
+        on the user object and in the cache, invalidated by profile saves.
+        """
+        try:
+            return user._profile_timezone or None
+        except AttributeError:
+            pass
 
-    def _get_user_profile_timezone(self, user):
-        """Get timezone from user's profile if available."""
+        key = f"{PROFILE_TIMEZONE_CACHE_PREFIX}:{user.pk}"
         try:
-            if hasattr(user, 'profile') and hasattr(user.profile, 'timezone'):
-                return user.profile.timezone
+            tz_name = cache.get(key)
         except Exception as e:
-            logger.warning(f"Error getting user timezone: {e}")
-        return None
+            logger.warning(f"Profile timezone cache read failed: {e}")
+            tz_name = None
+
+        if tz_name is None:
+            try:
+                tz_name = user.basic_profile.timezone or ''
+            except ObjectDoesNotExist:
+                tz_name = ''
+            except Exception as e:
+                logger.warning(f"Error getting user timezone: {e}")
+                return None
+            if tz_name == PROFILE_DEFAULT_TIMEZONE:
+                tz_name = ''
+            try:
+                cache.set(key, tz_name, PROFILE_TIMEZONE_CACHE_TIMEOUT)
+            except Exception as e:
+                logger.warning(f"Profile timezone cache write failed: {e}")
+
+        user._profile_timezone = tz_name
+        return tz_name or None
 
     def _get_timezone_from_language(self, request):
         """Extract timezone from Accept-Language header."""
-        accept_language = request.META.get('HTTP_ACCEPT_LANGUAGE', '')
-
-        # Common language to timezone mappings
-        language_timezone_map = {
-            # English variants
-            'en-US': 'America/New_York',
-            'en-GB': 'Europe/London',
-            'en-AU': 'Australia/Sydney',
-            'en-CA': 'America/Toronto',
-            'en-NZ': 'Pacific/Auckland',
-            'en-IE': 'Europe/Dublin',
-
-            # Spanish variants
-            'es-ES': 'Europe/Madrid',
-            'es-MX': 'America/Mexico_City',
-            'es-AR': 'America/Buenos_Aires',
-            'es-CL': 'America/Buenos_Aires',
-            'es-CO': 'America/Sao_Paulo',
-
-            # French variants
-            'fr-FR': 'Europe/Paris',
-            'fr-CA': 'America/Toronto',
-            'fr-BE': 'Europe/Amsterdam',
-            'fr-CH': 'Europe/Berlin',
-
-            # German variants
-            'de-DE': 'Europe/Berlin',
-            'de-AT': 'Europe/Berlin',
-            'de-CH': 'Europe/Berlin',
-
-            # Dutch variants
-            'nl-NL': 'Europe/Amsterdam',
-            'nl-BE': 'Europe/Amsterdam',  # Flemish
-
-            # Italian variants
-            'it-IT': 'Europe/Rome',
-            'it-CH': 'Europe/Berlin',
-
-            # Portuguese variants
-            'pt-BR': 'America/Sao_Paulo',
-            'pt-PT': 'Europe/Madrid',
-
-            # Nordic languages
-            'sv-SE': 'Europe/Stockholm',  # Swedish
-            'no-NO': 'Europe/Stockholm',  # Norwegian
-            'da-DK': 'Europe/Stockholm',  # Danish
-            'fi-FI': 'Europe/Stockholm',  # Finnish
-
-            # Other European languages
-            'ru-RU': 'Europe/Moscow',
-            'pl-PL': 'Europe/Berlin',
-            'cs-CZ': 'Europe/Berlin',     # Czech
-            'hu-HU': 'Europe/Berlin',     # Hungarian
-            'sk-SK': 'Europe/Berlin',     # Slovak
-            'sl-SI': 'Europe/Berlin',     # Slovenian
-            'hr-HR': 'Europe/Berlin',     # Croatian
-            'el-GR': 'Europe/Berlin',     # Greek (mapped to Central European)
-
-            # Asian languages
-            'ja-JP': 'Asia/Tokyo',
-            'ko-KR': 'Asia/Seoul',
-            'zh-CN': 'Asia/Shanghai',
-            'zh-TW': 'Asia/Taipei',
-            'zh-HK': 'Asia/Hong_Kong',
-            'hi-IN': 'Asia/Kolkata',
-            'th-TH': 'Asia/Bangkok',
-            'ar-SA': 'Asia/Dubai',
-            'ar-AE': 'Asia/Dubai',
-            'ar-EG': 'Africa/Cairo',
-        }
-
-        # Parse first language preference
-        if accept_language:
-            primary_lang = accept_language.split(',')[0].strip()
-            return language_timezone_map.get(primary_lang)
-
-        return None
+        return timezone_from_language(request.META.get('HTTP_ACCEPT_LANGUAGE', ''))
 
     def _get_timezone_from_geoip(self, request):
         """Get timezone based on client IP using GeoIP2 (optional)."""
-        try:
-            if not getattr(settings, 'GEOIP_PATH', None):
-                return None
-
-            client_ip = self._get_client_ip(request)
-            if not client_ip or self._is_private_ip(client_ip):
-                return None
-
-            g = GeoIP2()
-            country_code = g.country_code(client_ip)
-
-            # Map country codes to timezones (comprehensive mapping)
-            country_timezone_map = {
-                # North America
-                'US': 'America/New_York',        # United States (Eastern)
-                'CA': 'America/Toronto',         # Canada (Eastern)
-                'MX': 'America/Mexico_City',     # Mexico
-
-                # Europe
-                'GB': 'Europe/London',           # United Kingdom
-                'IE': 'Europe/Dublin',           # Ireland
-                'FR': 'Europe/Paris',            # France
-                'DE': 'Europe/Berlin',           # Germany
-                'NL': 'Europe/Amsterdam',        # Netherlands
-                # Belgium (same as Netherlands)
-                'BE': 'Europe/Amsterdam',
-                # Luxembourg (same as Netherlands)
-                'LU': 'Europe/Amsterdam',
-                'IT': 'Europe/Rome',             # Italy
-                'ES': 'Europe/Madrid',           # Spain
-                # Portugal (same timezone as Spain)
-                'PT': 'Europe/Madrid',
-                # Switzerland (same as Germany)
-                'CH': 'Europe/Berlin',
-                'AT': 'Europe/Berlin',           # Austria (same as Germany)
-                'SE': 'Europe/Stockholm',        # Sweden
-                'NO': 'Europe/Stockholm',        # Norway (same as Sweden)
-                'DK': 'Europe/Stockholm',        # Denmark (same as Sweden)
-                'FI': 'Europe/Stockholm',        # Finland (same as Sweden)
-                'IS': 'Europe/London',           # Iceland (same as UK)
-                'RU': 'Europe/Moscow',           # Russia (Moscow time)
-                'PL': 'Europe/Berlin',           # Poland (same as Germany)
-                # Czech Republic (same as Germany)
-                'CZ': 'Europe/Berlin',
-                'HU': 'Europe/Berlin',           # Hungary (same as Germany)
-                'SK': 'Europe/Berlin',           # Slovakia (same as Germany)
-                'SI': 'Europe/Berlin',           # Slovenia (same as Germany)
-                'HR': 'Europe/Berlin',           # Croatia (same as Germany)
-                # Greece (but fallback to Berlin if Athens not available)
-                'GR': 'Europe/Athens',
-                'BG': 'Europe/Berlin',           # Bulgaria (same as Germany)
-                'RO': 'Europe/Berlin',           # Romania (same as Germany)
-                'EE': 'Europe/Stockholm',        # Estonia (same as Sweden)
-                'LV': 'Europe/Stockholm',        # Latvia (same as Sweden)
-                'LT': 'Europe/Stockholm',        # Lithuania (same as Sweden)
-                'MT': 'Europe/Rome',             # Malta (same as Italy)
-                # Cyprus (closer to Middle East time)
-                'CY': 'Asia/Dubai',
-
-                # Asia Pacific
-                'JP': 'Asia/Tokyo',              # Japan
-                'KR': 'Asia/Seoul',              # South Korea
-                'CN': 'Asia/Shanghai',           # China
-                'HK': 'Asia/Hong_Kong',          # Hong Kong
-                'TW': 'Asia/Shanghai',           # Taiwan (same as China)
-                'SG': 'Asia/Singapore',          # Singapore
-                'MY': 'Asia/Singapore',          # Malaysia (same as Singapore)
-                'TH': 'Asia/Bangkok',            # Thailand
-                'VN': 'Asia/Bangkok',            # Vietnam (same as Thailand)
-                # Philippines (closer to China time)
-                'PH': 'Asia/Shanghai',
-                # Indonesia (main islands, same as Thailand)
-                'ID': 'Asia/Bangkok',
-                'IN': 'Asia/Kolkata',            # India
-                'PK': 'Asia/Kolkata',            # Pakistan (close to India)
-                'BD': 'Asia/Kolkata',            # Bangladesh (close to India)
-                'LK': 'Asia/Kolkata',            # Sri Lanka (same as India)
-                'AE': 'Asia/Dubai',              # United Arab Emirates
-                'SA': 'Asia/Dubai',              # Saudi Arabia (same as UAE)
-                'QA': 'Asia/Dubai',              # Qatar (same as UAE)
-                'KW': 'Asia/Dubai',              # Kuwait (same as UAE)
-                'BH': 'Asia/Dubai',              # Bahrain (same as UAE)
-                'OM': 'Asia/Dubai',              # Oman (same as UAE)
-                'JO': 'Asia/Dubai',              # Jordan (same as UAE)
-                'IL': 'Asia/Dubai',              # Israel (same as UAE)
-                'TR': 'Europe/Berlin',           # Turkey (same as Germany)
-                'IR': 'Asia/Dubai',              # Iran (close to UAE)
-                'IQ': 'Asia/Dubai',              # Iraq (same as UAE)
-                'AU': 'Australia/Sydney',        # Australia (Eastern)
-                'NZ': 'Pacific/Auckland',        # New Zealand
-
-                # Africa
-                'EG': 'Africa/Cairo',            # Egypt
-                'ZA': 'Africa/Johannesburg',     # South Africa
-                'NG': 'Africa/Cairo',            # Nigeria (same as Egypt)
-                'KE': 'Africa/Cairo',            # Kenya (same as Egypt)
-                'GH': 'Africa/Cairo',            # Ghana (same as Egypt)
-                'ET': 'Africa/Cairo',            # Ethiopia (same as Egypt)
-                'TZ': 'Africa/Cairo',            # Tanzania (same as Egypt)
-                'UG': 'Africa/Cairo',            # Uganda (same as Egypt)
-                'MA': 'Europe/London',           # Morocco (same as UK)
-                'DZ': 'Europe/Paris',            # Algeria (same as France)
-                'TN': 'Europe/Paris',            # Tunisia (same as France)
-                'LY': 'Africa/Cairo',            # Libya (same as Egypt)
-                'SD': 'Africa/Cairo',            # Sudan (same as Egypt)
-
-                # South America
-                'BR': 'America/Sao_Paulo',      # Brazil
-                'AR': 'America/Buenos_Aires',    # Argentina
-                'CL': 'America/Buenos_Aires',    # Chile (same as Argentina)
-                'CO': 'America/Sao_Paulo',      # Colombia (same as Brazil)
-                'PE': 'America/Sao_Paulo',      # Peru (same as Brazil)
-                'VE': 'America/Sao_Paulo',      # Venezuela (same as Brazil)
-                'EC': 'America/Sao_Paulo',      # Ecuador (same as Brazil)
-                'BO': 'America/Sao_Paulo',      # Bolivia (same as Brazil)
-                'UY': 'America/Buenos_Aires',    # Uruguay (same as Argentina)
-                'PY': 'America/Sao_Paulo',      # Paraguay (same as Brazil)
-
-                # Caribbean & Central America
-                'GT': 'America/Mexico_City',     # Guatemala (same as Mexico)
-                'BZ': 'America/Mexico_City',     # Belize (same as Mexico)
-                'SV': 'America/Mexico_City',     # El Salvador (same as Mexico)
-                'HN': 'America/Mexico_City',     # Honduras (same as Mexico)
-                'NI': 'America/Mexico_City',     # Nicaragua (same as Mexico)
-                'CR': 'America/Mexico_City',     # Costa Rica (same as Mexico)
-                'PA': 'America/Mexico_City',     # Panama (same as Mexico)
-                'JM': 'America/New_York',        # Jamaica (same as US Eastern)
-                'CU': 'America/New_York',        # Cuba (same as US Eastern)
-                # Dominican Republic (same as US Eastern)
-                'DO': 'America/New_York',
-                'HT': 'America/New_York',        # Haiti (same as US Eastern)
-                # Trinidad and Tobago (same as US Eastern)
-                'TT': 'America/New_York',
-            }
-
-            return country_timezone_map.get(country_code)
-
-        except (ImproperlyConfigured, Exception) as e:
-            logger.debug(f"GeoIP timezone detection failed: {e}")
+        if not getattr(settings, 'GEOIP_PATH', None):
             return None
+        return timezone_from_geoip(client_network(self._get_client_ip(request)))
 
     def _get_client_ip(self, request):
         """Get the real client IP address."""
@@ -344,22 +484,15 @@ class TimezoneMiddleware(MiddlewareMixin):
 
     def _is_private_ip(self, ip):
         """Check if IP is private/local."""
-        import ipaddress
-        try:
-            return ipaddress.ip_address(ip).is_private
-        except ValueError:
-            return True
+        return is_private_ip(ip)
 
     def _use_default_timezone(self, request):
         """Activate the default timezone."""
         default_tz = getattr(settings, 'TIME_ZONE', 'UTC')
-        try:
-            tz = pytz.timezone(default_tz)
-            timezone.activate(tz)
-            request.user_timezone = default_tz
-            request.user_timezone_object = tz
-        except pytz.exceptions.UnknownTimeZoneError:
+        tz = load_timezone(default_tz)
+        if tz is None:
             # Ultimate fallback to UTC
-            timezone.activate(pytz.UTC)
-            request.user_timezone = 'UTC'
-            request.user_timezone_object = pytz.UTC
+            default_tz, tz = 'UTC', pytz.UTC
+        timezone.activate(tz)
+        request.user_timezone = default_tz
+        request.user_timezone_object = tz
@@ -0,0 +1,82 @@
+"""
+Websocket authentication middleware for Vineyard Group Fellowship.
+
+Authenticates websocket connections with the same JWT access tokens used
+by the REST API, read like CookieJWTAuthentication does (in order):
+1. The Authorization header, for clients that can set handshake headers
+2. The access token cookie, which browsers send with the handshake
+
+Tokens in the query string are ignored: URLs end up in proxy and access
+logs.
+"""
+
+import logging
+
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http.cookie import parse_cookie
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from core.auth import CookieJWTAuthentication
+
+
+logger = logging.getLogger(__name__)
+
+
+class JWTAuthMiddleware(BaseMiddleware):
+    """
+    Populate scope['user'] from a JWT access token.
+
+    Connections without a valid token get an AnonymousUser; consumers
+    decide whether to refuse them.
+    """
+
+    def __init__(self, inner):
+        super().__init__(inner)
+        self.authentication = CookieJWTAuthentication()
+
+    async def __call__(self, scope, receive, send):
+        scope = dict(scope)
+        scope['user'] = await self.get_user(self.get_raw_token(scope))
+        return await super().__call__(scope, receive, send)
+
+    def get_raw_token(self, scope):
+        """Extract the raw token from the Authorization header or cookies."""
+        headers = dict(scope.get('headers', []))
+        if b'authorization' in headers:
+            try:
+                raw_token = self.authentication.get_raw_token(headers[b'authorization'])
+            except Exception as e:
+                logger.debug(f"Rejected websocket Authorization header: {e}")
+                raw_token = None
+            if raw_token:
+                return raw_token.decode()
+
+        if b'cookie' in headers:
+            cookie_settings = getattr(settings, 'JWT_COOKIE_SETTINGS', {})
+            cookie_name = cookie_settings.get(
+                'ACCESS_TOKEN_COOKIE_NAME', 'access_token')
+            return parse_cookie(headers[b'cookie'].decode()).get(cookie_name)
+
+        return None
+
+    @database_sync_to_async
+    def get_user(self, raw_token):
+        """Validate the token and load its user."""
+        if not raw_token:
+            return AnonymousUser()
+
+        try:
+            validated_token = self.authentication.get_validated_token(
+                raw_token.encode('utf-8'))
+            if self.authentication._is_token_blacklisted(validated_token):
+                return AnonymousUser()
+            return self.authentication.get_user(validated_token)
+        except (InvalidToken, TokenError) as e:
+            logger.debug(f"Rejected websocket token: {e}")
+            return AnonymousUser()
+        except Exception as e:
+            logger.warning(f"Websocket authentication failed: {e}")
+            return AnonymousUser()
@@ -13,7 +13,7 @@ import hashlib
 import logging
 import re
 import uuid
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Any
 from django.conf import settings
 from django.http import HttpRequest, HttpResponse
 from django.utils import timezone
@@ -22,6 +22,103 @@ from django.utils.deprecation import MiddlewareMixin
 logger = logging.getLogger(__name__)
 
 
+# PII scrubbed from response bodies. The patterns are combined into one
+# alternation and matched against the raw bytes, so a body is scanned once
+# without being decoded and re-encoded.
+PII_PATTERNS = (
+    # Email addresses
+    rb'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+    # Phone numbers (various formats)
+    rb'\b(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b',
+    # SSN (XXX-XX-XXXX format)
+    rb'\b\d{3}-\d{2}-\d{4}\b',
+    # Credit card numbers (basic pattern)
+    rb'\b(?:\d{4}[-.\s]?){3}\d{4}\b',
+    # IP addresses
+    rb'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b',
+    # Potential session tokens or API keys (long alphanumeric strings)
+    rb'\b[A-Za-z0-9]{20,}\b',
+)
+PII_REGEX = re.compile(b'|'.join(PII_PATTERNS))
+PII_REPLACEMENT = b'[REDACTED]'
+
+# Bytes none of the patterns can match. Streamed bodies are only split
+# right after one of these, so no match straddles two chunks.
+PII_BOUNDARY_BYTES = tuple(bytes([c]) for c in b'"\',:;=&/<>[]{}')
+
+# Longest tail held back while waiting for a boundary byte
+PII_STREAM_CARRY_LIMIT = 64 * 1024
+
+PII_SCRUBBED_CONTENT_TYPES = ('application/json', 'text/', 'application/xml')
+PII_SCRUBBED_CHARSETS = ('', 'utf-8', 'utf8', 'us-ascii', 'ascii')
+
+
+def scrub_pii(content: bytes) -> bytes:
+    """
+    Replace PII in a response body with [REDACTED].
+
+    Args:
+        content: UTF-8 or ASCII encoded body
+
+    Returns:
+        The scrubbed body
+    """
+    return PII_REGEX.sub(PII_REPLACEMENT, content)
+
+
+def scrub_pii_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Scrub PII from a streamed body chunk by chunk.
+
+    Each chunk is scrubbed up to its last boundary byte; the rest is
+    carried into the next chunk so values split across chunks are still
+    matched whole.
+
+    Args:
+        chunks: Body chunks as yielded by streaming_content
+
+    Yields:
+        Scrubbed chunks
+    """
+    carry = b''
+    for chunk in chunks:
+        buffer = carry + chunk if carry else chunk
+        cut = max(map(buffer.rfind, PII_BOUNDARY_BYTES)) + 1
+        if not cut:
+            if len(buffer) < PII_STREAM_CARRY_LIMIT:
+                carry = buffer
+                continue
+            cut = len(buffer)
+        carry = buffer[cut:]
+        yield scrub_pii(buffer[:cut])
+    if carry:
+        yield scrub_pii(carry)
+
+
+def pii_safe(view):
+    """
+    Mark a view whose responses never need PII scrubbing.
+
+    Use on views that only return data the user may see unredacted, or
+    binary-like payloads such as Base64 photos. Works on function views
+    and on view classes.
+    """
+    view.pii_safe = True
+    return view
+
+
+def _is_pii_safe_view(view_func) -> bool:
+    """Check a resolved view, or the class behind it, for @pii_safe."""
+    return any(
+        getattr(candidate, 'pii_safe', False)
+        for candidate in (
+            view_func,
+            getattr(view_func, 'view_class', None),
+            getattr(view_func, 'cls', None),
+        )
+    )
+
+
 class SecurityHeadersMiddleware(MiddlewareMixin):
     """
     Phase 6: Comprehensive security headers middleware.
@@ -37,9 +134,6 @@ class SecurityHeadersMiddleware(MiddlewareMixin):
         # Load security configuration
         self.security_config = self._load_security_config()
 
-        # PII patterns for scrubbing
-        self.pii_patterns = self._compile_pii_patterns()
-
         # CSP nonce cache
         self.nonce_cache = {}
 
@@ -66,6 +160,10 @@ class SecurityHeadersMiddleware(MiddlewareMixin):
         # Log security-sensitive requests
         self._log_security_request(request)
 
+    def process_view(self, request: HttpRequest, view_func, view_args, view_kwargs) -> None:
+        """Note whether the resolved view is marked @pii_safe."""
+        request.pii_safe = _is_pii_safe_view(view_func)
+
     def process_response(self, request: HttpRequest, response: HttpResponse) -> HttpResponse:
         """
         Add comprehensive security headers to response.
@@ -89,7 +187,7 @@ class SecurityHeadersMiddleware(MiddlewareMixin):
         # Scrub PII from response if needed (but exclude API documentation)
         if (self.security_config.get('scrub_pii', True) and
                 not self._is_api_documentation(request)):
-            self._scrub_response_pii(response)
+            self._scrub_response_pii(request, response)
 
         # Log security response
         self._log_security_response(request, response)
@@ -112,31 +210,6 @@ class SecurityHeadersMiddleware(MiddlewareMixin):
             'enable_csp_reporting': getattr(settings, 'CSP_ENABLE_REPORTING', True),
         }
 
-    def _compile_pii_patterns(self) -> List[re.Pattern]:
-        """Compile regex patterns for PII detection."""
-        patterns = [
-            # Email addresses
-            re.compile(
-                r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', re.IGNORECASE),
-
-            # Phone numbers (various formats)
-            re.compile(
-                r'\b(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b'),
-
-            # SSN (XXX-XX-XXXX format)
-            re.compile(r'\b\d{3}-\d{2}-\d{4}\b'),
-
-            # Credit card numbers (basic pattern)
-            re.compile(r'\b(?:\d{4}[-.\s]?){3}\d{4}\b'),
-
-            # IP addresses
-            re.compile(r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b'),
-
-            # Potential session tokens or API keys (long alphanumeric strings)
-            re.compile(r'\b[A-Za-z0-9]{20,}\b'),
-        ]
-        return patterns
-
     def _generate_csp_nonce(self) -> str:
         """Generate a cryptographically secure nonce for CSP."""
         nonce = hashlib.sha256(str(uuid.uuid4()).encode()).hexdigest()[:16]
@@ -371,25 +444,35 @@ class SecurityHeadersMiddleware(MiddlewareMixin):
         return (path in api_docs_base_paths or
                 any(request.path.startswith(base_path + '/') for base_path in api_docs_base_paths))
 
-    def _scrub_response_pii(self, response: HttpResponse) -> None:
-        """Scrub PII from response content."""
-        if not hasattr(response, 'content') or not response.content:
+    def _scrub_response_pii(self, request: HttpRequest, response: HttpResponse) -> None:
+        """Scrub PII from response content, streamed or not."""
+        if getattr(request, 'pii_safe', False) or getattr(response, 'pii_safe', False):
+            return
+
+        # Only scrub text-based responses in an ASCII-compatible encoding
+        content_type = response.get('Content-Type', '')
+        if not content_type.startswith(PII_SCRUBBED_CONTENT_TYPES):
+            return
+        charset = response.charset.lower() if 'charset=' in content_type else ''
+        if charset not in PII_SCRUBBED_CHARSETS:
             return
 
         try:
-            # Only scrub text-based responses
-            content_type = response.get('Content-Type', '')
-            if not content_type.startswith(('application/json', 'text/', 'application/xml')):
+            if response.streaming:
+                response.streaming_content = scrub_pii_stream(response.streaming_content)
+                if response.has_header('Content-Length'):
+                    del response['Content-Length']
                 return
 
-            content = response.content.decode('utf-8', errors='ignore')
-
-            # Apply PII patterns
-            for pattern in self.pii_patterns:
-                content = pattern.sub('[REDACTED]', content)
+            content = response.content
+            if not content:
+                return
 
-            # Update response content
-            response.content = content.encode('utf-8')
+            scrubbed = scrub_pii(content)
+            if scrubbed != content:
+                response.content = scrubbed
+                if response.has_header('Content-Length'):
+                    response['Content-Length'] = str(len(scrubbed))
 
         except Exception as e:
             logger.warning(f"Error scrubbing PII from response: {e}")
@@ -0,0 +1,76 @@
+"""
+Tests for bounded background pools.
+
+Covers:
+- Jobs run on the pool's threads and stop() waits for them
+- A full pool, or one without workers, runs jobs inline
+- A failing job does not take its slot with it
+"""
+
+import threading
+
+from django.test import SimpleTestCase
+
+from core.background import BackgroundPool
+
+
+class BackgroundPoolTest(SimpleTestCase):
+    """Test jobs are queued up to capacity."""
+
+    def setUp(self):
+        """Set up a gate that holds jobs on the pool's threads."""
+        self.gate = threading.Event()
+        self.ran = []
+
+    def job(self, number):
+        if threading.current_thread().name.startswith('test-pool'):
+            self.gate.wait(5)
+        self.ran.append((number, threading.current_thread().name))
+
+    def test_jobs_run_on_pool_threads(self):
+        """Test submitted jobs run in the background and stop() waits for them."""
+        pool = BackgroundPool('test-pool', workers=2, capacity=10)
+        self.gate.set()
+
+        results = [pool.submit(self.job, number) for number in range(5)]
+        pool.stop()
+
+        self.assertEqual(results, [True] * 5)
+        self.assertEqual(sorted(number for number, _ in self.ran), list(range(5)))
+        self.assertTrue(all(name.startswith('test-pool') for _, name in self.ran))
+
+    def test_full_pool_runs_inline(self):
+        """Test jobs beyond the workers and capacity run in the caller."""
+        pool = BackgroundPool('test-pool', workers=1, capacity=2)
+        try:
+            results = [pool.submit(self.job, number) for number in range(4)]
+            inline = list(self.ran)
+        finally:
+            self.gate.set()
+            pool.stop()
+
+        self.assertEqual(results, [True, True, True, False])
+        self.assertEqual(inline, [(3, threading.current_thread().name)])
+        self.assertEqual(len(self.ran), 4)
+
+    def test_no_workers_runs_inline(self):
+        """Test a pool without workers runs every job before submit returns."""
+        pool = BackgroundPool('test-pool', workers=0)
+
+        self.assertFalse(pool.submit(self.job, 1))
+        self.assertEqual(self.ran, [(1, threading.current_thread().name)])
+
+    def test_failed_job_releases_its_slot(self):
+        """Test an exception in a job is logged and frees room for the next."""
+        pool = BackgroundPool('test-pool', workers=1, capacity=0)
+        self.gate.set()
+
+        def fail():
+            raise ValueError('broken')
+
+        with self.assertLogs('core.background', 'ERROR'):
+            pool.submit(fail)
+            pool.stop()
+        pool = BackgroundPool('test-pool', workers=1, capacity=0)
+        self.assertTrue(pool.submit(self.job, 1))
+        pool.stop()
@@ -0,0 +1,61 @@
+"""
+Tests for keyset-chunked bulk deletes and updates.
+"""
+
+import time
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from authentication.models import AuditLog
+from core.batching import run_in_batches
+
+
+class RunInBatchesTest(TestCase):
+    """Test batched deletes and updates."""
+
+    def setUp(self):
+        """Set up test data."""
+        AuditLog.objects.bulk_create([
+            AuditLog(event_type='token_refresh', success=True, user_agent='agent')
+            for _ in range(7)
+        ])
+
+    def test_delete_in_batches(self):
+        """Test rows are deleted a batch per statement."""
+        with CaptureQueriesContext(connection) as queries:
+            deleted, finished = run_in_batches(
+                AuditLog.objects.all(), batch_size=3, pause=0)
+
+        self.assertEqual((deleted, finished), (7, True))
+        self.assertFalse(AuditLog.objects.exists())
+        deletes = [q for q in queries if q['sql'].startswith('DELETE')]
+        self.assertEqual(len(deletes), 3)
+
+    def test_update_in_batches(self):
+        """Test only matching rows are updated."""
+        updated, finished = run_in_batches(
+            AuditLog.objects.exclude(user_agent=''), {'user_agent': ''},
+            batch_size=2, pause=0)
+
+        self.assertEqual((updated, finished), (7, True))
+        self.assertFalse(AuditLog.objects.exclude(user_agent='').exists())
+
+    def test_deadline_stops_and_resumes(self):
+        """Test a run cut off by its deadline can be run again."""
+        calls = []
+
+        def record_batch(pks):
+            calls.append(pks)
+
+        deleted, finished = run_in_batches(
+            AuditLog.objects.all(), batch_size=3, pause=0,
+            deadline=time.monotonic() - 1)
+        self.assertEqual((deleted, finished), (0, False))
+
+        deleted, finished = run_in_batches(
+            AuditLog.objects.all(), batch_size=3, pause=0,
+            before_batch=record_batch)
+        self.assertEqual((deleted, finished), (7, True))
+        self.assertEqual([len(pks) for pks in calls], [3, 3, 1])
@@ -0,0 +1,195 @@
+"""
+Tests for the shared circuit breaker.
+"""
+
+from unittest.mock import patch
+
+import requests
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core import circuit_breaker
+from core.circuit_breaker import (
+    CircuitBreakerOpen,
+    SharedCircuitBreaker,
+    get_circuit_breaker,
+    get_circuit_breaker_states,
+    raise_for_server_error,
+)
+
+User = get_user_model()
+
+
+def fail():
+    raise ConnectionError('provider down')
+
+
+def make_response(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = 'https://provider.test/'
+    return response
+
+
+class SharedCircuitBreakerTest(TestCase):
+    """Test breaker state shared between breaker instances."""
+
+    def setUp(self):
+        """Set up test."""
+        cache.clear()
+        # Two instances stand in for two worker processes
+        self.worker1 = SharedCircuitBreaker(
+            'provider', failure_threshold=2, recovery_timeout=60)
+        self.worker2 = SharedCircuitBreaker(
+            'provider', failure_threshold=2, recovery_timeout=60)
+
+    def open_circuit(self):
+        for breaker in (self.worker1, self.worker2):
+            with self.assertRaises(ConnectionError):
+                breaker.call(fail)
+
+    def expire_open_period(self):
+        cache.delete(self.worker1.open_key)
+
+    def test_failures_counted_across_workers(self):
+        """Test failures in different workers open the circuit for all."""
+        self.open_circuit()
+
+        self.assertEqual(self.worker1.state, SharedCircuitBreaker.OPEN)
+        with self.assertRaises(CircuitBreakerOpen):
+            self.worker2.call(lambda: 'ok')
+
+    def test_success_resets_failure_count(self):
+        """Test a success in any worker clears earlier failures."""
+        with self.assertRaises(ConnectionError):
+            self.worker1.call(fail)
+
+        self.worker2.call(lambda: 'ok')
+
+        self.assertEqual(self.worker1.failure_count, 0)
+
+    def test_unexpected_exceptions_are_not_failures(self):
+        """Test only expected exceptions count against the provider."""
+        breaker = SharedCircuitBreaker(
+            'provider', failure_threshold=1,
+            expected_exceptions=(ConnectionError,))
+
+        with self.assertRaises(ValueError):
+            breaker.call(lambda: int('not a number'))
+
+        self.assertEqual(breaker.state, SharedCircuitBreaker.CLOSED)
+
+    def test_client_errors_are_not_failures(self):
+        """Test 4xx responses pass through the breaker and 5xx ones count."""
+        breaker = SharedCircuitBreaker('provider', failure_threshold=1)
+
+        def request(status_code):
+            response = make_response(status_code)
+            raise_for_server_error(response)
+            return response
+
+        self.assertEqual(breaker.call(request, 404).status_code, 404)
+        self.assertEqual(breaker.state, SharedCircuitBreaker.CLOSED)
+
+        with self.assertRaises(requests.HTTPError):
+            breaker.call(request, 503)
+        self.assertEqual(breaker.state, SharedCircuitBreaker.OPEN)
+
+    def test_registered_breaker_rejects_other_options(self):
+        """Test options that differ from the registered breaker's raise."""
+        self.addCleanup(circuit_breaker._breakers.pop, 'registered', None)
+        breaker = get_circuit_breaker(
+            'registered', expected_exceptions=(ConnectionError,))
+
+        self.assertIs(get_circuit_breaker('registered'), breaker)
+        self.assertIs(get_circuit_breaker(
+            'registered', expected_exceptions=(ConnectionError,)), breaker)
+        with self.assertRaises(ValueError):
+            get_circuit_breaker('registered', failure_threshold=1)
+
+    def test_single_probe_elected_when_half_open(self):
+        """Test only one worker probes after the open period expires."""
+        self.open_circuit()
+        self.expire_open_period()
+        self.assertEqual(self.worker1.state, SharedCircuitBreaker.HALF_OPEN)
+
+        def probe():
+            # While the probe is in flight, other workers fail fast
+            with self.assertRaises(CircuitBreakerOpen):
+                self.worker2.call(lambda: 'ok')
+            return 'recovered'
+
+        self.assertEqual(self.worker1.call(probe), 'recovered')
+        self.assertEqual(self.worker2.state, SharedCircuitBreaker.CLOSED)
+        self.assertEqual(self.worker2.call(lambda: 'ok'), 'ok')
+
+    def test_failed_probe_reopens_circuit(self):
+        """Test a failed probe opens the circuit again."""
+        self.open_circuit()
+        self.expire_open_period()
+
+        with self.assertRaises(ConnectionError):
+            self.worker2.call(fail)
+
+        self.assertEqual(self.worker1.state, SharedCircuitBreaker.OPEN)
+        self.assertFalse(self.worker1.get_status()['probe_in_flight'])
+
+    def test_cache_outage_fails_open(self):
+        """Test calls go through when the cache is unavailable."""
+        with patch('core.circuit_breaker.cache.get_many',
+                   side_effect=ConnectionError('redis down')):
+            self.assertEqual(self.worker1.call(lambda: 'ok'), 'ok')
+
+    def test_states_include_known_providers(self):
+        """Test monitoring lists every configured provider."""
+        names = [state['name'] for state in get_circuit_breaker_states()]
+
+        for name in ['bible_api', 'email', 'nominatim', 'pwned_passwords']:
+            self.assertIn(name, names)
+
+
+class CircuitBreakerMonitoringTest(TestCase):
+    """Test the circuit breaker monitoring endpoint."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            username='admin',
+            email='admin@test.com',
+            password='testpass123',
+            is_staff=True
+        )
+        self.url = reverse('monitoring:circuit-breaker-metrics')
+
+    def test_reports_open_breakers(self):
+        """Test open breakers are reported to admins."""
+        breaker = SharedCircuitBreaker('email', failure_threshold=1)
+        with self.assertRaises(ConnectionError):
+            breaker.call(fail)
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['open_count'], 1)
+        states = {b['name']: b for b in response.data['breakers']}
+        self.assertEqual(states['email']['state'], 'open')
+        self.assertEqual(states['bible_api']['state'], 'closed')
+
+    def test_requires_admin(self):
+        """Test regular users cannot read breaker state."""
+        user = User.objects.create_user(
+            username='member',
+            email='member@test.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 403)
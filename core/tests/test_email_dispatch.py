@@ -0,0 +1,230 @@
+"""
+Tests for background email dispatch.
+
+Covers:
+- A burst is sent by the fixed worker pool over reused connections
+- Transient failures are retried, permanent ones (including 4xx API
+  rejections) are not
+- Messages hitting an open circuit breaker are deferred, not dropped
+- Callable jobs do not open a worker connection
+- A full queue sends inline, and stop() sends what is queued
+"""
+
+import smtplib
+import threading
+from unittest import mock
+
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.mail.backends.base import BaseEmailBackend
+from django.test import SimpleTestCase, override_settings
+
+from core.circuit_breaker import CircuitBreakerOpen
+from core.email_dispatch import EmailDispatcher, send_email
+
+BACKEND = 'core.tests.test_email_dispatch.RecordingBackend'
+
+
+class RecordingBackend(BaseEmailBackend):
+    """Records sends and opened connections; failures are queued per test."""
+
+    lock = threading.Lock()
+    sent = []
+    opened = 0
+    failures = []
+    # Holds sends from the worker threads while cleared
+    gate = threading.Event()
+    entered = threading.Event()
+
+    def open(self):
+        with self.lock:
+            RecordingBackend.opened += 1
+        return True
+
+    def send_messages(self, email_messages):
+        if threading.current_thread().name.startswith('email-dispatch'):
+            self.entered.set()
+            self.gate.wait(5)
+        with self.lock:
+            if self.failures:
+                raise self.failures.pop(0)
+            self.sent.extend(message.to[0] for message in email_messages)
+        return len(email_messages)
+
+    @classmethod
+    def reset(cls):
+        cls.sent = []
+        cls.opened = 0
+        cls.failures = []
+        cls.gate.set()
+        cls.entered.clear()
+
+
+class APIError(Exception):
+    """An HTTP backend error carrying the response status."""
+
+    def __init__(self, status_code):
+        super().__init__(f'status {status_code}')
+        self.status_code = status_code
+
+
+def make_message(number):
+    return EmailMessage('Verify', 'body', 'from@example.com', [f'user{number}@example.com'])
+
+
+class EmailDispatcherTest(SimpleTestCase):
+    """Test delivery from the worker pool."""
+
+    def setUp(self):
+        """Set up a dispatcher with two workers and no retry delay."""
+        RecordingBackend.reset()
+        self.dispatcher = EmailDispatcher(
+            workers=2, capacity=50, batch_size=10, retry_backoff=0, backend=BACKEND)
+
+    def tearDown(self):
+        """Stop the workers."""
+        RecordingBackend.gate.set()
+        self.dispatcher.stop()
+
+    def test_burst_uses_fixed_workers_and_reused_connections(self):
+        """Test a burst of sends neither adds threads nor opens a connection per email."""
+        threads_before = threading.active_count()
+
+        for number in range(40):
+            self.assertTrue(self.dispatcher.send(make_message(number)))
+        self.dispatcher.flush()
+
+        self.assertLessEqual(threading.active_count() - threads_before, 2)
+        self.assertEqual(len(RecordingBackend.sent), 40)
+        self.assertLessEqual(RecordingBackend.opened, 2)
+        stats = self.dispatcher.stats()
+        self.assertEqual((stats['sent'], stats['failed'], stats['queued']), (40, 0, 0))
+
+    def test_transient_failure_is_retried(self):
+        """Test a failed send is retried on a new connection."""
+        RecordingBackend.failures = [smtplib.SMTPServerDisconnected('gone')]
+
+        self.dispatcher.send(make_message(1))
+        self.dispatcher.flush()
+
+        self.assertEqual(RecordingBackend.sent, ['user1@example.com'])
+        self.assertEqual(RecordingBackend.opened, 2)
+        self.assertEqual(self.dispatcher.stats()['retried'], 1)
+
+    def test_permanent_failure_is_not_retried(self):
+        """Test refused recipients fail without retries."""
+        RecordingBackend.failures = [smtplib.SMTPRecipientsRefused({})]
+
+        self.dispatcher.send(make_message(1))
+        self.dispatcher.send(make_message(2))
+        self.dispatcher.flush()
+
+        stats = self.dispatcher.stats()
+        self.assertEqual((stats['sent'], stats['failed'], stats['retried']), (1, 1, 0))
+
+    def test_client_error_status_is_not_retried(self):
+        """Test a 4xx rejection from an HTTP backend fails without retries."""
+        RecordingBackend.failures = [APIError(400)]
+
+        self.dispatcher.send(make_message(1))
+        self.dispatcher.flush()
+
+        stats = self.dispatcher.stats()
+        self.assertEqual((stats['sent'], stats['failed'], stats['retried']), (0, 1, 0))
+
+    def test_rate_limit_status_is_retried(self):
+        """Test a 429 from an HTTP backend is retried like other transient errors."""
+        RecordingBackend.failures = [APIError(429)]
+
+        self.dispatcher.send(make_message(1))
+        self.dispatcher.flush()
+
+        self.assertEqual(RecordingBackend.sent, ['user1@example.com'])
+        self.assertEqual(self.dispatcher.stats()['retried'], 1)
+
+    @mock.patch.object(EmailDispatcher, '_breaker_delay', return_value=0.05)
+    def test_open_breaker_defers_message(self, breaker_delay):
+        """Test a message rejected by the open breaker is sent once it closes."""
+        RecordingBackend.failures = [CircuitBreakerOpen('email')]
+
+        self.dispatcher.send(make_message(1))
+        self.dispatcher.flush()
+
+        self.assertEqual(RecordingBackend.sent, ['user1@example.com'])
+        stats = self.dispatcher.stats()
+        self.assertEqual((stats['sent'], stats['failed'], stats['deferred']), (1, 0, 1))
+
+    @mock.patch.object(EmailDispatcher, '_breaker_delay', return_value=0)
+    def test_breaker_deferrals_are_bounded(self, breaker_delay):
+        """Test a message is dropped after max_retries deferrals."""
+        RecordingBackend.failures = [CircuitBreakerOpen('email')] * 4
+
+        self.dispatcher.send(make_message(1))
+        self.dispatcher.flush()
+
+        stats = self.dispatcher.stats()
+        self.assertEqual((stats['sent'], stats['failed'], stats['deferred']), (0, 1, 3))
+
+    @mock.patch.object(EmailDispatcher, '_breaker_delay', return_value=60)
+    def test_stop_retries_deferred_messages(self, breaker_delay):
+        """Test stop() gives deferred messages a last attempt."""
+        RecordingBackend.failures = [CircuitBreakerOpen('email')]
+        self.dispatcher.send(make_message(1))
+        while not self.dispatcher.stats()['deferred']:
+            threading.Event().wait(0.01)
+
+        self.dispatcher.stop()
+
+        self.assertEqual(RecordingBackend.sent, ['user1@example.com'])
+
+    def test_callable_job_does_not_open_connection(self):
+        """Test functions that send email themselves run without a worker connection."""
+        called = threading.Event()
+
+        self.dispatcher.call(called.set)
+        self.dispatcher.flush()
+
+        self.assertTrue(called.is_set())
+        self.assertEqual(RecordingBackend.opened, 0)
+
+    def test_full_queue_sends_inline(self):
+        """Test messages beyond capacity are sent by the caller."""
+        dispatcher = EmailDispatcher(workers=1, capacity=2, backend=BACKEND)
+        RecordingBackend.gate.clear()
+        try:
+            results = [dispatcher.send(make_message(0))]
+            RecordingBackend.entered.wait(5)
+            # The worker is busy with the first message and two fill the queue
+            results += [dispatcher.send(make_message(number)) for number in range(1, 4)]
+        finally:
+            RecordingBackend.gate.set()
+            dispatcher.stop()
+
+        self.assertEqual(results, [True, True, True, False])
+        self.assertEqual(dispatcher.stats()['sent_inline'], 1)
+        self.assertEqual(RecordingBackend.sent[0], 'user3@example.com')
+        self.assertEqual(len(RecordingBackend.sent), 4)
+
+    def test_stop_sends_queued_messages(self):
+        """Test queued messages are sent before the workers end."""
+        RecordingBackend.gate.clear()
+        for number in range(10):
+            self.dispatcher.send(make_message(number))
+        RecordingBackend.gate.set()
+
+        self.dispatcher.stop()
+
+        self.assertEqual(len(RecordingBackend.sent), 10)
+        self.assertEqual(self.dispatcher.stats()['workers'], 0)
+
+
+@override_settings(
+    EMAIL_DISPATCH_ASYNC=False,
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class SendEmailInlineTest(SimpleTestCase):
+    """Test synchronous sending."""
+
+    def test_send_email_inline(self):
+        """Test messages are sent before send_email returns when async is off."""
+        self.assertFalse(send_email(make_message(1)))
+        self.assertEqual(mail.outbox[0].to, ['user1@example.com'])
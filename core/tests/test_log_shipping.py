@@ -0,0 +1,129 @@
+"""
+Tests for asynchronous log shipping.
+
+Covers:
+- The bounded queue drops its oldest records and counts them
+- Records reach the original handlers, a batch per write
+- Logging does not wait for a blocked sink
+- The handler's filters see the original msg and args
+"""
+
+import io
+import logging
+import threading
+
+from django.test import SimpleTestCase
+
+from core.logging.shipping import DropOldestQueue, LogShipper, QueuedHandler
+from core.logging.structured import SensitiveDataFilter
+
+
+class CountingStream(io.StringIO):
+    """A stream that counts writes and can be made to block."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+        self.open = threading.Event()
+        self.open.set()
+
+    def write(self, text):
+        self.open.wait(5)
+        self.writes += 1
+        return super().write(text)
+
+
+class DropOldestQueueTest(SimpleTestCase):
+    """Test the bounded queue."""
+
+    def test_full_queue_drops_oldest(self):
+        """Test new items replace the oldest ones."""
+        log_queue = DropOldestQueue(3)
+
+        for item in range(5):
+            log_queue.offer(item)
+
+        self.assertEqual(log_queue.take(10), [2, 3, 4])
+        self.assertEqual(log_queue.dropped, 2)
+
+
+class LogShipperTest(SimpleTestCase):
+    """Test records are written from the shipper thread."""
+
+    def setUp(self):
+        """Set up a logger with a stream handler behind a shipper."""
+        self.stream = CountingStream()
+        self.handler = logging.StreamHandler(self.stream)
+        self.handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+
+        self.logger = logging.getLogger('shipping.test')
+        self.logger.handlers = [self.handler]
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+
+        self.shipper = LogShipper(capacity=100, batch_size=50)
+        self.shipper.attach([self.logger])
+        self.shipper.start()
+
+    def tearDown(self):
+        """Stop the shipper and detach the test logger."""
+        self.stream.open.set()
+        self.shipper.stop()
+        self.logger.handlers = []
+
+    def test_handlers_are_replaced(self):
+        """Test the logger's handler is swapped for a queued stand-in."""
+        (stand_in,) = self.logger.handlers
+
+        self.assertIsInstance(stand_in, QueuedHandler)
+        self.assertIs(stand_in.target, self.handler)
+
+    def test_records_are_written_in_batches(self):
+        """Test queued records are written in order with one write per batch."""
+        self.stream.open.clear()
+        self.logger.info('first')
+        for number in range(20):
+            self.logger.info('record %s', number)
+        self.stream.open.set()
+
+        self.shipper.flush()
+
+        lines = self.stream.getvalue().splitlines()
+        self.assertEqual(lines, ['INFO first'] + [f'INFO record {n}' for n in range(20)])
+        self.assertLessEqual(self.stream.writes, 2)
+
+    def test_args_are_snapshotted(self):
+        """Test later changes to mutable args do not alter the record."""
+        payload = {'state': 'before'}
+        self.stream.open.clear()
+
+        self.logger.info('payload %s', payload)
+        payload['state'] = 'after'
+        self.stream.open.set()
+        self.shipper.flush()
+
+        self.assertIn("'before'", self.stream.getvalue())
+
+    def test_logging_does_not_wait_for_sink(self):
+        """Test a blocked sink neither blocks logging nor grows the queue unbounded."""
+        self.stream.open.clear()
+
+        for number in range(500):
+            self.logger.info('record %s', number)
+
+        self.assertLessEqual(self.shipper.queue.qsize(), 100)
+        self.assertGreater(self.shipper.dropped, 0)
+        self.stream.open.set()
+        self.shipper.flush()
+        self.assertIn('INFO record 499', self.stream.getvalue())
+
+    def test_sensitive_args_are_filtered(self):
+        """Test dict args are redacted by the handler's filter before merging."""
+        self.handler.addFilter(SensitiveDataFilter())
+
+        self.logger.info('payload %s', {'password': 'hunter2', 'state': 'ok'})
+        self.shipper.flush()
+
+        output = self.stream.getvalue()
+        self.assertNotIn('hunter2', output)
+        self.assertIn("'password': '[FILTERED]'", output)
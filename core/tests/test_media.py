@@ -0,0 +1,118 @@
+"""
+Tests for production media serving.
+
+Covers:
+- Streaming with ETag/Last-Modified and 304 revalidation
+- Byte ranges
+- Immutable caching of content-hashed names
+- Hand-off to a front proxy
+"""
+
+import os
+import shutil
+import tempfile
+
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.middleware.media import IMMUTABLE_CACHE_CONTROL, ProductionMediaMiddleware
+
+CONTENT = bytes(range(256)) * 40
+
+
+class ProductionMediaMiddlewareTest(SimpleTestCase):
+    """Test media files are served efficiently and revalidated cheaply."""
+
+    def setUp(self):
+        """Set up test."""
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(
+            MEDIA_ROOT=self.media_root, MEDIA_URL='/media/',
+            SERVE_MEDIA_IN_PRODUCTION=True)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        os.makedirs(os.path.join(self.media_root, 'avatars'))
+        for name in ('avatars/member.png', 'avatars/member.3f2a9c1b7e4d.png'):
+            with open(os.path.join(self.media_root, name), 'wb') as f:
+                f.write(CONTENT)
+
+        self.factory = RequestFactory()
+        self.middleware = ProductionMediaMiddleware(lambda request: None)
+
+    def get(self, path, **headers):
+        response = self.middleware.process_request(self.factory.get(path, **headers))
+        self.addCleanup(response.close)
+        return response
+
+    def test_file_is_streamed_with_validators(self):
+        """Test the full file is streamed with ETag and Last-Modified."""
+        response = self.get('/media/avatars/member.png')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(b''.join(response.streaming_content), CONTENT)
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertEqual(int(response['Content-Length']), len(CONTENT))
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+        self.assertNotIn('immutable', response['Cache-Control'])
+
+    def test_conditional_requests_get_304(self):
+        """Test If-None-Match and If-Modified-Since revalidate without a body."""
+        first = self.get('/media/avatars/member.png')
+
+        by_etag = self.get('/media/avatars/member.png', HTTP_IF_NONE_MATCH=first['ETag'])
+        by_date = self.get(
+            '/media/avatars/member.png', HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+
+        for response in (by_etag, by_date):
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.content, b'')
+            self.assertEqual(response['ETag'], first['ETag'])
+
+    def test_byte_ranges(self):
+        """Test single ranges get 206 and out-of-range requests 416."""
+        response = self.get('/media/avatars/member.png', HTTP_RANGE='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), CONTENT[100:200])
+        self.assertEqual(response['Content-Range'], f'bytes 100-199/{len(CONTENT)}')
+        self.assertEqual(int(response['Content-Length']), 100)
+
+        suffix = self.get('/media/avatars/member.png', HTTP_RANGE='bytes=-10')
+        self.assertEqual(b''.join(suffix.streaming_content), CONTENT[-10:])
+
+        stale = self.get(
+            '/media/avatars/member.png', HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(stale.status_code, 200)
+
+        beyond = self.get('/media/avatars/member.png', HTTP_RANGE=f'bytes={len(CONTENT)}-')
+        self.assertEqual(beyond.status_code, 416)
+        self.assertEqual(beyond['Content-Range'], f'bytes */{len(CONTENT)}')
+
+    def test_hashed_names_are_immutable(self):
+        """Test content-hashed names are cached for a year."""
+        response = self.get('/media/avatars/member.3f2a9c1b7e4d.png')
+
+        self.assertEqual(response['Cache-Control'], IMMUTABLE_CACHE_CONTROL)
+
+    def test_front_proxy_hand_off(self):
+        """Test X-Accel-Redirect and X-Sendfile responses carry no body."""
+        with override_settings(MEDIA_SENDFILE_HEADER='X-Accel-Redirect'):
+            accel = self.get('/media/avatars/member.png')
+        with override_settings(MEDIA_SENDFILE_HEADER='X-Sendfile'):
+            sendfile = self.get('/media/avatars/member.png')
+
+        self.assertEqual(accel['X-Accel-Redirect'], '/protected-media/avatars/member.png')
+        self.assertEqual(
+            sendfile['X-Sendfile'], os.path.join(self.media_root, 'avatars/member.png'))
+        for response in (accel, sendfile):
+            self.assertEqual(response.content, b'')
+            self.assertIn('ETag', response)
+
+    def test_missing_and_unsafe_paths_404(self):
+        """Test missing files, directories and traversal attempts are rejected."""
+        for path in ('/media/avatars/missing.png', '/media/avatars', '/media/../secret'):
+            with self.assertRaises(Http404):
+                self.middleware.process_request(self.factory.get(path))
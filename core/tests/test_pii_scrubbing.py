@@ -0,0 +1,141 @@
+"""
+Tests for response PII scrubbing in the security headers middleware.
+
+Covers:
+- The combined byte pattern redacts what the separate patterns did
+- Streamed bodies give the same output however they are chunked
+- Views marked @pii_safe and non-text responses are left alone
+"""
+
+import json
+import re
+
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from core.security.headers import (
+    SecurityHeadersMiddleware,
+    pii_safe,
+    scrub_pii,
+    scrub_pii_stream,
+)
+
+# The six patterns the middleware used to run one after another
+LEGACY_PATTERNS = [
+    re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', re.IGNORECASE),
+    re.compile(r'\b(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b'),
+    re.compile(r'\b\d{3}-\d{2}-\d{4}\b'),
+    re.compile(r'\b(?:\d{4}[-.\s]?){3}\d{4}\b'),
+    re.compile(r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b'),
+    re.compile(r'\b[A-Za-z0-9]{20,}\b'),
+]
+
+
+def legacy_scrub(content: bytes) -> bytes:
+    text = content.decode('utf-8')
+    for pattern in LEGACY_PATTERNS:
+        text = pattern.sub('[REDACTED]', text)
+    return text.encode('utf-8')
+
+
+def sample_body() -> bytes:
+    return json.dumps({
+        'results': [
+            {
+                'id': i,
+                'email': f'member{i}@example.org',
+                'phone': '+1 555-123-4567',
+                'ssn': '123-45-6789',
+                'card': '4111 1111 1111 1111',
+                'last_ip': f'10.0.{i}.1',
+                'token': 'abcDEF0123456789ghijKLMNOP',
+                'bio': f'Reach me at Friend.{i}@Example.COM or (555) 987-6543, café 🙂',
+                'photo': 'data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAAB',
+            }
+            for i in range(20)
+        ]
+    }, ensure_ascii=False).encode('utf-8')
+
+
+class ScrubPiiTest(SimpleTestCase):
+    """Test the byte scrubber against the legacy per-pattern passes."""
+
+    def test_matches_legacy_output(self):
+        """Test the single pass redacts exactly what the six passes did."""
+        body = sample_body()
+
+        scrubbed = scrub_pii(body)
+
+        self.assertEqual(scrubbed, legacy_scrub(body))
+        self.assertNotIn(b'@example.org', scrubbed)
+        self.assertNotIn(b'555-123-4567', scrubbed)
+        self.assertIn('café 🙂'.encode('utf-8'), scrubbed)
+
+    def test_stream_matches_whole_body(self):
+        """Test chunk boundaries never split or hide a match."""
+        body = sample_body()
+        expected = scrub_pii(body)
+
+        for size in (1, 7, 64, 1000):
+            chunks = [body[i:i + size] for i in range(0, len(body), size)]
+            self.assertEqual(b''.join(scrub_pii_stream(chunks)), expected)
+
+
+class ScrubResponseMiddlewareTest(SimpleTestCase):
+    """Test which responses the middleware scrubs."""
+
+    def setUp(self):
+        """Set up test."""
+        self.factory = RequestFactory()
+        self.middleware = SecurityHeadersMiddleware(lambda request: None)
+
+    def process(self, response, view=None):
+        request = self.factory.get('/api/v1/groups/')
+        self.middleware.process_request(request)
+        if view is not None:
+            self.middleware.process_view(request, view, (), {})
+        return self.middleware.process_response(request, response)
+
+    def test_json_response_is_scrubbed(self):
+        """Test JSON bodies are redacted and Content-Length kept in sync."""
+        response = JsonResponse({'email': 'someone@example.com'})
+        response['Content-Length'] = len(response.content)
+
+        response = self.process(response)
+
+        self.assertEqual(json.loads(response.content), {'email': '[REDACTED]'})
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+
+    def test_streaming_response_is_scrubbed(self):
+        """Test streamed bodies are scrubbed as they are sent."""
+        response = StreamingHttpResponse(
+            iter([b'{"email": "some', b'one@example.com"}']),
+            content_type='application/json')
+
+        response = self.process(response)
+
+        self.assertEqual(b''.join(response.streaming_content), b'{"email": "[REDACTED]"}')
+
+    def test_pii_safe_views_are_skipped(self):
+        """Test function views and view classes can opt out."""
+        from rest_framework.views import APIView
+
+        @pii_safe
+        def view(request):
+            pass
+
+        @pii_safe
+        class PhotoView(APIView):
+            pass
+
+        for marked in (view, PhotoView.as_view()):
+            response = self.process(JsonResponse({'email': 'someone@example.com'}), marked)
+            self.assertIn(b'someone@example.com', response.content)
+
+    def test_non_text_responses_are_skipped(self):
+        """Test binary and non-UTF-8 bodies are left untouched."""
+        binary = HttpResponse(b'someone@example.com', content_type='image/png')
+        latin1 = HttpResponse(b'someone@example.com', content_type='text/plain; charset=latin-1')
+
+        self.assertEqual(self.process(binary).content, b'someone@example.com')
+        self.assertEqual(self.process(latin1).content, b'someone@example.com')
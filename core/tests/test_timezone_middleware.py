@@ -0,0 +1,155 @@
+"""
+Tests for timezone detection in TimezoneMiddleware.
+
+Covers:
+- Header and Accept-Language resolution, memoized per request shape
+- One memory-mapped GeoIP reader, looked up once per /24 network
+- Profile timezones cached per user and invalidated on profile saves
+"""
+
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core.middleware import timezone as timezone_middleware
+from core.middleware.timezone import (
+    TimezoneMiddleware,
+    client_network,
+    get_geoip_reader,
+    resolve_timezone,
+)
+from profiles.models import UserProfileBasic
+
+User = get_user_model()
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class TimezoneMiddlewareTestMixin:
+    """Helpers to run requests through the middleware."""
+
+    def setUp(self):
+        """Set up a middleware and clear the memoized resolutions."""
+        self.factory = RequestFactory()
+        self.middleware = TimezoneMiddleware(lambda request: HttpResponse())
+        resolve_timezone.cache_clear()
+
+    def resolve(self, user=None, **meta):
+        request = self.factory.get('/', **meta)
+        if user is not None:
+            request.user = user
+        self.middleware.process_request(request)
+        self.middleware.process_response(request, HttpResponse())
+        return request.user_timezone
+
+
+@override_settings(TIME_ZONE='UTC', ENABLE_GEOIP_TIMEZONE=False)
+class TimezoneResolutionTest(TimezoneMiddlewareTestMixin, SimpleTestCase):
+    """Test header and language detection."""
+
+    def test_header_takes_priority(self):
+        """Test X-Timezone wins over Accept-Language."""
+        self.assertEqual(
+            self.resolve(HTTP_X_TIMEZONE='Asia/Tokyo', HTTP_ACCEPT_LANGUAGE='nl-NL'),
+            'Asia/Tokyo')
+        self.assertEqual(self.resolve(HTTP_X_USER_TIMEZONE='Europe/Rome'), 'Europe/Rome')
+
+    def test_accept_language(self):
+        """Test the first language preference maps to a timezone."""
+        self.assertEqual(
+            self.resolve(HTTP_ACCEPT_LANGUAGE='nl-NL,nl;q=0.9,en;q=0.8'), 'Europe/Amsterdam')
+
+    def test_invalid_or_missing_timezone_uses_default(self):
+        """Test unknown timezones fall back to TIME_ZONE."""
+        self.assertEqual(self.resolve(HTTP_X_TIMEZONE='Mars/Olympus'), 'UTC')
+        self.assertEqual(self.resolve(HTTP_ACCEPT_LANGUAGE='xx-XX'), 'UTC')
+
+    def test_resolutions_are_memoized(self):
+        """Test repeated request shapes are resolved once."""
+        for _ in range(5):
+            self.resolve(HTTP_ACCEPT_LANGUAGE='de-DE,de;q=0.9')
+
+        info = resolve_timezone.cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 4)
+
+
+@override_settings(TIME_ZONE='UTC', ENABLE_GEOIP_TIMEZONE=True, GEOIP_PATH='/geoip')
+class GeoIPTimezoneTest(TimezoneMiddlewareTestMixin, SimpleTestCase):
+    """Test GeoIP detection."""
+
+    def test_client_network(self):
+        """Test clients are grouped by /24 and /48 networks."""
+        self.assertEqual(client_network('203.0.113.57'), '203.0.113.0')
+        self.assertEqual(client_network('2001:db8:1:2::5'), '2001:db8:1::')
+        self.assertIsNone(client_network('not-an-ip:x'))
+
+    def test_one_lookup_per_network(self):
+        """Test clients in the same /24 share a lookup."""
+        reader = MagicMock()
+        reader.country_code.return_value = 'NL'
+
+        with patch.object(timezone_middleware, 'get_geoip_reader', return_value=reader):
+            first = self.resolve(REMOTE_ADDR='81.204.10.5')
+            second = self.resolve(HTTP_X_FORWARDED_FOR='81.204.10.200, 10.0.0.1')
+            private = self.resolve(REMOTE_ADDR='192.168.1.10')
+
+        self.assertEqual((first, second, private), ('Europe/Amsterdam', 'Europe/Amsterdam', 'UTC'))
+        reader.country_code.assert_called_once_with('81.204.10.0')
+
+    def test_reader_is_opened_once_memory_mapped(self):
+        """Test the GeoIP database is opened once per process with MODE_MMAP."""
+        with patch.object(timezone_middleware, '_geoip_reader', None), \
+                patch.object(timezone_middleware, 'GeoIP2') as geoip:
+            geoip.MODE_MMAP = 2
+            self.assertIs(get_geoip_reader(), get_geoip_reader())
+
+        geoip.assert_called_once_with(cache=2)
+
+
+@override_settings(TIME_ZONE='UTC', CACHES=LOCMEM_CACHE)
+class ProfileTimezoneTest(TimezoneMiddlewareTestMixin, TestCase):
+    """Test profile timezones."""
+
+    def setUp(self):
+        """Set up a user with a profile timezone."""
+        super().setUp()
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='tz-user', email='tz@example.com', password='pass12345!')
+        self.profile = UserProfileBasic.objects.create(
+            user=self.user, timezone='Europe/Amsterdam')
+
+    def test_profile_timezone_is_cached(self):
+        """Test the profile is read once across requests."""
+        self.assertEqual(self.resolve(User.objects.get(pk=self.user.pk)), 'Europe/Amsterdam')
+
+        user = User.objects.get(pk=self.user.pk)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.resolve(user), 'Europe/Amsterdam')
+            self.assertEqual(self.resolve(user), 'Europe/Amsterdam')
+
+        self.assertEqual(len(queries), 0)
+
+    def test_profile_save_invalidates(self):
+        """Test changing the profile timezone takes effect on the next request."""
+        self.resolve(User.objects.get(pk=self.user.pk))
+
+        self.profile.timezone = 'Asia/Tokyo'
+        self.profile.save(update_fields=['timezone'])
+
+        self.assertEqual(self.resolve(User.objects.get(pk=self.user.pk)), 'Asia/Tokyo')
+
+    def test_default_profile_timezone_is_not_a_choice(self):
+        """Test the UTC profile default does not override request headers."""
+        self.profile.timezone = 'UTC'
+        self.profile.save()
+
+        self.assertEqual(
+            self.resolve(User.objects.get(pk=self.user.pk), HTTP_X_TIMEZONE='Asia/Seoul'),
+            'Asia/Seoul')
@@ -11,6 +11,10 @@ from django.conf import settings
 from django.core.cache import cache
 import requests
 
+from core.circuit_breaker import (
+    CircuitBreakerOpen, get_circuit_breaker, raise_for_server_error
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,6 +36,9 @@ class NominatimGeocoder:
     - Max 1 request per second
     - Must include User-Agent header
     - Cache results to minimize requests
+
+    Requests go through the shared 'nominatim' circuit breaker, so an
+    outage seen by one process makes every process fail fast.
     """
 
     BASE_URL = 'https://nominatim.openstreetmap.org'
@@ -45,6 +52,43 @@ class NominatimGeocoder:
             'Accept-Language': 'en',
         })
         self._last_request_time = 0
+        self.breaker = get_circuit_breaker(
+            'nominatim',
+            expected_exceptions=(requests.exceptions.RequestException,)
+        )
+
+    def _get(self, path: str, params: Dict[str, Any]) -> requests.Response:
+        """
+        Send a GET request through the circuit breaker.
+
+        Args:
+            path: API path (e.g., '/search')
+            params: Query parameters
+
+        Returns:
+            Successful response
+
+        Raises:
+            GeocodingError: If the circuit is open
+            requests.exceptions.RequestException: If the request fails
+        """
+        def make_request():
+            response = self.session.get(
+                f"{self.BASE_URL}{path}",
+                params=params,
+                timeout=10
+            )
+            raise_for_server_error(response)
+            return response
+
+        try:
+            response = self.breaker.call(make_request)
+        except CircuitBreakerOpen as e:
+            logger.warning(f"Geocoding skipped: {e}")
+            raise GeocodingError("Geocoding service temporarily unavailable")
+        # Client errors (a bad query, rate limiting) are not provider failures
+        response.raise_for_status()
+        return response
 
     def _rate_limit(self):
         """Enforce rate limiting (1 request per second)."""
@@ -117,12 +161,7 @@ class NominatimGeocoder:
 
         try:
             logger.info(f"Geocoding address: {address}")
-            response = self.session.get(
-                f"{self.BASE_URL}/search",
-                params=params,
-                timeout=10
-            )
-            response.raise_for_status()
+            response = self._get('/search', params)
 
             results = response.json()
 
@@ -219,12 +258,7 @@ class NominatimGeocoder:
 
         try:
             logger.info(f"Reverse geocoding: ({latitude}, {longitude})")
-            response = self.session.get(
-                f"{self.BASE_URL}/reverse",
-                params=params,
-                timeout=10
-            )
-            response.raise_for_status()
+            response = self._get('/reverse', params)
 
             result = response.json()
 
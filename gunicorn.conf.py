@@ -0,0 +1,30 @@
+"""
+Gunicorn hooks.
+
+Server options are passed on the command line (see start.sh); gunicorn
+runs the ASGI app on uvicorn workers, so HTTP and websockets share one
+server, and also loads this file from the working directory.
+
+With --preload the app, and its log shipping thread, start in the master
+and threads do not survive fork, so each worker starts its own. Email
+dispatch workers and the photo and export pools start on first use in
+each worker.
+"""
+
+
+def post_fork(server, worker):
+    """Start this worker's log shipping thread."""
+    from core.logging import shipping
+    shipping.restart()
+
+
+def worker_exit(server, worker):
+    """Finish queued email, photos, exports and log records before the worker exits."""
+    from core import email_dispatch
+    from core.logging import shipping
+    from privacy.utils.gdpr import get_export_pool
+    from profiles.services import get_photo_pool
+    email_dispatch.stop()
+    get_photo_pool().stop()
+    get_export_pool().stop()
+    shipping.stop()
@@ -0,0 +1,120 @@
+"""
+Websocket consumers for messaging app.
+
+Push inbox and feed events to connected clients so they no longer need to
+poll the REST API. Events are published by RealtimeService; consumers
+only join the right channel layer groups and relay events as JSON:
+
+    {"event": "message.created", "payload": {...}}
+"""
+
+import logging
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from group.models import GroupMembership
+from .services.realtime_service import RealtimeService
+
+logger = logging.getLogger(__name__)
+
+
+# Close codes sent when a connection is refused
+CLOSE_UNAUTHENTICATED = 4401
+CLOSE_FORBIDDEN = 4403
+
+
+class RealtimeConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Base consumer joining one channel layer group per connection.
+
+    Subclasses implement get_group_name() and may refuse the connection by
+    returning None.
+    """
+
+    group_name = None
+
+    async def connect(self):
+        """Authenticate, authorize and join the consumer's group."""
+        user = self.scope.get('user')
+        if user is None or not user.is_authenticated:
+            await self.close(code=CLOSE_UNAUTHENTICATED)
+            return
+
+        self.group_name = await self.get_group_name(user)
+        if self.group_name is None:
+            await self.close(code=CLOSE_FORBIDDEN)
+            return
+
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, close_code):
+        """Leave the consumer's group."""
+        if self.group_name:
+            await self.channel_layer.group_discard(
+                self.group_name, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        """Answer keepalive pings; clients send no other messages."""
+        if content.get('type') == 'ping':
+            await self.send_json({'event': 'pong'})
+
+    async def get_group_name(self, user):
+        """Return the group to join for this connection, or None to refuse."""
+        raise NotImplementedError
+
+    async def relay(self, event):
+        """Relay a published event to the client."""
+        await self.send_json({
+            'event': event['event'],
+            'payload': event['payload'],
+        })
+
+
+class InboxConsumer(RealtimeConsumer):
+    """
+    Per-user inbox events.
+
+    Endpoint: ws/messaging/inbox/
+
+    Events:
+    - message.created: New message in one of the user's conversations,
+      with the user's updated unread count
+    """
+
+    async def get_group_name(self, user):
+        return RealtimeService.user_group(user.id)
+
+    async def inbox_event(self, event):
+        await self.relay(event)
+
+
+class GroupFeedConsumer(RealtimeConsumer):
+    """
+    Per-group feed events for active members.
+
+    Endpoint: ws/messaging/groups/<group_id>/feed/
+
+    Events:
+    - feed.item_created: New feed item (same shape as the cached feed)
+    - feed.item_updated: Updated counts, pin or delete state
+    - feed.item_deleted: Feed item removed
+    """
+
+    async def get_group_name(self, user):
+        group_id = self.scope['url_route']['kwargs']['group_id']
+        if not await self.is_active_member(user, group_id):
+            return None
+        return RealtimeService.feed_group(group_id)
+
+    @database_sync_to_async
+    def is_active_member(self, user, group_id):
+        return GroupMembership.objects.filter(
+            group_id=group_id,
+            user=user,
+            status='active'
+        ).exists()
+
+    async def feed_event(self, event):
+        await self.relay(event)
@@ -0,0 +1,112 @@
+"""
+Management command to backfill the denormalized group on comments and reactions.
+
+Rows are updated with set-based UPDATE ... SET group_id = (subquery)
+statements in primary-key ordered chunks, so each transaction stays small
+and the command can be interrupted and re-run safely.
+
+Usage:
+    python manage.py backfill_content_groups
+    python manage.py backfill_content_groups --chunk-size 10000 --sleep 0.1
+"""
+import time
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db.models import OuterRef, Subquery
+
+from messaging.models import (
+    Discussion, Scripture, PrayerRequest, Testimony, Comment, Reaction
+)
+
+
+# Content models that carry a group foreign key
+GROUP_CONTENT_MODELS = [Discussion, Scripture, PrayerRequest, Testimony]
+
+
+class Command(BaseCommand):
+    help = 'Backfill group on comments and reactions in chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Number of rows updated per statement'
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0.0,
+            help='Seconds to pause between chunks'
+        )
+
+    def handle(self, *args, **options):
+        self.chunk_size = options['chunk_size']
+        self.sleep = options['sleep']
+
+        self.stdout.write('Backfilling comment groups...')
+        total = self.backfill(
+            Comment.objects.filter(discussion__isnull=False),
+            Discussion, 'discussion_id', 'legacy discussion comments')
+        for model in GROUP_CONTENT_MODELS:
+            total += self.backfill(
+                Comment.objects.filter(
+                    content_type=ContentType.objects.get_for_model(model)),
+                model, 'content_id', f'{model.__name__} comments')
+
+        # Reactions on comments read the comment group, so run them last
+        self.stdout.write('\nBackfilling reaction groups...')
+        total += self.backfill(
+            Reaction.objects.filter(discussion__isnull=False),
+            Discussion, 'discussion_id', 'legacy discussion reactions')
+        total += self.backfill(
+            Reaction.objects.filter(comment__isnull=False),
+            Comment, 'comment_id', 'legacy comment reactions')
+        for model in GROUP_CONTENT_MODELS + [Comment]:
+            total += self.backfill(
+                Reaction.objects.filter(
+                    content_type=ContentType.objects.get_for_model(model)),
+                model, 'object_id', f'{model.__name__} reactions')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✅ Backfilled group on {total} rows'))
+
+    def backfill(self, queryset, content_model, content_field, label):
+        """
+        Set group_id from the content model on rows that lack it.
+
+        Args:
+            queryset: Rows to backfill
+            content_model: Model holding the group_id to copy
+            content_field: Field on the row referencing the content
+            label: Description used in progress output
+
+        Returns:
+            int: Number of rows updated
+        """
+        group_subquery = Subquery(
+            content_model.objects.filter(
+                pk=OuterRef(content_field)
+            ).values('group_id')[:1]
+        )
+        pending = queryset.filter(group__isnull=True).order_by('pk')
+
+        updated = 0
+        last_pk = None
+        while True:
+            chunk = pending if last_pk is None else pending.filter(pk__gt=last_pk)
+            pks = list(chunk.values_list('pk', flat=True)[:self.chunk_size])
+            if not pks:
+                break
+
+            updated += queryset.model.objects.filter(
+                pk__in=pks).update(group_id=group_subquery)
+            last_pk = pks[-1]
+
+            if self.sleep:
+                time.sleep(self.sleep)
+
+        if updated:
+            self.stdout.write(f'  Updated {updated} {label}')
+        return updated
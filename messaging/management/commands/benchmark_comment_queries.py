@@ -0,0 +1,116 @@
+"""
+Management command to compare membership-scoped comment query strategies.
+
+Runs the legacy polymorphic filter (an OR of content_id__in subqueries per
+content type) against the denormalized group_id filter for one user, and
+prints the query plans and timings of fetching the first page of each.
+
+Usage:
+    python manage.py benchmark_comment_queries --user member@example.com
+    python manage.py benchmark_comment_queries --iterations 50 --no-explain
+"""
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count, Q
+
+from group.models import GroupMembership
+from messaging.models import (
+    Discussion, Scripture, PrayerRequest, Testimony, Comment
+)
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Compare legacy and group_id based comment listing queries'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            type=str,
+            help='Email of the member to scope queries to (default: member of most groups)'
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=20,
+            help='Timed iterations per strategy'
+        )
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=25,
+            help='Rows fetched per iteration'
+        )
+        parser.add_argument(
+            '--no-explain',
+            action='store_true',
+            help='Skip printing query plans'
+        )
+
+    def handle(self, *args, **options):
+        user = self.get_user(options.get('user'))
+        user_groups = GroupMembership.objects.filter(
+            user=user,
+            status='active'
+        ).values_list('group_id', flat=True)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'🚀 Comment query benchmark for {user.email} '
+            f'({Comment.objects.count()} comments, {len(user_groups)} groups)'))
+
+        strategies = [
+            ('legacy', self.legacy_queryset(user_groups)),
+            ('group_id', Comment.objects.filter(
+                is_deleted=False, group_id__in=user_groups)),
+        ]
+
+        for label, queryset in strategies:
+            page = queryset.order_by('created_at')[:options['page_size']]
+
+            if not options['no_explain']:
+                self.stdout.write(f'\n--- {label} plan ---')
+                analyze = connection.vendor == 'postgresql'
+                self.stdout.write(page.explain(analyze=analyze) if analyze else page.explain())
+
+            timings = []
+            for _ in range(options['iterations']):
+                start = time.perf_counter()
+                list(page.values_list('pk', flat=True))
+                timings.append((time.perf_counter() - start) * 1000)
+
+            self.stdout.write(
+                f'\n{label}: median {statistics.median(timings):.2f} ms, '
+                f'max {max(timings):.2f} ms over {len(timings)} runs')
+
+    def get_user(self, email):
+        """Return the requested user, or the member of the most groups."""
+        if email:
+            try:
+                return User.objects.get(email=email)
+            except User.DoesNotExist:
+                raise CommandError(f'User {email} not found')
+
+        user = User.objects.annotate(
+            group_count=Count('group_memberships', filter=Q(
+                group_memberships__status='active'))
+        ).order_by('-group_count').first()
+        if user is None:
+            raise CommandError('No users found')
+        return user
+
+    def legacy_queryset(self, user_groups):
+        """Build the pre-denormalization polymorphic filter."""
+        group_filter = Q(discussion__group_id__in=user_groups)
+        for model in (Discussion, Scripture, PrayerRequest, Testimony):
+            group_filter |= Q(
+                content_type=ContentType.objects.get_for_model(model),
+                content_id__in=model.objects.filter(
+                    group_id__in=user_groups).values_list('id', flat=True)
+            )
+        return Comment.objects.filter(is_deleted=False).filter(group_filter)
@@ -0,0 +1,199 @@
+"""
+Management command to benchmark Bible verse lookups.
+
+Measures BibleAPIService.get_verse (the verse_lookup endpoint's service
+call) under three conditions:
+- warm: the verse is in the cache
+- cold: the cache is empty and the verse is served from the local store
+  (or, when it has not been imported, from the upstream provider)
+- stampede: many concurrent requests miss the cache for the same verse,
+  with and without single-flight coalescing
+
+The upstream provider is simulated with a fixed latency unless --live is
+given, so the benchmark does not depend on (or load) bible-api.com.
+Only the benchmarked verse's cache entry is touched.
+
+Usage:
+    python manage.py benchmark_verse_lookup
+    python manage.py benchmark_verse_lookup --reference "Psalm 23:1-6" --concurrency 100
+    python manage.py benchmark_verse_lookup --upstream-ms 250 --live
+"""
+import statistics
+import threading
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from messaging.services.bible_api import BibleAPIService
+from messaging.services.cache_service import CacheService
+
+
+class Command(BaseCommand):
+    help = 'Benchmark verse lookups at cold, warm and stampede conditions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reference',
+            type=str,
+            default='John 3:16',
+            help='Verse reference to look up'
+        )
+        parser.add_argument(
+            '--translation',
+            type=str,
+            default='KJV',
+            help='Translation to look up'
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=50,
+            help='Timed lookups for the warm and cold scenarios'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=50,
+            help='Concurrent requests in the stampede scenario'
+        )
+        parser.add_argument(
+            '--upstream-ms',
+            type=float,
+            default=150.0,
+            help='Simulated upstream provider latency'
+        )
+        parser.add_argument(
+            '--live',
+            action='store_true',
+            help='Call the real providers instead of a simulated one'
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        reference = options['reference']
+        translation = options['translation'].upper()
+        self.cache_key = CacheService.get_verse_key(
+            BibleAPIService()._normalize_reference(reference), translation)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'🚀 Verse lookup benchmark: {reference} ({translation})'))
+        self.stdout.write(
+            f"\n{'Scenario':<28} {'Lookups':>8} {'Upstream':>9} "
+            f"{'Median ms':>10} {'p95 ms':>9} {'Wall ms':>9}")
+        self.stdout.write('-' * 78)
+
+        service = self.build_service()
+
+        # Cold: empty cache, local store first
+        cold_local = self.run_serial(
+            service, reference, translation, clear_cache=True)
+        self.report('cold (local store)', cold_local, service.upstream_calls)
+
+        # Cold: empty cache, local store bypassed
+        service = self.build_service(local=False)
+        cold_remote = self.run_serial(
+            service, reference, translation, clear_cache=True,
+            iterations=min(self.options['iterations'], 10))
+        self.report('cold (upstream)', cold_remote, service.upstream_calls)
+
+        # Warm: every lookup hits the cache
+        service = self.build_service()
+        service.get_verse(reference, translation)
+        service.upstream_calls = 0
+        warm = self.run_serial(service, reference, translation)
+        self.report('warm (cache)', warm, service.upstream_calls)
+
+        # Stampede: concurrent misses without and with single-flight
+        for label, coalesce in [
+            ('stampede (no coalescing)', False),
+            ('stampede (single-flight)', True),
+        ]:
+            service = self.build_service(local=False)
+            cache.delete(self.cache_key)
+            timings, wall = self.run_concurrent(
+                service, reference, translation, coalesce)
+            self.report(label, timings, service.upstream_calls, wall)
+
+        cache.delete(self.cache_key)
+
+    def build_service(self, local=True):
+        """Build a service that counts (and optionally simulates) upstream calls."""
+        service = BibleAPIService()
+        service.upstream_calls = 0
+        lock = threading.Lock()
+        fetch = service._fetch_from_bible_api
+        upstream_seconds = self.options['upstream_ms'] / 1000
+
+        def counted_fetch(reference, translation):
+            with lock:
+                service.upstream_calls += 1
+            if self.options['live']:
+                return fetch(reference, translation)
+            time.sleep(upstream_seconds)
+            return {
+                'reference': reference,
+                'text': 'Simulated verse text',
+                'translation': translation,
+                'translation_note': None,
+                'source': 'benchmark',
+            }
+
+        service._fetch_from_bible_api = counted_fetch
+        if not local:
+            service._lookup_local = lambda reference, translation: None
+        return service
+
+    def run_serial(self, service, reference, translation, clear_cache=False, iterations=None):
+        """Time lookups one after another."""
+        timings = []
+        for _ in range(iterations or self.options['iterations']):
+            if clear_cache:
+                cache.delete(self.cache_key)
+            start = time.perf_counter()
+            service.get_verse(reference, translation)
+            timings.append(time.perf_counter() - start)
+        return timings
+
+    def run_concurrent(self, service, reference, translation, coalesce):
+        """Time concurrent lookups of one uncached verse."""
+        timings = []
+        barrier = threading.Barrier(self.options['concurrency'])
+        normalized = service._normalize_reference(reference)
+
+        def worker():
+            barrier.wait()
+            start = time.perf_counter()
+            try:
+                if coalesce:
+                    service.get_verse(reference, translation)
+                else:
+                    # What every request did before single-flight: fetch
+                    # from the providers on its own cache miss
+                    service._fetch_from_providers(
+                        normalized, translation.upper(), self.cache_key)
+            finally:
+                timings.append(time.perf_counter() - start)
+                connection.close()
+
+        threads = [
+            threading.Thread(target=worker)
+            for _ in range(self.options['concurrency'])
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return timings, time.perf_counter() - start
+
+    def report(self, label, timings, upstream_calls, wall=None):
+        """Print one scenario row."""
+        timings = sorted(timings)
+        p95 = timings[max(int(len(timings) * 0.95) - 1, 0)]
+        wall = wall if wall is not None else sum(timings)
+        self.stdout.write(
+            f"{label:<28} {len(timings):>8} {upstream_calls:>9} "
+            f"{statistics.median(timings) * 1000:>10.2f} {p95 * 1000:>9.2f} "
+            f"{wall * 1000:>9.1f}")
@@ -0,0 +1,159 @@
+"""
+Management command to import a public-domain Bible translation.
+
+Loads verses into the local BibleVerse table so lookups for that
+translation are served without calling the external Bible APIs.
+
+Accepted files:
+- CSV with a header of book (or book_name/b), chapter (or c), verse (or v)
+  and text (or t). Books may be names or canonical numbers, so exports
+  such as scrollmapper's t_kjv.csv/t_web.csv load as-is.
+- JSON: a list of verse objects, an object with a "verses" list, or one
+  verse object per line (JSON Lines), using the same keys.
+
+Usage:
+    python manage.py import_verses t_kjv.csv --translation KJV
+    python manage.py import_verses web.json --translation WEB --replace
+"""
+import csv
+import json
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from messaging.models import BibleVerse
+from messaging.services.verse_store import LOCAL_TRANSLATIONS, VerseStore
+
+
+# Header aliases mapped to the keys VerseStore expects
+COLUMN_ALIASES = {
+    'book': 'book', 'book_name': 'book', 'b': 'book',
+    'chapter': 'chapter', 'c': 'chapter',
+    'verse': 'verse', 'v': 'verse',
+    'text': 'text', 't': 'text',
+}
+
+
+class Command(BaseCommand):
+    help = 'Import a public-domain Bible translation into the local verse store'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            type=str,
+            help='CSV or JSON file of verses'
+        )
+        parser.add_argument(
+            '--translation',
+            type=str,
+            required=True,
+            help=f'Translation code ({", ".join(LOCAL_TRANSLATIONS)})'
+        )
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'json'],
+            help='File format (default: from the file extension)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Verses inserted per statement'
+        )
+        parser.add_argument(
+            '--replace',
+            action='store_true',
+            help='Delete the stored translation before importing'
+        )
+
+    def handle(self, *args, **options):
+        translation = options['translation'].upper()
+        if translation not in LOCAL_TRANSLATIONS:
+            raise CommandError(
+                f"Translation '{translation}' cannot be stored locally. "
+                f"Supported: {', '.join(LOCAL_TRANSLATIONS)}")
+
+        path = options['path']
+        file_format = options['format'] or (
+            'csv' if path.lower().endswith('.csv') else 'json')
+        batch_size = options['batch_size']
+
+        try:
+            handle = open(path, encoding='utf-8-sig', newline='')
+        except OSError as e:
+            raise CommandError(f'Cannot open {path}: {e}')
+
+        self.stdout.write(f'Importing {translation} from {path}...')
+
+        with handle, transaction.atomic():
+            if options['replace']:
+                deleted, _ = BibleVerse.objects.filter(
+                    translation=translation).delete()
+                self.stdout.write(f'  Deleted {deleted} stored verses')
+
+            rows = self.read_csv(handle) if file_format == 'csv' else self.read_json(handle)
+            total = 0
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                total += VerseStore.save_verses(
+                    translation, batch, batch_size=batch_size)
+                self.stdout.write(f'  Processed {total} verses')
+
+        stored = BibleVerse.objects.filter(translation=translation).count()
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Imported {translation}: {stored} verses stored'))
+
+    def read_csv(self, handle):
+        """Yield verse rows from a CSV file."""
+        reader = csv.DictReader(handle)
+        columns = {
+            name: COLUMN_ALIASES[name.strip().lower()]
+            for name in reader.fieldnames or []
+            if name.strip().lower() in COLUMN_ALIASES
+        }
+        if set(columns.values()) != {'book', 'chapter', 'verse', 'text'}:
+            raise CommandError(
+                'CSV needs book, chapter, verse and text columns')
+
+        for row in reader:
+            yield self.normalize_row(
+                {key: row[name] for name, key in columns.items()})
+
+    def read_json(self, handle):
+        """Yield verse rows from a JSON or JSON Lines file."""
+        first_line = handle.readline()
+        handle.seek(0)
+
+        # JSON Lines: one verse object per line
+        try:
+            if isinstance(json.loads(first_line), dict) and 'verses' not in first_line:
+                for line in handle:
+                    if line.strip():
+                        yield self.normalize_row(self.rename(json.loads(line)))
+                return
+        except ValueError:
+            pass
+
+        data = json.load(handle)
+        if isinstance(data, dict):
+            data = data.get('verses', [])
+        for row in data:
+            yield self.normalize_row(self.rename(row))
+
+    def rename(self, row):
+        """Map aliased keys of a JSON verse object."""
+        return {
+            COLUMN_ALIASES[key]: value
+            for key, value in row.items()
+            if key in COLUMN_ALIASES
+        }
+
+    def normalize_row(self, row):
+        """Treat numeric book values as canonical book numbers."""
+        book = str(row.get('book', '')).strip()
+        if book.isdigit():
+            return {**row, 'book': None, 'book_number': int(book)}
+        return row
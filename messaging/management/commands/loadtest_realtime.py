@@ -0,0 +1,189 @@
+"""
+Management command to load test websocket delivery against REST polling.
+
+Connects one inbox websocket per active user through the full ASGI stack
+(JWT middleware, routing, consumers and the configured channel layer),
+publishes inbox events at a fixed rate and measures delivery latency.
+It then compares the requests each active user makes when polling the
+conversation list and feed against the realtime client, which only loads
+both once and receives every change as a push.
+
+Users are read from the database; nothing is written.
+
+Usage:
+    python manage.py loadtest_realtime
+    python manage.py loadtest_realtime --users 200 --duration 60 --rate 20
+    python manage.py loadtest_realtime --poll-interval 5 --session-minutes 20
+"""
+import asyncio
+import random
+import statistics
+import time
+
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from messaging.services import RealtimeService
+from vineyard_group_fellowship.asgi import application
+
+User = get_user_model()
+
+# REST endpoints a polling client refreshes: conversation list and feed
+POLLED_ENDPOINTS = 2
+
+
+class Command(BaseCommand):
+    help = 'Load test websocket inbox delivery and compare with REST polling'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=50,
+            help='Concurrent websocket clients (one per active user)'
+        )
+        parser.add_argument(
+            '--duration',
+            type=float,
+            default=30.0,
+            help='Seconds to publish events for'
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=10.0,
+            help='Inbox events published per second'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=10.0,
+            help='Seconds between refreshes of a polling client'
+        )
+        parser.add_argument(
+            '--session-minutes',
+            type=float,
+            default=30.0,
+            help='Typical session length, over which initial loads are spread'
+        )
+
+    def handle(self, *args, **options):
+        users = list(User.objects.filter(
+            is_active=True).order_by('date_joined')[:options['users']])
+        if not users:
+            raise CommandError('No active users found')
+        if get_channel_layer() is None:
+            raise CommandError('CHANNEL_LAYERS is not configured')
+
+        tokens = {user.id: str(AccessToken.for_user(user)) for user in users}
+
+        self.stdout.write(self.style.SUCCESS(
+            f'🚀 Realtime load test: {len(users)} clients, '
+            f'{options["rate"]:.0f} events/s for {options["duration"]:.0f}s'))
+
+        result = asyncio.run(self.run_load(
+            tokens, options['duration'], options['rate']))
+        self.report(result, len(users), options)
+
+    async def run_load(self, tokens, duration, rate):
+        """Connect clients, publish events and collect delivery latencies."""
+        communicators = {}
+        for user_id, token in tokens.items():
+            communicator = WebsocketCommunicator(
+                application,
+                '/ws/messaging/inbox/',
+                headers=[
+                    (b'origin', b'http://localhost'),
+                    (b'authorization', f'Bearer {token}'.encode()),
+                ]
+            )
+            connected, _ = await communicator.connect()
+            if connected:
+                communicators[user_id] = communicator
+
+        if not communicators:
+            raise CommandError('No websocket connections were accepted')
+
+        latencies = []
+
+        async def receive(communicator):
+            # A timeout cancels the connection, so wait for the stop event
+            while True:
+                event = await communicator.receive_json_from(
+                    timeout=duration + 30)
+                if event['event'] == 'loadtest.stop':
+                    return
+                latencies.append(time.perf_counter() - event['payload']['sent_at'])
+
+        receivers = [
+            asyncio.create_task(receive(communicator))
+            for communicator in communicators.values()
+        ]
+
+        channel_layer = get_channel_layer()
+        user_ids = list(communicators)
+        published = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < duration:
+            await channel_layer.group_send(
+                RealtimeService.user_group(random.choice(user_ids)),
+                {
+                    'type': 'inbox.event',
+                    'event': 'message.created',
+                    'payload': {'sent_at': time.perf_counter()},
+                }
+            )
+            published += 1
+            await asyncio.sleep(1 / rate)
+
+        # Stop events queue behind any in-flight events
+        for user_id in user_ids:
+            await channel_layer.group_send(
+                RealtimeService.user_group(user_id),
+                {'type': 'inbox.event', 'event': 'loadtest.stop', 'payload': {}}
+            )
+        await asyncio.gather(*receivers)
+        for communicator in communicators.values():
+            await communicator.disconnect()
+
+        return {
+            'connected': len(communicators),
+            'published': published,
+            'latencies': sorted(latencies),
+        }
+
+    def report(self, result, requested_users, options):
+        """Print delivery statistics and the polling comparison."""
+        latencies = result['latencies']
+        delivered = len(latencies)
+
+        self.stdout.write(
+            f"\nConnected: {result['connected']}/{requested_users}")
+        self.stdout.write(
+            f"Delivered: {delivered}/{result['published']} events")
+        if latencies:
+            p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0]
+            self.stdout.write(
+                f"Latency: median {statistics.median(latencies) * 1000:.2f} ms, "
+                f"p95 {p95 * 1000:.2f} ms, max {latencies[-1] * 1000:.2f} ms")
+
+        # Requests per active user per minute: a polling client refreshes
+        # every endpoint each interval, a websocket client loads each once
+        # per session and is pushed everything else
+        polling = POLLED_ENDPOINTS * 60 / options['poll_interval']
+        realtime = POLLED_ENDPOINTS / options['session_minutes']
+        reduction = (1 - realtime / polling) * 100 if polling else 0
+
+        self.stdout.write(
+            f"\n{'Client':<12} {'Requests/user/min':>18} {'Avg staleness (s)':>18}")
+        self.stdout.write('-' * 50)
+        self.stdout.write(
+            f"{'polling':<12} {polling:>18.1f} {options['poll_interval'] / 2:>18.1f}")
+        median_latency = statistics.median(latencies) if latencies else 0
+        self.stdout.write(
+            f"{'websocket':<12} {realtime:>18.1f} {median_latency:>18.3f}")
+        self.stdout.write(self.style.SUCCESS(
+            f'\nPolling requests reduced by {reduction:.0f}%'))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('group', '0006_change_photo_to_base64'),
+        ('messaging', '0010_alter_prayerrequest_urgency_conversation_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='group',
+            field=models.ForeignKey(blank=True, db_index=False, help_text='Group the commented content belongs to', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='group.group'),
+        ),
+        migrations.AddField(
+            model_name='reaction',
+            name='group',
+            field=models.ForeignKey(blank=True, db_index=False, help_text='Group the reacted content belongs to', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='reactions', to='group.group'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['group', 'is_deleted', 'created_at'], name='messaging_c_group_i_64153c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reaction',
+            index=models.Index(fields=['group', '-created_at'], name='messaging_r_group_i_6a408d_idx'),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.7 on 2026-10-18 21:11
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_inbox_entries(apps, schema_editor):
+    """
+    Create an inbox entry for every participant of existing conversations,
+    seeded from their current messages.
+    """
+    Conversation = apps.get_model('messaging', 'Conversation')
+    InboxEntry = apps.get_model('messaging', 'InboxEntry')
+
+    created = 0
+    for conversation in Conversation.objects.prefetch_related('participants').iterator(chunk_size=500):
+        participant_ids = [user.id for user in conversation.participants.all()]
+        messages = conversation.private_messages.all()
+        message_count = messages.count()
+        last_message = messages.order_by('-created_at').first()
+
+        entries = []
+        for user_id in participant_ids:
+            entries.append(InboxEntry(
+                conversation=conversation,
+                user_id=user_id,
+                other_participant_id=next(
+                    (pk for pk in participant_ids if pk != user_id), None),
+                message_count=message_count,
+                unread_count=messages.filter(
+                    is_read=False).exclude(sender_id=user_id).count(),
+                last_message=last_message,
+                last_message_sender_id=last_message.sender_id if last_message else None,
+                last_message_preview=last_message.content[:100] if last_message else '',
+                last_message_at=last_message.created_at if last_message else None,
+            ))
+        InboxEntry.objects.bulk_create(entries, ignore_conflicts=True)
+        created += len(entries)
+
+    print(f"✅ Backfilled {created} inbox entries")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0011_comment_group_reaction_group'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InboxEntry',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('unread_count', models.PositiveIntegerField(default=0, help_text='Messages from others not yet read by this user')),
+                ('message_count', models.PositiveIntegerField(default=0, help_text='Total messages in the conversation')),
+                ('last_read_at', models.DateTimeField(blank=True, help_text='When this user last read the conversation', null=True)),
+                ('last_message_preview', models.CharField(blank=True, help_text='Preview of the most recent message', max_length=100)),
+                ('last_message_at', models.DateTimeField(blank=True, help_text='When the most recent message was sent', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('conversation', models.ForeignKey(help_text='Conversation this entry summarizes', on_delete=django.db.models.deletion.CASCADE, related_name='inbox_entries', to='messaging.conversation')),
+                ('last_message', models.ForeignKey(blank=True, help_text='Most recent message in the conversation', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='messaging.privatemessage')),
+                ('last_message_sender', models.ForeignKey(blank=True, help_text='Sender of the most recent message', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('other_participant', models.ForeignKey(blank=True, help_text='The other participant shown in the inbox', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('user', models.ForeignKey(help_text='Participant owning this inbox entry', on_delete=django.db.models.deletion.CASCADE, related_name='inbox_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'messaging_inbox_entry',
+                'ordering': ['-last_message_at', '-created_at'],
+                'indexes': [models.Index(fields=['user', '-last_message_at'], name='inbox_user_last_msg_idx')],
+                'unique_together': {('conversation', 'user')},
+            },
+        ),
+        migrations.RunPython(backfill_inbox_entries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-18 21:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0012_inboxentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BibleVerse',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('translation', models.CharField(help_text='Translation code (e.g., KJV, WEB)', max_length=10)),
+                ('book_number', models.PositiveSmallIntegerField(help_text='Canonical book order (1 = Genesis, 66 = Revelation)')),
+                ('book', models.CharField(help_text='Book display name', max_length=30)),
+                ('chapter', models.PositiveSmallIntegerField()),
+                ('verse', models.PositiveSmallIntegerField()),
+                ('text', models.TextField()),
+            ],
+            options={
+                'db_table': 'messaging_bible_verse',
+                'ordering': ['translation', 'book_number', 'chapter', 'verse'],
+                'unique_together': {('translation', 'book_number', 'chapter', 'verse')},
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-18 21:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0013_bibleverse'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='risk_categories',
+            field=models.JSONField(blank=True, default=list, help_text='Moderation risk categories matched on save'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='risk_score',
+            field=models.FloatField(default=0.0, help_text='Moderation risk score (0-1), computed on save'),
+        ),
+        migrations.AddField(
+            model_name='discussion',
+            name='risk_categories',
+            field=models.JSONField(blank=True, default=list, help_text='Moderation risk categories matched on save'),
+        ),
+        migrations.AddField(
+            model_name='discussion',
+            name='risk_score',
+            field=models.FloatField(default=0.0, help_text='Moderation risk score (0-1), computed on save'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+from django.db import migrations
+
+from messaging.risk_scoring import risk_scorer
+
+CHUNK_SIZE = 2000
+
+
+def score_rows(model, text_fields, get_text):
+    """Score every row in primary-key ordered chunks, as score_content_risk does."""
+    rows = model.objects.only('pk', *text_fields).order_by('pk')
+    scored = 0
+    last_pk = None
+    while True:
+        chunk = rows if last_pk is None else rows.filter(pk__gt=last_pk)
+        batch = list(chunk[:CHUNK_SIZE])
+        if not batch:
+            return scored
+        for row in batch:
+            row.risk_score, row.risk_categories = risk_scorer.analyze(get_text(row))
+        model.objects.bulk_update(batch, ['risk_score', 'risk_categories'])
+        scored += len(batch)
+        last_pk = batch[-1].pk
+
+
+def backfill_content_risk_score(apps, schema_editor):
+    """
+    Score discussions and comments created before 0014 added the columns.
+
+    Those rows kept the 0.0 default, so moderation dashboards reading the
+    stored scores would never surface them.
+    """
+    Discussion = apps.get_model('messaging', 'Discussion')
+    Comment = apps.get_model('messaging', 'Comment')
+
+    scored = score_rows(
+        Discussion, ('title', 'content'), lambda row: f"{row.title} {row.content}")
+    scored += score_rows(Comment, ('content',), lambda row: row.content)
+
+    print(f"✅ Scored moderation risk on {scored} discussions and comments")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0014_content_risk_score'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_content_risk_score, migrations.RunPython.noop),
+    ]
@@ -12,6 +12,8 @@ This module contains models for group messaging functionality including:
 - CommentHistory (edit tracking)
 - NotificationPreference (user notification settings)
 - NotificationLog (notification tracking for compliance)
+- InboxEntry (denormalized per-participant conversation list)
+- BibleVerse (local store for public-domain Bible translations)
 
 Phase 1 Models:
 - Discussion, Comment, Reaction, FeedItem, CommentHistory
@@ -33,12 +35,58 @@ from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import MinLengthValidator
 from django.core.exceptions import ValidationError
-from django.db.models import F
+from django.db import transaction
+from django.db.models import Case, F, Q, When
+from django.db.models.functions import Greatest
 from group.models import Group
 
+from .risk_scoring import risk_scorer
+
 User = get_user_model()
 
 
+def resolve_content_group_id(content_type_id, object_id):
+    """
+    Look up the group owning a piece of commentable or reactable content.
+
+    Args:
+        content_type_id: ContentType ID of the content
+        object_id: Primary key of the content
+
+    Returns:
+        Group ID, or None if the content has no group
+    """
+    if not content_type_id or not object_id:
+        return None
+
+    model = ContentType.objects.get_for_id(content_type_id).model_class()
+    if model is Comment:
+        comment = Comment.objects.filter(pk=object_id).only(
+            'group_id', 'discussion_id', 'content_type_id', 'content_id'
+        ).first()
+        if comment is None:
+            return None
+        return comment.group_id or comment.resolve_group_id()
+
+    if model is None or not any(f.name == 'group' for f in model._meta.fields):
+        return None
+    return model.objects.filter(pk=object_id).values_list(
+        'group_id', flat=True).first()
+
+
+def _add_update_field(save_kwargs, field_name):
+    """Include a field populated in save() in an explicit update_fields."""
+    update_fields = save_kwargs.get('update_fields')
+    if update_fields is not None:
+        save_kwargs['update_fields'] = {*update_fields, field_name}
+
+
+def _saves_any(save_kwargs, field_names):
+    """Check whether a save() writes any of the given fields."""
+    update_fields = save_kwargs.get('update_fields')
+    return update_fields is None or any(name in update_fields for name in field_names)
+
+
 # =============================================================================
 # PHASE 1: CORE MODELS
 # =============================================================================
@@ -119,6 +167,15 @@ class Discussion(models.Model):
         default=0,
         help_text=_('Number of active reports')
     )
+    risk_score = models.FloatField(
+        default=0.0,
+        help_text=_('Moderation risk score (0-1), computed on save')
+    )
+    risk_categories = models.JSONField(
+        default=list,
+        blank=True,
+        help_text=_('Moderation risk categories matched on save')
+    )
 
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -138,6 +195,15 @@ class Discussion(models.Model):
     def __str__(self):
         return f"{self.title} by {self.author.username} in {self.group.name}"
 
+    def save(self, *args, **kwargs):
+        """Score the title and content for moderation before saving."""
+        if _saves_any(kwargs, ('title', 'content')):
+            self.risk_score, self.risk_categories = risk_scorer.analyze(
+                f"{self.title} {self.content}")
+            _add_update_field(kwargs, 'risk_score')
+            _add_update_field(kwargs, 'risk_categories')
+        super().save(*args, **kwargs)
+
     def soft_delete(self):
         """Soft delete the discussion."""
         self.is_deleted = True
@@ -195,6 +261,18 @@ class Comment(models.Model):
     )
     content_object = GenericForeignKey('content_type', 'content_id')
 
+    # Denormalized group of the commented content, populated on save so
+    # membership-scoped listings avoid polymorphic subqueries
+    group = models.ForeignKey(
+        Group,
+        on_delete=models.CASCADE,
+        related_name='comments',
+        null=True,
+        blank=True,
+        db_index=False,
+        help_text=_('Group the commented content belongs to')
+    )
+
     # Legacy field - kept for backward compatibility, will be deprecated
     discussion = models.ForeignKey(
         Discussion,
@@ -261,6 +339,15 @@ class Comment(models.Model):
         default=0,
         help_text=_('Number of active reports')
     )
+    risk_score = models.FloatField(
+        default=0.0,
+        help_text=_('Moderation risk score (0-1), computed on save')
+    )
+    risk_categories = models.JSONField(
+        default=list,
+        blank=True,
+        help_text=_('Moderation risk categories matched on save')
+    )
 
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -281,12 +368,32 @@ class Comment(models.Model):
             # Author and parent indexes
             models.Index(fields=['author', '-created_at']),
             models.Index(fields=['parent', '-created_at']),
+            # Membership-scoped listings
+            models.Index(fields=['group', 'is_deleted', 'created_at']),
         ]
 
     def __str__(self):
         preview = self.content[:50]
         return f"Comment by {self.author.username}: {preview}..."
 
+    def save(self, *args, **kwargs):
+        """Populate the denormalized group and moderation risk before saving."""
+        if self.group_id is None:
+            self.group_id = self.resolve_group_id()
+            _add_update_field(kwargs, 'group')
+        if _saves_any(kwargs, ('content',)):
+            self.risk_score, self.risk_categories = risk_scorer.analyze(self.content)
+            _add_update_field(kwargs, 'risk_score')
+            _add_update_field(kwargs, 'risk_categories')
+        super().save(*args, **kwargs)
+
+    def resolve_group_id(self):
+        """Return the ID of the group owning the commented content."""
+        if self.discussion_id:
+            return Discussion.objects.filter(
+                pk=self.discussion_id).values_list('group_id', flat=True).first()
+        return resolve_content_group_id(self.content_type_id, self.content_id)
+
     def can_edit(self):
         """Check if comment can still be edited (within 15 minutes)."""
         if self.is_deleted:
@@ -406,6 +513,17 @@ class Reaction(models.Model):
     )
     content_object = GenericForeignKey('content_type', 'object_id')
 
+    # Denormalized group of the reacted content, populated on save
+    group = models.ForeignKey(
+        Group,
+        on_delete=models.CASCADE,
+        related_name='reactions',
+        null=True,
+        blank=True,
+        db_index=False,
+        help_text=_('Group the reacted content belongs to')
+    )
+
     # DEPRECATED: Legacy fields for backward compatibility (will be removed in future migration)
     # These are kept to maintain existing reactions during migration period
     discussion = models.ForeignKey(
@@ -449,11 +567,30 @@ class Reaction(models.Model):
             models.Index(
                 fields=['content_type', 'object_id', 'reaction_type']),
             models.Index(fields=['user', '-created_at']),
+            # Membership-scoped listings
+            models.Index(fields=['group', '-created_at']),
         ]
 
     def __str__(self):
         return f"{self.user.username} reacted {self.reaction_type} to {self.content_object}"
 
+    def save(self, *args, **kwargs):
+        """Populate the denormalized group before saving."""
+        if self.group_id is None:
+            self.group_id = self.resolve_group_id()
+            _add_update_field(kwargs, 'group')
+        super().save(*args, **kwargs)
+
+    def resolve_group_id(self):
+        """Return the ID of the group owning the reacted content."""
+        if self.discussion_id:
+            return Discussion.objects.filter(
+                pk=self.discussion_id).values_list('group_id', flat=True).first()
+        if self.comment_id:
+            return resolve_content_group_id(
+                ContentType.objects.get_for_model(Comment).id, self.comment_id)
+        return resolve_content_group_id(self.content_type_id, self.object_id)
+
     def clean(self):
         """Validate that reaction is for a valid content type."""
         from django.apps import apps
@@ -1510,10 +1647,21 @@ class Conversation(models.Model):
         """Get count of unread messages for a specific user."""
         return self.private_messages.filter(is_read=False).exclude(sender=user).count()
 
-    def mark_messages_as_read(self, user):
-        """Mark all messages in this conversation as read for the given user."""
-        self.private_messages.filter(is_read=False).exclude(
-            sender=user).update(is_read=True)
+    def mark_messages_as_read(self, user, up_to=None):
+        """
+        Mark messages in this conversation as read for the given user.
+
+        Also updates the user's inbox unread counter in the same transaction.
+
+        Args:
+            user: User reading the conversation
+            up_to: Optional newest PrivateMessage the user has been shown;
+                later messages stay unread
+
+        Returns:
+            int: Number of messages marked as read
+        """
+        return InboxEntry.mark_read(self, user, up_to=up_to)
 
     def close(self, user, reason=None):
         """Close the conversation."""
@@ -1579,12 +1727,272 @@ class PrivateMessage(models.Model):
         return f"Message from {self.sender.username} at {self.created_at}"
 
     def save(self, *args, **kwargs):
-        """Update conversation's last_message_at when a new message is created."""
+        """
+        Update conversation's last_message_at and participants' inbox
+        entries when a new message is created, and push the message to
+        their websocket connections once committed.
+        """
+        from .services.realtime_service import RealtimeService
+
         is_new = self._state.adding
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+            if is_new:
+                # Update conversation's last_message_at
+                self.conversation.last_message_at = self.created_at
+                self.conversation.save(
+                    update_fields=['last_message_at', 'updated_at'])
+                InboxEntry.record_message(self)
+                RealtimeService.publish_message_created(self)
+
+
+class InboxEntry(models.Model):
+    """
+    Denormalized inbox row for one participant of a conversation.
+
+    Holds the counters and last-message preview shown in the conversation
+    list, so an inbox is listed with a single indexed query. Counters are
+    maintained with atomic F() updates from PrivateMessage.save and
+    Conversation.mark_messages_as_read; rows are created and removed as
+    participants change (see signals).
+    """
+
+    PREVIEW_LENGTH = 100
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    conversation = models.ForeignKey(
+        Conversation,
+        on_delete=models.CASCADE,
+        related_name='inbox_entries',
+        help_text=_('Conversation this entry summarizes')
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='inbox_entries',
+        help_text=_('Participant owning this inbox entry')
+    )
+    other_participant = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text=_('The other participant shown in the inbox')
+    )
+
+    # Counters
+    unread_count = models.PositiveIntegerField(
+        default=0,
+        help_text=_('Messages from others not yet read by this user')
+    )
+    message_count = models.PositiveIntegerField(
+        default=0,
+        help_text=_('Total messages in the conversation')
+    )
+    last_read_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=_('When this user last read the conversation')
+    )
+
+    # Last message preview
+    last_message = models.ForeignKey(
+        PrivateMessage,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text=_('Most recent message in the conversation')
+    )
+    last_message_sender = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text=_('Sender of the most recent message')
+    )
+    last_message_preview = models.CharField(
+        max_length=PREVIEW_LENGTH,
+        blank=True,
+        help_text=_('Preview of the most recent message')
+    )
+    last_message_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=_('When the most recent message was sent')
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'messaging_inbox_entry'
+        unique_together = [['conversation', 'user']]
+        indexes = [
+            models.Index(fields=['user', '-last_message_at'],
+                         name='inbox_user_last_msg_idx'),
+        ]
+        ordering = ['-last_message_at', '-created_at']
+
+    def __str__(self):
+        return f"Inbox entry for {self.user_id} in {self.conversation_id}"
+
+    @classmethod
+    def record_message(cls, message):
+        """
+        Apply a newly created message to every participant's entry.
+
+        Counters are incremented with F() expressions so concurrent messages
+        never lose updates. The preview only moves forward in time, so a
+        slower transaction cannot overwrite a newer last message.
+
+        Args:
+            message: The PrivateMessage that was just created
+        """
+        entries = cls.objects.filter(conversation_id=message.conversation_id)
+        entries.update(
+            message_count=F('message_count') + 1,
+            unread_count=Case(
+                When(user_id=message.sender_id, then=F('unread_count')),
+                default=F('unread_count') + 1,
+            ),
+        )
+        entries.filter(
+            Q(last_message_at__isnull=True) |
+            Q(last_message_at__lte=message.created_at)
+        ).update(
+            last_message=message,
+            last_message_sender_id=message.sender_id,
+            last_message_preview=message.content[:cls.PREVIEW_LENGTH],
+            last_message_at=message.created_at,
+        )
+
+    @classmethod
+    def mark_read(cls, conversation, user, up_to=None):
+        """
+        Mark messages from others as read and update the user's counter.
+
+        The user's entry is locked first, so a message committed while the
+        read is in progress is either marked read here or counted afterwards,
+        never both.
+
+        Args:
+            conversation: Conversation being read
+            user: User reading the conversation
+            up_to: Optional newest PrivateMessage delivered to the user;
+                only messages at or before its (created_at, id) are marked
+
+        Returns:
+            int: Number of messages marked as read
+        """
+        with transaction.atomic():
+            entry_ids = list(
+                cls.objects.select_for_update().filter(
+                    conversation=conversation, user=user
+                ).values_list('id', flat=True)
+            )
+            unread = conversation.private_messages.filter(
+                is_read=False
+            ).exclude(sender=user)
+            if up_to is not None:
+                unread = unread.filter(
+                    Q(created_at__lt=up_to.created_at) |
+                    Q(created_at=up_to.created_at, id__lte=up_to.id)
+                )
+            marked = unread.update(is_read=True)
+
+            cls.objects.filter(id__in=entry_ids).update(
+                unread_count=Greatest(F('unread_count') - marked, 0),
+                last_read_at=timezone.now(),
+            )
+
+        return marked
+
+    @classmethod
+    def sync_participants(cls, conversation):
+        """
+        Create, remove and relink entries to match the participants.
+
+        New entries are seeded from the conversation's existing messages.
+
+        Args:
+            conversation: Conversation whose participants changed
+        """
+        participant_ids = list(
+            conversation.participants.values_list('id', flat=True))
+        cls.objects.filter(conversation=conversation).exclude(
+            user_id__in=participant_ids).delete()
+
+        entries = {
+            entry.user_id: entry
+            for entry in cls.objects.filter(conversation=conversation)
+        }
+        messages = conversation.private_messages.all()
+        last_message = messages.order_by('-created_at').first()
+
+        for user_id in participant_ids:
+            other_id = next(
+                (pk for pk in participant_ids if pk != user_id), None)
+            entry = entries.get(user_id)
+            if entry is None:
+                cls.objects.get_or_create(
+                    conversation=conversation,
+                    user_id=user_id,
+                    defaults={
+                        'other_participant_id': other_id,
+                        'message_count': messages.count(),
+                        'unread_count': messages.filter(
+                            is_read=False).exclude(sender_id=user_id).count(),
+                        'last_message': last_message,
+                        'last_message_sender_id': (
+                            last_message.sender_id if last_message else None),
+                        'last_message_preview': (
+                            last_message.content[:cls.PREVIEW_LENGTH]
+                            if last_message else ''),
+                        'last_message_at': (
+                            last_message.created_at if last_message else None),
+                    }
+                )
+            elif entry.other_participant_id != other_id:
+                cls.objects.filter(pk=entry.pk).update(
+                    other_participant_id=other_id)
+
 
-        if is_new:
-            # Update conversation's last_message_at
-            self.conversation.last_message_at = self.created_at
-            self.conversation.save(
-                update_fields=['last_message_at', 'updated_at'])
+# =============================================================================
+# BIBLE VERSE STORE
+# =============================================================================
+
+class BibleVerse(models.Model):
+    """
+    A single verse of a locally stored, public-domain Bible translation.
+
+    Populated by the import_verses command and by verses fetched from
+    bible-api.com, so verse lookups are served from the database before
+    any external provider is called.
+    """
+
+    translation = models.CharField(
+        max_length=10,
+        help_text=_('Translation code (e.g., KJV, WEB)')
+    )
+    book_number = models.PositiveSmallIntegerField(
+        help_text=_('Canonical book order (1 = Genesis, 66 = Revelation)')
+    )
+    book = models.CharField(
+        max_length=30,
+        help_text=_('Book display name')
+    )
+    chapter = models.PositiveSmallIntegerField()
+    verse = models.PositiveSmallIntegerField()
+    text = models.TextField()
+
+    class Meta:
+        db_table = 'messaging_bible_verse'
+        ordering = ['translation', 'book_number', 'chapter', 'verse']
+        unique_together = [['translation', 'book_number', 'chapter', 'verse']]
+
+    def __str__(self):
+        return f"{self.book} {self.chapter}:{self.verse} ({self.translation})"
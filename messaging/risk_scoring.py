@@ -0,0 +1,113 @@
+"""
+Content risk scoring for moderation.
+
+Keywords are tested as substrings of the lowercased text and the spam
+regexes are compiled once and searched separately, so matches may
+overlap: a keyword inside a URL or inside another keyword still counts,
+as in the per-pattern loop the moderation views used to run. (A single
+alternation of every pattern cannot do that, since the greedy URL
+pattern consumes the keywords after it, and it was slower: substring
+tests run in C.)
+
+Discussions and comments are scored in save() and keep their score and
+categories on the row; moderation dashboards aggregate the stored values
+instead of re-scanning content.
+
+Scoring (capped at 1.0 overall):
+- crisis_keywords: 0.3 per distinct match, capped at 0.8
+- spam_patterns: 0.2 per distinct match, capped at 0.4
+- inappropriate_language: 0.15 per distinct match, capped at 0.3
+- substance_abuse_triggers: 0.25 per distinct match, capped at 0.5
+"""
+
+import re
+from typing import Dict, List, Tuple
+
+# Content risk patterns (simplified - would be more sophisticated in production)
+RISK_PATTERNS = {
+    'crisis_keywords': [
+        'suicide', 'self-harm', 'kill myself', 'end it all', 'not worth living',
+        'overdose', 'cutting', 'pills', 'bridge', 'gun'
+    ],
+    'spam_patterns': [
+        r'\b(?:buy|purchase|click here|free money|earn \$\d+)\b',
+        r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
+    ],
+    'inappropriate_language': [
+        # This would be a more comprehensive list in production
+        'offensive_term_1', 'offensive_term_2', 'harassment_term'
+    ],
+    'substance_abuse_triggers': [
+        'dealer', 'score', 'fix', 'high quality', 'pure stuff',
+        'connect me', 'hook me up'
+    ]
+}
+
+# Categories whose entries are regular expressions rather than keywords
+REGEX_CATEGORIES = {'spam_patterns'}
+
+# (score per distinct match, cap) for each category
+RISK_WEIGHTS = {
+    'crisis_keywords': (0.3, 0.8),
+    'spam_patterns': (0.2, 0.4),
+    'inappropriate_language': (0.15, 0.3),
+    'substance_abuse_triggers': (0.25, 0.5),
+}
+
+
+class RiskScorer:
+    """Score text against every risk pattern."""
+
+    def __init__(self, patterns: Dict[str, List[str]] = RISK_PATTERNS,
+                 weights: Dict[str, Tuple[float, float]] = RISK_WEIGHTS):
+        """
+        Prepare the keywords and compile the regex entries.
+
+        Args:
+            patterns: Category name to keywords (or regexes for
+                REGEX_CATEGORIES)
+            weights: Category name to (score per match, cap)
+        """
+        self.categories = list(patterns)
+        self.weights = weights
+        self.keywords = {
+            category: list(dict.fromkeys(entry.lower() for entry in entries if entry))
+            for category, entries in patterns.items()
+            if category not in REGEX_CATEGORIES
+        }
+        self.regexes = {
+            category: [re.compile(entry, re.IGNORECASE) for entry in entries]
+            for category, entries in patterns.items()
+            if category in REGEX_CATEGORIES
+        }
+
+    def analyze(self, text: str) -> Tuple[float, List[str]]:
+        """
+        Score text and list the risk categories it falls into.
+
+        Args:
+            text: Content to scan
+
+        Returns:
+            Tuple of (risk score 0.0-1.0, categories in pattern order)
+        """
+        if not text:
+            return 0.0, []
+
+        text_lower = text.lower()
+        risk_score = 0.0
+        categories = []
+        for category in self.categories:
+            if category in self.regexes:
+                matches = sum(1 for regex in self.regexes[category] if regex.search(text_lower))
+            else:
+                matches = sum(1 for keyword in self.keywords[category] if keyword in text_lower)
+            if matches:
+                per_match, cap = self.weights[category]
+                risk_score += min(matches * per_match, cap)
+                categories.append(category)
+
+        return round(min(risk_score, 1.0), 4), categories
+
+
+risk_scorer = RiskScorer()
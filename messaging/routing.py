@@ -0,0 +1,15 @@
+"""
+Websocket URL routing for messaging app.
+"""
+
+from django.urls import path
+
+from . import consumers
+
+websocket_urlpatterns = [
+    path('ws/messaging/inbox/', consumers.InboxConsumer.as_asgi()),
+    path(
+        'ws/messaging/groups/<uuid:group_id>/feed/',
+        consumers.GroupFeedConsumer.as_asgi()
+    ),
+]
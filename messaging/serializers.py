@@ -22,6 +22,7 @@ from .models import (
     Conversation,
     PrivateMessage,
 )
+from .services import MessageHistoryService
 from group.models import Group
 
 User = get_user_model()
@@ -271,13 +272,20 @@ class CommentSerializer(serializers.ModelSerializer):
         return 'discussion'  # Default for legacy comments
 
     def get_replies(self, obj):
-        """Get nested replies (1 level deep to avoid infinite recursion)."""
-        if obj.replies.exists():
+        """
+        Get nested replies (1 level deep to avoid infinite recursion).
+
+        Uses replies assembled by CommentThreadService when present, then
+        prefetched replies, so serializing a page never queries per comment.
+        """
+        replies = getattr(obj, 'thread_replies', None)
+        if replies is None:
             # Only show non-deleted replies
-            replies = obj.replies.filter(is_deleted=False)
-            # Avoid infinite recursion by using a simplified serializer
-            return CommentSimpleSerializer(replies, many=True, context=self.context).data
-        return []
+            replies = [
+                reply for reply in obj.replies.all() if not reply.is_deleted
+            ]
+        # Avoid infinite recursion by using a simplified serializer
+        return CommentSimpleSerializer(replies, many=True, context=self.context).data
 
     def get_can_edit(self, obj):
         """Check if current user can edit this comment."""
@@ -333,6 +341,22 @@ class CommentSerializer(serializers.ModelSerializer):
         return instance
 
 
+class CommentThreadSerializer(CommentSerializer):
+    """
+    Serializer for a top-level comment with its capped reply thread.
+
+    Expects comments assembled by CommentThreadService.build_threads.
+    """
+    reply_count = serializers.IntegerField(read_only=True)
+    has_more_replies = serializers.BooleanField(read_only=True)
+
+    class Meta(CommentSerializer.Meta):
+        fields = CommentSerializer.Meta.fields + [
+            'reply_count',
+            'has_more_replies',
+        ]
+
+
 class CommentSimpleSerializer(serializers.ModelSerializer):
     """
     Simplified comment serializer (for nested replies, no recursion).
@@ -1411,6 +1435,10 @@ class ConversationContextSerializer(serializers.Serializer):
 class ConversationListSerializer(serializers.ModelSerializer):
     """
     List serializer for conversations (lightweight for inbox view).
+
+    Reads the denormalized InboxEntry attached as ``obj.inbox_entry`` by
+    ConversationViewSet.list, falling back to per-conversation queries
+    when serializing a conversation on its own.
     """
     other_participant = serializers.SerializerMethodField()
     context = ConversationContextSerializer(source='*', read_only=True)
@@ -1436,6 +1464,11 @@ class ConversationListSerializer(serializers.ModelSerializer):
 
     def get_other_participant(self, obj):
         """Get the other participant (not the current user)."""
+        entry = getattr(obj, 'inbox_entry', None)
+        if entry is not None:
+            other = entry.other_participant
+            return UserMinimalSerializer(other).data if other else None
+
         request = self.context.get('request')
         if request and request.user:
             other = obj.get_other_participant(request.user)
@@ -1446,6 +1479,17 @@ class ConversationListSerializer(serializers.ModelSerializer):
     def get_last_message(self, obj):
         """Get preview of the last message."""
         request = self.context.get('request')
+        entry = getattr(obj, 'inbox_entry', None)
+        if entry is not None:
+            if entry.last_message_id is None:
+                return None
+            return {
+                'content': entry.last_message_preview,
+                'sender_id': str(entry.last_message_sender_id),
+                'is_mine': entry.last_message_sender_id == request.user.id if request else False,
+                'created_at': entry.last_message_at,
+            }
+
         last_msg = obj.private_messages.order_by('-created_at').first()
         if last_msg:
             return {
@@ -1458,6 +1502,10 @@ class ConversationListSerializer(serializers.ModelSerializer):
 
     def get_unread_count(self, obj):
         """Get count of unread messages for current user."""
+        entry = getattr(obj, 'inbox_entry', None)
+        if entry is not None:
+            return entry.unread_count
+
         request = self.context.get('request')
         if request and request.user:
             return obj.get_unread_count(request.user)
@@ -1465,16 +1513,24 @@ class ConversationListSerializer(serializers.ModelSerializer):
 
     def get_message_count(self, obj):
         """Get total message count."""
+        entry = getattr(obj, 'inbox_entry', None)
+        if entry is not None:
+            return entry.message_count
         return obj.private_messages.count()
 
 
 class ConversationDetailSerializer(serializers.ModelSerializer):
     """
-    Detail serializer for conversations with full message history.
+    Detail serializer for conversations with the latest page of messages.
+
+    Older history is loaded through GET /conversations/{id}/messages/ with
+    the cursors in ``messages_page``. A page already loaded by the view can
+    be passed in as the ``message_page`` context entry.
     """
     participants = UserMinimalSerializer(many=True, read_only=True)
     context = ConversationContextSerializer(source='*', read_only=True)
     messages = serializers.SerializerMethodField()
+    messages_page = serializers.SerializerMethodField()
     unread_count = serializers.SerializerMethodField()
     message_count = serializers.SerializerMethodField()
     closed_by_user = serializers.SerializerMethodField()
@@ -1497,16 +1553,50 @@ class ConversationDetailSerializer(serializers.ModelSerializer):
             'close_reason',
             'unread_count',
             'messages',
+            'messages_page',
         ]
         read_only_fields = fields
 
+    def _get_message_page(self, obj):
+        """Get the page of messages to embed, loading the newest if needed."""
+        page = self.context.get('message_page')
+        if page is None:
+            if not hasattr(obj, 'message_page'):
+                obj.message_page = MessageHistoryService.get_page(obj)
+            page = obj.message_page
+        return page
+
+    def _get_inbox_entry(self, obj):
+        """Get the current user's inbox entry for its stored counters."""
+        request = self.context.get('request')
+        if not request or not request.user.is_authenticated:
+            return None
+        if not hasattr(obj, 'inbox_entry'):
+            obj.inbox_entry = obj.inbox_entries.filter(
+                user=request.user).first()
+        return obj.inbox_entry
+
     def get_messages(self, obj):
-        """Get all messages in the conversation."""
-        messages = obj.private_messages.select_related('sender').all()
+        """Get the latest page of messages in the conversation."""
+        messages = self._get_message_page(obj)['messages']
         return PrivateMessageSerializer(messages, many=True).data
 
+    def get_messages_page(self, obj):
+        """Get cursors for loading older or newer messages."""
+        page = self._get_message_page(obj)
+        return {
+            'has_older': page['has_older'],
+            'has_newer': page['has_newer'],
+            'before_cursor': page['before_cursor'],
+            'after_cursor': page['after_cursor'],
+        }
+
     def get_unread_count(self, obj):
         """Get count of unread messages for current user."""
+        entry = self._get_inbox_entry(obj)
+        if entry is not None:
+            return entry.unread_count
+
         request = self.context.get('request')
         if request and request.user:
             return obj.get_unread_count(request.user)
@@ -1514,6 +1604,9 @@ class ConversationDetailSerializer(serializers.ModelSerializer):
 
     def get_message_count(self, obj):
         """Get total message count."""
+        entry = self._get_inbox_entry(obj)
+        if entry is not None:
+            return entry.message_count
         return obj.private_messages.count()
 
     def get_closed_by_user(self, obj):
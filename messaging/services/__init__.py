@@ -6,6 +6,9 @@ from .bible_api import BibleAPIService, bible_service
 from .notification_service import NotificationService, notification_service
 from .cache_service import CacheService
 from .feed_service import FeedService
+from .comment_thread_service import CommentThreadService
+from .message_history_service import MessageHistoryService
+from .realtime_service import RealtimeService
 
 __all__ = [
     'BibleAPIService',
@@ -14,4 +17,7 @@ __all__ = [
     'notification_service',
     'CacheService',
     'FeedService',
+    'CommentThreadService',
+    'MessageHistoryService',
+    'RealtimeService',
 ]
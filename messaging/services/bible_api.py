@@ -2,100 +2,108 @@
 Bible API Service with multi-provider support and circuit breaker pattern.
 
 Supports multiple Bible API providers with automatic fallback:
-1. Bible API (primary) - https://bible-api.com/
-2. ESV API (fallback) - https://api.esv.org/
+1. Local verse store (imported public-domain translations)
+2. Bible API (primary) - https://bible-api.com/
+3. ESV API (fallback) - https://api.esv.org/
 
 Features:
+- Local-first lookups from the BibleVerse table
 - Multi-provider support with automatic fallback
-- Circuit breaker pattern for resilient API calls
+- Circuit breaker pattern for resilient API calls, shared across processes
 - Caching for frequently accessed verses
+- Single-flight fetching: concurrent misses for the same verse share one
+  upstream request
+- Pooled HTTP connections shared by all outbound requests
 - Translation support (KJV, NIV, ESV, etc.)
 - Verse reference parsing
 """
 
 import re
+import threading
+import time
 import requests
 import logging
 from typing import Dict, Optional, Tuple
 from django.core.cache import cache
 from django.conf import settings
+from requests.adapters import HTTPAdapter
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
 
+from core.circuit_breaker import get_circuit_breaker, raise_for_server_error
+
+from .cache_service import CacheService
+from .verse_store import VerseStore
+
 logger = logging.getLogger(__name__)
 
 
-class CircuitBreaker:
-    """
-    Simple circuit breaker implementation.
+def _build_http_session() -> requests.Session:
+    """Build the pooled session shared by all Bible API requests."""
+    pool_size = getattr(settings, 'BIBLE_API_POOL_SIZE', 10)
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# Shared by every BibleAPIService instance so connections are reused
+http_session = _build_http_session()
 
-    States:
-    - CLOSED: Normal operation, requests go through
-    - OPEN: Too many failures, requests fail fast
-    - HALF_OPEN: Testing if service recovered
+
+class SingleFlight:
     """
+    Coalesce concurrent calls for the same key within a process.
 
-    CLOSED = 'closed'
-    OPEN = 'open'
-    HALF_OPEN = 'half_open'
+    The first caller for a key runs the function; callers arriving while
+    it runs wait for and share its result (or exception).
+    """
 
-    def __init__(self, failure_threshold=5, timeout=60):
-        """
-        Initialize circuit breaker.
+    class _Call:
+        def __init__(self):
+            self.event = threading.Event()
+            self.result = None
+            self.error = None
 
-        Args:
-            failure_threshold: Number of failures before opening circuit
-            timeout: Seconds to wait before trying again (half-open)
-        """
-        self.failure_threshold = failure_threshold
-        self.timeout = timeout
-        self.failure_count = 0
-        self.state = self.CLOSED
-        self.last_failure_time = None
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
 
-    def call(self, func, *args, **kwargs):
+    def do(self, key, func):
         """
-        Execute function with circuit breaker protection.
+        Run func once for all concurrent callers of key.
 
         Args:
-            func: Function to execute
-            *args, **kwargs: Function arguments
+            key: Deduplication key
+            func: Zero-argument callable
 
         Returns:
-            Function result
-
-        Raises:
-            Exception: If circuit is open or function fails
+            Result of func
         """
-        import time
-
-        if self.state == self.OPEN:
-            # Check if timeout expired
-            if time.time() - self.last_failure_time >= self.timeout:
-                self.state = self.HALF_OPEN
-                logger.info("Circuit breaker entering HALF_OPEN state")
-            else:
-                raise Exception("Circuit breaker is OPEN")
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
 
         try:
-            result = func(*args, **kwargs)
-            # Success - reset circuit
-            if self.state == self.HALF_OPEN:
-                self.state = self.CLOSED
-                logger.info("Circuit breaker CLOSED after successful call")
-            self.failure_count = 0
-            return result
-
+            call.result = func()
+            return call.result
         except Exception as e:
-            self.failure_count += 1
-            self.last_failure_time = time.time()
-
-            if self.failure_count >= self.failure_threshold:
-                self.state = self.OPEN
-                logger.warning(
-                    f"Circuit breaker OPENED after {self.failure_count} failures")
-
-            raise e
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
 
 
 class BibleAPIService:
@@ -126,13 +134,19 @@ class BibleAPIService:
     }
 
     # Cache settings
-    CACHE_TTL = 60 * 60 * 24 * 7  # 7 days (verses don't change)
+    CACHE_TTL = CacheService.VERSE_TIMEOUT  # 7 days (verses don't change)
+
+    # Cross-process fetch lock: while one worker fetches a verse, other
+    # workers poll the cache for its result instead of fetching it too
+    FETCH_LOCK_TIMEOUT = 15
+    FETCH_WAIT = 10
+    FETCH_POLL_INTERVAL = 0.05
 
     def __init__(self):
         """Initialize Bible API service with circuit breakers."""
-        self.bible_api_breaker = CircuitBreaker(
-            failure_threshold=3, timeout=60)
-        self.esv_api_breaker = CircuitBreaker(failure_threshold=3, timeout=60)
+        self.bible_api_breaker = get_circuit_breaker('bible_api')
+        self.esv_api_breaker = get_circuit_breaker('esv_api')
+        self.single_flight = SingleFlight()
 
     def get_verse(
         self,
@@ -142,6 +156,10 @@ class BibleAPIService:
         """
         Fetch Bible verse with automatic provider fallback.
 
+        Verses are served from the cache, then the local verse store, and
+        only then from the external providers. Concurrent misses for the
+        same verse are coalesced into a single fetch.
+
         Args:
             reference: Bible reference (e.g., "John 3:16", "Psalm 23:1-6")
             translation: Bible translation (KJV, NIV, ESV, etc.)
@@ -164,12 +182,139 @@ class BibleAPIService:
             )
 
         # Check cache first
-        cache_key = f"bible_verse:{translation}:{reference}"
+        cache_key = CacheService.get_verse_key(reference, translation)
         cached_verse = cache.get(cache_key)
         if cached_verse:
             logger.info(f"Cache hit for {reference} ({translation})")
             return cached_verse
 
+        return self.single_flight.do(
+            cache_key,
+            lambda: self._load_verse(reference, translation, cache_key)
+        )
+
+    def _load_verse(
+        self,
+        reference: str,
+        translation: str,
+        cache_key: str
+    ) -> Dict[str, str]:
+        """
+        Load an uncached verse locally or from the providers and cache it.
+
+        Args:
+            reference: Normalized Bible reference
+            translation: Bible translation
+            cache_key: Cache key for the verse
+
+        Returns:
+            Verse data dict
+        """
+        verse_data = self._lookup_local(reference, translation)
+        if verse_data:
+            cache.set(cache_key, verse_data, self.CACHE_TTL)
+            return verse_data
+
+        # Only one worker fetches a verse at a time; the others wait for
+        # its result and fetch themselves only if it fails or never arrives
+        lock_key = f"{cache_key}:lock"
+        locked = cache.add(lock_key, True, self.FETCH_LOCK_TIMEOUT)
+        if not locked:
+            verse_data = self._wait_for_cached_verse(cache_key, lock_key)
+            if verse_data:
+                return verse_data
+
+        try:
+            return self._fetch_from_providers(reference, translation, cache_key)
+        finally:
+            if locked:
+                cache.delete(lock_key)
+
+    def _lookup_local(
+        self,
+        reference: str,
+        translation: str
+    ) -> Optional[Dict[str, str]]:
+        """
+        Look up a verse in the local verse store.
+
+        Args:
+            reference: Bible reference
+            translation: Requested translation
+
+        Returns:
+            Verse data dict, or None if the passage is not stored
+        """
+        local_translation = self.BIBLE_API_TRANSLATIONS.get(
+            translation, 'kjv').upper()
+
+        try:
+            local_verse = VerseStore.lookup(reference, local_translation)
+        except Exception as e:
+            logger.warning(f"Local verse lookup failed: {str(e)}")
+            return None
+
+        if not local_verse:
+            return None
+
+        logger.info(f"Local store hit for {reference} ({local_translation})")
+        return {
+            'reference': local_verse['reference'],
+            'text': local_verse['text'],
+            'translation': translation,
+            'translation_note': f"Retrieved as {local_translation} from local verse store" if local_translation != translation else None,
+            'source': 'local',
+        }
+
+    def _wait_for_cached_verse(
+        self,
+        cache_key: str,
+        lock_key: str
+    ) -> Optional[Dict[str, str]]:
+        """
+        Wait for another worker to cache a verse it is fetching.
+
+        The fetching worker caches the verse before releasing its lock, so
+        a released lock without a cached verse means its fetch failed.
+
+        Args:
+            cache_key: Cache key for the verse
+            lock_key: Cache key of the other worker's fetch lock
+
+        Returns:
+            Cached verse data, or None if the fetch failed or did not
+            finish in time
+        """
+        deadline = time.monotonic() + self.FETCH_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(self.FETCH_POLL_INTERVAL)
+            values = cache.get_many([cache_key, lock_key])
+            if values.get(cache_key):
+                return values[cache_key]
+            if lock_key not in values:
+                return None
+        return None
+
+    def _fetch_from_providers(
+        self,
+        reference: str,
+        translation: str,
+        cache_key: str
+    ) -> Dict[str, str]:
+        """
+        Fetch a verse from the external providers in order.
+
+        Args:
+            reference: Bible reference
+            translation: Bible translation
+            cache_key: Cache key for the verse
+
+        Returns:
+            Verse data dict
+
+        Raises:
+            ValidationError: If all providers fail
+        """
         # Try providers in order
         providers = [
             ('bible-api.com', self._fetch_from_bible_api),
@@ -211,6 +356,9 @@ class BibleAPIService:
         """
         Fetch verse from bible-api.com.
 
+        The individual verses in the response are public domain (KJV/WEB)
+        and are written to the local verse store for later lookups.
+
         Args:
             reference: Bible reference
             translation: Bible translation
@@ -218,34 +366,53 @@ class BibleAPIService:
         Returns:
             Verse data dict
         """
+        # Map to bible-api.com supported translations
+        bible_api_translation = self.BIBLE_API_TRANSLATIONS.get(
+            translation, 'kjv'
+        )
+
         def make_request():
             # bible-api.com URL format: /reference?translation=KJV
-            # Map to bible-api.com supported translations
-            bible_api_translation = self.BIBLE_API_TRANSLATIONS.get(
-                translation, 'kjv'
-            )
-
             url = f"{self.BIBLE_API_BASE}/{reference}"
             params = {'translation': bible_api_translation}
 
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
+            response = http_session.get(url, params=params, timeout=10)
+            raise_for_server_error(response)
+            return response
 
-            data = response.json()
+        response = self.bible_api_breaker.call(make_request)
+        # Client errors (an unknown reference) are not provider failures
+        response.raise_for_status()
+        data = response.json()
 
-            # Parse response
-            if not data.get('text'):
-                raise ValidationError(f"Verse not found: {reference}")
+        # Parse response
+        if not data.get('text'):
+            raise ValidationError(f"Verse not found: {reference}")
 
-            return {
-                'reference': data.get('reference', reference),
-                'text': data['text'].strip(),
-                'translation': translation,  # Return requested translation
-                'translation_note': f"Retrieved as {bible_api_translation.upper()} from bible-api.com" if bible_api_translation != translation.lower() else None,
-                'source': 'bible-api.com',
-            }
+        if data.get('verses'):
+            try:
+                VerseStore.save_verses(
+                    bible_api_translation.upper(),
+                    [
+                        {
+                            'book': verse.get('book_name'),
+                            'chapter': verse.get('chapter'),
+                            'verse': verse.get('verse'),
+                            'text': verse.get('text'),
+                        }
+                        for verse in data['verses']
+                    ]
+                )
+            except Exception as e:
+                logger.warning(f"Failed to store fetched verses: {str(e)}")
 
-        return self.bible_api_breaker.call(make_request)
+        return {
+            'reference': data.get('reference', reference),
+            'text': data['text'].strip(),
+            'translation': translation,  # Return requested translation
+            'translation_note': f"Retrieved as {bible_api_translation.upper()} from bible-api.com" if bible_api_translation != translation.lower() else None,
+            'source': 'bible-api.com',
+        }
 
     def _fetch_from_esv_api(
         self,
@@ -288,29 +455,31 @@ class BibleAPIService:
                 'include-passage-references': False,
             }
 
-            response = requests.get(
+            response = http_session.get(
                 self.ESV_API_BASE,
                 params=params,
                 headers=headers,
                 timeout=10
             )
-            response.raise_for_status()
-
-            data = response.json()
-
-            # Parse response
-            passages = data.get('passages', [])
-            if not passages or not passages[0]:
-                raise ValidationError(f"Verse not found: {reference}")
-
-            return {
-                'reference': reference,
-                'text': passages[0].strip(),
-                'translation': 'ESV',
-                'source': 'ESV API',
-            }
-
-        return self.esv_api_breaker.call(make_request)
+            raise_for_server_error(response)
+            return response
+
+        response = self.esv_api_breaker.call(make_request)
+        # Client errors (a bad reference or API key) are not provider failures
+        response.raise_for_status()
+        data = response.json()
+
+        # Parse response
+        passages = data.get('passages', [])
+        if not passages or not passages[0]:
+            raise ValidationError(f"Verse not found: {reference}")
+
+        return {
+            'reference': reference,
+            'text': passages[0].strip(),
+            'translation': 'ESV',
+            'source': 'ESV API',
+        }
 
     def _normalize_reference(self, reference: str) -> str:
         """
@@ -0,0 +1,128 @@
+"""
+Comment thread service for loading complete reply trees.
+
+Fetches every comment on a content item in a single query and assembles
+the reply tree in memory, replacing per-comment reply lookups when a
+whole conversation is rendered.
+"""
+
+from collections import defaultdict
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CommentThreadService:
+    """Single-query comment thread loader with per-thread reply caps."""
+
+    REPLY_LIMIT = 3
+    MAX_REPLY_LIMIT = 50
+
+    @classmethod
+    def normalize_reply_limit(cls, reply_limit):
+        """
+        Clamp a requested reply cap to the allowed range.
+
+        Args:
+            reply_limit: Requested replies per thread (None for default)
+
+        Returns:
+            int: Replies to inline per thread
+        """
+        if reply_limit is None:
+            return cls.REPLY_LIMIT
+        return max(0, min(int(reply_limit), cls.MAX_REPLY_LIMIT))
+
+    @classmethod
+    def load_comments(cls, queryset):
+        """
+        Fetch all comments of a content item, including soft-deleted ones.
+
+        Deleted rows are loaded so replies below a deleted comment can still
+        be placed in their thread; they are never returned to callers.
+
+        Args:
+            queryset: Comments scoped to a single content item
+
+        Returns:
+            list: Comments ordered by creation time
+        """
+        return list(
+            queryset.select_related(
+                'content_type', 'author', 'author__profile_photo'
+            ).order_by('created_at', 'id')
+        )
+
+    @classmethod
+    def build_threads(cls, comments, reply_limit=None):
+        """
+        Assemble comments into threads keyed by their top-level comment.
+
+        Every reply, however deeply nested, is grouped under its root and
+        ordered by creation time, so threads read as (root, created_at).
+        Each returned root carries:
+            thread_replies: the first ``reply_limit`` visible replies
+            reply_count: total visible replies in the thread
+            has_more_replies: whether replies were cut off by the cap
+
+        Args:
+            comments: Comments ordered by creation time (see load_comments)
+            reply_limit: Replies to inline per thread (None for default)
+
+        Returns:
+            list: Visible top-level comments in creation order
+        """
+        reply_limit = cls.normalize_reply_limit(reply_limit)
+        threads = cls._group_by_root(comments)
+
+        roots = []
+        for comment in comments:
+            if comment.parent_id is not None or comment.is_deleted:
+                continue
+            replies = threads.get(comment.pk, [])
+            comment.thread_replies = replies[:reply_limit]
+            comment.reply_count = len(replies)
+            comment.has_more_replies = len(replies) > reply_limit
+            roots.append(comment)
+
+        return roots
+
+    @classmethod
+    def get_thread_replies(cls, comments, root_id):
+        """
+        Return every visible reply in one comment's thread.
+
+        Args:
+            comments: Comments ordered by creation time (see load_comments)
+            root_id: ID of the top-level comment
+
+        Returns:
+            list: Replies in creation order
+        """
+        return cls._group_by_root(comments).get(root_id, [])
+
+    @classmethod
+    def _group_by_root(cls, comments):
+        """Map each root comment ID to its visible replies in creation order."""
+        parents = {comment.pk: comment.parent_id for comment in comments}
+        roots = {}
+
+        def find_root(comment_id):
+            path = []
+            while parents.get(comment_id) is not None:
+                if comment_id in roots:
+                    break
+                path.append(comment_id)
+                comment_id = parents[comment_id]
+            root_id = roots.get(comment_id, comment_id)
+            for node_id in path:
+                roots[node_id] = root_id
+            return root_id
+
+        threads = defaultdict(list)
+        for comment in comments:
+            if comment.parent_id is None or comment.is_deleted:
+                continue
+            threads[find_root(comment.pk)].append(comment)
+
+        return threads
@@ -0,0 +1,130 @@
+"""
+Message history service for cursor-paginated private conversations.
+
+Pages are keyed on (created_at, id) and read through the
+(conversation, created_at) index, so loading any page of a conversation
+costs O(page size) regardless of how long its history is.
+"""
+
+import base64
+import binascii
+import logging
+import uuid
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+logger = logging.getLogger(__name__)
+
+
+class MessageHistoryService:
+    """Keyset pagination over a conversation's messages."""
+
+    PAGE_SIZE = 50
+    MAX_PAGE_SIZE = 100
+
+    @classmethod
+    def encode_cursor(cls, message):
+        """
+        Encode a message's position as an opaque cursor.
+
+        Args:
+            message: PrivateMessage marking the position
+
+        Returns:
+            str: URL-safe cursor
+        """
+        raw = f"{message.created_at.isoformat()}|{message.id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @classmethod
+    def decode_cursor(cls, cursor):
+        """
+        Decode a cursor into its (created_at, id) position.
+
+        Args:
+            cursor: Cursor produced by encode_cursor
+
+        Returns:
+            tuple: (datetime, UUID)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            created_at, message_id = raw.split('|')
+            position = (parse_datetime(created_at), uuid.UUID(message_id))
+        except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+            raise ValueError(f"Invalid cursor: {e}")
+
+        if position[0] is None:
+            raise ValueError("Invalid cursor timestamp")
+        return position
+
+    @classmethod
+    def get_page(cls, conversation, before=None, after=None, page_size=None):
+        """
+        Get one page of a conversation's messages in chronological order.
+
+        Without a cursor the newest page is returned. ``before`` pages back
+        through older history and ``after`` pages forward to newer messages.
+
+        Args:
+            conversation: Conversation to read
+            before: Cursor; return messages older than this position
+            after: Cursor; return messages newer than this position
+            page_size: Messages per page (default: 50, max: 100)
+
+        Returns:
+            dict: Page data
+                {
+                    'messages': List of PrivateMessage, oldest first,
+                    'has_older': bool,
+                    'has_newer': bool,
+                    'before_cursor': Cursor for the previous (older) page,
+                    'after_cursor': Cursor for the next (newer) page,
+                }
+
+        Raises:
+            ValueError: If a cursor is malformed or both are given
+        """
+        if before and after:
+            raise ValueError("Use either before or after, not both")
+
+        if page_size is None:
+            page_size = cls.PAGE_SIZE
+        page_size = max(1, min(page_size, cls.MAX_PAGE_SIZE))
+
+        queryset = conversation.private_messages.select_related(
+            'sender', 'sender__profile_photo')
+
+        if after:
+            created_at, message_id = cls.decode_cursor(after)
+            rows = list(queryset.filter(
+                Q(created_at__gt=created_at) |
+                Q(created_at=created_at, id__gt=message_id)
+            ).order_by('created_at', 'id')[:page_size + 1])
+            has_newer = len(rows) > page_size
+            messages = rows[:page_size]
+            has_older = True
+        else:
+            if before:
+                created_at, message_id = cls.decode_cursor(before)
+                queryset = queryset.filter(
+                    Q(created_at__lt=created_at) |
+                    Q(created_at=created_at, id__lt=message_id)
+                )
+            rows = list(
+                queryset.order_by('-created_at', '-id')[:page_size + 1])
+            has_older = len(rows) > page_size
+            messages = list(reversed(rows[:page_size]))
+            has_newer = bool(before)
+
+        return {
+            'messages': messages,
+            'has_older': has_older,
+            'has_newer': has_newer,
+            'before_cursor': cls.encode_cursor(messages[0]) if messages else before,
+            'after_cursor': cls.encode_cursor(messages[-1]) if messages else after,
+        }
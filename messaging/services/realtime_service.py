@@ -0,0 +1,140 @@
+"""
+Realtime service for pushing inbox and feed events over websockets.
+
+Events are published to channel layer groups after the surrounding
+transaction commits, so clients never see data that was rolled back and
+can stop polling ConversationViewSet and FeedViewSet for changes.
+
+Groups:
+    user_<user_id>: Inbox events for one user (all their connections)
+    group_feed_<group_id>: Feed events for members of one group
+"""
+
+import json
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+class RealtimeService:
+    """Publish realtime events to websocket consumers."""
+
+    @staticmethod
+    def user_group(user_id):
+        """Channel layer group receiving a user's inbox events."""
+        return f"user_{user_id}"
+
+    @staticmethod
+    def feed_group(group_id):
+        """Channel layer group receiving a group's feed events."""
+        return f"group_feed_{group_id}"
+
+    @classmethod
+    def publish_on_commit(cls, group_name, handler, event_type, payload):
+        """
+        Publish an event once the current transaction commits.
+
+        Args:
+            group_name: Channel layer group to publish to
+            handler: Consumer method handling the event (e.g. 'inbox.event')
+            event_type: Event name delivered to clients
+            payload: JSON-serializable event data
+        """
+        transaction.on_commit(
+            lambda: cls.publish(group_name, handler, event_type, payload))
+
+    @classmethod
+    def publish(cls, group_name, handler, event_type, payload):
+        """
+        Publish an event immediately.
+
+        Failures are logged and swallowed; realtime delivery is best effort
+        and clients resynchronize over the REST API on reconnect.
+
+        Args:
+            group_name: Channel layer group to publish to
+            handler: Consumer method handling the event (e.g. 'inbox.event')
+            event_type: Event name delivered to clients
+            payload: JSON-serializable event data
+        """
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+
+        try:
+            async_to_sync(channel_layer.group_send)(group_name, {
+                'type': handler,
+                'event': event_type,
+                # Normalize UUIDs and datetimes for msgpack-based layers
+                'payload': json.loads(json.dumps(payload, cls=DjangoJSONEncoder)),
+            })
+        except Exception as e:
+            logger.warning(
+                f"Failed to publish {event_type} to {group_name}: {e}")
+
+    @classmethod
+    def publish_message_created(cls, message):
+        """
+        Notify every participant of a new private message after commit.
+
+        Each participant receives their own unread count from the inbox
+        entries, so clients can update badges without refetching.
+
+        Args:
+            message: The PrivateMessage that was just created
+        """
+        transaction.on_commit(lambda: cls._send_message_created(message))
+
+    @classmethod
+    def _send_message_created(cls, message):
+        """Fan a committed message out to the participants' inbox groups."""
+        from ..models import InboxEntry
+
+        entries = InboxEntry.objects.filter(
+            conversation_id=message.conversation_id
+        ).values_list('user_id', 'unread_count')
+
+        for user_id, unread_count in entries:
+            cls.publish(cls.user_group(user_id), 'inbox.event', 'message.created', {
+                'conversation_id': message.conversation_id,
+                'message': {
+                    'id': message.id,
+                    'sender_id': message.sender_id,
+                    'content': message.content,
+                    'created_at': message.created_at,
+                },
+                'is_mine': user_id == message.sender_id,
+                'unread_count': unread_count,
+            })
+
+    @classmethod
+    def publish_feed_item(cls, feed_item, event_type):
+        """
+        Notify a group's members of a feed change after commit.
+
+        Args:
+            feed_item: FeedItem that was created, updated or deleted
+            event_type: 'feed.item_created', 'feed.item_updated' or
+                'feed.item_deleted'
+        """
+        if event_type == 'feed.item_created':
+            from .feed_service import FeedService
+            payload = FeedService._serialize_feed_item(feed_item)
+        else:
+            payload = {
+                'id': feed_item.id,
+                'content_type': feed_item.content_type,
+                'content_id': feed_item.content_id,
+                'comment_count': feed_item.comment_count,
+                'reaction_count': feed_item.reaction_count,
+                'is_pinned': feed_item.is_pinned,
+                'is_deleted': feed_item.is_deleted,
+            }
+
+        cls.publish_on_commit(
+            cls.feed_group(feed_item.group_id), 'feed.event', event_type, payload)
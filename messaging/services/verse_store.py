@@ -0,0 +1,205 @@
+"""
+Local Bible verse store.
+
+Serves verse lookups for public-domain translations (KJV, WEB) from the
+BibleVerse table so that the external Bible APIs are only called for
+passages that have not been imported or fetched before.
+"""
+
+import logging
+import re
+from typing import Dict, Iterable, List, Optional
+
+from ..models import BibleVerse
+
+logger = logging.getLogger(__name__)
+
+
+# Canonical book order, indexed by book_number - 1
+BOOKS = [
+    'Genesis', 'Exodus', 'Leviticus', 'Numbers', 'Deuteronomy', 'Joshua',
+    'Judges', 'Ruth', '1 Samuel', '2 Samuel', '1 Kings', '2 Kings',
+    '1 Chronicles', '2 Chronicles', 'Ezra', 'Nehemiah', 'Esther', 'Job',
+    'Psalms', 'Proverbs', 'Ecclesiastes', 'Song of Solomon', 'Isaiah',
+    'Jeremiah', 'Lamentations', 'Ezekiel', 'Daniel', 'Hosea', 'Joel', 'Amos',
+    'Obadiah', 'Jonah', 'Micah', 'Nahum', 'Habakkuk', 'Zephaniah', 'Haggai',
+    'Zechariah', 'Malachi', 'Matthew', 'Mark', 'Luke', 'John', 'Acts',
+    'Romans', '1 Corinthians', '2 Corinthians', 'Galatians', 'Ephesians',
+    'Philippians', 'Colossians', '1 Thessalonians', '2 Thessalonians',
+    '1 Timothy', '2 Timothy', 'Titus', 'Philemon', 'Hebrews', 'James',
+    '1 Peter', '2 Peter', '1 John', '2 John', '3 John', 'Jude', 'Revelation',
+]
+
+# Alternative spellings that differ from the canonical name
+BOOK_ALIASES = {
+    'psalm': 'Psalms',
+    'song of songs': 'Song of Solomon',
+    'songs': 'Song of Solomon',
+    'canticles': 'Song of Solomon',
+    'revelations': 'Revelation',
+    'revelation of john': 'Revelation',
+}
+
+BOOK_NUMBERS = {
+    re.sub(r'\s+', '', name.lower()): number
+    for number, name in enumerate(BOOKS, start=1)
+}
+BOOK_NUMBERS.update({
+    re.sub(r'\s+', '', alias): BOOK_NUMBERS[re.sub(r'\s+', '', name.lower())]
+    for alias, name in BOOK_ALIASES.items()
+})
+
+# Translations that may be stored locally
+LOCAL_TRANSLATIONS = ['KJV', 'WEB']
+
+REFERENCE_PATTERN = re.compile(
+    r'^\s*(?P<book>[1-3]?\s*[A-Za-z][A-Za-z ]*?)\s*'
+    r'(?P<chapter>\d+)\s*:\s*(?P<start>\d+)(?:\s*-\s*(?P<end>\d+))?\s*$'
+)
+
+
+class VerseStore:
+    """Read and write verses in the local BibleVerse table."""
+
+    @classmethod
+    def get_book_number(cls, book: str) -> Optional[int]:
+        """
+        Resolve a book name to its canonical number.
+
+        Args:
+            book: Book name in any case or spacing (e.g., "1corinthians")
+
+        Returns:
+            Book number (1-66) or None if the book is unknown
+        """
+        return BOOK_NUMBERS.get(re.sub(r'\s+', '', book.lower()))
+
+    @classmethod
+    def parse_reference(cls, reference: str) -> Optional[Dict]:
+        """
+        Parse a single-chapter reference such as "Psalm 23:1-6".
+
+        Args:
+            reference: Bible reference
+
+        Returns:
+            Dict with book_number, chapter, start and end, or None if the
+            reference cannot be served from the local store
+        """
+        match = REFERENCE_PATTERN.match(reference)
+        if not match:
+            return None
+
+        book_number = cls.get_book_number(match.group('book'))
+        if book_number is None:
+            return None
+
+        start = int(match.group('start'))
+        end = int(match.group('end') or start)
+        if end < start:
+            return None
+
+        return {
+            'book_number': book_number,
+            'chapter': int(match.group('chapter')),
+            'start': start,
+            'end': end,
+        }
+
+    @classmethod
+    def lookup(cls, reference: str, translation: str) -> Optional[Dict[str, str]]:
+        """
+        Look up a passage in the local store.
+
+        A passage is only returned when every verse in its range is stored,
+        so partial imports fall through to the external providers.
+
+        Args:
+            reference: Bible reference (e.g., "John 3:16", "Psalm 23:1-6")
+            translation: Local translation code (KJV or WEB)
+
+        Returns:
+            Dict with keys: reference, text, translation, or None on a miss
+        """
+        parsed = cls.parse_reference(reference)
+        if parsed is None:
+            return None
+
+        verses = list(
+            BibleVerse.objects.filter(
+                translation=translation,
+                book_number=parsed['book_number'],
+                chapter=parsed['chapter'],
+                verse__gte=parsed['start'],
+                verse__lte=parsed['end'],
+            ).order_by('verse').values_list('verse', 'text')
+        )
+        if len(verses) != parsed['end'] - parsed['start'] + 1:
+            return None
+
+        book = BOOKS[parsed['book_number'] - 1]
+        canonical = f"{book} {parsed['chapter']}:{parsed['start']}"
+        if parsed['end'] != parsed['start']:
+            canonical += f"-{parsed['end']}"
+
+        return {
+            'reference': canonical,
+            'text': ' '.join(text.strip() for _, text in verses),
+            'translation': translation,
+        }
+
+    @classmethod
+    def build_verses(cls, translation: str, rows: Iterable[Dict]) -> List[BibleVerse]:
+        """
+        Build unsaved BibleVerse instances from raw verse rows.
+
+        Rows need book (name) or book_number, chapter, verse and text; rows
+        with an unknown book or empty text are skipped.
+
+        Args:
+            translation: Local translation code
+            rows: Iterable of verse dicts
+
+        Returns:
+            List of BibleVerse instances
+        """
+        verses = []
+        for row in rows:
+            book_number = row.get('book_number')
+            if book_number is None:
+                book_number = cls.get_book_number(row.get('book') or '')
+            text = (row.get('text') or '').strip()
+            if not book_number or not 1 <= int(book_number) <= len(BOOKS) or not text:
+                continue
+
+            book_number = int(book_number)
+            verses.append(BibleVerse(
+                translation=translation,
+                book_number=book_number,
+                book=BOOKS[book_number - 1],
+                chapter=int(row['chapter']),
+                verse=int(row['verse']),
+                text=text,
+            ))
+        return verses
+
+    @classmethod
+    def save_verses(cls, translation: str, rows: Iterable[Dict], batch_size: int = 1000) -> int:
+        """
+        Store verses, leaving already stored verses untouched.
+
+        Args:
+            translation: Local translation code
+            rows: Iterable of verse dicts (see build_verses)
+            batch_size: Rows per INSERT statement
+
+        Returns:
+            Number of verses submitted for insert
+        """
+        if translation not in LOCAL_TRANSLATIONS:
+            return 0
+
+        verses = cls.build_verses(translation, rows)
+        BibleVerse.objects.bulk_create(
+            verses, batch_size=batch_size, ignore_conflicts=True)
+        return len(verses)
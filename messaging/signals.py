@@ -4,7 +4,7 @@ Signals for messaging app.
 Handles automatic FeedItem creation, count updates, and cache invalidation.
 """
 
-from django.db.models.signals import post_save, post_delete, pre_save
+from django.db.models.signals import post_save, post_delete, pre_save, m2m_changed
 from django.dispatch import receiver
 from django.core.cache import cache
 from django.db.models import F
@@ -18,6 +18,8 @@ from .models import (
     PrayerRequest,
     Testimony,
     Scripture,
+    Conversation,
+    InboxEntry,
 )
 
 
@@ -255,7 +257,10 @@ def invalidate_feed_cache_on_discussion_delete(sender, instance, **kwargs):
 @receiver(post_save, sender=Comment)
 def invalidate_feed_cache_on_comment_change(sender, instance, **kwargs):
     """Invalidate feed cache when comment is created/updated (counts changed)."""
-    cache_key = f"group:{instance.discussion.group.id}:feed:*"
+    if not instance.group_id:
+        return
+
+    cache_key = f"group:{instance.group_id}:feed:*"
     if hasattr(cache, 'delete_pattern'):
         cache.delete_pattern(cache_key)
 
@@ -263,24 +268,11 @@ def invalidate_feed_cache_on_comment_change(sender, instance, **kwargs):
 @receiver(post_save, sender=Reaction)
 def invalidate_feed_cache_on_reaction_change(sender, instance, **kwargs):
     """Invalidate feed cache when reaction is created (counts changed)."""
-    from .models import Discussion, Comment
-
-    content_object = instance.content_object
-
-    # Get the group based on content type
-    if isinstance(content_object, Discussion):
-        group_id = content_object.group.id
-    elif isinstance(content_object, Comment):
-        group_id = content_object.discussion.group.id
-    else:
-        # Phase 2 content types (PrayerRequest, Testimony, Scripture) have group directly
-        if hasattr(content_object, 'group'):
-            group_id = content_object.group.id
-        else:
-            # Unknown content type, skip cache invalidation
-            return
+    if not instance.group_id:
+        # Content without a group, skip cache invalidation
+        return
 
-    cache_key = f"group:{group_id}:feed:*"
+    cache_key = f"group:{instance.group_id}:feed:*"
     if hasattr(cache, 'delete_pattern'):
         cache.delete_pattern(cache_key)
 
@@ -786,3 +778,49 @@ def invalidate_feed_cache_on_reaction_delete(sender, instance, **kwargs):
 
     if instance.discussion and instance.discussion.group:
         FeedService.invalidate_group_feed(instance.discussion.group.id)
+
+
+# =============================================================================
+# CONVERSATION INBOX
+# =============================================================================
+
+@receiver(m2m_changed, sender=Conversation.participants.through)
+def sync_inbox_entries_on_participant_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Keep one InboxEntry per conversation participant.
+
+    Handles both conversation.participants.add(...) and the reverse
+    user.private_conversations.add(...).
+    """
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        InboxEntry.sync_participants(instance)
+    elif action == 'post_clear':
+        InboxEntry.objects.filter(user=instance).delete()
+    else:
+        for conversation in Conversation.objects.filter(pk__in=pk_set):
+            InboxEntry.sync_participants(conversation)
+
+
+# =============================================================================
+# REALTIME EVENTS
+# =============================================================================
+
+@receiver(post_save, sender=FeedItem)
+def publish_feed_item_event(sender, instance, created, **kwargs):
+    """Push feed item changes to the group's websocket subscribers."""
+    from .services.realtime_service import RealtimeService
+
+    RealtimeService.publish_feed_item(
+        instance, 'feed.item_created' if created else 'feed.item_updated')
+
+
+@receiver(post_delete, sender=FeedItem)
+def publish_feed_item_delete_event(sender, instance, **kwargs):
+    """Push feed item removal to the group's websocket subscribers."""
+    from .services.realtime_service import RealtimeService
+
+    RealtimeService.publish_feed_item(instance, 'feed.item_deleted')
+
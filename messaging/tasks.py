@@ -14,6 +14,8 @@ from datetime import timedelta
 from django.db.models import Count
 import logging
 
+from core.batching import run_in_batches
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,28 +36,28 @@ def cleanup_soft_deleted_content(self):
 
         cutoff_date = timezone.now() - timedelta(days=30)
 
-        # Delete old soft-deleted discussions
-        deleted_discussions = Discussion.objects.filter(
+        # Delete old soft-deleted discussions, in small batches
+        deleted_discussions, _ = run_in_batches(Discussion.objects.filter(
             is_deleted=True,
             deleted_at__lt=cutoff_date
-        ).delete()
+        ))
 
         # Delete old soft-deleted comments
-        deleted_comments = Comment.objects.filter(
+        deleted_comments, _ = run_in_batches(Comment.objects.filter(
             is_deleted=True,
             updated_at__lt=cutoff_date
-        ).delete()
+        ))
 
         result = {
-            'discussions': deleted_discussions[0],
-            'comments': deleted_comments[0],
+            'discussions': deleted_discussions,
+            'comments': deleted_comments,
             'status': 'success',
             'cutoff_date': cutoff_date.isoformat(),
         }
 
         logger.info(
-            f"Cleanup completed: {deleted_discussions[0]} discussions, "
-            f"{deleted_comments[0]} comments deleted"
+            f"Cleanup completed: {deleted_discussions} discussions, "
+            f"{deleted_comments} comments deleted"
         )
 
         return result
@@ -83,9 +85,9 @@ def cleanup_old_notification_logs(self):
 
         cutoff_date = timezone.now() - timedelta(days=90)
 
-        deleted_count = NotificationLog.objects.filter(
+        deleted_count, _ = run_in_batches(NotificationLog.objects.filter(
             created_at__lt=cutoff_date
-        ).delete()[0]
+        ))
 
         result = {
             'deleted': deleted_count,
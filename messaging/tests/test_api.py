@@ -4,8 +4,11 @@ API tests for messaging app ViewSets.
 Tests all API endpoints including permissions, throttling, and business logic.
 """
 
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
@@ -274,6 +277,112 @@ class CommentAPITest(TestCase):
         self.assertEqual(comment.content, 'Updated content')
 
 
+class CommentThreadAPITest(TestCase):
+    """Test single-query comment thread loading."""
+
+    def setUp(self):
+        """Set up a discussion with a 200-comment thread."""
+        self.client = APIClient()
+
+        self.user = User.objects.create_user(
+            username='threaduser',
+            email='thread@example.com',
+            password='testpass123'
+        )
+        self.group = Group.objects.create(
+            name='Thread Group',
+            description='A test group',
+            location='Test Location',
+            leader=self.user,
+        )
+        GroupMembership.objects.create(
+            group=self.group,
+            user=self.user,
+            role='leader',
+            status='active'
+        )
+        self.discussion = Discussion.objects.create(
+            group=self.group,
+            author=self.user,
+            title='Busy Discussion',
+            content='Test content',
+        )
+        self.discussion_type = ContentType.objects.get_for_model(Discussion)
+
+        # 40 threads of 5 comments: a root, 3 replies and 1 nested reply
+        self.roots = []
+        for i in range(40):
+            root = self.create_comment(f'Root {i}')
+            replies = [
+                self.create_comment(f'Reply {i}.{j}', parent=root)
+                for j in range(3)
+            ]
+            self.create_comment(f'Nested {i}', parent=replies[0])
+            self.roots.append(root)
+
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('messaging:comment-thread')
+
+    def create_comment(self, content, parent=None):
+        return Comment.objects.create(
+            content_type=self.discussion_type,
+            content_id=self.discussion.id,
+            group=self.group,
+            author=self.user,
+            parent=parent,
+            content=content,
+        )
+
+    def test_thread_of_200_comments_loads_in_one_query(self):
+        """The whole thread is fetched and assembled from one query."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                self.url, {'discussion': str(self.discussion.id)})
+
+        # Ignore request metrics written by the monitoring middleware
+        selects = [
+            query for query in queries.captured_queries
+            if query['sql'].startswith('SELECT')
+        ]
+        self.assertEqual(len(selects), 1)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 40)
+        self.assertEqual(len(response.data['results']), 25)
+
+    def test_replies_are_capped_per_thread(self):
+        """Nested replies count towards their root and respect the cap."""
+        response = self.client.get(
+            self.url, {'discussion': str(self.discussion.id), 'reply_limit': 2})
+
+        first = response.data['results'][0]
+        self.assertEqual(first['id'], str(self.roots[0].id))
+        self.assertEqual(first['reply_count'], 4)
+        self.assertTrue(first['has_more_replies'])
+        self.assertEqual(
+            [reply['content'] for reply in first['replies']],
+            ['Reply 0.0', 'Reply 0.1'])
+
+    def test_replies_below_deleted_comment_stay_in_thread(self):
+        """Soft-deleted comments are hidden without orphaning their replies."""
+        reply = self.roots[0].replies.get(content='Reply 0.0')
+        reply.is_deleted = True
+        reply.save(update_fields=['is_deleted'])
+
+        response = self.client.get(reverse(
+            'messaging:comment-replies', args=[self.roots[0].id]))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item['content'] for item in response.data['results']],
+            ['Reply 0.1', 'Reply 0.2', 'Nested 0'])
+
+    def test_thread_requires_content_filter(self):
+        """Thread loading is limited to a single content item."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
 class ReactionAPITest(TestCase):
     """Test Reaction API endpoints."""
 
@@ -230,6 +230,40 @@ class CommentModelTest(TestCase):
         # Deleted comments can't be edited
         self.assertFalse(comment.can_edit())
 
+    def test_comment_group_populated_on_save(self):
+        """Test comments carry the group of their content."""
+        from django.contrib.contenttypes.models import ContentType
+
+        legacy = Comment.objects.create(
+            discussion=self.discussion,
+            author=self.user,
+            content='Legacy comment',
+        )
+        polymorphic = Comment.objects.create(
+            content_type=ContentType.objects.get_for_model(Discussion),
+            content_id=self.discussion.id,
+            author=self.user,
+            content='Polymorphic comment',
+        )
+
+        self.assertEqual(legacy.group_id, self.group.id)
+        self.assertEqual(polymorphic.group_id, self.group.id)
+
+    def test_comment_group_backfilled_on_partial_save(self):
+        """Test a save with update_fields fills a missing group."""
+        comment = Comment.objects.create(
+            discussion=self.discussion,
+            author=self.user,
+            content='Test comment',
+        )
+        Comment.objects.filter(pk=comment.pk).update(group=None)
+        comment.refresh_from_db()
+
+        comment.soft_delete()
+        comment.refresh_from_db()
+
+        self.assertEqual(comment.group_id, self.group.id)
+
 
 class CommentHistoryModelTest(TestCase):
     """Test CommentHistory model."""
@@ -405,6 +439,22 @@ class ReactionModelTest(TestCase):
         with self.assertRaises(ValidationError):
             reaction.clean()
 
+    def test_reaction_group_populated_on_save(self):
+        """Test reactions carry the group of their content."""
+        on_discussion = Reaction.objects.create(
+            user=self.user1,
+            discussion=self.discussion,
+            reaction_type='👍',
+        )
+        on_comment = Reaction.objects.create(
+            user=self.user2,
+            comment=self.comment,
+            reaction_type='❤️',
+        )
+
+        self.assertEqual(on_discussion.group_id, self.group.id)
+        self.assertEqual(on_comment.group_id, self.group.id)
+
 
 class FeedItemModelTest(TestCase):
     """Test FeedItem model and signal auto-population."""
@@ -4,11 +4,20 @@ Phase 2 Service Tests.
 Tests for:
 - Bible API Service
 - Circuit Breaker
+- Local Verse Store and single-flight verse fetching
 - Notification Service
 - Rate Limiting
 - Quiet Hours
 """
 
+import os
+import tempfile
+import threading
+import time
+
+import requests
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.utils import timezone
@@ -23,8 +32,12 @@ from messaging.models import (
     Scripture,
     NotificationPreference,
     NotificationLog,
+    BibleVerse,
 )
-from messaging.services.bible_api import BibleAPIService, CircuitBreaker
+from core.circuit_breaker import SharedCircuitBreaker
+from messaging.services.bible_api import BibleAPIService, SingleFlight
+from messaging.services.cache_service import CacheService
+from messaging.services.verse_store import VerseStore
 from messaging.services.notification_service import NotificationService
 
 User = get_user_model()
@@ -37,7 +50,7 @@ class BibleAPIServiceTest(TestCase):
         """Set up test."""
         self.service = BibleAPIService()
 
-    @patch('requests.get')
+    @patch('messaging.services.bible_api.http_session.get')
     def test_fetch_verse_from_bible_api(self, mock_get):
         """Test fetching verse from bible-api.com."""
         # Mock successful API response
@@ -101,7 +114,7 @@ class BibleAPIServiceTest(TestCase):
 
         self.assertIn('not supported', str(context.exception))
 
-    @patch('requests.get')
+    @patch('messaging.services.bible_api.http_session.get')
     @patch('messaging.services.bible_api.cache')
     def test_verse_caching(self, mock_cache, mock_get):
         """Test that verses are cached."""
@@ -135,12 +148,35 @@ class BibleAPIServiceTest(TestCase):
         self.assertEqual(result, cached_data)
 
 
+    @patch('messaging.services.bible_api.http_session.get')
+    def test_unknown_reference_is_not_provider_failure(self, mock_get):
+        """Test a 404 from bible-api.com does not count against its breaker."""
+        cache.clear()
+        response = requests.Response()
+        response.status_code = 404
+        response.url = 'https://bible-api.com/Hezekiah 1:1'
+        mock_get.return_value = response
+
+        for _ in range(self.service.bible_api_breaker.failure_threshold + 1):
+            with self.assertRaises(requests.HTTPError):
+                self.service._fetch_from_bible_api('Hezekiah 1:1', 'KJV')
+
+        self.assertEqual(self.service.bible_api_breaker.failure_count, 0)
+        self.assertEqual(
+            self.service.bible_api_breaker.state, SharedCircuitBreaker.CLOSED)
+
+
 class CircuitBreakerTest(TestCase):
     """Test Circuit Breaker pattern."""
 
+    def setUp(self):
+        """Set up test."""
+        cache.clear()
+
     def test_circuit_breaker_closed_state(self):
         """Test circuit breaker in closed state allows calls."""
-        breaker = CircuitBreaker(failure_threshold=3, timeout=60)
+        breaker = SharedCircuitBreaker(
+            'test', failure_threshold=3, recovery_timeout=60)
 
         def success_func():
             return 'success'
@@ -148,12 +184,13 @@ class CircuitBreakerTest(TestCase):
         result = breaker.call(success_func)
 
         self.assertEqual(result, 'success')
-        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(breaker.state, SharedCircuitBreaker.CLOSED)
         self.assertEqual(breaker.failure_count, 0)
 
     def test_circuit_breaker_opens_after_failures(self):
         """Test circuit breaker opens after threshold failures."""
-        breaker = CircuitBreaker(failure_threshold=3, timeout=60)
+        breaker = SharedCircuitBreaker(
+            'test', failure_threshold=3, recovery_timeout=60)
 
         def failing_func():
             raise Exception('API Error')
@@ -164,7 +201,7 @@ class CircuitBreakerTest(TestCase):
                 breaker.call(failing_func)
 
         # Circuit should be open
-        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(breaker.state, SharedCircuitBreaker.OPEN)
 
         # Next call should fail fast
         with self.assertRaises(Exception) as context:
@@ -173,6 +210,213 @@ class CircuitBreakerTest(TestCase):
         self.assertIn('Circuit breaker is OPEN', str(context.exception))
 
 
+class VerseStoreTest(TestCase):
+    """Test local-first verse lookups."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.service = BibleAPIService()
+        VerseStore.save_verses('KJV', [
+            {'book': 'Psalms', 'chapter': 23, 'verse': 1,
+             'text': 'The LORD is my shepherd; I shall not want.'},
+            {'book': 'Psalms', 'chapter': 23, 'verse': 2,
+             'text': 'He maketh me to lie down in green pastures.'},
+            {'book': 'John', 'chapter': 3, 'verse': 16,
+             'text': 'For God so loved the world...'},
+        ])
+
+    def test_parse_reference(self):
+        """Test references resolve to canonical book numbers."""
+        self.assertEqual(
+            VerseStore.parse_reference('1corinthians 13:4-7'),
+            {'book_number': 46, 'chapter': 13, 'start': 4, 'end': 7}
+        )
+        self.assertEqual(
+            VerseStore.parse_reference('Psalm 23:1')['book_number'], 19)
+        self.assertIsNone(VerseStore.parse_reference('Hezekiah 1:1'))
+        self.assertIsNone(VerseStore.parse_reference('John 3'))
+
+    @patch('messaging.services.bible_api.http_session.get')
+    def test_stored_verse_served_without_network(self, mock_get):
+        """Test stored passages never reach the external providers."""
+        result = self.service.get_verse('psalm 23:1-2', 'KJV')
+
+        mock_get.assert_not_called()
+        self.assertEqual(result['reference'], 'Psalms 23:1-2')
+        self.assertEqual(result['source'], 'local')
+        self.assertTrue(result['text'].startswith('The LORD is my shepherd'))
+        self.assertIn('green pastures', result['text'])
+        self.assertEqual(
+            cache.get(CacheService.get_verse_key('Psalm 23:1-2', 'KJV')),
+            result
+        )
+
+    @patch('messaging.services.bible_api.http_session.get')
+    def test_partial_passage_falls_through_to_provider(self, mock_get):
+        """Test passages with missing verses are fetched and stored."""
+        mock_response = MagicMock()
+        mock_response.json.return_value = {
+            'reference': 'Psalms 23:1-3',
+            'text': 'Full passage',
+            'verses': [
+                {'book_name': 'Psalms', 'chapter': 23, 'verse': 3,
+                 'text': 'He restoreth my soul.\n'},
+            ],
+        }
+        mock_get.return_value = mock_response
+
+        result = self.service.get_verse('Psalm 23:1-3', 'KJV')
+
+        self.assertEqual(result['source'], 'bible-api.com')
+        mock_get.assert_called_once()
+        self.assertEqual(
+            BibleVerse.objects.get(
+                translation='KJV', book_number=19, chapter=23, verse=3).text,
+            'He restoreth my soul.'
+        )
+        self.assertIsNotNone(VerseStore.lookup('Psalm 23:1-3', 'KJV'))
+
+    def test_mapped_translation_served_locally(self):
+        """Test translations mapped to KJV are answered from the store."""
+        result = self.service.get_verse('John 3:16', 'NKJV')
+
+        self.assertEqual(result['translation'], 'NKJV')
+        self.assertEqual(result['source'], 'local')
+        self.assertIn('KJV', result['translation_note'])
+
+    def test_import_verses_command(self):
+        """Test importing a CSV export with numeric book columns."""
+        with tempfile.NamedTemporaryFile(
+                'w', suffix='.csv', delete=False) as handle:
+            handle.write('id,b,c,v,t\n')
+            handle.write('1001001,1,1,1,In the beginning God created the heaven and the earth.\n')
+            handle.write('1001002,1,1,2,"And the earth was without form, and void."\n')
+        self.addCleanup(os.unlink, handle.name)
+
+        call_command('import_verses', handle.name,
+                     translation='web', stdout=MagicMock())
+
+        self.assertEqual(BibleVerse.objects.filter(translation='WEB').count(), 2)
+        self.assertEqual(
+            VerseStore.lookup('Genesis 1:1-2', 'WEB')['text'],
+            'In the beginning God created the heaven and the earth. '
+            'And the earth was without form, and void.'
+        )
+
+
+class SingleFlightTest(TestCase):
+    """Test coalescing of concurrent verse misses."""
+
+    def setUp(self):
+        """Set up test."""
+        cache.clear()
+
+    def test_concurrent_callers_share_one_call(self):
+        """Test only the first caller runs the function."""
+        single_flight = SingleFlight()
+        calls = []
+        results = []
+        started = threading.Event()
+
+        def slow_call():
+            calls.append(1)
+            started.set()
+            time.sleep(0.1)
+            return 'verse'
+
+        def worker():
+            results.append(single_flight.do('key', slow_call))
+
+        threads = [threading.Thread(target=worker) for _ in range(10)]
+        threads[0].start()
+        started.wait()
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['verse'] * 10)
+
+    def test_errors_are_shared_and_not_cached(self):
+        """Test waiting callers receive the leader's error."""
+        single_flight = SingleFlight()
+
+        with self.assertRaises(ValueError):
+            single_flight.do('key', lambda: (_ for _ in ()).throw(ValueError()))
+
+        self.assertEqual(single_flight.do('key', lambda: 'ok'), 'ok')
+
+    @patch('messaging.services.bible_api.http_session.get')
+    def test_stampede_fetches_once(self, mock_get):
+        """Test concurrent misses for one verse make a single request."""
+        service = BibleAPIService()
+        service._lookup_local = lambda reference, translation: None
+
+        def slow_get(*args, **kwargs):
+            time.sleep(0.1)
+            response = MagicMock()
+            response.json.return_value = {
+                'reference': 'John 3:16', 'text': 'For God so loved'}
+            return response
+
+        mock_get.side_effect = slow_get
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    service.get_verse('John 3:16', 'KJV')))
+            for _ in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(len(results), 20)
+
+    def test_other_worker_fetch_is_awaited(self):
+        """Test a held fetch lock makes callers wait for the cached verse."""
+        service = BibleAPIService()
+        service._lookup_local = lambda reference, translation: None
+        service.FETCH_WAIT = 2
+        cache_key = CacheService.get_verse_key('John 3:16', 'KJV')
+        cache.add(f'{cache_key}:lock', True, 30)
+        verse = {'reference': 'John 3:16', 'text': 'Cached by another worker'}
+        threading.Timer(0.1, cache.set, args=(cache_key, verse)).start()
+
+        with patch('messaging.services.bible_api.http_session.get') as mock_get:
+            result = service.get_verse('John 3:16', 'KJV')
+
+        mock_get.assert_not_called()
+        self.assertEqual(result, verse)
+
+
+    def test_failed_fetch_ends_the_wait(self):
+        """Test callers stop waiting once the other worker releases its lock."""
+        service = BibleAPIService()
+        service._lookup_local = lambda reference, translation: None
+        service.FETCH_WAIT = 5
+        cache_key = CacheService.get_verse_key('John 3:16', 'KJV')
+        cache.add(f'{cache_key}:lock', True, 30)
+        # The other worker's fetch fails: it releases the lock, caching nothing
+        threading.Timer(0.1, cache.delete, args=(f'{cache_key}:lock',)).start()
+        response = MagicMock()
+        response.json.return_value = {
+            'reference': 'John 3:16', 'text': 'For God so loved'}
+
+        started = time.monotonic()
+        with patch('messaging.services.bible_api.http_session.get',
+                   return_value=response) as mock_get:
+            result = service.get_verse('John 3:16', 'KJV')
+
+        self.assertLess(time.monotonic() - started, 2)
+        mock_get.assert_called_once()
+        self.assertEqual(result['text'], 'For God so loved')
+
+
 class NotificationServiceTest(TestCase):
     """Test Notification Service."""
 
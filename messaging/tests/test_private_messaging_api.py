@@ -2,12 +2,17 @@
 Tests for private messaging API endpoints.
 """
 
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from datetime import timedelta
+from django.utils import timezone
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.contrib.auth import get_user_model
-from messaging.models import Conversation, PrivateMessage
+from messaging.models import Conversation, PrivateMessage, InboxEntry
+from messaging.services import MessageHistoryService
 from group.models import Group
 
 User = get_user_model()
@@ -363,3 +368,131 @@ class ConversationAPITest(TestCase):
 
         self.assertTrue(msg1.is_read)
         self.assertTrue(msg2.is_read)
+
+    def test_list_conversations_reads_inbox_entries(self):
+        """The inbox is listed without per-conversation queries."""
+        for other in (self.user2, self.user3):
+            conversation = Conversation.objects.create()
+            conversation.participants.add(self.user1, other)
+            for i in range(3):
+                PrivateMessage.objects.create(
+                    conversation=conversation,
+                    sender=other,
+                    content=f'Message {i} from {other.username}'
+                )
+
+        url = reverse('messaging:conversation-list')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        # Ignore request metrics written by the monitoring middleware
+        selects = [
+            query for query in queries.captured_queries
+            if query['sql'].startswith('SELECT')
+        ]
+        # One page query plus the paginator's count
+        self.assertEqual(len(selects), 2)
+
+        first = response.data['results'][0]
+        self.assertEqual(first['other_participant']['username'], 'user3')
+        self.assertEqual(first['unread_count'], 3)
+        self.assertEqual(first['message_count'], 3)
+        self.assertEqual(first['last_message']['content'], 'Message 2 from user3')
+        self.assertFalse(first['last_message']['is_mine'])
+
+
+class MessageHistoryAPITest(TestCase):
+    """Test cursor-paginated conversation history."""
+
+    def setUp(self):
+        """Set up a conversation with a long history."""
+        self.client = APIClient()
+
+        self.user1 = User.objects.create_user(
+            username='user1',
+            email='user1@test.com',
+            password='testpass123'
+        )
+        self.user2 = User.objects.create_user(
+            username='user2',
+            email='user2@test.com',
+            password='testpass123'
+        )
+
+        self.conversation = Conversation.objects.create()
+        self.conversation.participants.add(self.user1, self.user2)
+
+        # 120 messages from user2, one second apart
+        start = timezone.now() - timedelta(hours=1)
+        self.messages = []
+        for i in range(120):
+            message = PrivateMessage.objects.create(
+                conversation=self.conversation,
+                sender=self.user2,
+                content=f'Message {i}'
+            )
+            message.created_at = start + timedelta(seconds=i)
+            PrivateMessage.objects.filter(pk=message.pk).update(
+                created_at=message.created_at)
+            self.messages.append(message)
+
+        self.client.force_authenticate(user=self.user1)
+        self.url = reverse(
+            'messaging:conversation-send-message', args=[self.conversation.id])
+
+    def contents(self, response):
+        return [message['content'] for message in response.data['results']]
+
+    def test_pages_backward_through_history(self):
+        """Following before cursors walks the whole history exactly once."""
+        seen = []
+        params = {'page_size': 50}
+        while True:
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen = self.contents(response) + seen
+            if not response.data['has_older']:
+                break
+            params['before'] = response.data['before_cursor']
+
+        self.assertEqual(seen, [f'Message {i}' for i in range(120)])
+
+    def test_after_cursor_returns_newer_messages(self):
+        """The after cursor loads messages newer than a position."""
+        cursor = MessageHistoryService.encode_cursor(self.messages[109])
+        response = self.client.get(self.url, {'after': cursor})
+
+        self.assertEqual(
+            self.contents(response), [f'Message {i}' for i in range(110, 120)])
+        self.assertFalse(response.data['has_newer'])
+        self.assertTrue(response.data['has_older'])
+
+    def test_marks_read_only_up_to_delivered_messages(self):
+        """Messages newer than the returned page stay unread."""
+        cursor = MessageHistoryService.encode_cursor(self.messages[100])
+        response = self.client.get(self.url, {'before': cursor, 'page_size': 10})
+
+        self.assertEqual(
+            self.contents(response), [f'Message {i}' for i in range(90, 100)])
+        self.assertEqual(self.conversation.get_unread_count(self.user1), 20)
+        entry = InboxEntry.objects.get(
+            conversation=self.conversation, user=self.user1)
+        self.assertEqual(entry.unread_count, 20)
+
+    def test_retrieve_returns_latest_page_only(self):
+        """Opening a conversation embeds one bounded page of messages."""
+        url = reverse('messaging:conversation-detail', args=[self.conversation.id])
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['messages']), 50)
+        self.assertEqual(response.data['messages'][-1]['content'], 'Message 119')
+        self.assertTrue(response.data['messages_page']['has_older'])
+        self.assertEqual(response.data['message_count'], 120)
+        self.assertEqual(response.data['unread_count'], 0)
+
+    def test_invalid_cursor(self):
+        """Malformed cursors are rejected."""
+        response = self.client.get(self.url, {'before': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
@@ -1,11 +1,15 @@
 """
-Tests for private messaging models (Conversation and PrivateMessage).
+Tests for private messaging models (Conversation, PrivateMessage and InboxEntry).
 """
 
-from django.test import TestCase
+from concurrent.futures import ThreadPoolExecutor
+from unittest import skipUnless
+
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase
 from django.contrib.auth import get_user_model
 from django.utils import timezone
-from messaging.models import Conversation, PrivateMessage
+from messaging.models import Conversation, PrivateMessage, InboxEntry
 from group.models import Group
 
 User = get_user_model()
@@ -287,3 +291,143 @@ class PrivateMessageModelTest(TestCase):
         str_repr = str(message)
         self.assertIn('user1', str_repr)
         self.assertIn('Message from', str_repr)
+
+
+class InboxEntryModelTest(TestCase):
+    """Test the denormalized per-participant inbox entries."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user1 = User.objects.create_user(
+            username='user1',
+            email='user1@test.com',
+            password='testpass123'
+        )
+        self.user2 = User.objects.create_user(
+            username='user2',
+            email='user2@test.com',
+            password='testpass123'
+        )
+
+        self.conversation = Conversation.objects.create()
+        self.conversation.participants.add(self.user1, self.user2)
+
+    def get_entry(self, user):
+        return InboxEntry.objects.get(conversation=self.conversation, user=user)
+
+    def test_entries_created_for_participants(self):
+        """Adding participants creates one entry each, linked to the other."""
+        self.assertEqual(self.get_entry(self.user1).other_participant, self.user2)
+        self.assertEqual(self.get_entry(self.user2).other_participant, self.user1)
+
+    def test_message_updates_counters_and_preview(self):
+        """Only the recipient's unread counter grows; both see the preview."""
+        message = PrivateMessage.objects.create(
+            conversation=self.conversation,
+            sender=self.user1,
+            content='x' * 150
+        )
+
+        sender_entry = self.get_entry(self.user1)
+        recipient_entry = self.get_entry(self.user2)
+        self.assertEqual(sender_entry.unread_count, 0)
+        self.assertEqual(recipient_entry.unread_count, 1)
+        self.assertEqual(recipient_entry.message_count, 1)
+        self.assertEqual(recipient_entry.last_message_id, message.id)
+        self.assertEqual(recipient_entry.last_message_preview, 'x' * 100)
+
+    def test_mark_read_resets_unread_count(self):
+        """Reading the conversation clears the reader's counter."""
+        for i in range(3):
+            PrivateMessage.objects.create(
+                conversation=self.conversation,
+                sender=self.user1,
+                content=f'Message {i}'
+            )
+
+        marked = self.conversation.mark_messages_as_read(self.user2)
+
+        entry = self.get_entry(self.user2)
+        self.assertEqual(marked, 3)
+        self.assertEqual(entry.unread_count, 0)
+        self.assertIsNotNone(entry.last_read_at)
+
+    def test_stale_instances_do_not_lose_updates(self):
+        """Writers holding stale copies still produce exact counters."""
+        stale_a = Conversation.objects.get(pk=self.conversation.pk)
+        stale_b = Conversation.objects.get(pk=self.conversation.pk)
+
+        for conversation in (stale_a, stale_b, stale_a):
+            PrivateMessage.objects.create(
+                conversation=conversation,
+                sender=self.user1,
+                content='Hello'
+            )
+        stale_b.mark_messages_as_read(self.user2)
+        PrivateMessage.objects.create(
+            conversation=stale_a,
+            sender=self.user1,
+            content='After read'
+        )
+
+        entry = self.get_entry(self.user2)
+        self.assertEqual(entry.unread_count, 1)
+        self.assertEqual(entry.unread_count, self.conversation.get_unread_count(self.user2))
+        self.assertEqual(entry.message_count, 4)
+
+
+@skipUnless(
+    connection.features.has_select_for_update,
+    'Concurrent writers need a database with row locking'
+)
+class InboxEntryConcurrencyTest(TransactionTestCase):
+    """Test unread counters under concurrent senders and readers."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.sender = User.objects.create_user(
+            username='sender',
+            email='sender@test.com',
+            password='testpass123'
+        )
+        self.reader = User.objects.create_user(
+            username='reader',
+            email='reader@test.com',
+            password='testpass123'
+        )
+
+        self.conversation = Conversation.objects.create()
+        self.conversation.participants.add(self.sender, self.reader)
+
+    def send(self, index):
+        try:
+            PrivateMessage.objects.create(
+                conversation_id=self.conversation.pk,
+                sender=self.sender,
+                content=f'Message {index}'
+            )
+        finally:
+            connections.close_all()
+
+    def read(self, _):
+        try:
+            Conversation.objects.get(
+                pk=self.conversation.pk).mark_messages_as_read(self.reader)
+        finally:
+            connections.close_all()
+
+    def test_unread_count_matches_messages_under_concurrency(self):
+        """Interleaved sends and reads leave the counter equal to the truth."""
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            jobs = [executor.submit(self.send, i) for i in range(40)]
+            jobs += [executor.submit(self.read, i) for i in range(10)]
+            for job in jobs:
+                job.result()
+
+        entry = InboxEntry.objects.get(
+            conversation=self.conversation, user=self.reader)
+        self.assertEqual(entry.message_count, 40)
+        self.assertEqual(
+            entry.unread_count,
+            self.conversation.get_unread_count(self.reader))
+
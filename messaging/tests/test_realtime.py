@@ -0,0 +1,154 @@
+"""
+Tests for websocket inbox and feed events.
+
+Runs the real ASGI application against the in-memory channel layer.
+"""
+
+from channels.db import database_sync_to_async
+from channels.layers import channel_layers
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from group.models import Group, GroupMembership
+from messaging.models import Conversation, Discussion, PrivateMessage
+from vineyard_group_fellowship.asgi import application
+
+User = get_user_model()
+
+
+@override_settings(CHANNEL_LAYERS={
+    'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}
+})
+class RealtimeConsumerTest(TestCase):
+    """Test the inbox and group feed consumers."""
+
+    def setUp(self):
+        """Set up test data."""
+        # Each async test runs in its own event loop
+        channel_layers.backends.clear()
+
+        self.user1 = User.objects.create_user(
+            username='user1',
+            email='user1@test.com',
+            password='testpass123'
+        )
+        self.user2 = User.objects.create_user(
+            username='user2',
+            email='user2@test.com',
+            password='testpass123'
+        )
+        self.outsider = User.objects.create_user(
+            username='outsider',
+            email='outsider@test.com',
+            password='testpass123'
+        )
+
+        self.group = Group.objects.create(
+            name='Test Group',
+            description='A test group',
+            leader=self.user1,
+            location='Test Location'
+        )
+        for user in (self.user1, self.user2):
+            GroupMembership.objects.create(
+                group=self.group,
+                user=user,
+                role='member',
+                status='active'
+            )
+
+        self.conversation = Conversation.objects.create()
+        self.conversation.participants.add(self.user1, self.user2)
+
+    def connect(self, path, user=None, header=b'cookie'):
+        headers = [(b'origin', b'http://testserver')]
+        if user is not None:
+            token = AccessToken.for_user(user)
+            value = f'access_token={token}' if header == b'cookie' else f'Bearer {token}'
+            headers.append((header, value.encode()))
+        return WebsocketCommunicator(application, path, headers=headers)
+
+    @database_sync_to_async
+    def send_message(self, sender, content):
+        with self.captureOnCommitCallbacks(execute=True):
+            return PrivateMessage.objects.create(
+                conversation=self.conversation,
+                sender=sender,
+                content=content
+            )
+
+    @database_sync_to_async
+    def create_discussion(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Discussion.objects.create(
+                group=self.group,
+                author=self.user1,
+                title='New discussion',
+                content='Hello group',
+            )
+
+    async def test_inbox_requires_authentication(self):
+        """Anonymous connections are refused."""
+        communicator = self.connect('/ws/messaging/inbox/')
+        connected, code = await communicator.connect()
+
+        self.assertFalse(connected)
+        self.assertEqual(code, 4401)
+
+    async def test_authorization_header_is_accepted(self):
+        """Clients that can set headers authenticate with a bearer token."""
+        communicator = self.connect(
+            '/ws/messaging/inbox/', self.user2, header=b'authorization')
+        connected, _ = await communicator.connect()
+
+        self.assertTrue(connected)
+        await communicator.disconnect()
+
+    async def test_query_string_token_is_ignored(self):
+        """Tokens in the URL, which proxies log, do not authenticate."""
+        communicator = self.connect(
+            f'/ws/messaging/inbox/?token={AccessToken.for_user(self.user2)}')
+        connected, code = await communicator.connect()
+
+        self.assertFalse(connected)
+        self.assertEqual(code, 4401)
+
+    async def test_new_message_pushed_to_recipient_inbox(self):
+        """Recipients receive the message with their unread count."""
+        communicator = self.connect('/ws/messaging/inbox/', self.user2)
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+
+        message = await self.send_message(self.user1, 'Hello there')
+        event = await communicator.receive_json_from()
+
+        self.assertEqual(event['event'], 'message.created')
+        self.assertEqual(event['payload']['message']['id'], str(message.id))
+        self.assertEqual(event['payload']['unread_count'], 1)
+        self.assertFalse(event['payload']['is_mine'])
+        await communicator.disconnect()
+
+    async def test_group_feed_pushes_new_items_to_members(self):
+        """Members subscribed to a group feed receive new feed items."""
+        communicator = self.connect(
+            f'/ws/messaging/groups/{self.group.id}/feed/', self.user2)
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+
+        discussion = await self.create_discussion()
+        event = await communicator.receive_json_from()
+
+        self.assertEqual(event['event'], 'feed.item_created')
+        self.assertEqual(event['payload']['content_id'], str(discussion.id))
+        await communicator.disconnect()
+
+    async def test_group_feed_refuses_non_members(self):
+        """Users outside the group cannot subscribe to its feed."""
+        communicator = self.connect(
+            f'/ws/messaging/groups/{self.group.id}/feed/', self.outsider)
+        connected, code = await communicator.connect()
+
+        self.assertFalse(connected)
+        self.assertEqual(code, 4403)
@@ -0,0 +1,179 @@
+"""
+Tests for single-pass content risk scoring.
+"""
+
+import re
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from group.models import Group
+from messaging.models import Comment, Discussion
+from messaging.risk_scoring import RISK_PATTERNS, RiskScorer, risk_scorer
+
+User = get_user_model()
+
+
+def legacy_score(content):
+    """The per-pattern loop the moderation views used before."""
+    content_lower = content.lower()
+    risk_score = 0.0
+    for category, per_match, cap in [
+        ('crisis_keywords', 0.3, 0.8),
+        ('inappropriate_language', 0.15, 0.3),
+        ('substance_abuse_triggers', 0.25, 0.5),
+    ]:
+        matches = sum(1 for keyword in RISK_PATTERNS[category] if keyword in content_lower)
+        if matches:
+            risk_score += min(matches * per_match, cap)
+    spam_matches = sum(1 for pattern in RISK_PATTERNS['spam_patterns']
+                       if re.search(pattern, content_lower, re.IGNORECASE))
+    if spam_matches:
+        risk_score += min(spam_matches * 0.2, 0.4)
+    return min(risk_score, 1.0)
+
+
+class RiskScorerTest(TestCase):
+    """Test the combined risk pattern."""
+
+    def test_empty_text(self):
+        """Test empty text carries no risk."""
+        self.assertEqual(risk_scorer.analyze(''), (0.0, []))
+        self.assertEqual(risk_scorer.analyze(None), (0.0, []))
+
+    def test_distinct_matches_add_up_per_category(self):
+        """Test each distinct keyword adds to its category score."""
+        score, categories = risk_scorer.analyze('Suicide thoughts and PILLS')
+
+        self.assertAlmostEqual(score, 0.6)
+        self.assertEqual(categories, ['crisis_keywords'])
+
+    def test_repeated_keyword_counts_once(self):
+        """Test a keyword repeated in the text is one match."""
+        score, _ = risk_scorer.analyze('pills, pills and more pills')
+
+        self.assertAlmostEqual(score, 0.3)
+
+    def test_category_caps(self):
+        """Test category caps and the overall cap apply."""
+        crisis = 'suicide overdose pills gun bridge'
+        self.assertAlmostEqual(risk_scorer.analyze(crisis)[0], 0.8)
+
+        score, categories = risk_scorer.analyze(
+            f'{crisis} dealer hook me up click here https://spam.example')
+        self.assertEqual(score, 1.0)
+        self.assertEqual(
+            categories,
+            ['crisis_keywords', 'spam_patterns', 'substance_abuse_triggers'])
+
+    def test_regex_patterns(self):
+        """Test spam entries are matched as regular expressions."""
+        score, categories = risk_scorer.analyze('Earn $500 today, buy now')
+
+        self.assertAlmostEqual(score, 0.2)
+        self.assertEqual(categories, ['spam_patterns'])
+
+    def test_custom_patterns(self):
+        """Test keywords are escaped, not treated as regexes."""
+        scorer = RiskScorer(
+            patterns={'crisis_keywords': ['a.b']},
+            weights={'crisis_keywords': (0.5, 0.5)})
+
+        self.assertEqual(scorer.analyze('axb'), (0.0, []))
+        self.assertEqual(scorer.analyze('a.b'), (0.5, ['crisis_keywords']))
+
+
+    def test_keywords_inside_urls_count(self):
+        """Test a URL does not hide the keywords in or after it."""
+        score, categories = risk_scorer.analyze('see http://x.com/suicide-pills-dealer now')
+
+        self.assertEqual(score, 1.0)
+        self.assertEqual(
+            categories,
+            ['crisis_keywords', 'spam_patterns', 'substance_abuse_triggers'])
+
+    def test_overlapping_and_prefix_keywords(self):
+        """Test keywords sharing a start or overlapping are all counted."""
+        scorer = RiskScorer(
+            patterns={'crisis_keywords': ['fix', 'fixed', 'xed it']},
+            weights={'crisis_keywords': (0.1, 1.0)})
+
+        self.assertEqual(scorer.analyze('FIXED IT'), (0.3, ['crisis_keywords']))
+
+    def test_matches_legacy_scoring(self):
+        """Test scores equal the previous per-pattern loop."""
+        samples = [
+            'see http://x.com/suicide-pills-dealer now',
+            'https://example.com/buy?ref=gun then overdose',
+            'Click here: http://a.b/c pills pills',
+            'I scored a fix from my dealer, pure stuff, hook me up',
+            'Prefix scores and suffixes: gunshot, bridges, cuttings',
+            'offensive_term_1 and harassment_term at http://x.io',
+            'earn $100 free money https://spam.example/kill myself',
+            'A quiet week of prayer and thanks',
+            'Not worth living; end it all. Self-harm. CUTTING.',
+        ]
+        for text in samples:
+            with self.subTest(text=text):
+                self.assertAlmostEqual(risk_scorer.analyze(text)[0], legacy_score(text))
+
+
+class ContentRiskOnSaveTest(TestCase):
+    """Test risk is stored on discussions and comments when saved."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.group = Group.objects.create(
+            name='Test Group',
+            description='A test group',
+            location='Test Location',
+            leader=self.user,
+        )
+        self.discussion = Discussion.objects.create(
+            group=self.group,
+            author=self.user,
+            title='Feeling like the end it all',
+            content='Looking for someone to talk to tonight.',
+        )
+
+    def test_discussion_scored_from_title_and_content(self):
+        """Test the title is part of the scored text."""
+        self.discussion.refresh_from_db()
+
+        self.assertAlmostEqual(self.discussion.risk_score, 0.3)
+        self.assertEqual(self.discussion.risk_categories, ['crisis_keywords'])
+
+    def test_comment_scored_on_create(self):
+        """Test comments are scored when created."""
+        comment = Comment.objects.create(
+            discussion=self.discussion,
+            author=self.user,
+            content='Click here for free money',
+        )
+        comment.refresh_from_db()
+
+        self.assertAlmostEqual(comment.risk_score, 0.2)
+        self.assertEqual(comment.risk_categories, ['spam_patterns'])
+
+    def test_edit_rescores(self):
+        """Test editing the content replaces the stored score."""
+        self.discussion.title = 'Weekly check-in'
+        self.discussion.save(update_fields=['title'])
+        self.discussion.refresh_from_db()
+
+        self.assertEqual(self.discussion.risk_score, 0.0)
+        self.assertEqual(self.discussion.risk_categories, [])
+
+    def test_saves_without_text_skip_scoring(self):
+        """Test counter updates do not rescan the content."""
+        Discussion.objects.filter(pk=self.discussion.pk).update(risk_score=0.9)
+        self.discussion.is_pinned = True
+        self.discussion.save(update_fields=['is_pinned'])
+        self.discussion.refresh_from_db()
+
+        self.assertEqual(self.discussion.risk_score, 0.9)
@@ -17,11 +17,12 @@ from .models import (
     Discussion, Comment, CommentHistory, Reaction,
     FeedItem, NotificationPreference, ContentReport,
     PrayerRequest, Testimony, Scripture,
-    Conversation, PrivateMessage
+    Conversation, PrivateMessage, InboxEntry
 )
 from .serializers import (
     DiscussionListSerializer, DiscussionDetailSerializer, DiscussionCreateSerializer,
     CommentSerializer, CommentSimpleSerializer, CommentCreateSerializer,
+    CommentThreadSerializer,
     ReactionSerializer, FeedItemSerializer, NotificationPreferenceSerializer,
     CommentHistorySerializer,
     PrayerRequestListSerializer, PrayerRequestDetailSerializer, PrayerRequestCreateSerializer,
@@ -38,7 +39,7 @@ from .utils import (
     validate_can_message_user,
     get_or_create_direct_conversation,
 )
-from .services import FeedService
+from .services import FeedService, CommentThreadService, MessageHistoryService
 from .filters import CommentFilter
 from .permissions import (
     IsGroupMember, IsAuthorOrGroupLeaderOrReadOnly,
@@ -199,6 +200,8 @@ class CommentViewSet(viewsets.ModelViewSet):
     - PUT/PATCH /comments/{id}/ - Update comment (within 15 min)
     - DELETE /comments/{id}/ - Soft delete comment
     - GET /comments/{id}/history/ - Get edit history
+    - GET /comments/thread/ - Top-level comments with capped reply threads
+    - GET /comments/{id}/replies/ - All replies in a comment's thread
 
     Filtering:
     - ?discussion=<uuid> - Comments on a discussion
@@ -208,6 +211,10 @@ class CommentViewSet(viewsets.ModelViewSet):
     - ?parent=<uuid> - Replies to a specific comment
     """
 
+    # Filters identifying a single content item, required by thread loading
+    THREAD_CONTENT_PARAMS = (
+        'discussion', 'scripture', 'prayer', 'testimony', 'content_id')
+
     permission_classes = [IsAuthenticated, IsGroupMember, IsAuthorOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_class = CommentFilter
@@ -217,9 +224,9 @@ class CommentViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """
         Return comments from user's groups only.
-        Works with polymorphic content (discussions, scriptures, prayers, testimonies).
+        Works with polymorphic content (discussions, scriptures, prayers, testimonies)
+        through the denormalized group, so this is a single index scan.
         """
-        from django.contrib.contenttypes.models import ContentType
         user = self.request.user
 
         # Get groups user is a member of
@@ -228,64 +235,19 @@ class CommentViewSet(viewsets.ModelViewSet):
             status='active'
         ).values_list('group_id', flat=True)
 
-        # Get content types for all commentable models
-        discussion_type = ContentType.objects.get_for_model(Discussion)
-
-        # Build Q objects for filtering by group
-        # For discussions: filter by discussion__group_id
-        # For scriptures/prayers/testimonies: filter by their respective group_id fields
-
-        # Start with base queryset
-        queryset = Comment.objects.filter(is_deleted=False)
-
-        # Filter by user's groups based on content type
-        # This uses a Q filter to check different FK paths depending on content_type
-        group_filter = Q()
-
-        # Discussion comments (both old discussion FK and new polymorphic)
-        group_filter |= Q(discussion__group_id__in=user_groups)
-        group_filter |= Q(
-            content_type=discussion_type,
-            content_id__in=Discussion.objects.filter(
-                group_id__in=user_groups).values_list('id', flat=True)
-        )
-
-        # Scripture comments
-        try:
-            scripture_type = ContentType.objects.get_for_model(Scripture)
-            group_filter |= Q(
-                content_type=scripture_type,
-                content_id__in=Scripture.objects.filter(
-                    group_id__in=user_groups).values_list('id', flat=True)
-            )
-        except:
-            pass
-
-        # Prayer comments
-        try:
-            prayer_type = ContentType.objects.get_for_model(PrayerRequest)
-            group_filter |= Q(
-                content_type=prayer_type,
-                content_id__in=PrayerRequest.objects.filter(
-                    group_id__in=user_groups).values_list('id', flat=True)
-            )
-        except:
-            pass
-
-        # Testimony comments
-        try:
-            testimony_type = ContentType.objects.get_for_model(Testimony)
-            group_filter |= Q(
-                content_type=testimony_type,
-                content_id__in=Testimony.objects.filter(
-                    group_id__in=user_groups).values_list('id', flat=True)
-            )
-        except:
-            pass
-
-        queryset = queryset.filter(group_filter).select_related(
+        queryset = Comment.objects.filter(
+            is_deleted=False,
+            group_id__in=user_groups
+        ).select_related(
             'content_type', 'author', 'parent', 'discussion'
-        ).prefetch_related('replies')
+        ).prefetch_related(
+            Prefetch(
+                'replies',
+                queryset=Comment.objects.filter(
+                    is_deleted=False
+                ).select_related('author', 'author__profile_photo')
+            )
+        )
 
         return queryset
 
@@ -323,6 +285,86 @@ class CommentViewSet(viewsets.ModelViewSet):
         serializer = CommentHistorySerializer(history, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'])
+    def thread(self, request):
+        """
+        Get a content item's comments as threads.
+
+        Loads every comment on the content item in one query and returns a
+        page of top-level comments, each with up to ``reply_limit`` replies
+        inlined (default 3, max 50) plus its total reply count.
+
+        Query parameters:
+        - One of discussion, scripture, prayer, testimony or
+          content_type + content_id (required)
+        - page: Page of top-level comments
+        - reply_limit: Replies inlined per thread
+        """
+        if not any(request.query_params.get(param) for param in self.THREAD_CONTENT_PARAMS):
+            return Response(
+                {'detail': 'A content item filter is required.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            reply_limit = CommentThreadService.normalize_reply_limit(
+                request.query_params.get('reply_limit'))
+        except ValueError:
+            return Response(
+                {'detail': 'reply_limit must be an integer.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        comments = CommentThreadService.load_comments(
+            self._get_thread_queryset(request))
+        roots = CommentThreadService.build_threads(comments, reply_limit)
+
+        page = self.paginate_queryset(roots)
+        serializer = CommentThreadSerializer(
+            page, many=True, context=self.get_serializer_context())
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['get'])
+    def replies(self, request, pk=None):
+        """
+        Get every reply in a comment's thread, paginated.
+
+        Used to expand threads cut off by the reply cap of the thread
+        endpoint. Nested replies are included in creation order.
+        """
+        comment = self.get_object()
+        queryset = Comment.objects.filter(group_id=comment.group_id)
+        if comment.content_type_id:
+            queryset = queryset.filter(
+                content_type_id=comment.content_type_id,
+                content_id=comment.content_id
+            )
+        else:
+            queryset = queryset.filter(discussion_id=comment.discussion_id)
+
+        comments = CommentThreadService.load_comments(queryset)
+        replies = CommentThreadService.get_thread_replies(comments, comment.pk)
+
+        page = self.paginate_queryset(replies)
+        serializer = CommentSimpleSerializer(
+            page, many=True, context=self.get_serializer_context())
+        return self.get_paginated_response(serializer.data)
+
+    def _get_thread_queryset(self, request):
+        """
+        Comments on the requested content item in the user's groups.
+
+        Soft-deleted comments are kept so the thread service can place
+        replies below them; it never returns them.
+        """
+        user_groups = GroupMembership.objects.filter(
+            user=request.user,
+            status='active'
+        ).values_list('group_id', flat=True)
+
+        return self.filter_queryset(
+            Comment.objects.filter(group_id__in=user_groups))
+
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated, IsGroupMember])
     def report(self, request, pk=None):
         """Report a comment for moderation."""
@@ -371,7 +413,7 @@ class ReactionViewSet(viewsets.ModelViewSet):
     http_method_names = ['get', 'post', 'delete', 'head', 'options']
 
     def get_queryset(self):
-        """Return reactions from user's group discussions only."""
+        """Return reactions on content in the user's groups only."""
         user = self.request.user
 
         # Get groups user is a member of
@@ -380,10 +422,9 @@ class ReactionViewSet(viewsets.ModelViewSet):
             status='active'
         ).values_list('group_id', flat=True)
 
-        # Return reactions from discussions in those groups
+        # Reactions carry their content's group, so no joins are needed
         queryset = Reaction.objects.filter(
-            Q(discussion__group_id__in=user_groups) |
-            Q(comment__discussion__group_id__in=user_groups)
+            group_id__in=user_groups
         ).select_related('user', 'discussion', 'comment')
 
         return queryset
@@ -1162,6 +1203,7 @@ class ConversationViewSet(viewsets.ModelViewSet):
     - GET /conversations/{id}/ - Get conversation detail with messages
     - POST /conversations/group-inquiry/ - Create conversation with group leader
     - POST /conversations/start/ - Start peer-to-peer conversation with another user
+    - GET /conversations/{id}/messages/ - Cursor-paginated message history
     - POST /conversations/{id}/messages/ - Send message in conversation
     - PATCH /conversations/{id}/close/ - Close conversation
     - PATCH /conversations/{id}/reopen/ - Reopen conversation
@@ -1204,41 +1246,69 @@ class ConversationViewSet(viewsets.ModelViewSet):
         """
         List all conversations for the current user.
 
+        Reads the user's denormalized inbox entries, so the page is served
+        by one indexed query regardless of conversation or message count.
+
         Query params:
         - status: Filter by status (active, closed, archived)
         """
-        queryset = self.get_queryset()
+        queryset = InboxEntry.objects.filter(
+            user=request.user
+        ).select_related(
+            'conversation', 'conversation__group',
+            'other_participant', 'other_participant__profile_photo'
+        )
 
         # Filter by status if provided
         status_filter = request.query_params.get('status')
         if status_filter:
-            queryset = queryset.filter(status=status_filter)
+            queryset = queryset.filter(conversation__status=status_filter)
 
         # Apply ordering
         queryset = self.filter_queryset(queryset)
 
         page = self.paginate_queryset(queryset)
+        entries = page if page is not None else queryset
+
+        conversations = []
+        for entry in entries:
+            entry.conversation.inbox_entry = entry
+            conversations.append(entry.conversation)
+
+        serializer = self.get_serializer(conversations, many=True)
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
             return self.get_paginated_response(serializer.data)
-
-        serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
     def retrieve(self, request, *args, **kwargs):
         """
-        Get conversation detail with full message history.
+        Get conversation detail with the latest page of messages.
 
-        Also marks all messages as read for the current user.
+        Marks messages as read up to the newest message returned.
         """
         conversation = self.get_object()
+        page = MessageHistoryService.get_page(conversation)
 
         # Mark messages as read
-        conversation.mark_messages_as_read(request.user)
+        self._mark_page_read(conversation, page)
 
-        serializer = self.get_serializer(conversation)
+        serializer = self.get_serializer(
+            conversation,
+            context={**self.get_serializer_context(), 'message_page': page}
+        )
         return Response(serializer.data)
 
+    def _mark_page_read(self, conversation, page):
+        """Mark messages read up to the newest message delivered in a page."""
+        if not page['messages']:
+            return
+
+        conversation.mark_messages_as_read(
+            self.request.user, up_to=page['messages'][-1])
+        for message in page['messages']:
+            if message.sender_id != self.request.user.id:
+                message.is_read = True
+
     @action(detail=False, methods=['post'], url_path='group-inquiry')
     def group_inquiry(self, request):
         """
@@ -1466,6 +1536,46 @@ class ConversationViewSet(viewsets.ModelViewSet):
             status=status.HTTP_201_CREATED
         )
 
+    @send_message.mapping.get
+    def message_history(self, request, pk=None):
+        """
+        Get a page of message history, keyed on (created_at, id).
+
+        Query params:
+        - before: Cursor; load older messages
+        - after: Cursor; load newer messages
+        - page_size: Messages per page (default: 50, max: 100)
+
+        Returns the page oldest first, with has_older/has_newer flags and the
+        before_cursor/after_cursor for the adjacent pages. Messages are
+        marked as read up to the newest one returned.
+        """
+        conversation = self.get_object()
+
+        try:
+            page_size = request.query_params.get('page_size')
+            page = MessageHistoryService.get_page(
+                conversation,
+                before=request.query_params.get('before'),
+                after=request.query_params.get('after'),
+                page_size=int(page_size) if page_size else None,
+            )
+        except ValueError as e:
+            return Response(
+                {'error': 'invalid_pagination', 'message': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        self._mark_page_read(conversation, page)
+
+        return Response({
+            'results': PrivateMessageSerializer(page['messages'], many=True).data,
+            'has_older': page['has_older'],
+            'has_newer': page['has_newer'],
+            'before_cursor': page['before_cursor'],
+            'after_cursor': page['after_cursor'],
+        })
+
     @action(detail=True, methods=['patch'])
     def close(self, request, pk=None):
         """
@@ -0,0 +1,221 @@
+"""
+Activity rollup for engagement analytics.
+
+Maintains the DailyActivityFact table: for every UTC hour it stores how
+many discussions, comments, reactions, prayer requests, testimonies and
+scriptures each user created in each group. Facts are rebuilt per day
+from the content tables with one aggregate query per event type, so a
+rebuild is idempotent and picks up late deletions or backfills.
+
+The engagement analytics and cohort retention count a user as active
+for discussions and comments only (ENGAGEMENT_EVENT_TYPES), as they did
+when they scanned the content tables; churn scoring uses every type.
+
+Run by Celery:
+- refresh_activity_facts: every 15 minutes, rebuilds the current day
+- rebuild_recent_activity_facts: nightly, rebuilds the last few days
+
+Deployments without Celery Beat keep the facts current on read instead:
+the analytics call ensure_fresh(), which rebuilds the days since the last
+refresh once it is ACTIVITY_FACT_MAX_AGE seconds old. Deploys backfill
+the table with `rebuild_activity_facts --backfill` (scripts/post-migration.sh).
+"""
+
+import logging
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from typing import Dict, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Min
+from django.db.models.functions import ExtractHour
+from django.utils import timezone
+
+from messaging.models import (
+    Comment, Discussion, PrayerRequest, Reaction, Scripture, Testimony
+)
+
+from .models import DailyActivityFact
+
+logger = logging.getLogger(__name__)
+
+
+# Content model and user field for each event type
+ACTIVITY_SOURCES: Dict[str, Tuple] = {
+    DailyActivityFact.EventType.DISCUSSION: (Discussion, 'author_id'),
+    DailyActivityFact.EventType.COMMENT: (Comment, 'author_id'),
+    DailyActivityFact.EventType.REACTION: (Reaction, 'user_id'),
+    DailyActivityFact.EventType.PRAYER_REQUEST: (PrayerRequest, 'author_id'),
+    DailyActivityFact.EventType.TESTIMONY: (Testimony, 'author_id'),
+    DailyActivityFact.EventType.SCRIPTURE: (Scripture, 'author_id'),
+}
+
+# Event types that make a user active in the engagement analytics
+ENGAGEMENT_EVENT_TYPES = [
+    DailyActivityFact.EventType.DISCUSSION,
+    DailyActivityFact.EventType.COMMENT,
+]
+
+
+class ActivityRollupService:
+    """Rebuild DailyActivityFact rows from the content tables."""
+
+    BATCH_SIZE = 5000
+    # When the facts were last refreshed up to now, by any process
+    REFRESHED_KEY = 'monitoring:activity_facts_refreshed_at'
+    REFRESH_LOCK_KEY = 'monitoring:activity_facts_refresh_lock'
+
+    @classmethod
+    def rebuild_day(cls, day: date) -> int:
+        """
+        Replace the facts of one UTC day.
+
+        Args:
+            day: Date to rebuild
+
+        Returns:
+            Number of fact rows written
+        """
+        start = datetime.combine(day, time.min, tzinfo=dt_timezone.utc)
+        end = start + timedelta(days=1)
+
+        facts = []
+        for event_type, (model, user_field) in ACTIVITY_SOURCES.items():
+            rows = model.objects.filter(
+                created_at__gte=start,
+                created_at__lt=end,
+            ).annotate(
+                fact_hour=ExtractHour('created_at', tzinfo=dt_timezone.utc)
+            ).values(
+                'fact_hour', user_field, 'group_id'
+            ).annotate(
+                events=Count('pk')
+            ).order_by()
+
+            facts.extend(
+                DailyActivityFact(
+                    date=day,
+                    hour=row['fact_hour'],
+                    user_id=row[user_field],
+                    group_id=row['group_id'],
+                    event_type=event_type,
+                    count=row['events'],
+                )
+                for row in rows
+            )
+
+        with transaction.atomic():
+            DailyActivityFact.objects.filter(date=day).delete()
+            DailyActivityFact.objects.bulk_create(
+                facts, batch_size=cls.BATCH_SIZE)
+
+        return len(facts)
+
+    @classmethod
+    def rebuild_range(cls, start_date: date, end_date: date) -> int:
+        """
+        Rebuild the facts for every day in a range, one day at a time.
+
+        Args:
+            start_date: First day (inclusive)
+            end_date: Last day (inclusive)
+
+        Returns:
+            Number of fact rows written
+        """
+        total = 0
+        day = start_date
+        while day <= end_date:
+            total += cls.rebuild_day(day)
+            day += timedelta(days=1)
+
+        logger.info(
+            f"Rebuilt activity facts {start_date} to {end_date}: {total} rows")
+        return total
+
+    @classmethod
+    def refresh_today(cls) -> int:
+        """
+        Rebuild the current UTC day, and the previous one shortly after
+        midnight so its last hour is complete.
+
+        Returns:
+            Number of fact rows written
+        """
+        now = timezone.now().astimezone(dt_timezone.utc)
+        start_date = now.date()
+        if now.hour == 0:
+            start_date -= timedelta(days=1)
+        rows = cls.rebuild_range(start_date, now.date())
+        cache.set(cls.REFRESHED_KEY, now, None)
+        return rows
+
+    @classmethod
+    def ensure_fresh(cls) -> int:
+        """
+        Refresh the facts before they are read, when no scheduled refresh
+        has run in the last ACTIVITY_FACT_MAX_AGE seconds (900).
+
+        Rebuilds every day since the last refresh, going back at most
+        ACTIVITY_FACT_REBUILD_DAYS. One process refreshes at a time; the
+        others read the facts as they are. Does nothing when
+        ACTIVITY_FACT_REFRESH_ON_READ is False.
+
+        Returns:
+            Number of fact rows written
+        """
+        if not getattr(settings, 'ACTIVITY_FACT_REFRESH_ON_READ', True):
+            return 0
+
+        now = timezone.now().astimezone(dt_timezone.utc)
+        max_age = timedelta(seconds=getattr(settings, 'ACTIVITY_FACT_MAX_AGE', 900))
+        refreshed_at = cache.get(cls.REFRESHED_KEY)
+        if refreshed_at is not None and now - refreshed_at < max_age:
+            return 0
+        if not cache.add(cls.REFRESH_LOCK_KEY, True, 300):
+            return 0
+
+        try:
+            days = getattr(settings, 'ACTIVITY_FACT_REBUILD_DAYS', 3)
+            start_date = now.date() - timedelta(days=days)
+            if refreshed_at is not None:
+                start_date = max(start_date, refreshed_at.astimezone(dt_timezone.utc).date())
+            rows = cls.rebuild_range(start_date, now.date())
+            cache.set(cls.REFRESHED_KEY, now, None)
+            return rows
+        finally:
+            cache.delete(cls.REFRESH_LOCK_KEY)
+
+    @classmethod
+    def rebuild_recent(cls, days: int = None) -> int:
+        """
+        Rebuild the last complete days.
+
+        Args:
+            days: Number of days before today to rebuild
+                (default: ACTIVITY_FACT_REBUILD_DAYS setting, 3)
+
+        Returns:
+            Number of fact rows written
+        """
+        days = days or getattr(settings, 'ACTIVITY_FACT_REBUILD_DAYS', 3)
+        today = timezone.now().astimezone(dt_timezone.utc).date()
+        return cls.rebuild_range(today - timedelta(days=days), today - timedelta(days=1))
+
+    @classmethod
+    def earliest_activity_date(cls):
+        """
+        Get the date of the oldest content, for full backfills.
+
+        Returns:
+            Earliest UTC date with activity, or None if there is none
+        """
+        firsts = [
+            model.objects.aggregate(first=Min('created_at'))['first']
+            for model, _ in ACTIVITY_SOURCES.values()
+        ]
+        firsts = [first for first in firsts if first is not None]
+        if not firsts:
+            return None
+        return min(firsts).astimezone(dt_timezone.utc).date()
@@ -0,0 +1,349 @@
+"""
+Churn prediction pipeline.
+
+Builds a per-user feature matrix from DailyActivityFact with a single
+grouped aggregate, scores every user in one vectorized NumPy pass and
+stores one UserChurnScore per recently active user, instead of running
+several queries per user and scoring users one by one.
+
+Features (per user, from the activity facts):
+- recent_activity / prior_activity: events in the last 7 days / the 14
+  days before that
+- recent_active_days / prior_active_days: days with any activity in the
+  same windows
+- recent_social / prior_social: comments and reactions
+- recent_posts / prior_posts: discussions, prayer requests, testimonies
+  and scriptures
+- days_since_activity: days since the last active UTC date
+
+Scores (capped at 1.0):
+- activity decline (30%): daily activity rate down 50% (15% if down 20%)
+- inactivity (25%): no activity for over 14 days (15% over 7 days)
+- engagement decline (20%): share of active days down 30% (10% if down 10%)
+- social decline (15%): daily social interactions down 50%
+- posting decline (10%): stopped posting after posting before
+
+Run by Celery:
+- score_user_churn: daily, rescores all recently active users
+"""
+
+import logging
+from datetime import date, timedelta, timezone as dt_timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Q, Sum
+from django.utils import timezone
+
+from .activity_rollup import ActivityRollupService
+from .models import DailyActivityFact, UserChurnScore
+
+logger = logging.getLogger(__name__)
+
+
+RECENT_DAYS = 7
+PRIOR_DAYS = 14
+
+# Feature matrix columns, in order
+FEATURES = (
+    'recent_activity',
+    'prior_activity',
+    'recent_active_days',
+    'prior_active_days',
+    'recent_social',
+    'prior_social',
+    'recent_posts',
+    'prior_posts',
+    'days_since_activity',
+)
+
+SOCIAL_EVENTS = [
+    DailyActivityFact.EventType.COMMENT,
+    DailyActivityFact.EventType.REACTION,
+]
+
+POSTING_EVENTS = [
+    DailyActivityFact.EventType.DISCUSSION,
+    DailyActivityFact.EventType.PRAYER_REQUEST,
+    DailyActivityFact.EventType.TESTIMONY,
+    DailyActivityFact.EventType.SCRIPTURE,
+]
+
+# Risk factor names in score order
+RISK_FACTORS = (
+    'activity_decline',
+    'inactivity',
+    'engagement_decline',
+    'social_decline',
+    'posting_decline',
+)
+
+HIGH_RISK_THRESHOLD = 0.7
+MODERATE_RISK_THRESHOLD = 0.4
+
+
+class ChurnPredictionService:
+    """Score churn risk for all recently active users at once."""
+
+    BATCH_SIZE = 1000
+    # Stored scores older than this are recomputed on read
+    MAX_SCORE_AGE = timedelta(days=1)
+
+    @classmethod
+    def window_days(cls) -> int:
+        """Days of inactivity after which users are no longer scored (CHURN_WINDOW_DAYS, 60)."""
+        return getattr(settings, 'CHURN_WINDOW_DAYS', 60)
+
+    @classmethod
+    def collect_features(
+        cls,
+        today: Optional[date] = None,
+        window_days: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Build the feature matrix of every user active in the window.
+
+        Runs one GROUP BY over the activity facts however many users
+        there are.
+
+        Args:
+            today: UTC date the windows end on (default: today)
+            window_days: Only score users active in this many days
+
+        Returns:
+            Tuple of (user IDs, last activity dates, feature matrix with
+            one row per user and FEATURES columns)
+        """
+        today = today or timezone.now().astimezone(dt_timezone.utc).date()
+        window_days = window_days or cls.window_days()
+        recent_start = today - timedelta(days=RECENT_DAYS - 1)
+        prior_start = recent_start - timedelta(days=PRIOR_DAYS)
+
+        recent = Q(date__gte=recent_start)
+        prior = Q(date__gte=prior_start, date__lt=recent_start)
+        social = Q(event_type__in=SOCIAL_EVENTS)
+        posting = Q(event_type__in=POSTING_EVENTS)
+
+        rows = DailyActivityFact.objects.filter(
+            date__gt=today - timedelta(days=window_days), date__lte=today
+        ).values('user_id').annotate(
+            recent_activity=Sum('count', filter=recent),
+            prior_activity=Sum('count', filter=prior),
+            recent_active_days=Count('date', filter=recent, distinct=True),
+            prior_active_days=Count('date', filter=prior, distinct=True),
+            recent_social=Sum('count', filter=recent & social),
+            prior_social=Sum('count', filter=prior & social),
+            recent_posts=Sum('count', filter=recent & posting),
+            prior_posts=Sum('count', filter=prior & posting),
+            last_date=Max('date'),
+        ).order_by().values_list(
+            'user_id', 'last_date', *FEATURES[:-1])
+
+        user_ids = []
+        last_dates = []
+        matrix = []
+        for user_id, last_date, *features in rows.iterator(chunk_size=10000):
+            user_ids.append(user_id)
+            last_dates.append(last_date)
+            matrix.append(features)
+
+        # Sum() over no matching rows is NULL
+        features = np.array(matrix, dtype=float).reshape(-1, len(FEATURES) - 1)
+        features = np.nan_to_num(features)
+
+        last_dates = np.array(last_dates, dtype='datetime64[D]')
+        days_since = (np.datetime64(today, 'D') - last_dates).astype(float)
+
+        return (
+            np.array(user_ids),
+            last_dates,
+            np.column_stack([features, days_since]),
+        )
+
+    @staticmethod
+    def score(features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score a feature matrix.
+
+        Args:
+            features: One row per user with FEATURES columns
+
+        Returns:
+            Tuple of (churn scores, boolean matrix with one RISK_FACTORS
+            column per factor that contributed)
+        """
+        column = {name: features[:, i] for i, name in enumerate(FEATURES)}
+
+        # Compare daily rates so the 7 and 14 day windows are comparable
+        had_prior = column['prior_activity'] > 0
+        activity_ratio = np.divide(
+            column['recent_activity'] / RECENT_DAYS,
+            column['prior_activity'] / PRIOR_DAYS,
+            out=np.ones(len(features)),
+            where=had_prior,
+        )
+        activity_score = np.select(
+            [activity_ratio < 0.5, activity_ratio < 0.8], [0.3, 0.15], 0.0)
+
+        days_since = column['days_since_activity']
+        inactivity_score = np.select(
+            [days_since > 14, days_since > 7], [0.25, 0.15], 0.0)
+
+        engagement_change = np.divide(
+            column['recent_active_days'] / RECENT_DAYS,
+            column['prior_active_days'] / PRIOR_DAYS,
+            out=np.ones(len(features)),
+            where=column['prior_active_days'] > 0,
+        ) - 1
+        engagement_score = np.select(
+            [engagement_change < -0.3, engagement_change < -0.1], [0.2, 0.1], 0.0)
+
+        social_decline = (column['prior_social'] > 0) & (
+            column['recent_social'] / RECENT_DAYS <
+            0.5 * column['prior_social'] / PRIOR_DAYS)
+
+        posting_decline = (column['prior_posts'] > 0) & (column['recent_posts'] == 0)
+
+        factor_scores = np.column_stack([
+            activity_score,
+            inactivity_score,
+            engagement_score,
+            np.where(social_decline, 0.15, 0.0),
+            np.where(posting_decline, 0.10, 0.0),
+        ])
+        scores = np.minimum(factor_scores.sum(axis=1), 1.0)
+        return scores, factor_scores > 0
+
+    @staticmethod
+    def risk_levels(scores: np.ndarray) -> np.ndarray:
+        """Get the UserChurnScore.RiskLevel of each score."""
+        return np.select(
+            [scores >= HIGH_RISK_THRESHOLD, scores >= MODERATE_RISK_THRESHOLD],
+            [UserChurnScore.RiskLevel.HIGH.value,
+             UserChurnScore.RiskLevel.MODERATE.value],
+            UserChurnScore.RiskLevel.LOW.value,
+        )
+
+    @classmethod
+    def score_users(cls, today: Optional[date] = None) -> int:
+        """
+        Score every recently active user and replace the stored scores.
+
+        Args:
+            today: UTC date the windows end on (default: today)
+
+        Returns:
+            Number of users scored
+        """
+        user_ids, last_dates, features = cls.collect_features(today)
+        scores, factors = cls.score(features)
+        levels = cls.risk_levels(scores)
+        scored_at = timezone.now()
+
+        factor_names = np.array(RISK_FACTORS)
+        ints = features.astype(int).tolist()
+        predictions = [
+            UserChurnScore(
+                user_id=user_id,
+                churn_score=round(score, 4),
+                risk_level=level,
+                risk_factors=factor_names[user_factors].tolist(),
+                **dict(zip(FEATURES, row)),
+                last_activity_date=last_date,
+                scored_at=scored_at,
+            )
+            for user_id, score, level, user_factors, row, last_date in zip(
+                user_ids.tolist(), scores.tolist(), levels.tolist(), factors,
+                ints, last_dates.tolist())
+        ]
+
+        with transaction.atomic():
+            UserChurnScore.objects.all().delete()
+            UserChurnScore.objects.bulk_create(
+                predictions, batch_size=cls.BATCH_SIZE)
+
+        logger.info(
+            f"Churn scores: {len(predictions)} users, "
+            f"{int((levels == UserChurnScore.RiskLevel.HIGH.value).sum())} high risk")
+        return len(predictions)
+
+    @classmethod
+    def latest_scores(cls):
+        """
+        Get the stored churn scores.
+
+        Scores users first if the stored scores are older than
+        MAX_SCORE_AGE, or none have been stored.
+
+        Returns:
+            UserChurnScore queryset
+        """
+        scored_at = UserChurnScore.objects.aggregate(
+            scored_at=Max('scored_at'))['scored_at']
+        if scored_at is None or scored_at < timezone.now() - cls.MAX_SCORE_AGE:
+            ActivityRollupService.ensure_fresh()
+            cls.score_users()
+        return UserChurnScore.objects.all()
+
+    @classmethod
+    def summarize(cls) -> Dict:
+        """
+        Count users per risk level and at-risk users per factor.
+
+        Returns:
+            Dict with 'levels' (risk level to count), 'factors' (risk
+            factor to number of high or moderate risk users), 'total'
+            and 'scored_at'
+        """
+        scores = cls.latest_scores()
+        levels = dict(scores.values_list('risk_level').annotate(
+            count=Count('pk')).order_by())
+
+        factors = dict.fromkeys(RISK_FACTORS, 0)
+        at_risk = scores.exclude(risk_level=UserChurnScore.RiskLevel.LOW)
+        for row_factors, count in at_risk.values_list(
+                'risk_factors').annotate(count=Count('pk')).order_by():
+            for factor in row_factors or []:
+                factors[factor] += count
+
+        return {
+            'levels': {
+                level: levels.get(level, 0)
+                for level in UserChurnScore.RiskLevel.values
+            },
+            'factors': factors,
+            'total': sum(levels.values()),
+            'scored_at': scores.aggregate(Max('scored_at'))['scored_at__max'],
+        }
+
+    @staticmethod
+    def top_users(risk_level: str, limit: int) -> List[Dict]:
+        """
+        Get the highest scoring users of a risk level.
+
+        Args:
+            risk_level: UserChurnScore.RiskLevel value
+            limit: Maximum number of users
+
+        Returns:
+            List of user prediction dicts, highest score first
+        """
+        rows = UserChurnScore.objects.filter(
+            risk_level=risk_level
+        ).select_related('user').order_by('-churn_score')[:limit]
+        now = timezone.now()
+
+        return [
+            {
+                'user_id': row.user_id,
+                'username': row.user.username,
+                'churn_score': round(row.churn_score, 2),
+                'risk_factors': row.risk_factors,
+                'account_age_days': (now - row.user.date_joined).days,
+                'last_activity': row.last_activity_date.isoformat(),
+                'days_since_activity': row.days_since_activity,
+            }
+            for row in rows
+        ]
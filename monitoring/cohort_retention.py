@@ -0,0 +1,195 @@
+"""
+Cohort retention for engagement analytics.
+
+Builds the monthly retention triangle (registration month × month of
+activity) from DailyActivityFact with one GROUP BY over (cohort month,
+active month) and one over registration months, instead of one DISTINCT
+join per cohort and month offset.
+
+Months that can no longer change are cached as raw counts and extended
+incrementally when another month closes; only the open months are
+queried on each request. A month is closed once the nightly fact rebuild
+(ACTIVITY_FACT_REBUILD_DAYS) has moved past its last day.
+
+Active means creating discussions or comments (ENGAGEMENT_EVENT_TYPES).
+Retention only covers activity that has been rolled up; deploys backfill
+it with `rebuild_activity_facts --backfill`.
+"""
+
+import logging
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, DateField
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from authentication.models import User
+
+from .activity_rollup import ENGAGEMENT_EVENT_TYPES, ActivityRollupService
+from .models import DailyActivityFact
+
+logger = logging.getLogger(__name__)
+
+
+def month_offset(cohort: date, month: date) -> int:
+    """Number of months from a cohort month to another month."""
+    return (month.year - cohort.year) * 12 + month.month - cohort.month
+
+
+class CohortRetentionService:
+    """Compute and cache the monthly cohort retention matrix."""
+
+    CACHE_KEY = 'monitoring:cohort_retention'
+    MAX_MONTHS = 12
+
+    @classmethod
+    def get_cohort_analysis(cls, max_months: int = MAX_MONTHS) -> List[Dict]:
+        """
+        Get the retention triangle of every registration cohort.
+
+        Args:
+            max_months: Number of months after registration to report
+
+        Returns:
+            List of cohorts, oldest first, each with its size and the users
+            active in every following month that has started
+        """
+        sizes, active = cls.get_matrix()
+        current_month = timezone.now().astimezone(dt_timezone.utc).date().replace(day=1)
+
+        cohort_data = []
+        for cohort_month in sorted(sizes):
+            cohort_size = sizes[cohort_month]
+            elapsed = min(month_offset(cohort_month, current_month), max_months)
+
+            retention_months = []
+            for offset in range(1, elapsed + 1):
+                retained_users = active.get((cohort_month, offset), 0)
+                retention_months.append({
+                    'month': offset,
+                    'retained_users': retained_users,
+                    'retention_rate': round(
+                        retained_users / max(cohort_size, 1) * 100, 2)
+                })
+
+            cohort_data.append({
+                'cohort_month': cohort_month.strftime('%Y-%m'),
+                'cohort_size': cohort_size,
+                'retention_by_month': retention_months
+            })
+
+        return cohort_data
+
+    @classmethod
+    def get_matrix(cls) -> Tuple[Dict[date, int], Dict[Tuple[date, int], int]]:
+        """
+        Get cohort sizes and active users per (cohort, month offset).
+
+        Closed months come from the cache, extended with any month that
+        closed since it was stored; open months are counted live.
+
+        Returns:
+            Tuple of ({cohort month: size}, {(cohort month, offset): users})
+        """
+        ActivityRollupService.ensure_fresh()
+        boundary = cls.closed_boundary()
+
+        cached = cache.get(cls.CACHE_KEY)
+        if cached is None or cached['boundary'] > boundary:
+            cached = cls._count(until=boundary)
+            cls._store(cached)
+        elif cached['boundary'] < boundary:
+            logger.info(
+                f"Extending cohort retention cache from {cached['boundary']} to {boundary}")
+            cached = cls._merge(cached, cls._count(since=cached['boundary'], until=boundary))
+            cls._store(cached)
+
+        matrix = cls._merge(cached, cls._count(since=boundary))
+
+        active = {
+            (cohort_month, month_offset(cohort_month, active_month)): users
+            for (cohort_month, active_month), users in matrix['active'].items()
+        }
+        return matrix['sizes'], active
+
+    @classmethod
+    def closed_boundary(cls) -> date:
+        """
+        First day of the oldest month that may still change.
+
+        Returns:
+            Month start; every earlier month is closed
+        """
+        rebuild_days = getattr(settings, 'ACTIVITY_FACT_REBUILD_DAYS', 3)
+        today = timezone.now().astimezone(dt_timezone.utc).date()
+        return (today - timedelta(days=rebuild_days)).replace(day=1)
+
+    @classmethod
+    def invalidate(cls):
+        """Drop the cached matrix, e.g. after rebuilding old facts."""
+        cache.delete(cls.CACHE_KEY)
+
+    @classmethod
+    def _count(cls, since: Optional[date] = None, until: Optional[date] = None) -> Dict:
+        """
+        Count cohort sizes and active users for months in [since, until).
+
+        Each (cohort, active month) cell and each cohort size falls in
+        exactly one range, so counts of disjoint ranges can be added.
+        """
+        users = User.objects.all()
+        facts = DailyActivityFact.objects.filter(event_type__in=ENGAGEMENT_EVENT_TYPES)
+        if since is not None:
+            users = users.filter(date_joined__gte=cls._utc_start(since))
+            facts = facts.filter(date__gte=since)
+        if until is not None:
+            users = users.filter(date_joined__lt=cls._utc_start(until))
+            facts = facts.filter(date__lt=until)
+
+        cohort_month = TruncMonth(
+            'date_joined', output_field=DateField(), tzinfo=dt_timezone.utc)
+        sizes = dict(
+            users.annotate(cohort=cohort_month).values('cohort').annotate(
+                size=Count('id')
+            ).order_by().values_list('cohort', 'size')
+        )
+
+        active = {
+            (row['cohort'], row['active_month']): row['users']
+            for row in facts.annotate(
+                cohort=TruncMonth(
+                    'user__date_joined', output_field=DateField(), tzinfo=dt_timezone.utc),
+                active_month=TruncMonth('date'),
+            ).values('cohort', 'active_month').annotate(
+                users=Count('user_id', distinct=True)
+            ).order_by()
+        }
+
+        return {'boundary': until, 'sizes': sizes, 'active': active}
+
+    @classmethod
+    def _utc_start(cls, day: date) -> datetime:
+        """Start of a UTC day, matching the UTC months of the facts."""
+        return datetime.combine(day, time.min, tzinfo=dt_timezone.utc)
+
+    @classmethod
+    def _merge(cls, base: Dict, extra: Dict) -> Dict:
+        """Add the counts of a later range to a matrix."""
+        sizes = dict(base['sizes'])
+        for cohort_month, size in extra['sizes'].items():
+            sizes[cohort_month] = sizes.get(cohort_month, 0) + size
+
+        active = dict(base['active'])
+        for cell, users in extra['active'].items():
+            active[cell] = active.get(cell, 0) + users
+
+        return {'boundary': extra['boundary'], 'sizes': sizes, 'active': active}
+
+    @classmethod
+    def _store(cls, matrix: Dict):
+        """Cache the closed part of the matrix."""
+        timeout = getattr(settings, 'COHORT_RETENTION_CACHE_TIMEOUT', 60 * 60 * 24 * 30)
+        cache.set(cls.CACHE_KEY, matrix, timeout)
@@ -6,10 +6,15 @@ Comprehensive content moderation system providing:
 - Community health metrics and trends
 - Moderation queue management
 - Risk assessment and escalation tools
+
+Discussions and comments are scored once on save (see
+messaging.risk_scoring) and keep risk_score and risk_categories on the
+row, so the dashboards aggregate stored scores instead of re-scanning
+content on every request.
 """
 
-from django.db import models
-from django.db.models import Count, Q, Avg, F
+from django.db.models import Count, Q, Avg, F, Sum
+from django.db.models.functions import Length, TruncDate
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.views import APIView
@@ -19,11 +24,12 @@ from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
 from datetime import timedelta, datetime
 from typing import Dict, List, Optional, Tuple
-import re
 import logging
 from collections import defaultdict
 
-from groups.models import Group, GroupMembership, DiscussionTopic, Comment
+from group.models import Group
+from messaging.models import Discussion, Comment
+from messaging.risk_scoring import RISK_PATTERNS, risk_scorer
 from authentication.models import User
 
 logger = logging.getLogger('content_moderation')
@@ -34,25 +40,16 @@ class ContentModerationService:
     Service for content moderation analytics and automated detection.
     """
 
-    # Content risk patterns (simplified - would be more sophisticated in production)
-    RISK_PATTERNS = {
-        'crisis_keywords': [
-            'suicide', 'self-harm', 'kill myself', 'end it all', 'not worth living',
-            'overdose', 'cutting', 'pills', 'bridge', 'gun'
-        ],
-        'spam_patterns': [
-            r'\b(?:buy|purchase|click here|free money|earn \$\d+)\b',
-            r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-        ],
-        'inappropriate_language': [
-            # This would be a more comprehensive list in production
-            'offensive_term_1', 'offensive_term_2', 'harassment_term'
-        ],
-        'substance_abuse_triggers': [
-            'dealer', 'score', 'fix', 'high quality', 'pure stuff',
-            'connect me', 'hook me up'
-        ]
-    }
+    # Content risk patterns, compiled once into messaging.risk_scoring.risk_scorer
+    RISK_PATTERNS = RISK_PATTERNS
+
+    # Scores above which content is queued for review / auto-flagged
+    REVIEW_THRESHOLD = 0.3
+    AUTO_FLAG_THRESHOLD = 0.5
+    HIGH_PRIORITY_THRESHOLD = 0.7
+
+    # Maximum items of each type listed in the moderation queue
+    QUEUE_LIMIT = 50
 
     def __init__(self):
         self.cache_timeout = 300  # 5 minutes
@@ -85,92 +82,77 @@ class ContentModerationService:
 
     def _get_moderation_queue(self) -> Dict:
         """Get current moderation queue status."""
-        # In a full implementation, this would check a moderation queue table
-        # For now, we'll simulate with content that needs review
-
-        # Recent content that might need review
-        recent_discussions = DiscussionTopic.objects.filter(
-            created_at__gte=timezone.now() - timedelta(hours=24)
-        ).order_by('-created_at')
-
-        recent_comments = Comment.objects.filter(
-            created_at__gte=timezone.now() - timedelta(hours=24)
-        ).order_by('-created_at')
-
-        # Simulate flagged content
-        flagged_discussions = []
-        flagged_comments = []
-
-        for discussion in recent_discussions[:10]:  # Limit for demo
-            risk_score = self._calculate_content_risk_score(
-                discussion.title + " " + discussion.content)
-            if risk_score > 0.3:  # Threshold for review
-                flagged_discussions.append({
-                    'id': discussion.id,
-                    'title': discussion.title,
-                    'author': discussion.author.username,
-                    'created_at': discussion.created_at.isoformat(),
-                    'risk_score': round(risk_score, 2),
-                    'risk_categories': self._identify_risk_categories(discussion.title + " " + discussion.content),
-                    'group': discussion.group.name
-                })
-
-        for comment in recent_comments[:20]:  # Limit for demo
-            risk_score = self._calculate_content_risk_score(comment.content)
-            if risk_score > 0.3:
-                flagged_comments.append({
-                    'id': comment.id,
-                    'content_preview': comment.content[:100] + "..." if len(comment.content) > 100 else comment.content,
-                    'author': comment.author.username,
-                    'created_at': comment.created_at.isoformat(),
-                    'risk_score': round(risk_score, 2),
-                    'risk_categories': self._identify_risk_categories(comment.content),
-                    'discussion_title': comment.topic.title
-                })
+        # Content from the last 24 hours scored above the review threshold
+        since = timezone.now() - timedelta(hours=24)
+        flagged = Q(created_at__gte=since, risk_score__gt=self.REVIEW_THRESHOLD)
+
+        discussions = Discussion.objects.filter(flagged)
+        comments = Comment.objects.filter(flagged)
+
+        pending_reviews = discussions.count() + comments.count()
+        high_priority = discussions.filter(
+            risk_score__gt=self.HIGH_PRIORITY_THRESHOLD
+        ).count() + comments.filter(
+            risk_score__gt=self.HIGH_PRIORITY_THRESHOLD
+        ).count()
+
+        flagged_discussions = [
+            {
+                'id': discussion.id,
+                'title': discussion.title,
+                'author': discussion.author.username,
+                'created_at': discussion.created_at.isoformat(),
+                'risk_score': round(discussion.risk_score, 2),
+                'risk_categories': discussion.risk_categories,
+                'group': discussion.group.name
+            }
+            for discussion in discussions.select_related(
+                'author', 'group').order_by('-risk_score', '-created_at')[:self.QUEUE_LIMIT]
+        ]
+
+        flagged_comments = [
+            {
+                'id': comment.id,
+                'content_preview': comment.content[:100] + "..." if len(comment.content) > 100 else comment.content,
+                'author': comment.author.username,
+                'created_at': comment.created_at.isoformat(),
+                'risk_score': round(comment.risk_score, 2),
+                'risk_categories': comment.risk_categories,
+                'discussion_title': comment.discussion.title if comment.discussion else None
+            }
+            for comment in comments.select_related(
+                'author', 'discussion').order_by('-risk_score', '-created_at')[:self.QUEUE_LIMIT]
+        ]
 
         return {
-            'pending_reviews': len(flagged_discussions) + len(flagged_comments),
-            'high_priority': len([item for item in flagged_discussions + flagged_comments if item['risk_score'] > 0.7]),
-            'flagged_discussions': sorted(flagged_discussions, key=lambda x: x['risk_score'], reverse=True),
-            'flagged_comments': sorted(flagged_comments, key=lambda x: x['risk_score'], reverse=True),
+            'pending_reviews': pending_reviews,
+            'high_priority': high_priority,
+            'flagged_discussions': flagged_discussions,
+            'flagged_comments': flagged_comments,
             'last_updated': timezone.now().isoformat()
         }
 
     def _get_content_analysis(self, cutoff_date: datetime) -> Dict:
         """Analyze content patterns and risks."""
-        discussions = DiscussionTopic.objects.filter(
-            created_at__gte=cutoff_date)
+        discussions = Discussion.objects.filter(created_at__gte=cutoff_date)
         comments = Comment.objects.filter(created_at__gte=cutoff_date)
 
+        discussion_totals = discussions.aggregate(
+            count=Count('pk'), risk=Sum('risk_score'))
+        comment_totals = comments.aggregate(
+            count=Count('pk'), risk=Sum('risk_score'))
+
         # Content volume analysis
+        days = (timezone.now() - cutoff_date).days or 1
         content_volume = {
-            'total_discussions': discussions.count(),
-            'total_comments': comments.count(),
-            'daily_average_discussions': round(discussions.count() / ((timezone.now() - cutoff_date).days or 1), 2),
-            'daily_average_comments': round(comments.count() / ((timezone.now() - cutoff_date).days or 1), 2)
+            'total_discussions': discussion_totals['count'],
+            'total_comments': comment_totals['count'],
+            'daily_average_discussions': round(discussion_totals['count'] / days, 2),
+            'daily_average_comments': round(comment_totals['count'] / days, 2)
         }
 
-        # Risk category analysis
-        risk_categories = defaultdict(int)
-        total_risk_score = 0
-        content_count = 0
-
-        for discussion in discussions:
-            content = discussion.title + " " + discussion.content
-            categories = self._identify_risk_categories(content)
-            for category in categories:
-                risk_categories[category] += 1
-            total_risk_score += self._calculate_content_risk_score(content)
-            content_count += 1
-
-        for comment in comments:
-            categories = self._identify_risk_categories(comment.content)
-            for category in categories:
-                risk_categories[category] += 1
-            total_risk_score += self._calculate_content_risk_score(
-                comment.content)
-            content_count += 1
-
+        content_count = discussion_totals['count'] + comment_totals['count']
+        total_risk_score = (discussion_totals['risk'] or 0) + (comment_totals['risk'] or 0)
         avg_risk_score = round(total_risk_score / max(content_count, 1), 3)
 
         # Content quality metrics
@@ -178,29 +160,46 @@ class ContentModerationService:
 
         return {
             'content_volume': content_volume,
-            'risk_categories': dict(risk_categories),
+            'risk_categories': self._count_risk_categories(cutoff_date),
             'average_risk_score': avg_risk_score,
             'quality_metrics': quality_metrics
         }
 
+    def _count_risk_categories(self, cutoff_date: datetime) -> Dict[str, int]:
+        """Count content per stored risk category since the cutoff."""
+        risk_categories = defaultdict(int)
+
+        # Few distinct category combinations exist, so group by the list
+        for model in (Discussion, Comment):
+            combinations = model.objects.filter(
+                created_at__gte=cutoff_date, risk_score__gt=0
+            ).values('risk_categories').annotate(
+                count=Count('pk')
+            ).order_by()
+            for row in combinations:
+                for category in row['risk_categories'] or []:
+                    risk_categories[category] += row['count']
+
+        return dict(risk_categories)
+
     def _get_community_health_metrics(self, cutoff_date: datetime) -> Dict:
         """Get community health indicators."""
         # User engagement health
         active_users = User.objects.filter(
             Q(comments__created_at__gte=cutoff_date) |
-            Q(discussion_topics__created_at__gte=cutoff_date)
+            Q(discussions__created_at__gte=cutoff_date)
         ).distinct().count()
 
         # Group health indicators
         active_groups = Group.objects.filter(
-            discussion_topics__created_at__gte=cutoff_date
+            discussions__created_at__gte=cutoff_date
         ).distinct().count()
 
         # Participation distribution
         user_activity = User.objects.annotate(
-            discussion_count=Count('discussion_topics', filter=Q(
-                discussion_topics__created_at__gte=cutoff_date)),
-            comment_count=Count('comments', filter=Q(
+            discussion_count=Count('discussions', distinct=True, filter=Q(
+                discussions__created_at__gte=cutoff_date)),
+            comment_count=Count('comments', distinct=True, filter=Q(
                 comments__created_at__gte=cutoff_date)),
             total_activity=F('discussion_count') + F('comment_count')
         ).filter(total_activity__gt=0)
@@ -265,46 +264,36 @@ class ContentModerationService:
 
     def _get_moderation_trends(self, cutoff_date: datetime) -> Dict:
         """Get moderation trends over time."""
+        daily = defaultdict(lambda: {'content_volume': 0, 'risk': 0.0, 'flagged_content': 0})
+        for model in (Discussion, Comment):
+            rows = model.objects.filter(
+                created_at__gte=cutoff_date
+            ).annotate(
+                day=TruncDate('created_at')
+            ).values('day').annotate(
+                content_volume=Count('pk'),
+                risk=Sum('risk_score'),
+                flagged_content=Count('pk', filter=Q(
+                    risk_score__gt=self.REVIEW_THRESHOLD))
+            ).order_by()
+            for row in rows:
+                totals = daily[row['day']]
+                totals['content_volume'] += row['content_volume']
+                totals['risk'] += row['risk'] or 0
+                totals['flagged_content'] += row['flagged_content']
+
         daily_trends = []
-        current_date = cutoff_date.date()
-        end_date = timezone.now().date()
+        current_date = timezone.localdate(cutoff_date)
+        end_date = timezone.localdate()
 
         while current_date <= end_date:
-            day_start = timezone.make_aware(
-                datetime.combine(current_date, datetime.min.time()))
-            day_end = day_start + timedelta(days=1)
-
-            day_discussions = DiscussionTopic.objects.filter(
-                created_at__gte=day_start,
-                created_at__lt=day_end
-            )
-
-            day_comments = Comment.objects.filter(
-                created_at__gte=day_start,
-                created_at__lt=day_end
-            )
-
-            # Calculate daily risk metrics
-            daily_risk_score = 0
-            content_count = 0
-
-            for discussion in day_discussions:
-                content = discussion.title + " " + discussion.content
-                daily_risk_score += self._calculate_content_risk_score(content)
-                content_count += 1
-
-            for comment in day_comments:
-                daily_risk_score += self._calculate_content_risk_score(
-                    comment.content)
-                content_count += 1
-
-            avg_daily_risk = round(daily_risk_score / max(content_count, 1), 3)
-
+            totals = daily[current_date]
             daily_trends.append({
                 'date': current_date.isoformat(),
-                'content_volume': content_count,
-                'avg_risk_score': avg_daily_risk,
-                'flagged_content': len([1 for _ in range(content_count) if daily_risk_score / max(content_count, 1) > 0.3])
+                'content_volume': totals['content_volume'],
+                'avg_risk_score': round(
+                    totals['risk'] / max(totals['content_volume'], 1), 3),
+                'flagged_content': totals['flagged_content']
             })
 
             current_date += timedelta(days=1)
@@ -400,57 +389,11 @@ class ContentModerationService:
 
     def _calculate_content_risk_score(self, content: str) -> float:
         """Calculate risk score for content (0.0 to 1.0)."""
-        if not content:
-            return 0.0
-
-        content_lower = content.lower()
-        risk_score = 0.0
-
-        # Check for crisis keywords
-        crisis_matches = sum(1 for keyword in self.RISK_PATTERNS['crisis_keywords']
-                             if keyword in content_lower)
-        if crisis_matches > 0:
-            risk_score += min(crisis_matches * 0.3, 0.8)  # Cap at 0.8
-
-        # Check for spam patterns
-        spam_matches = sum(1 for pattern in self.RISK_PATTERNS['spam_patterns']
-                           if re.search(pattern, content_lower, re.IGNORECASE))
-        if spam_matches > 0:
-            risk_score += min(spam_matches * 0.2, 0.4)  # Cap at 0.4
-
-        # Check for inappropriate language
-        inappropriate_matches = sum(1 for term in self.RISK_PATTERNS['inappropriate_language']
-                                    if term in content_lower)
-        if inappropriate_matches > 0:
-            risk_score += min(inappropriate_matches * 0.15, 0.3)  # Cap at 0.3
-
-        # Check for substance abuse triggers
-        substance_matches = sum(1 for term in self.RISK_PATTERNS['substance_abuse_triggers']
-                                if term in content_lower)
-        if substance_matches > 0:
-            risk_score += min(substance_matches * 0.25, 0.5)  # Cap at 0.5
-
-        return min(risk_score, 1.0)  # Cap total at 1.0
+        return risk_scorer.analyze(content)[0]
 
     def _identify_risk_categories(self, content: str) -> List[str]:
         """Identify which risk categories apply to content."""
-        categories = []
-        content_lower = content.lower()
-
-        if any(keyword in content_lower for keyword in self.RISK_PATTERNS['crisis_keywords']):
-            categories.append('crisis_keywords')
-
-        if any(re.search(pattern, content_lower, re.IGNORECASE)
-               for pattern in self.RISK_PATTERNS['spam_patterns']):
-            categories.append('spam_patterns')
-
-        if any(term in content_lower for term in self.RISK_PATTERNS['inappropriate_language']):
-            categories.append('inappropriate_language')
-
-        if any(term in content_lower for term in self.RISK_PATTERNS['substance_abuse_triggers']):
-            categories.append('substance_abuse_triggers')
-
-        return categories
+        return risk_scorer.analyze(content)[1]
 
     def _analyze_content_quality(self, discussions, comments) -> Dict:
         """Analyze overall content quality metrics."""
@@ -458,21 +401,14 @@ class ContentModerationService:
             return {'insufficient_data': True}
 
         # Average content length
-        discussion_lengths = [len(d.content) for d in discussions if d.content]
-        comment_lengths = [len(c.content) for c in comments if c.content]
-
-        avg_discussion_length = sum(
-            discussion_lengths) / len(discussion_lengths) if discussion_lengths else 0
-        avg_comment_length = sum(comment_lengths) / \
-            len(comment_lengths) if comment_lengths else 0
+        avg_discussion_length = discussions.aggregate(
+            avg=Avg(Length('content')))['avg'] or 0
+        avg_comment_length = comments.aggregate(
+            avg=Avg(Length('content')))['avg'] or 0
 
         # Engagement quality (responses per discussion)
-        discussions_with_responses = discussions.annotate(
-            response_count=Count('comments')
-        )
-
-        avg_responses = discussions_with_responses.aggregate(
-            avg=Avg('response_count')
+        avg_responses = discussions.aggregate(
+            avg=Avg('comment_count')
         )['avg'] or 0
 
         return {
@@ -496,7 +432,7 @@ class ContentModerationService:
 
         # Simple quality indicators
         avg_interaction_length = comments.aggregate(
-            avg_length=Avg(models.Length('content'))
+            avg_length=Avg(Length('content'))
         )['avg_length'] or 0
 
         return {
@@ -511,20 +447,7 @@ class ContentModerationService:
         """Get crisis intervention metrics."""
         # In a full implementation, this would track actual interventions
         # For now, estimate based on crisis keyword detection
-
-        crisis_content_count = 0
-        discussions = DiscussionTopic.objects.filter(
-            created_at__gte=cutoff_date)
-        comments = Comment.objects.filter(created_at__gte=cutoff_date)
-
-        for discussion in discussions:
-            content = discussion.title + " " + discussion.content
-            if any(keyword in content.lower() for keyword in self.RISK_PATTERNS['crisis_keywords']):
-                crisis_content_count += 1
-
-        for comment in comments:
-            if any(keyword in comment.content.lower() for keyword in self.RISK_PATTERNS['crisis_keywords']):
-                crisis_content_count += 1
+        crisis_content_count = self._count_crisis_interventions(cutoff_date)
 
         return {
             'potential_crisis_content': crisis_content_count,
@@ -560,45 +483,47 @@ class ContentModerationService:
         return round(overall_score, 2)
 
     def _identify_high_risk_users(self, cutoff_date: datetime) -> List[Dict]:
-        """Identify users with high risk patterns."""
-        # This would be more sophisticated in production
-        high_risk_users = []
-
-        users_with_activity = User.objects.filter(
-            Q(comments__created_at__gte=cutoff_date) |
-            Q(discussion_topics__created_at__gte=cutoff_date)
-        ).distinct()
-
-        for user in users_with_activity:
-            # Calculate user risk score based on content
-            user_content = []
-
-            # Collect user's recent content
-            discussions = user.discussion_topics.filter(
-                created_at__gte=cutoff_date)
-            comments = user.comments.filter(created_at__gte=cutoff_date)
-
-            for discussion in discussions:
-                user_content.append(discussion.title +
-                                    " " + discussion.content)
-
-            for comment in comments:
-                user_content.append(comment.content)
-
-            # Calculate average risk score
-            if user_content:
-                total_risk = sum(self._calculate_content_risk_score(
-                    content) for content in user_content)
-                avg_risk = total_risk / len(user_content)
-
-                if avg_risk > 0.4:  # High risk threshold
-                    high_risk_users.append({
-                        'user_id': user.id,
-                        'username': user.username,
-                        'avg_risk_score': round(avg_risk, 2),
-                        'content_count': len(user_content),
-                        'risk_categories': self._get_user_risk_categories(user_content)
-                    })
+        """Identify users whose recent content has a high average risk."""
+        totals = defaultdict(lambda: {'risk': 0.0, 'count': 0})
+        for model in (Discussion, Comment):
+            rows = model.objects.filter(
+                created_at__gte=cutoff_date
+            ).values('author_id').annotate(
+                risk=Sum('risk_score'), count=Count('pk')
+            ).order_by()
+            for row in rows:
+                totals[row['author_id']]['risk'] += row['risk'] or 0
+                totals[row['author_id']]['count'] += row['count']
+
+        risky = {
+            author_id: total['risk'] / total['count']
+            for author_id, total in totals.items()
+            if total['risk'] / total['count'] > 0.4  # High risk threshold
+        }
+        if not risky:
+            return []
+
+        categories = defaultdict(set)
+        for model in (Discussion, Comment):
+            for author_id, row_categories in model.objects.filter(
+                    created_at__gte=cutoff_date, author_id__in=risky,
+                    risk_score__gt=0).values_list(
+                    'author_id', 'risk_categories').distinct():
+                categories[author_id].update(row_categories or [])
+
+        usernames = dict(User.objects.filter(
+            id__in=risky).values_list('id', 'username'))
+
+        high_risk_users = [
+            {
+                'user_id': author_id,
+                'username': usernames.get(author_id),
+                'avg_risk_score': round(avg_risk, 2),
+                'content_count': totals[author_id]['count'],
+                'risk_categories': sorted(categories[author_id])
+            }
+            for author_id, avg_risk in risky.items()
+        ]
 
         return sorted(high_risk_users, key=lambda x: x['avg_risk_score'], reverse=True)
 
@@ -612,48 +537,39 @@ class ContentModerationService:
 
     def _assess_group_risks(self, cutoff_date: datetime) -> List[Dict]:
         """Assess risk levels for groups."""
-        group_risks = []
-
-        active_groups = Group.objects.filter(
-            discussion_topics__created_at__gte=cutoff_date
-        ).distinct()
-
-        for group in active_groups:
-            # Collect group content
-            discussions = group.discussion_topics.filter(
-                created_at__gte=cutoff_date)
-            comments = Comment.objects.filter(
-                topic__group=group,
-                created_at__gte=cutoff_date
-            )
-
-            # Calculate group risk score
-            total_risk = 0
-            content_count = 0
-
-            for discussion in discussions:
-                content = discussion.title + " " + discussion.content
-                total_risk += self._calculate_content_risk_score(content)
-                content_count += 1
-
-            for comment in comments:
-                total_risk += self._calculate_content_risk_score(
-                    comment.content)
-                content_count += 1
-
-            if content_count > 0:
-                avg_risk = total_risk / content_count
-
-                if avg_risk > 0.3:  # Risk threshold for groups
-                    group_risks.append({
-                        'group_id': group.id,
-                        'group_name': group.name,
-                        'avg_risk_score': round(avg_risk, 2),
-                        'content_count': content_count,
-                        'member_count': group.memberships.filter(status='active').count()
-                    })
-
-        return sorted(group_risks, key=lambda x: x['avg_risk_score'], reverse=True)[:10]
+        totals = defaultdict(lambda: {'risk': 0.0, 'count': 0})
+        for model in (Discussion, Comment):
+            rows = model.objects.filter(
+                created_at__gte=cutoff_date, group__isnull=False
+            ).values('group_id').annotate(
+                risk=Sum('risk_score'), count=Count('pk')
+            ).order_by()
+            for row in rows:
+                totals[row['group_id']]['risk'] += row['risk'] or 0
+                totals[row['group_id']]['count'] += row['count']
+
+        risky = {
+            group_id: total['risk'] / total['count']
+            for group_id, total in totals.items()
+            if total['risk'] / total['count'] > 0.3  # Risk threshold for groups
+        }
+        top_groups = sorted(risky, key=risky.get, reverse=True)[:10]
+
+        groups = Group.objects.filter(id__in=top_groups).annotate(
+            member_count=Count('memberships', filter=Q(memberships__status='active'))
+        ).in_bulk()
+
+        return [
+            {
+                'group_id': group_id,
+                'group_name': groups[group_id].name,
+                'avg_risk_score': round(risky[group_id], 2),
+                'content_count': totals[group_id]['count'],
+                'member_count': groups[group_id].member_count
+            }
+            for group_id in top_groups
+            if group_id in groups
+        ]
 
     def _analyze_content_trend_risks(self, cutoff_date: datetime) -> Dict:
         """Analyze content trends for emerging risks."""
@@ -711,63 +627,18 @@ class ContentModerationService:
 
     def _count_auto_flagged_content(self, cutoff_date: datetime) -> int:
         """Count content that would be auto-flagged."""
-        # Simulate auto-flagging based on risk scores
-        count = 0
-
-        discussions = DiscussionTopic.objects.filter(
-            created_at__gte=cutoff_date)
-        comments = Comment.objects.filter(created_at__gte=cutoff_date)
-
-        for discussion in discussions:
-            content = discussion.title + " " + discussion.content
-            if self._calculate_content_risk_score(content) > 0.5:
-                count += 1
-
-        for comment in comments:
-            if self._calculate_content_risk_score(comment.content) > 0.5:
-                count += 1
-
-        return count
+        flagged = Q(created_at__gte=cutoff_date,
+                    risk_score__gt=self.AUTO_FLAG_THRESHOLD)
+        return Discussion.objects.filter(flagged).count() + \
+            Comment.objects.filter(flagged).count()
 
     def _count_crisis_interventions(self, cutoff_date: datetime) -> int:
         """Count crisis interventions that would be triggered."""
-        count = 0
-
-        discussions = DiscussionTopic.objects.filter(
-            created_at__gte=cutoff_date)
-        comments = Comment.objects.filter(created_at__gte=cutoff_date)
-
-        for discussion in discussions:
-            content = discussion.title + " " + discussion.content
-            if any(keyword in content.lower() for keyword in self.RISK_PATTERNS['crisis_keywords']):
-                count += 1
-
-        for comment in comments:
-            if any(keyword in comment.content.lower() for keyword in self.RISK_PATTERNS['crisis_keywords']):
-                count += 1
-
-        return count
+        return self._count_risk_categories(cutoff_date).get('crisis_keywords', 0)
 
     def _count_spam_removed(self, cutoff_date: datetime) -> int:
         """Count spam content that would be removed."""
-        count = 0
-
-        discussions = DiscussionTopic.objects.filter(
-            created_at__gte=cutoff_date)
-        comments = Comment.objects.filter(created_at__gte=cutoff_date)
-
-        for discussion in discussions:
-            content = discussion.title + " " + discussion.content
-            if any(re.search(pattern, content.lower(), re.IGNORECASE)
-                   for pattern in self.RISK_PATTERNS['spam_patterns']):
-                count += 1
-
-        for comment in comments:
-            if any(re.search(pattern, comment.content.lower(), re.IGNORECASE)
-                   for pattern in self.RISK_PATTERNS['spam_patterns']):
-                count += 1
-
-        return count
+        return self._count_risk_categories(cutoff_date).get('spam_patterns', 0)
 
     def _count_warnings_issued(self, cutoff_date: datetime) -> int:
         """Count warnings that would be issued."""
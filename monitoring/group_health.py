@@ -0,0 +1,442 @@
+"""
+Group health scoring pipeline.
+
+Computes every group's health features with a fixed handful of
+set-based aggregates (one per content table, lengths via Length() in
+SQL) instead of several queries per group and sub-score, scores them in
+Python and stores one GroupHealthSnapshot per group per day.
+
+Scores (0.0 to 1.0) and weights:
+- engagement (25%): participation, activity per member, response rate
+- content quality (25%): post lengths, discussion depth, freshness
+- social dynamics (20%): balanced participation, cross-member replies,
+  retention of existing members
+- growth and retention (15%): net member growth, new member activation
+- community support (15%): first reply time, answered discussions,
+  comments per member
+
+Run by Celery:
+- snapshot_group_health: daily, snapshots all groups
+"""
+
+import logging
+import statistics
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import (
+    Avg, Count, DurationField, Exists, ExpressionWrapper, F, Func, IntegerField,
+    OuterRef, Q, Subquery
+)
+from django.db.models.functions import Length
+from django.utils import timezone
+
+from group.models import Group, GroupMembership
+from messaging.models import Comment, Discussion
+
+from .models import GroupHealthSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+SCORE_WEIGHTS = {
+    'engagement': 0.25,
+    'content_quality': 0.25,
+    'social_dynamics': 0.20,
+    'growth_retention': 0.15,
+    'community_support': 0.15,
+}
+
+# Features of a group without any memberships or content
+EMPTY_FEATURES = {
+    'member_count': 0,
+    'members_at_start': 0,
+    'retained_members': 0,
+    'new_members': 0,
+    'activated_members': 0,
+    'churned_members': 0,
+    'discussion_count': 0,
+    'recent_discussion_count': 0,
+    'answered_discussions': 0,
+    'avg_discussion_length': None,
+    'avg_replies': None,
+    'avg_first_reply': None,
+    'comment_count': 0,
+    'recent_comment_count': 0,
+    'cross_member_comments': 0,
+    'avg_comment_length': None,
+    'activity_per_author': [],
+}
+
+
+def get_health_status(health_score: float) -> str:
+    """Get health status label from score."""
+    if health_score >= 0.8:
+        return GroupHealthSnapshot.HealthStatus.EXCELLENT
+    elif health_score >= 0.6:
+        return GroupHealthSnapshot.HealthStatus.GOOD
+    elif health_score >= 0.4:
+        return GroupHealthSnapshot.HealthStatus.FAIR
+    return GroupHealthSnapshot.HealthStatus.POOR
+
+
+class GroupHealthService:
+    """Compute group health scores in bulk and store daily snapshots."""
+
+    BATCH_SIZE = 1000
+    RECENT_DAYS = 7
+
+    @classmethod
+    def window_days(cls) -> int:
+        """Days of activity a snapshot covers (GROUP_HEALTH_WINDOW_DAYS, 30)."""
+        return getattr(settings, 'GROUP_HEALTH_WINDOW_DAYS', 30)
+
+    @classmethod
+    def collect_features(
+        cls,
+        cutoff_date: datetime,
+        group_ids: Optional[Iterable] = None,
+    ) -> Dict:
+        """
+        Compute the health features of groups since a cutoff.
+
+        Runs the same five aggregate queries however many groups there
+        are.
+
+        Args:
+            cutoff_date: Start of the analysis window
+            group_ids: Restrict to these groups (default: all groups)
+
+        Returns:
+            Dict of group ID to feature dict (see EMPTY_FEATURES)
+        """
+        recent_date = timezone.now() - timedelta(days=cls.RECENT_DAYS)
+
+        memberships = GroupMembership.objects.all()
+        discussions = Discussion.objects.filter(
+            created_at__gte=cutoff_date, is_deleted=False)
+        comments = Comment.objects.filter(
+            created_at__gte=cutoff_date, is_deleted=False, group__isnull=False)
+        if group_ids is not None:
+            group_ids = list(group_ids)
+            memberships = memberships.filter(group_id__in=group_ids)
+            discussions = discussions.filter(group_id__in=group_ids)
+            comments = comments.filter(group_id__in=group_ids)
+
+        features = defaultdict(lambda: {
+            **EMPTY_FEATURES, 'activity_per_author': []})
+
+        # Members, growth, churn and which members posted in the window
+        member_rows = memberships.annotate(
+            started_discussion=Exists(discussions.filter(
+                group_id=OuterRef('group_id'), author_id=OuterRef('user_id'))),
+            commented=Exists(comments.filter(
+                group_id=OuterRef('group_id'), author_id=OuterRef('user_id'))),
+        ).values('group_id').annotate(
+            member_count=Count('pk', filter=Q(status='active')),
+            members_at_start=Count('pk', filter=Q(
+                status='active', joined_at__lt=cutoff_date)),
+            retained_members=Count('pk', filter=Q(
+                status='active', joined_at__lt=cutoff_date
+            ) & (Q(started_discussion=True) | Q(commented=True))),
+            new_members=Count('pk', filter=Q(
+                status='active', joined_at__gte=cutoff_date)),
+            activated_members=Count('pk', filter=Q(
+                status='active', joined_at__gte=cutoff_date
+            ) & (Q(started_discussion=True) | Q(commented=True))),
+            churned_members=Count('pk', filter=Q(
+                status__in=['inactive', 'removed'], left_at__gte=cutoff_date)),
+        ).order_by()
+        for row in member_rows:
+            features[row.pop('group_id')].update(row)
+
+        # Discussion volume, length, depth and time to first reply
+        # Replies through the generic relation or the legacy discussion FK
+        discussion_type = ContentType.objects.get_for_model(Discussion)
+        replies = Comment.objects.filter(
+            Q(discussion_id=OuterRef('pk')) |
+            Q(content_type=discussion_type, content_id=OuterRef('pk')),
+            is_deleted=False,
+        )
+        first_reply = replies.order_by('created_at').values('created_at')[:1]
+        reply_count = replies.order_by().annotate(
+            total=Func(F('pk'), function='COUNT')).values('total')
+
+        discussion_rows = discussions.annotate(
+            replies=Subquery(reply_count, output_field=IntegerField()),
+            first_reply_wait=ExpressionWrapper(
+                Subquery(first_reply) - F('created_at'),
+                output_field=DurationField()
+            )
+        ).values('group_id').annotate(
+            discussion_count=Count('pk'),
+            recent_discussion_count=Count('pk', filter=Q(created_at__gte=recent_date)),
+            answered_discussions=Count('pk', filter=Q(replies__gt=0)),
+            avg_discussion_length=Avg(Length('content')),
+            avg_replies=Avg('replies'),
+            avg_first_reply=Avg('first_reply_wait'),
+        ).order_by()
+        for row in discussion_rows:
+            features[row.pop('group_id')].update(row)
+
+        # Comment volume, length and replies to other members' discussions
+        comment_rows = comments.annotate(
+            by_discussion_author=Exists(Discussion.objects.filter(
+                group_id=OuterRef('group_id'), author_id=OuterRef('author_id')))
+        ).values('group_id').annotate(
+            comment_count=Count('pk'),
+            recent_comment_count=Count('pk', filter=Q(created_at__gte=recent_date)),
+            cross_member_comments=Count('pk', filter=Q(by_discussion_author=False)),
+            avg_comment_length=Avg(Length('content')),
+        ).order_by()
+        for row in comment_rows:
+            features[row.pop('group_id')].update(row)
+
+        # Posts per author, for participation balance
+        activity = defaultdict(int)
+        for queryset in (discussions, comments):
+            for group_id, author_id, posts in queryset.values(
+                    'group_id', 'author_id').annotate(
+                    posts=Count('pk')).order_by().values_list(
+                    'group_id', 'author_id', 'posts'):
+                activity[group_id, author_id] += posts
+        for (group_id, _), posts in activity.items():
+            features[group_id]['activity_per_author'].append(posts)
+
+        return dict(features)
+
+    @classmethod
+    def score(cls, features: Dict, window_days: int) -> Dict[str, float]:
+        """
+        Score one group's features.
+
+        Args:
+            features: Feature dict from collect_features
+            window_days: Length of the analysis window in days
+
+        Returns:
+            Dict of component scores and the weighted health_score
+        """
+        scores = {
+            'engagement': cls._engagement_score(features),
+            'content_quality': cls._content_quality_score(features),
+            'social_dynamics': cls._social_dynamics_score(features),
+            'growth_retention': cls._growth_retention_score(features, window_days),
+            'community_support': cls._community_support_score(features),
+        }
+        total_score = sum(
+            score * SCORE_WEIGHTS[name] for name, score in scores.items())
+        scores['health_score'] = min(max(total_score, 0.0), 1.0)
+        return scores
+
+    @classmethod
+    def score_group(cls, group_id, cutoff_date: datetime) -> Dict[str, float]:
+        """
+        Score a single group live over an arbitrary window.
+
+        Args:
+            group_id: Group to score
+            cutoff_date: Start of the analysis window
+
+        Returns:
+            Dict of component scores and the weighted health_score
+        """
+        features = cls.collect_features(cutoff_date, group_ids=[group_id]).get(
+            group_id, EMPTY_FEATURES)
+        window_days = (timezone.now() - cutoff_date).days
+        return cls.score(features, window_days)
+
+    @classmethod
+    def take_snapshot(cls, day: Optional[date] = None) -> int:
+        """
+        Score every group and replace the snapshots of one day.
+
+        Args:
+            day: Snapshot date (default: today, UTC)
+
+        Returns:
+            Number of snapshots written
+        """
+        day = day or timezone.now().astimezone(dt_timezone.utc).date()
+        window_days = cls.window_days()
+        cutoff_date = timezone.now() - timedelta(days=window_days)
+
+        features = cls.collect_features(cutoff_date)
+
+        snapshots = []
+        for group_id in Group.objects.values_list('id', flat=True).iterator():
+            group_features = features.get(group_id, EMPTY_FEATURES)
+            scores = cls.score(group_features, window_days)
+            snapshots.append(GroupHealthSnapshot(
+                date=day,
+                group_id=group_id,
+                window_days=window_days,
+                health_score=round(scores['health_score'], 4),
+                health_status=get_health_status(scores['health_score']),
+                engagement_score=round(scores['engagement'], 4),
+                content_quality_score=round(scores['content_quality'], 4),
+                social_dynamics_score=round(scores['social_dynamics'], 4),
+                growth_retention_score=round(scores['growth_retention'], 4),
+                community_support_score=round(scores['community_support'], 4),
+                member_count=group_features['member_count'],
+                active_members=len(group_features['activity_per_author']),
+                new_members=group_features['new_members'],
+                churned_members=group_features['churned_members'],
+                discussion_count=group_features['discussion_count'],
+                comment_count=group_features['comment_count'],
+                recent_discussion_count=group_features['recent_discussion_count'],
+                recent_activity=(group_features['recent_discussion_count'] +
+                                 group_features['recent_comment_count']),
+            ))
+
+        with transaction.atomic():
+            GroupHealthSnapshot.objects.filter(date=day).delete()
+            GroupHealthSnapshot.objects.bulk_create(
+                snapshots, batch_size=cls.BATCH_SIZE)
+
+        logger.info(f"Group health snapshot {day}: {len(snapshots)} groups")
+        return len(snapshots)
+
+    @classmethod
+    def latest_snapshots(cls):
+        """
+        Get the most recent snapshot of every group.
+
+        Takes today's snapshot first if the latest one is from an earlier
+        day (or none has been taken), so the dashboards never show scores
+        from whenever the last snapshot happened to run.
+
+        Returns:
+            GroupHealthSnapshot queryset of today's snapshot
+        """
+        today = timezone.now().astimezone(dt_timezone.utc).date()
+        latest = GroupHealthSnapshot.objects.order_by('-date').values_list(
+            'date', flat=True).first()
+        if latest is None or latest < today:
+            cls.take_snapshot(today)
+        return GroupHealthSnapshot.objects.filter(date=today)
+
+    @staticmethod
+    def _engagement_score(features: Dict) -> float:
+        """Participation rate, activity per active member, response rate."""
+        active_members = len(features['activity_per_author'])
+        participation_rate = active_members / max(features['member_count'], 1)
+
+        total_activity = features['discussion_count'] + features['comment_count']
+        activity_per_member = total_activity / max(active_members, 1)
+
+        response_rate = features['answered_discussions'] / \
+            max(features['discussion_count'], 1)
+
+        engagement_score = (
+            participation_rate * 0.4 +
+            # Normalize to reasonable activity level
+            min(activity_per_member / 10.0, 1.0) * 0.3 +
+            response_rate * 0.3
+        )
+        return min(engagement_score, 1.0)
+
+    @staticmethod
+    def _content_quality_score(features: Dict) -> float:
+        """Average post lengths, replies per discussion, recent activity."""
+        if not features['discussion_count'] and not features['comment_count']:
+            return 0.5  # Neutral score for no activity
+
+        # Normalize length scores (optimal around 200-500 characters)
+        avg_discussion_length = features['avg_discussion_length'] or 0
+        avg_comment_length = features['avg_comment_length'] or 0
+        discussion_length_score = min(
+            avg_discussion_length / 400.0, 1.0) if avg_discussion_length > 50 else 0.3
+        comment_length_score = min(
+            avg_comment_length / 200.0, 1.0) if avg_comment_length > 20 else 0.3
+
+        # Normalize to 5 responses as good depth
+        depth_score = min((features['avg_replies'] or 0) / 5.0, 1.0)
+
+        # 10 recent activities is good
+        recent_activity = features['recent_discussion_count'] + \
+            features['recent_comment_count']
+        freshness_score = min(recent_activity / 10.0, 1.0)
+
+        quality_score = (
+            discussion_length_score * 0.25 +
+            comment_length_score * 0.25 +
+            depth_score * 0.3 +
+            freshness_score * 0.2
+        )
+        return min(quality_score, 1.0)
+
+    @staticmethod
+    def _social_dynamics_score(features: Dict) -> float:
+        """Participation balance, cross-member replies, member retention."""
+        activity_counts = features['activity_per_author']
+        if not activity_counts:
+            return 0.5
+
+        # Balanced participation (not dominated by few users)
+        if len(activity_counts) > 1:
+            activity_variance = statistics.stdev(activity_counts)
+            activity_mean = statistics.mean(activity_counts)
+            balance_score = 1.0 / \
+                (1.0 + (activity_variance / max(activity_mean, 1)))
+        else:
+            balance_score = 0.5
+
+        # Comments by members who have not started discussions in the group
+        interaction_ratio = features['cross_member_comments'] / \
+            max(features['comment_count'], 1)
+
+        retention_rate = features['retained_members'] / \
+            max(features['members_at_start'], 1)
+
+        social_score = (
+            balance_score * 0.4 +
+            interaction_ratio * 0.3 +
+            retention_rate * 0.3
+        )
+        return min(social_score, 1.0)
+
+    @staticmethod
+    def _growth_retention_score(features: Dict, window_days: int) -> float:
+        """Net member growth and activation of new members."""
+        total_members = max(features['member_count'], 1)
+        net_growth = (features['new_members'] -
+                      features['churned_members']) / total_members
+
+        # Normalize growth (5% monthly growth is good), centred around 0.5
+        monthly_growth = net_growth * (30 / max(window_days, 1))
+        growth_score = min(max(monthly_growth / 0.05 + 0.5, 0.0), 1.0)
+
+        activation_rate = features['activated_members'] / \
+            max(features['new_members'], 1)
+
+        return growth_score * 0.6 + activation_rate * 0.4
+
+    @staticmethod
+    def _community_support_score(features: Dict) -> float:
+        """Time to first reply, answered discussions, comments per member."""
+        avg_first_reply = features['avg_first_reply']
+        if avg_first_reply is not None:
+            # Good response time is within 6 hours
+            response_hours = avg_first_reply.total_seconds() / 3600
+            response_score = max(1.0 - (response_hours / 6.0), 0.0)
+        else:
+            response_score = 0.5
+
+        support_rate = features['answered_discussions'] / \
+            max(features['discussion_count'], 1)
+
+        # 5 comments per member is excellent
+        help_ratio = features['comment_count'] / max(features['member_count'], 1)
+        help_score = min(help_ratio / 5.0, 1.0)
+
+        support_score = (
+            response_score * 0.4 +
+            support_rate * 0.4 +
+            help_score * 0.2
+        )
+        return min(support_score, 1.0)
@@ -6,6 +6,9 @@ Comprehensive group-specific health metrics providing:
 - Discussion quality assessment and interaction patterns
 - Group optimization recommendations and interventions
 - Community dynamics and social network analysis
+
+Rankings, trends and at-risk detection read the daily GroupHealthSnapshot
+rows written by monitoring.group_health, so they cover every group.
 """
 
 from django.db import models
@@ -25,8 +28,10 @@ from collections import defaultdict, Counter
 import statistics
 import math
 
-from groups.models import Group, GroupMembership, DiscussionTopic, Comment
-from authentication.models import User
+from group.models import Group
+
+from .group_health import GroupHealthService, get_health_status
+from .models import GroupHealthSnapshot
 
 logger = logging.getLogger('group_health')
 
@@ -103,57 +108,36 @@ class GroupHealthAnalyticsService:
 
     def _get_overall_group_health_metrics(self, cutoff_date: datetime) -> Dict:
         """Get high-level group health metrics overview."""
-        # Total groups and activity
-        total_groups = Group.objects.count()
-        active_groups = Group.objects.filter(
-            discussion_topics__created_at__gte=cutoff_date
-        ).distinct().count()
-
-        # Health score distribution
-        group_health_scores = []
-        for group in Group.objects.all()[:50]:  # Limit for performance
-            health_score = self._calculate_group_health_score(
-                group, cutoff_date)
-            group_health_scores.append(health_score)
-
-        if group_health_scores:
-            avg_health_score = statistics.mean(group_health_scores)
-            health_std_dev = statistics.stdev(group_health_scores) if len(
-                group_health_scores) > 1 else 0
-        else:
-            avg_health_score = 0
-            health_std_dev = 0
-
-        # Health distribution
-        excellent_groups = len(
-            [score for score in group_health_scores if score >= 0.8])
-        good_groups = len(
-            [score for score in group_health_scores if 0.6 <= score < 0.8])
-        fair_groups = len(
-            [score for score in group_health_scores if 0.4 <= score < 0.6])
-        poor_groups = len(
-            [score for score in group_health_scores if score < 0.4])
-
-        # Group size analysis
-        group_sizes = Group.objects.annotate(
-            member_count=Count('memberships', filter=Q(
-                memberships__status='active'))
-        ).values_list('member_count', flat=True)
-
-        avg_group_size = statistics.mean(group_sizes) if group_sizes else 0
+        snapshots = GroupHealthService.latest_snapshots()
+
+        totals = snapshots.aggregate(
+            total_groups=Count('pk'),
+            active_groups=Count('pk', filter=Q(discussion_count__gt=0)),
+            average_health_score=Avg('health_score'),
+            average_group_size=Avg('member_count'),
+        )
+        total_groups = totals['total_groups']
+
+        health_distribution = {
+            health_status: 0 for health_status in GroupHealthSnapshot.HealthStatus.values
+        }
+        health_distribution.update(
+            snapshots.values('health_status').annotate(
+                groups=Count('pk')
+            ).order_by().values_list('health_status', 'groups')
+        )
+
+        health_scores = list(snapshots.values_list('health_score', flat=True))
+        health_std_dev = statistics.stdev(
+            health_scores) if len(health_scores) > 1 else 0
 
         return {
             'total_groups': total_groups,
-            'active_groups': active_groups,
-            'activity_rate': round(active_groups / max(total_groups, 1) * 100, 2),
-            'average_health_score': round(avg_health_score, 2),
-            'health_distribution': {
-                'excellent': excellent_groups,
-                'good': good_groups,
-                'fair': fair_groups,
-                'poor': poor_groups
-            },
-            'average_group_size': round(avg_group_size, 2),
+            'active_groups': totals['active_groups'],
+            'activity_rate': round(totals['active_groups'] / max(total_groups, 1) * 100, 2),
+            'average_health_score': round(totals['average_health_score'] or 0, 2),
+            'health_distribution': health_distribution,
+            'average_group_size': round(totals['average_group_size'] or 0, 2),
             'health_variance': round(health_std_dev, 2)
         }
 
@@ -161,380 +145,58 @@ class GroupHealthAnalyticsService:
         """
         Calculate comprehensive health score for a group (0.0 to 1.0).
 
-        Factors considered:
-        - Member engagement and activity levels
-        - Content quality and discussion depth
-        - Member retention and growth
-        - Social dynamics and interaction quality
-        - Moderator effectiveness
+        Scored live over the requested window with the same aggregates
+        as the daily snapshots; see monitoring.group_health for the
+        factors and weights.
         """
-        scores = {}
-
-        # 1. Member Engagement Score (25%)
-        scores['engagement'] = self._calculate_engagement_score(
-            group, cutoff_date) * 0.25
-
-        # 2. Content Quality Score (25%)
-        scores['content_quality'] = self._calculate_content_quality_score(
-            group, cutoff_date) * 0.25
-
-        # 3. Social Dynamics Score (20%)
-        scores['social_dynamics'] = self._calculate_social_dynamics_score(
-            group, cutoff_date) * 0.20
-
-        # 4. Growth and Retention Score (15%)
-        scores['growth_retention'] = self._calculate_growth_retention_score(
-            group, cutoff_date) * 0.15
-
-        # 5. Community Support Score (15%)
-        scores['community_support'] = self._calculate_community_support_score(
-            group, cutoff_date) * 0.15
-
-        total_score = sum(scores.values())
-        return min(max(total_score, 0.0), 1.0)  # Ensure between 0 and 1
-
-    def _calculate_engagement_score(self, group: Group, cutoff_date: datetime) -> float:
-        """Calculate member engagement score."""
-        # Get group discussions and comments in period
-        discussions = group.discussion_topics.filter(
-            created_at__gte=cutoff_date)
-        comments = Comment.objects.filter(
-            topic__group=group, created_at__gte=cutoff_date)
-
-        # Active members
-        active_members = User.objects.filter(
-            Q(discussion_topics__group=group, discussion_topics__created_at__gte=cutoff_date) |
-            Q(comments__topic__group=group, comments__created_at__gte=cutoff_date)
-        ).distinct().count()
-
-        total_members = group.memberships.filter(status='active').count()
-
-        # Participation rate
-        participation_rate = active_members / max(total_members, 1)
-
-        # Activity per member
-        total_activity = discussions.count() + comments.count()
-        activity_per_member = total_activity / max(active_members, 1)
-
-        # Discussion response rate
-        discussions_with_responses = discussions.annotate(
-            response_count=Count('comments')
-        ).filter(response_count__gt=0).count()
-
-        response_rate = discussions_with_responses / \
-            max(discussions.count(), 1)
-
-        # Weighted score
-        engagement_score = (
-            participation_rate * 0.4 +
-            # Normalize to reasonable activity level
-            min(activity_per_member / 10.0, 1.0) * 0.3 +
-            response_rate * 0.3
-        )
-
-        return min(engagement_score, 1.0)
-
-    def _calculate_content_quality_score(self, group: Group, cutoff_date: datetime) -> float:
-        """Calculate content quality score."""
-        discussions = group.discussion_topics.filter(
-            created_at__gte=cutoff_date)
-        comments = Comment.objects.filter(
-            topic__group=group, created_at__gte=cutoff_date)
-
-        if not discussions.exists() and not comments.exists():
-            return 0.5  # Neutral score for no activity
-
-        # Average content length (indicator of thoughtfulness)
-        discussion_lengths = [len(d.content) for d in discussions if d.content]
-        comment_lengths = [len(c.content) for c in comments if c.content]
-
-        avg_discussion_length = statistics.mean(
-            discussion_lengths) if discussion_lengths else 0
-        avg_comment_length = statistics.mean(
-            comment_lengths) if comment_lengths else 0
-
-        # Normalize length scores (optimal around 200-500 characters)
-        discussion_length_score = min(
-            avg_discussion_length / 400.0, 1.0) if avg_discussion_length > 50 else 0.3
-        comment_length_score = min(
-            avg_comment_length / 200.0, 1.0) if avg_comment_length > 20 else 0.3
-
-        # Discussion depth (responses per discussion)
-        discussions_with_responses = discussions.annotate(
-            response_count=Count('comments')
-        )
-
-        avg_responses = discussions_with_responses.aggregate(
-            avg=Avg('response_count')
-        )['avg'] or 0
-
-        # Normalize to 5 responses as good depth
-        depth_score = min(avg_responses / 5.0, 1.0)
-
-        # Content freshness (recent activity)
-        recent_activity = discussions.filter(
-            created_at__gte=timezone.now() - timedelta(days=7)
-        ).count() + comments.filter(
-            created_at__gte=timezone.now() - timedelta(days=7)
-        ).count()
-
-        # 10 recent activities is good
-        freshness_score = min(recent_activity / 10.0, 1.0)
-
-        quality_score = (
-            discussion_length_score * 0.25 +
-            comment_length_score * 0.25 +
-            depth_score * 0.3 +
-            freshness_score * 0.2
-        )
-
-        return min(quality_score, 1.0)
-
-    def _calculate_social_dynamics_score(self, group: Group, cutoff_date: datetime) -> float:
-        """Calculate social dynamics and interaction quality score."""
-        # Member diversity in participation
-        member_activity = User.objects.filter(
-            Q(discussion_topics__group=group, discussion_topics__created_at__gte=cutoff_date) |
-            Q(comments__topic__group=group, comments__created_at__gte=cutoff_date)
-        ).annotate(
-            activity_count=Count('discussion_topics', filter=Q(discussion_topics__group=group)) +
-            Count('comments', filter=Q(comments__topic__group=group))
-        )
-
-        if not member_activity.exists():
-            return 0.5
-
-        activity_counts = [member.activity_count for member in member_activity]
-
-        # Check for balanced participation (not dominated by few users)
-        if len(activity_counts) > 1:
-            activity_variance = statistics.stdev(activity_counts)
-            activity_mean = statistics.mean(activity_counts)
-            balance_score = 1.0 / \
-                (1.0 + (activity_variance / max(activity_mean, 1)))
-        else:
-            balance_score = 0.5
-
-        # Cross-member interactions (replies between different users)
-        cross_interactions = Comment.objects.filter(
-            topic__group=group,
-            created_at__gte=cutoff_date
-        ).exclude(
-            author__in=DiscussionTopic.objects.filter(
-                group=group).values('author')
-        ).count()
-
-        total_comments = Comment.objects.filter(
-            topic__group=group,
-            created_at__gte=cutoff_date
-        ).count()
-
-        interaction_ratio = cross_interactions / max(total_comments, 1)
-
-        # Member retention within period
-        members_at_start = group.memberships.filter(
-            status='active',
-            created_at__lt=cutoff_date
-        ).count()
-
-        members_still_active = group.memberships.filter(
-            status='active',
-            created_at__lt=cutoff_date,
-            user__in=User.objects.filter(
-                Q(discussion_topics__group=group, discussion_topics__created_at__gte=cutoff_date) |
-                Q(comments__topic__group=group,
-                  comments__created_at__gte=cutoff_date)
-            )
-        ).count()
-
-        retention_rate = members_still_active / max(members_at_start, 1)
-
-        social_score = (
-            balance_score * 0.4 +
-            interaction_ratio * 0.3 +
-            retention_rate * 0.3
-        )
-
-        return min(social_score, 1.0)
-
-    def _calculate_growth_retention_score(self, group: Group, cutoff_date: datetime) -> float:
-        """Calculate growth and member retention score."""
-        # New member acquisition
-        new_members = group.memberships.filter(
-            created_at__gte=cutoff_date,
-            status='active'
-        ).count()
-
-        # Member churn
-        churned_members = group.memberships.filter(
-            status='left',
-            updated_at__gte=cutoff_date
-        ).count()
-
-        total_members = group.memberships.filter(status='active').count()
-
-        # Growth rate
-        growth_rate = new_members / max(total_members, 1)
-        churn_rate = churned_members / max(total_members, 1)
-        net_growth = growth_rate - churn_rate
-
-        # Normalize growth (5% monthly growth is good)
-        days_in_period = (timezone.now() - cutoff_date).days
-        monthly_growth = net_growth * (30 / max(days_in_period, 1))
-        growth_score = min(max(monthly_growth / 0.05 + 0.5,
-                           0.0), 1.0)  # Center around 0.5
-
-        # Member activation rate (new members who become active)
-        new_member_users = User.objects.filter(
-            memberships__group=group,
-            memberships__created_at__gte=cutoff_date
-        )
-
-        active_new_members = new_member_users.filter(
-            Q(discussion_topics__group=group, discussion_topics__created_at__gte=cutoff_date) |
-            Q(comments__topic__group=group, comments__created_at__gte=cutoff_date)
-        ).distinct().count()
-
-        activation_rate = active_new_members / max(new_members, 1)
-
-        return (growth_score * 0.6 + activation_rate * 0.4)
-
-    def _calculate_community_support_score(self, group: Group, cutoff_date: datetime) -> float:
-        """Calculate community support and helpfulness score."""
-        # Response time to new discussions
-        discussions = group.discussion_topics.filter(
-            created_at__gte=cutoff_date)
-
-        response_times = []
-        for discussion in discussions:
-            first_comment = discussion.comments.first()
-            if first_comment:
-                response_time = (
-                    # hours
-                    first_comment.created_at - discussion.created_at).total_seconds() / 3600
-                response_times.append(response_time)
-
-        if response_times:
-            avg_response_time = statistics.mean(response_times)
-            # Good response time is within 6 hours
-            response_score = max(1.0 - (avg_response_time / 6.0), 0.0)
-        else:
-            response_score = 0.5
-
-        # Discussions that receive responses
-        discussions_with_responses = discussions.annotate(
-            response_count=Count('comments')
-        ).filter(response_count__gt=0).count()
-
-        support_rate = discussions_with_responses / max(discussions.count(), 1)
-
-        # Member helping behavior (cross-member support)
-        # This is a simplified metric - in practice you'd analyze content for helpful keywords
-        helpful_interactions = Comment.objects.filter(
-            topic__group=group,
-            created_at__gte=cutoff_date
-        ).count()  # Simplified - would analyze content sentiment
-
-        total_members = group.memberships.filter(status='active').count()
-        help_ratio = helpful_interactions / max(total_members, 1)
-        # 5 helpful interactions per member is excellent
-        help_score = min(help_ratio / 5.0, 1.0)
-
-        support_score = (
-            response_score * 0.4 +
-            support_rate * 0.4 +
-            help_score * 0.2
-        )
-
-        return min(support_score, 1.0)
+        return GroupHealthService.score_group(group.id, cutoff_date)['health_score']
 
     def _rank_groups_by_health(self, cutoff_date: datetime) -> List[Dict]:
-        """Rank groups by health score."""
-        group_rankings = []
-
-        for group in Group.objects.all()[:20]:  # Limit for performance
-            health_score = self._calculate_group_health_score(
-                group, cutoff_date)
-            member_count = group.memberships.filter(status='active').count()
-
-            recent_activity = group.discussion_topics.filter(
-                created_at__gte=cutoff_date
-            ).count() + Comment.objects.filter(
-                topic__group=group,
-                created_at__gte=cutoff_date
-            ).count()
-
-            group_rankings.append({
-                'group_id': group.id,
-                'group_name': group.name,
-                'health_score': round(health_score, 2),
-                'member_count': member_count,
-                'recent_activity': recent_activity,
-                'health_status': self._get_health_status(health_score)
-            })
-
-        # Sort by health score
-        group_rankings.sort(key=lambda x: x['health_score'], reverse=True)
-
-        return group_rankings
+        """Rank all groups by their latest health snapshot."""
+        snapshots = GroupHealthService.latest_snapshots().select_related(
+            'group').order_by('-health_score', 'group__name')
+
+        return [
+            {
+                'group_id': snapshot.group_id,
+                'group_name': snapshot.group.name,
+                'health_score': round(snapshot.health_score, 2),
+                'member_count': snapshot.member_count,
+                'recent_activity': snapshot.recent_activity,
+                'health_status': snapshot.health_status,
+                'snapshot_date': snapshot.date.isoformat()
+            }
+            for snapshot in snapshots
+        ]
 
     def _get_health_status(self, health_score: float) -> str:
         """Get health status label from score."""
-        if health_score >= 0.8:
-            return 'excellent'
-        elif health_score >= 0.6:
-            return 'good'
-        elif health_score >= 0.4:
-            return 'fair'
-        else:
-            return 'poor'
+        return get_health_status(health_score)
 
     def _analyze_group_health_trends(self, cutoff_date: datetime) -> Dict:
-        """Analyze trends in group health over time."""
-        # Weekly health trend analysis
-        weekly_trends = []
-        current_date = cutoff_date.date()
-        end_date = timezone.now().date()
-
-        while current_date <= end_date:
-            week_start = current_date - timedelta(days=current_date.weekday())
-            week_end = week_start + timedelta(days=6)
-
-            if week_end > end_date:
-                break
-
-            week_start_dt = timezone.make_aware(
-                datetime.combine(week_start, datetime.min.time()))
-            week_end_dt = timezone.make_aware(
-                datetime.combine(week_end, datetime.max.time()))
-
-            # Calculate average health for active groups this week
-            active_groups = Group.objects.filter(
-                discussion_topics__created_at__gte=week_start_dt,
-                discussion_topics__created_at__lte=week_end_dt
-            ).distinct()
-
-            if active_groups.exists():
-                health_scores = []
-                for group in active_groups[:10]:  # Limit for performance
-                    health_score = self._calculate_group_health_score(
-                        group, week_start_dt)
-                    health_scores.append(health_score)
-
-                avg_health = statistics.mean(
-                    health_scores) if health_scores else 0
-            else:
-                avg_health = 0
+        """Analyze weekly average group health from the daily snapshots."""
+        weekly_rows = GroupHealthSnapshot.objects.filter(
+            date__gte=cutoff_date.date()
+        ).annotate(
+            week=TruncWeek('date')
+        ).values('week').annotate(
+            average_health_score=Avg('health_score'),
+            active_groups_count=Count(
+                'group', distinct=True, filter=Q(recent_discussion_count__gt=0))
+        ).order_by('week')
 
+        weekly_trends = []
+        for row in weekly_rows:
+            week_start = row['week']
+            if isinstance(week_start, datetime):
+                week_start = week_start.date()
             weekly_trends.append({
                 'week_start': week_start.isoformat(),
-                'week_end': week_end.isoformat(),
-                'average_health_score': round(avg_health, 2),
-                'active_groups_count': active_groups.count()
+                'week_end': (week_start + timedelta(days=6)).isoformat(),
+                'average_health_score': round(row['average_health_score'], 2),
+                'active_groups_count': row['active_groups_count']
             })
 
-            current_date = week_end + timedelta(days=1)
-
         # Trend direction
         if len(weekly_trends) >= 2:
             recent_avg = statistics.mean(
@@ -557,55 +219,62 @@ class GroupHealthAnalyticsService:
             'trend_insights': self._generate_trend_insights(weekly_trends)
         }
 
-    def _identify_at_risk_groups(self, cutoff_date: datetime) -> List[Dict]:
-        """Identify groups that are at risk and need intervention."""
-        at_risk_groups = []
+    def _generate_trend_insights(self, weekly_trends: List[Dict]) -> List[str]:
+        """Generate insights from weekly health trends."""
+        if not weekly_trends:
+            return ['No group health snapshots in this period']
+
+        best_week = max(weekly_trends, key=lambda x: x['average_health_score'])
+        worst_week = min(weekly_trends, key=lambda x: x['average_health_score'])
 
-        for group in Group.objects.all()[:30]:  # Limit for performance
-            health_score = self._calculate_group_health_score(
-                group, cutoff_date)
+        return [
+            f"Healthiest week: {best_week['week_start']} "
+            f"(average score {best_week['average_health_score']})",
+            f"Weakest week: {worst_week['week_start']} "
+            f"(average score {worst_week['average_health_score']})",
+        ]
 
-            # Criteria for at-risk groups
-            member_count = group.memberships.filter(status='active').count()
-            recent_activity = group.discussion_topics.filter(
-                created_at__gte=timezone.now() - timedelta(days=7)
-            ).count()
+    def _identify_at_risk_groups(self, cutoff_date: datetime) -> List[Dict]:
+        """Identify groups that are at risk and need intervention."""
+        snapshots = GroupHealthService.latest_snapshots().filter(
+            Q(health_score__lt=0.4) |
+            Q(member_count__gt=10, recent_discussion_count=0) |
+            Q(member_count__lt=3) |
+            Q(discussion_count__gt=F('recent_discussion_count') * 3)
+        ).select_related('group')
 
+        at_risk_groups = []
+        for snapshot in snapshots:
             risk_factors = []
 
-            if health_score < 0.4:
+            if snapshot.health_score < 0.4:
                 risk_factors.append('low_health_score')
 
-            if member_count > 10 and recent_activity == 0:
+            if snapshot.member_count > 10 and snapshot.recent_discussion_count == 0:
                 risk_factors.append('no_recent_activity')
 
-            if member_count < 3:
+            if snapshot.member_count < 3:
                 risk_factors.append('very_small_group')
 
-            # Check for declining trends
-            older_activity = group.discussion_topics.filter(
-                created_at__gte=cutoff_date,
-                created_at__lt=timezone.now() - timedelta(days=7)
-            ).count()
-
-            if older_activity > recent_activity * 2:
+            # Discussions before the last week outnumber recent ones 2:1
+            older_activity = snapshot.discussion_count - snapshot.recent_discussion_count
+            if older_activity > snapshot.recent_discussion_count * 2:
                 risk_factors.append('declining_activity')
 
-            if risk_factors:
-                at_risk_groups.append({
-                    'group_id': group.id,
-                    'group_name': group.name,
-                    'health_score': round(health_score, 2),
-                    'member_count': member_count,
-                    'recent_activity': recent_activity,
-                    'risk_factors': risk_factors,
-                    'urgency': self._calculate_urgency_level(risk_factors, health_score)
-                })
+            at_risk_groups.append({
+                'group_id': snapshot.group_id,
+                'group_name': snapshot.group.name,
+                'health_score': round(snapshot.health_score, 2),
+                'member_count': snapshot.member_count,
+                'recent_activity': snapshot.recent_discussion_count,
+                'risk_factors': risk_factors,
+                'urgency': self._calculate_urgency_level(risk_factors, snapshot.health_score)
+            })
 
         # Sort by urgency
         at_risk_groups.sort(key=lambda x: x['urgency'], reverse=True)
 
-        return at_risk_groups[:10]  # Return top 10 most at-risk
+        return at_risk_groups
 
     def _calculate_urgency_level(self, risk_factors: List[str], health_score: float) -> int:
         """Calculate urgency level (1-10) for intervention."""
@@ -794,3 +463,35 @@ class GroupHealthRankingsView(APIView):
                 'error': 'Failed to generate group health rankings',
                 'details': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class GroupHealthAtRiskView(APIView):
+    """
+    At-risk groups view, checked across every group's latest snapshot.
+    """
+    permission_classes = [IsAdminUser]
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.health_service = GroupHealthAnalyticsService()
+
+    def get(self, request):
+        """
+        Get groups needing intervention, most urgent first.
+        """
+        try:
+            at_risk_groups = self.health_service._identify_at_risk_groups(
+                timezone.now() - timedelta(days=GroupHealthService.window_days()))
+
+            return Response({
+                'at_risk_groups': at_risk_groups,
+                'count': len(at_risk_groups),
+                'generated_at': timezone.now().isoformat()
+            }, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            logger.error(f"Error identifying at-risk groups: {e}")
+            return Response({
+                'error': 'Failed to identify at-risk groups',
+                'details': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
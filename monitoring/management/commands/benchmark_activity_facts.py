@@ -0,0 +1,261 @@
+"""
+Management command to benchmark engagement analytics on the activity facts.
+
+Seeds synthetic users, groups, discussions and comments (1M content rows
+by default) spread over the analysis window, then times:
+- legacy: one DISTINCT join per day for daily active users, plus Python
+  bucketing of every comment and discussion by hour and weekday
+- rollup: rebuilding the DailyActivityFact rows for the window (the cost
+  of the nightly job, paid once)
+- facts: the same metrics answered from DailyActivityFact with one
+  GROUP BY each
+
+Everything runs in a transaction that is rolled back at the end unless
+--keep is given.
+
+Usage:
+    python manage.py benchmark_activity_facts
+    python manage.py benchmark_activity_facts --rows 200000 --days 30
+    python manage.py benchmark_activity_facts --skip-legacy
+"""
+import random
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from group.models import Group
+from messaging.models import Comment, Discussion
+from monitoring.activity_rollup import ActivityRollupService
+from monitoring.user_engagement_views import UserEngagementAnalyticsService
+
+User = get_user_model()
+
+
+class Rollback(Exception):
+    """Raised to discard the seeded data."""
+
+
+class Command(BaseCommand):
+    help = 'Benchmark engagement analytics from content tables vs activity facts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=1_000_000,
+            help='Content rows to seed (95%% comments, 5%% discussions)'
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=90,
+            help='Analysis window (and spread of the seeded content)'
+        )
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=2000,
+            help='Users to seed'
+        )
+        parser.add_argument(
+            '--groups',
+            type=int,
+            default=100,
+            help='Groups to seed'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            help='Rows per INSERT while seeding'
+        )
+        parser.add_argument(
+            '--skip-legacy',
+            action='store_true',
+            help='Do not time the legacy content-table queries'
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the seeded data and facts'
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        try:
+            with transaction.atomic():
+                self.seed()
+                self.run()
+                if not options['keep']:
+                    raise Rollback()
+        except Rollback:
+            self.stdout.write('\nSeeded data rolled back')
+
+    def seed(self):
+        """Create users, groups and content spread over the window."""
+        options = self.options
+        batch_size = options['batch_size']
+        started = time.perf_counter()
+        tag = f"bench{int(time.time())}"
+
+        User.objects.bulk_create([
+            User(username=f'{tag}-{i}', email=f'{tag}-{i}@example.com', password='!')
+            for i in range(options['users'])
+        ], batch_size=batch_size)
+        user_ids = list(User.objects.filter(
+            username__startswith=f'{tag}-').values_list('id', flat=True))
+
+        Group.objects.bulk_create([
+            Group(
+                name=f'{tag} group {i}',
+                description='Benchmark group',
+                location='Benchmark',
+                leader_id=user_ids[i % len(user_ids)],
+            )
+            for i in range(options['groups'])
+        ], batch_size=batch_size)
+        group_ids = list(Group.objects.filter(
+            name__startswith=f'{tag} group').values_list('id', flat=True))
+
+        discussion_count = max(options['rows'] // 20, 1)
+        comment_count = options['rows'] - discussion_count
+
+        Discussion.objects.bulk_create([
+            Discussion(
+                group_id=random.choice(group_ids),
+                author_id=random.choice(user_ids),
+                title='Benchmark discussion',
+                content='Benchmark discussion content',
+            )
+            for _ in range(discussion_count)
+        ], batch_size=batch_size)
+        discussions = list(Discussion.objects.filter(
+            group_id__in=group_ids).values_list('id', 'group_id'))
+
+        created = 0
+        while created < comment_count:
+            size = min(batch_size, comment_count - created)
+            batch = []
+            for _ in range(size):
+                discussion_id, group_id = random.choice(discussions)
+                batch.append(Comment(
+                    discussion_id=discussion_id,
+                    group_id=group_id,
+                    author_id=random.choice(user_ids),
+                    content='Benchmark comment',
+                ))
+            Comment.objects.bulk_create(batch, batch_size=batch_size)
+            created += size
+
+        # auto_now_add ignores explicit values, so spread timestamps in SQL
+        for model in (Discussion, Comment):
+            self.spread_created_at(model, group_ids)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'🚀 Seeded {options["rows"]} content rows for {len(user_ids)} users '
+            f'in {len(group_ids)} groups over {options["days"]} days '
+            f'({time.perf_counter() - started:.1f}s)'))
+
+    def spread_created_at(self, model, group_ids):
+        """Randomize created_at of seeded rows across the window."""
+        table = connection.ops.quote_name(model._meta.db_table)
+        pk_column = connection.ops.quote_name(model._meta.pk.column)
+        seeded_sql, seeded_params = model.objects.filter(
+            group_id__in=group_ids).values('pk').query.sql_with_params()
+        seconds = self.options['days'] * 86400
+
+        if connection.vendor == 'postgresql':
+            expression = "NOW() - random() * (%s * INTERVAL '1 second')"
+        else:
+            expression = "datetime('now', '-' || (abs(random()) %% %s) || ' seconds')"
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} SET created_at = {expression} "
+                f"WHERE {pk_column} IN ({seeded_sql})",
+                [seconds, *seeded_params]
+            )
+
+    def run(self):
+        """Time the legacy queries, the rollup and the fact queries."""
+        cutoff_date = timezone.now() - timedelta(days=self.options['days'])
+        service = UserEngagementAnalyticsService()
+
+        self.stdout.write(
+            f"\n{'Step':<34} {'Queries':>8} {'Time (ms)':>11}")
+        self.stdout.write('-' * 55)
+
+        if not self.options['skip_legacy']:
+            legacy_total = 0
+            for label, func in [
+                ('legacy daily active users', self.legacy_daily_active_users),
+                ('legacy hourly + weekday patterns', self.legacy_time_patterns),
+            ]:
+                legacy_total += self.measure(label, func, cutoff_date)
+            self.stdout.write(f"{'legacy total':<34} {'':>8} {legacy_total:>11.1f}")
+            self.stdout.write('')
+
+        self.measure(
+            'rollup (rebuild window)',
+            lambda cutoff: ActivityRollupService.rebuild_range(
+                cutoff.astimezone(dt_timezone.utc).date(),
+                timezone.now().astimezone(dt_timezone.utc).date()),
+            cutoff_date)
+        self.stdout.write('')
+
+        facts_total = 0
+        for label, func in [
+            ('facts daily active users', service._calculate_daily_active_users),
+            ('facts hourly patterns', service._analyze_hourly_activity_patterns),
+            ('facts weekday patterns', service._analyze_daily_activity_patterns),
+        ]:
+            facts_total += self.measure(label, func, cutoff_date)
+        self.stdout.write(f"{'facts total':<34} {'':>8} {facts_total:>11.1f}")
+
+        self.measure(
+            'facts full activity endpoint',
+            lambda cutoff: service.get_activity_analytics(self.options['days']),
+            cutoff_date)
+
+    def measure(self, label, func, cutoff_date):
+        """Run one step, printing its query count and duration."""
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            func(cutoff_date)
+            elapsed = (time.perf_counter() - start) * 1000
+        self.stdout.write(f"{label:<34} {len(queries):>8} {elapsed:>11.1f}")
+        return elapsed
+
+    def legacy_daily_active_users(self, cutoff_date):
+        """One DISTINCT join per day, as the service used to compute it."""
+        daily_active = []
+        current_date = cutoff_date.date()
+        end_date = timezone.now().date()
+        while current_date <= end_date:
+            day_start = datetime.combine(
+                current_date, datetime.min.time(), tzinfo=dt_timezone.utc)
+            day_end = day_start + timedelta(days=1)
+            daily_active.append(User.objects.filter(
+                Q(comments__created_at__gte=day_start, comments__created_at__lt=day_end) |
+                Q(discussions__created_at__gte=day_start,
+                  discussions__created_at__lt=day_end)
+            ).distinct().count())
+            current_date += timedelta(days=1)
+        return daily_active
+
+    def legacy_time_patterns(self, cutoff_date):
+        """Bucket every row in Python, as the service used to."""
+        hourly = defaultdict(int)
+        weekday = defaultdict(int)
+        for model in (Comment, Discussion):
+            for row in model.objects.filter(created_at__gte=cutoff_date):
+                hourly[row.created_at.hour] += 1
+                weekday[row.created_at.strftime('%A')] += 1
+        return hourly, weekday
@@ -0,0 +1,216 @@
+"""
+Management command to benchmark churn scoring.
+
+Seeds synthetic users (100k by default) with activity facts spread over
+the churn windows, then times:
+- legacy: separate aggregate queries per user and Python scoring, as the
+  predictive analytics service used to score users one by one (run on a
+  sample and extrapolated to every user)
+- features: the single grouped query building the feature matrix
+- python: scoring the matrix row by row in a Python loop
+- numpy: scoring the matrix in one vectorized pass
+- persist: the whole scoring run including replacing the stored scores
+
+Everything runs in a transaction that is rolled back at the end unless
+--keep is given.
+
+Usage:
+    python manage.py benchmark_churn_scoring
+    python manage.py benchmark_churn_scoring --users 20000 --facts-per-user 10
+    python manage.py benchmark_churn_scoring --legacy-sample 0
+"""
+import random
+import time
+from datetime import timedelta, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max, Q, Sum
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from monitoring.churn_prediction import (
+    FEATURES, POSTING_EVENTS, PRIOR_DAYS, RECENT_DAYS, SOCIAL_EVENTS,
+    ChurnPredictionService
+)
+from monitoring.models import DailyActivityFact
+
+User = get_user_model()
+
+
+class Rollback(Exception):
+    """Raised to discard the seeded data."""
+
+
+class Command(BaseCommand):
+    help = 'Benchmark per-user vs vectorized churn scoring'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=100_000,
+            help='Active users to seed'
+        )
+        parser.add_argument(
+            '--facts-per-user',
+            type=int,
+            default=6,
+            help='Activity fact rows to seed per user'
+        )
+        parser.add_argument(
+            '--legacy-sample',
+            type=int,
+            default=500,
+            help='Users to score with the legacy per-user queries (0 to skip)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            help='Rows per INSERT while seeding'
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the seeded data and scores'
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.today = timezone.now().astimezone(dt_timezone.utc).date()
+        try:
+            with transaction.atomic():
+                self.seed()
+                self.run()
+                if not options['keep']:
+                    raise Rollback()
+        except Rollback:
+            self.stdout.write('\nSeeded data rolled back')
+
+    def seed(self):
+        """Create users with activity facts over the last 30 days."""
+        options = self.options
+        batch_size = options['batch_size']
+        started = time.perf_counter()
+        tag = f"bench{int(time.time())}"
+
+        User.objects.bulk_create([
+            User(username=f'{tag}-{i}', email=f'{tag}-{i}@example.com', password='!')
+            for i in range(options['users'])
+        ], batch_size=batch_size)
+        self.user_ids = list(User.objects.filter(
+            username__startswith=f'{tag}-').values_list('id', flat=True))
+
+        event_types = DailyActivityFact.EventType.values
+        batch = []
+        for user_id in self.user_ids:
+            for _ in range(options['facts_per_user']):
+                batch.append(DailyActivityFact(
+                    date=self.today - timedelta(days=random.randrange(30)),
+                    hour=random.randrange(24),
+                    user_id=user_id,
+                    event_type=random.choice(event_types),
+                    count=random.randint(1, 5),
+                ))
+            if len(batch) >= batch_size:
+                DailyActivityFact.objects.bulk_create(batch)
+                batch = []
+        DailyActivityFact.objects.bulk_create(batch)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'🚀 Seeded {len(self.user_ids)} users with '
+            f'{len(self.user_ids) * options["facts_per_user"]} activity facts '
+            f'({time.perf_counter() - started:.1f}s)'))
+
+    def run(self):
+        """Time the legacy path and each step of the vectorized pipeline."""
+        self.stdout.write(
+            f"\n{'Step':<34} {'Queries':>8} {'Time (ms)':>11}")
+        self.stdout.write('-' * 55)
+
+        sample = self.user_ids[:self.options['legacy_sample']]
+        if sample:
+            elapsed = self.measure(
+                f'legacy per-user ({len(sample)} users)',
+                lambda: [self.legacy_score(user_id) for user_id in sample])
+            scale = len(self.user_ids) / len(sample)
+            self.stdout.write(
+                f"{'legacy extrapolated':<34} "
+                f"{round(self.query_count * scale):>8} {elapsed * scale:>11.1f}")
+            self.stdout.write('')
+
+        result = {}
+        self.measure('features (grouped query)', lambda: result.update(
+            features=ChurnPredictionService.collect_features(self.today)[2]))
+        features = result['features']
+
+        self.measure('python loop scoring', lambda: [
+            self.python_score(row) for row in features.tolist()])
+        self.measure('numpy vectorized scoring',
+                     lambda: ChurnPredictionService.score(features))
+        self.measure('full run + persist',
+                     lambda: ChurnPredictionService.score_users(self.today))
+
+    def measure(self, label, func):
+        """Run one step, printing its query count and duration."""
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            func()
+            elapsed = (time.perf_counter() - start) * 1000
+        self.query_count = len(queries)
+        self.stdout.write(f"{label:<34} {len(queries):>8} {elapsed:>11.1f}")
+        return elapsed
+
+    def legacy_score(self, user_id):
+        """Query one user's features separately and score them in Python."""
+        facts = DailyActivityFact.objects.filter(user_id=user_id)
+        recent_start = self.today - timedelta(days=RECENT_DAYS - 1)
+        prior_start = recent_start - timedelta(days=PRIOR_DAYS)
+        recent = Q(date__gte=recent_start)
+        prior = Q(date__gte=prior_start, date__lt=recent_start)
+
+        def total(query):
+            return facts.filter(query).aggregate(total=Sum('count'))['total'] or 0
+
+        last_date = facts.aggregate(last=Max('date'))['last']
+        row = {
+            'recent_activity': total(recent),
+            'prior_activity': total(prior),
+            'recent_active_days': facts.filter(recent).values('date').distinct().count(),
+            'prior_active_days': facts.filter(prior).values('date').distinct().count(),
+            'recent_social': total(recent & Q(event_type__in=SOCIAL_EVENTS)),
+            'prior_social': total(prior & Q(event_type__in=SOCIAL_EVENTS)),
+            'recent_posts': total(recent & Q(event_type__in=POSTING_EVENTS)),
+            'prior_posts': total(prior & Q(event_type__in=POSTING_EVENTS)),
+            'days_since_activity': (self.today - last_date).days,
+        }
+        return self.python_score([row[name] for name in FEATURES])
+
+    def python_score(self, row):
+        """Score one feature row with scalar Python, for comparison."""
+        row = dict(zip(FEATURES, row))
+        score = 0.0
+
+        if row['prior_activity'] > 0:
+            ratio = (row['recent_activity'] / RECENT_DAYS) / \
+                (row['prior_activity'] / PRIOR_DAYS)
+            score += 0.3 if ratio < 0.5 else 0.15 if ratio < 0.8 else 0.0
+
+        days_since = row['days_since_activity']
+        score += 0.25 if days_since > 14 else 0.15 if days_since > 7 else 0.0
+
+        if row['prior_active_days'] > 0:
+            change = (row['recent_active_days'] / RECENT_DAYS) / \
+                (row['prior_active_days'] / PRIOR_DAYS) - 1
+            score += 0.2 if change < -0.3 else 0.1 if change < -0.1 else 0.0
+
+        if row['prior_social'] > 0 and row['recent_social'] / RECENT_DAYS < \
+                0.5 * row['prior_social'] / PRIOR_DAYS:
+            score += 0.15
+
+        if row['prior_posts'] > 0 and row['recent_posts'] == 0:
+            score += 0.10
+
+        return min(score, 1.0)
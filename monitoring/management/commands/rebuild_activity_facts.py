@@ -0,0 +1,86 @@
+"""
+Management command to rebuild the activity fact table.
+
+Used to backfill DailyActivityFact after deploying it, or to repair a
+range of days. Each day is rebuilt in its own transaction, so the command
+can be interrupted and re-run safely.
+
+--backfill runs on every deploy (scripts/post-migration.sh): a full
+rebuild while the table is empty, otherwise only the recent days.
+
+Usage:
+    python manage.py rebuild_activity_facts --backfill
+    python manage.py rebuild_activity_facts --all
+    python manage.py rebuild_activity_facts --days 30
+    python manage.py rebuild_activity_facts --since 2025-01-01
+"""
+from datetime import date, timedelta, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from monitoring.activity_rollup import ActivityRollupService
+from monitoring.cohort_retention import CohortRetentionService
+from monitoring.models import DailyActivityFact
+
+
+class Command(BaseCommand):
+    help = 'Rebuild daily activity facts from the content tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=7,
+            help='Rebuild this many days up to and including today'
+        )
+        parser.add_argument(
+            '--since',
+            type=date.fromisoformat,
+            help='Rebuild from this date (YYYY-MM-DD) up to today'
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Rebuild from the oldest content up to today'
+        )
+        parser.add_argument(
+            '--backfill',
+            action='store_true',
+            help='Rebuild everything if no facts exist yet, else the last --days days'
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.now().astimezone(dt_timezone.utc).date()
+
+        backfill = options['backfill'] and not DailyActivityFact.objects.exists()
+        if options['all'] or backfill:
+            start_date = ActivityRollupService.earliest_activity_date()
+            if start_date is None:
+                self.stdout.write('No content to roll up')
+                return
+        elif options['since']:
+            start_date = options['since']
+        else:
+            start_date = today - timedelta(days=options['days'] - 1)
+
+        if start_date > today:
+            raise CommandError('Start date is in the future')
+
+        self.stdout.write(f'Rebuilding activity facts {start_date} to {today}...')
+
+        total = 0
+        day = start_date
+        while day <= today:
+            rows = ActivityRollupService.rebuild_day(day)
+            total += rows
+            if rows:
+                self.stdout.write(f'  {day}: {rows} rows')
+            day += timedelta(days=1)
+
+        if start_date < CohortRetentionService.closed_boundary():
+            # Closed months changed, so the cached cohort matrix is stale
+            CohortRetentionService.invalidate()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Rebuilt {(today - start_date).days + 1} days: {total} fact rows'))
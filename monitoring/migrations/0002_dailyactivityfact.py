@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-18 21:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('group', '0006_change_photo_to_base64'),
+        ('monitoring', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyActivityFact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(help_text='UTC date of the activity')),
+                ('hour', models.PositiveSmallIntegerField(help_text='UTC hour of the activity (0-23)')),
+                ('event_type', models.CharField(choices=[('discussion', 'Discussion'), ('comment', 'Comment'), ('reaction', 'Reaction'), ('prayer_request', 'Prayer Request'), ('testimony', 'Testimony'), ('scripture', 'Scripture')], help_text='Kind of content created', max_length=20)),
+                ('count', models.PositiveIntegerField(help_text='Number of events in this hour')),
+                ('group', models.ForeignKey(blank=True, help_text='Group the activity happened in', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='activity_facts', to='group.group')),
+                ('user', models.ForeignKey(help_text='User who performed the activity', on_delete=django.db.models.deletion.CASCADE, related_name='activity_facts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Daily Activity Fact',
+                'verbose_name_plural': 'Daily Activity Facts',
+                'ordering': ['-date', '-hour'],
+                'indexes': [models.Index(fields=['date', 'event_type'], name='monitoring__date_aba92a_idx'), models.Index(fields=['user', 'date'], name='monitoring__user_id_bc8ef0_idx'), models.Index(fields=['group', 'date'], name='monitoring__group_i_3a635c_idx')],
+            },
+        ),
+    ]
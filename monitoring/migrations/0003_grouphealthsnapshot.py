@@ -0,0 +1,47 @@
+# Generated by Django 5.2.7 on 2026-10-18 21:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('group', '0006_change_photo_to_base64'),
+        ('monitoring', '0002_dailyactivityfact'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupHealthSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(help_text='UTC date the snapshot was taken')),
+                ('window_days', models.PositiveSmallIntegerField(help_text='Number of days of activity the scores cover')),
+                ('health_score', models.FloatField(help_text='Weighted overall health score')),
+                ('health_status', models.CharField(choices=[('excellent', 'Excellent'), ('good', 'Good'), ('fair', 'Fair'), ('poor', 'Poor')], help_text='Health band of the overall score', max_length=20)),
+                ('engagement_score', models.FloatField()),
+                ('content_quality_score', models.FloatField()),
+                ('social_dynamics_score', models.FloatField()),
+                ('growth_retention_score', models.FloatField()),
+                ('community_support_score', models.FloatField()),
+                ('member_count', models.PositiveIntegerField(help_text='Active members')),
+                ('active_members', models.PositiveIntegerField(help_text='Members who posted during the window')),
+                ('new_members', models.PositiveIntegerField(help_text='Active members who joined during the window')),
+                ('churned_members', models.PositiveIntegerField(help_text='Members who left or were removed during the window')),
+                ('discussion_count', models.PositiveIntegerField(help_text='Discussions started during the window')),
+                ('comment_count', models.PositiveIntegerField(help_text='Comments written during the window')),
+                ('recent_discussion_count', models.PositiveIntegerField(help_text='Discussions started in the last 7 days')),
+                ('recent_activity', models.PositiveIntegerField(help_text='Discussions and comments in the last 7 days')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('group', models.ForeignKey(help_text='Group the snapshot describes', on_delete=django.db.models.deletion.CASCADE, related_name='health_snapshots', to='group.group')),
+            ],
+            options={
+                'verbose_name': 'Group Health Snapshot',
+                'verbose_name_plural': 'Group Health Snapshots',
+                'ordering': ['-date', '-health_score'],
+                'indexes': [models.Index(fields=['date', 'health_score'], name='monitoring__date_354371_idx')],
+                'unique_together': {('group', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-18 21:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0003_grouphealthsnapshot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserChurnScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('churn_score', models.FloatField(help_text='Churn probability score (0.0 to 1.0)')),
+                ('risk_level', models.CharField(choices=[('high', 'High'), ('moderate', 'Moderate'), ('low', 'Low')], help_text='Risk band of the churn score', max_length=20)),
+                ('risk_factors', models.JSONField(blank=True, default=list, help_text='Churn factors that contributed to the score')),
+                ('recent_activity', models.PositiveIntegerField(help_text='Activity in the last 7 days')),
+                ('prior_activity', models.PositiveIntegerField(help_text='Activity in the 14 days before that')),
+                ('recent_active_days', models.PositiveSmallIntegerField(help_text='Days with activity in the last 7 days')),
+                ('prior_active_days', models.PositiveSmallIntegerField(help_text='Days with activity in the 14 days before that')),
+                ('recent_social', models.PositiveIntegerField(help_text='Comments and reactions in the last 7 days')),
+                ('prior_social', models.PositiveIntegerField(help_text='Comments and reactions in the 14 days before that')),
+                ('recent_posts', models.PositiveIntegerField(help_text='Posts started in the last 7 days')),
+                ('prior_posts', models.PositiveIntegerField(help_text='Posts started in the 14 days before that')),
+                ('days_since_activity', models.PositiveIntegerField(help_text="Days since the user's last activity")),
+                ('last_activity_date', models.DateField(help_text="UTC date of the user's last activity")),
+                ('scored_at', models.DateTimeField(help_text='When the prediction was computed')),
+                ('user', models.OneToOneField(help_text='User the prediction is for', on_delete=django.db.models.deletion.CASCADE, related_name='churn_prediction', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'User Churn Score',
+                'verbose_name_plural': 'User Churn Scores',
+                'ordering': ['-churn_score'],
+                'indexes': [models.Index(fields=['risk_level', 'churn_score'], name='monitoring__risk_le_66682c_idx')],
+            },
+        ),
+    ]
@@ -6,8 +6,11 @@ Stores performance data for analysis and alerting:
 - Database query performance
 - Error rates and response times
 - System health snapshots
+- Daily activity facts for engagement analytics
+- Daily group health snapshots
 """
 
+from django.conf import settings
 from django.db import models
 from django.utils import timezone
 from django.contrib.contenttypes.models import ContentType
@@ -303,3 +306,261 @@ class HealthCheck(models.Model):
 
     def __str__(self):
         return f"{self.check_type}: {self.status} ({self.timestamp.strftime('%Y-%m-%d %H:%M')})"
+
+
+class DailyActivityFact(models.Model):
+    """
+    Hourly activity rollup per user, group and event type.
+
+    One row counts the content a user created in a group during one UTC
+    hour. Rows are rebuilt from the content tables by the activity rollup
+    Celery tasks, so engagement analytics read this table with a single
+    GROUP BY instead of scanning comments and discussions.
+    """
+
+    class EventType(models.TextChoices):
+        DISCUSSION = 'discussion', 'Discussion'
+        COMMENT = 'comment', 'Comment'
+        REACTION = 'reaction', 'Reaction'
+        PRAYER_REQUEST = 'prayer_request', 'Prayer Request'
+        TESTIMONY = 'testimony', 'Testimony'
+        SCRIPTURE = 'scripture', 'Scripture'
+
+    date = models.DateField(
+        help_text="UTC date of the activity"
+    )
+
+    hour = models.PositiveSmallIntegerField(
+        help_text="UTC hour of the activity (0-23)"
+    )
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='activity_facts',
+        help_text="User who performed the activity"
+    )
+
+    group = models.ForeignKey(
+        'group.Group',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='activity_facts',
+        help_text="Group the activity happened in"
+    )
+
+    event_type = models.CharField(
+        max_length=20,
+        choices=EventType.choices,
+        help_text="Kind of content created"
+    )
+
+    count = models.PositiveIntegerField(
+        help_text="Number of events in this hour"
+    )
+
+    class Meta:
+        verbose_name = "Daily Activity Fact"
+        verbose_name_plural = "Daily Activity Facts"
+        indexes = [
+            models.Index(fields=['date', 'event_type']),
+            models.Index(fields=['user', 'date']),
+            models.Index(fields=['group', 'date']),
+        ]
+        ordering = ['-date', '-hour']
+
+    def __str__(self):
+        return f"{self.date} {self.hour:02d}:00 {self.event_type} x{self.count}"
+
+
+class GroupHealthSnapshot(models.Model):
+    """
+    Daily health score of one group.
+
+    Written for every group by the group health Celery task from a few
+    set-based aggregates over the trailing window, so rankings, trends
+    and at-risk detection read stored scores instead of recomputing them
+    group by group on each request.
+    """
+
+    class HealthStatus(models.TextChoices):
+        EXCELLENT = 'excellent', 'Excellent'
+        GOOD = 'good', 'Good'
+        FAIR = 'fair', 'Fair'
+        POOR = 'poor', 'Poor'
+
+    date = models.DateField(
+        help_text="UTC date the snapshot was taken"
+    )
+
+    group = models.ForeignKey(
+        'group.Group',
+        on_delete=models.CASCADE,
+        related_name='health_snapshots',
+        help_text="Group the snapshot describes"
+    )
+
+    window_days = models.PositiveSmallIntegerField(
+        help_text="Number of days of activity the scores cover"
+    )
+
+    # Scores (0.0 to 1.0)
+    health_score = models.FloatField(
+        help_text="Weighted overall health score"
+    )
+
+    health_status = models.CharField(
+        max_length=20,
+        choices=HealthStatus.choices,
+        help_text="Health band of the overall score"
+    )
+
+    engagement_score = models.FloatField()
+    content_quality_score = models.FloatField()
+    social_dynamics_score = models.FloatField()
+    growth_retention_score = models.FloatField()
+    community_support_score = models.FloatField()
+
+    # Features the scores were computed from
+    member_count = models.PositiveIntegerField(
+        help_text="Active members"
+    )
+
+    active_members = models.PositiveIntegerField(
+        help_text="Members who posted during the window"
+    )
+
+    new_members = models.PositiveIntegerField(
+        help_text="Active members who joined during the window"
+    )
+
+    churned_members = models.PositiveIntegerField(
+        help_text="Members who left or were removed during the window"
+    )
+
+    discussion_count = models.PositiveIntegerField(
+        help_text="Discussions started during the window"
+    )
+
+    comment_count = models.PositiveIntegerField(
+        help_text="Comments written during the window"
+    )
+
+    recent_discussion_count = models.PositiveIntegerField(
+        help_text="Discussions started in the last 7 days"
+    )
+
+    recent_activity = models.PositiveIntegerField(
+        help_text="Discussions and comments in the last 7 days"
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Group Health Snapshot"
+        verbose_name_plural = "Group Health Snapshots"
+        unique_together = [['group', 'date']]
+        indexes = [
+            models.Index(fields=['date', 'health_score']),
+        ]
+        ordering = ['-date', '-health_score']
+
+    def __str__(self):
+        return f"{self.group_id} {self.date}: {self.health_score:.2f}"
+
+
+class UserChurnScore(models.Model):
+    """
+    Latest churn prediction for one recently active user.
+
+    Rewritten for every user active in the analysis window by the churn
+    scoring Celery task, which builds a feature matrix from the activity
+    facts and scores all users in one vectorized pass. Churn and early
+    warning endpoints read these rows instead of scoring users on each
+    request.
+    """
+
+    class RiskLevel(models.TextChoices):
+        HIGH = 'high', 'High'
+        MODERATE = 'moderate', 'Moderate'
+        LOW = 'low', 'Low'
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='churn_prediction',
+        help_text="User the prediction is for"
+    )
+
+    churn_score = models.FloatField(
+        help_text="Churn probability score (0.0 to 1.0)"
+    )
+
+    risk_level = models.CharField(
+        max_length=20,
+        choices=RiskLevel.choices,
+        help_text="Risk band of the churn score"
+    )
+
+    risk_factors = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Churn factors that contributed to the score"
+    )
+
+    # Features the score was computed from
+    recent_activity = models.PositiveIntegerField(
+        help_text="Activity in the last 7 days"
+    )
+
+    prior_activity = models.PositiveIntegerField(
+        help_text="Activity in the 14 days before that"
+    )
+
+    recent_active_days = models.PositiveSmallIntegerField(
+        help_text="Days with activity in the last 7 days"
+    )
+
+    prior_active_days = models.PositiveSmallIntegerField(
+        help_text="Days with activity in the 14 days before that"
+    )
+
+    recent_social = models.PositiveIntegerField(
+        help_text="Comments and reactions in the last 7 days"
+    )
+
+    prior_social = models.PositiveIntegerField(
+        help_text="Comments and reactions in the 14 days before that"
+    )
+
+    recent_posts = models.PositiveIntegerField(
+        help_text="Posts started in the last 7 days"
+    )
+
+    prior_posts = models.PositiveIntegerField(
+        help_text="Posts started in the 14 days before that"
+    )
+
+    days_since_activity = models.PositiveIntegerField(
+        help_text="Days since the user's last activity"
+    )
+
+    last_activity_date = models.DateField(
+        help_text="UTC date of the user's last activity"
+    )
+
+    scored_at = models.DateTimeField(
+        help_text="When the prediction was computed"
+    )
+
+    class Meta:
+        verbose_name = "User Churn Score"
+        verbose_name_plural = "User Churn Scores"
+        indexes = [
+            models.Index(fields=['risk_level', 'churn_score']),
+        ]
+        ordering = ['-churn_score']
+
+    def __str__(self):
+        return f"{self.user_id}: {self.churn_score:.2f} ({self.risk_level})"
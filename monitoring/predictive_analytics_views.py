@@ -25,9 +25,13 @@ import statistics
 import math
 import json
 
-from groups.models import Group, GroupMembership, DiscussionTopic, Comment
+from group.models import Group, GroupMembership
+from messaging.models import Comment, Discussion
 from authentication.models import User
 
+from .churn_prediction import ChurnPredictionService
+from .models import UserChurnScore
+
 logger = logging.getLogger('predictive_analytics')
 
 
@@ -73,69 +77,43 @@ class PredictiveAnalyticsService:
     def _predict_user_churn(self, cutoff_date: datetime) -> Dict:
         """
         Predict which users are likely to churn in the next 30 days.
-        Uses statistical analysis of user behavior patterns.
+
+        Reads the scores stored by the daily churn scoring task, which
+        covers every user active in the last CHURN_WINDOW_DAYS, so the
+        cutoff date does not change the result.
         """
         prediction_horizon = 30  # days
 
-        # Analyze historical churn patterns
-        churn_factors = self._analyze_churn_factors(cutoff_date)
-
-        # Score current users for churn risk
-        at_risk_users = []
-        moderate_risk_users = []
-        low_risk_users = []
-
-        # Get active users to analyze
-        active_users = User.objects.filter(
-            Q(comments__created_at__gte=cutoff_date) |
-            Q(discussion_topics__created_at__gte=cutoff_date)
-        ).distinct()
-
-        for user in active_users[:100]:  # Limit for performance
-            churn_score = self._calculate_user_churn_score(
-                user, cutoff_date, churn_factors)
-
-            user_data = {
-                'user_id': user.id,
-                'username': user.username,
-                'churn_score': round(churn_score, 2),
-                'risk_factors': self._identify_user_risk_factors(user, cutoff_date),
-                'account_age_days': (timezone.now() - user.date_joined).days,
-                'last_activity': self._get_user_last_activity(user)
-            }
-
-            if churn_score >= 0.7:
-                at_risk_users.append(user_data)
-            elif churn_score >= 0.4:
-                moderate_risk_users.append(user_data)
-            else:
-                low_risk_users.append(user_data)
+        summary = ChurnPredictionService.summarize()
+        levels = summary['levels']
+        at_risk_users = ChurnPredictionService.top_users(
+            UserChurnScore.RiskLevel.HIGH, 10)
 
-        # Calculate overall churn predictions
-        total_analyzed = len(at_risk_users) + \
-            len(moderate_risk_users) + len(low_risk_users)
-        predicted_churn_rate = len(at_risk_users) / \
-            max(total_analyzed, 1) * 100
+        predicted_churn_rate = levels[UserChurnScore.RiskLevel.HIGH] / \
+            max(summary['total'], 1) * 100
 
         return {
             'prediction_horizon_days': prediction_horizon,
-            'total_users_analyzed': total_analyzed,
+            'scored_at': summary['scored_at'].isoformat() if summary['scored_at'] else None,
+            'total_users_analyzed': summary['total'],
             'predicted_churn_rate_percent': round(predicted_churn_rate, 2),
             'churn_categories': {
                 'high_risk': {
-                    'count': len(at_risk_users),
-                    'users': sorted(at_risk_users, key=lambda x: x['churn_score'], reverse=True)[:10]
+                    'count': levels[UserChurnScore.RiskLevel.HIGH],
+                    'users': at_risk_users
                 },
                 'moderate_risk': {
-                    'count': len(moderate_risk_users),
-                    'users': sorted(moderate_risk_users, key=lambda x: x['churn_score'], reverse=True)[:5]
+                    'count': levels[UserChurnScore.RiskLevel.MODERATE],
+                    'users': ChurnPredictionService.top_users(
+                        UserChurnScore.RiskLevel.MODERATE, 5)
                 },
                 'low_risk': {
-                    'count': len(low_risk_users)
+                    'count': levels[UserChurnScore.RiskLevel.LOW]
                 }
             },
-            'churn_factors': churn_factors,
-            'retention_recommendations': self._generate_retention_recommendations(at_risk_users)
+            'churn_factors': summary['factors'],
+            'retention_recommendations': self._generate_retention_recommendations(
+                summary['factors'])
         }
 
     def _forecast_community_growth(self, cutoff_date: datetime) -> Dict:
@@ -296,6 +274,24 @@ class PredictiveAnalyticsService:
         """
         alerts = []
 
+        # Check for a high share of users predicted to churn
+        churn_summary = ChurnPredictionService.summarize()
+        high_risk_rate = churn_summary['levels'][UserChurnScore.RiskLevel.HIGH] / \
+            max(churn_summary['total'], 1) * 100
+        if high_risk_rate > 10:  # 10% of active users at high churn risk
+            alerts.append({
+                'type': 'churn_risk',
+                'severity': 'high',
+                'title': 'High Churn Risk Detected',
+                'description': f'{high_risk_rate:.1f}% of active users are at high risk of churning',
+                'predicted_impact_days': 30,
+                'recommended_actions': [
+                    'Reach out to high risk members personally',
+                    'Review the most common churn factors',
+                    'Launch re-engagement campaigns'
+                ]
+            })
+
         # Check for rapid growth that might strain resources
         recent_growth = self._analyze_recent_growth_rate(cutoff_date)
         if recent_growth > 50:  # 50% growth in analysis period
@@ -313,7 +309,7 @@ class PredictiveAnalyticsService:
             })
 
         # Check for declining engagement patterns
-        engagement_decline = self._detect_engagement_decline(cutoff_date)
+        engagement_decline = self._detect_engagement_decline(churn_summary)
         if engagement_decline:
             alerts.append({
                 'type': 'engagement_decline',
@@ -348,51 +344,6 @@ class PredictiveAnalyticsService:
 
     # Helper methods for predictive calculations
 
-    def _calculate_user_churn_score(self, user: User, cutoff_date: datetime, churn_factors: Dict) -> float:
-        """Calculate churn probability score for a user (0.0 to 1.0)."""
-        score = 0.0
-
-        # Factor 1: Activity decline (30% weight)
-        recent_activity = self._get_user_recent_activity(user, days=7)
-        past_activity = self._get_user_recent_activity(
-            user, days=14, offset_days=7)
-
-        if past_activity > 0:
-            activity_ratio = recent_activity / past_activity
-            if activity_ratio < 0.5:  # 50% decline
-                score += 0.3
-            elif activity_ratio < 0.8:
-                score += 0.15
-
-        # Factor 2: Time since last activity (25% weight)
-        last_activity = self._get_user_last_activity_days(user)
-        if last_activity > 14:
-            score += 0.25
-        elif last_activity > 7:
-            score += 0.15
-
-        # Factor 3: Engagement pattern changes (20% weight)
-        engagement_change = self._calculate_user_engagement_change(
-            user, cutoff_date)
-        if engagement_change < -0.3:  # 30% decline in engagement
-            score += 0.20
-        elif engagement_change < -0.1:
-            score += 0.10
-
-        # Factor 4: Social connections decline (15% weight)
-        social_decline = self._detect_social_connection_decline(
-            user, cutoff_date)
-        if social_decline:
-            score += 0.15
-
-        # Factor 5: Content posting patterns (10% weight)
-        posting_decline = self._detect_posting_pattern_change(
-            user, cutoff_date)
-        if posting_decline:
-            score += 0.10
-
-        return min(score, 1.0)
-
     def _analyze_historical_growth(self, cutoff_date: datetime) -> Dict:
         """Analyze historical growth patterns."""
         daily_data = []
@@ -415,7 +366,7 @@ class PredictiveAnalyticsService:
             ).count()
 
             daily_activity = (
-                DiscussionTopic.objects.filter(created_at__gte=day_start, created_at__lt=day_end).count() +
+                Discussion.objects.filter(created_at__gte=day_start, created_at__lt=day_end).count() +
                 Comment.objects.filter(
                     created_at__gte=day_start, created_at__lt=day_end).count()
             )
@@ -573,38 +524,45 @@ class PredictiveAnalyticsService:
     # Additional helper methods would be implemented here...
     # (Many more specific calculation methods - abbreviated for length)
 
-    def _get_user_recent_activity(self, user: User, days: int, offset_days: int = 0) -> int:
-        """Get user activity count for a specific period."""
-        end_date = timezone.now() - timedelta(days=offset_days)
-        start_date = end_date - timedelta(days=days)
-
-        activity_count = (
-            user.discussion_topics.filter(created_at__gte=start_date, created_at__lt=end_date).count() +
-            user.comments.filter(created_at__gte=start_date,
-                                 created_at__lt=end_date).count()
+    def _generate_retention_recommendations(self, churn_factors: Dict) -> List[str]:
+        """Recommend retention actions for the most common churn factors."""
+        actions = {
+            'activity_decline': 'Invite members whose activity dropped to upcoming group meetings',
+            'inactivity': 'Send a personal check-in to members who have gone quiet',
+            'engagement_decline': 'Encourage group leaders to follow up with less regular members',
+            'social_decline': 'Pair at-risk members with an active member for support',
+            'posting_decline': 'Prompt former contributors to share a prayer request or testimony',
+        }
+        common = sorted(
+            (factor for factor, count in churn_factors.items() if count),
+            key=churn_factors.get, reverse=True)
+        return [actions[factor] for factor in common[:3]]
+
+    def _analyze_recent_growth_rate(self, cutoff_date: datetime) -> float:
+        """Percentage growth of the user base since the cutoff."""
+        counts = User.objects.aggregate(
+            new=Count('pk', filter=Q(date_joined__gte=cutoff_date)),
+            existing=Count('pk', filter=Q(date_joined__lt=cutoff_date)),
         )
-
-        return activity_count
-
-    def _get_user_last_activity_days(self, user: User) -> int:
-        """Get days since user's last activity."""
-        last_comment = user.comments.order_by('-created_at').first()
-        last_discussion = user.discussion_topics.order_by(
-            '-created_at').first()
-
-        last_activity = None
-        if last_comment and last_discussion:
-            last_activity = max(last_comment.created_at,
-                                last_discussion.created_at)
-        elif last_comment:
-            last_activity = last_comment.created_at
-        elif last_discussion:
-            last_activity = last_discussion.created_at
-
-        if last_activity:
-            return (timezone.now() - last_activity).days
-        else:
-            return 999  # Very high number for inactive users
+        return counts['new'] / max(counts['existing'], 1) * 100
+
+    def _detect_engagement_decline(self, churn_summary: Dict) -> bool:
+        """Whether over 30% of scored users show declining engagement."""
+        return churn_summary['factors']['engagement_decline'] > \
+            0.3 * churn_summary['total']
+
+    def _detect_content_quality_issues(self, cutoff_date: datetime) -> bool:
+        """Whether over 10% of recent content was flagged for review."""
+        flagged = 0
+        total = 0
+        for model in (Discussion, Comment):
+            counts = model.objects.filter(created_at__gte=cutoff_date).aggregate(
+                total=Count('pk'),
+                flagged=Count('pk', filter=Q(risk_score__gte=0.3)),
+            )
+            flagged += counts['flagged']
+            total += counts['total']
+        return flagged > 0.1 * total
 
 
 class PredictiveAnalyticsDashboardView(APIView):
@@ -669,6 +627,41 @@ class ChurnPredictionView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class EarlyWarningAlertsView(APIView):
+    """
+    Early warning alerts view for predicted community issues.
+    """
+    permission_classes = [IsAdminUser]
+
+    def __init__(self):
+        super().__init__()
+        self.predictive_service = PredictiveAnalyticsService()
+
+    def get(self, request):
+        """
+        Get early warning alerts.
+        """
+        days = int(request.query_params.get('days', 30))
+
+        try:
+            cutoff_date = timezone.now() - timedelta(days=days)
+            alerts = self.predictive_service._generate_early_warning_alerts(
+                cutoff_date)
+
+            return Response({
+                'analysis_period_days': days,
+                'generated_at': timezone.now().isoformat(),
+                'alerts': alerts
+            }, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            logger.error(f"Error generating early warning alerts: {e}")
+            return Response({
+                'error': 'Failed to generate early warning alerts',
+                'details': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 class GrowthForecastView(APIView):
     """
     Community growth forecast view for capacity planning.
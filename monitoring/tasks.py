@@ -0,0 +1,103 @@
+"""
+Celery tasks for monitoring app.
+
+Background tasks for:
+- Refreshing the activity fact table used by engagement analytics
+- Snapshotting group health scores
+"""
+
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3)
+def refresh_activity_facts(self):
+    """
+    Rebuild today's activity facts.
+
+    Runs every 15 minutes via Celery Beat so engagement dashboards lag
+    the content tables by at most one interval.
+
+    Returns:
+        dict: Number of fact rows written
+    """
+    try:
+        from .activity_rollup import ActivityRollupService
+
+        rows = ActivityRollupService.refresh_today()
+        return {'rows': rows, 'status': 'success'}
+
+    except Exception as exc:
+        logger.error(f"Activity fact refresh failed: {exc}", exc_info=True)
+        raise self.retry(exc=exc, countdown=60)
+
+
+@shared_task(bind=True, max_retries=3)
+def rebuild_recent_activity_facts(self, days=None):
+    """
+    Rebuild the activity facts of the last few complete days.
+
+    Runs nightly at 3:30am via Celery Beat and corrects facts for content
+    deleted or backfilled after its day was rolled up.
+
+    Args:
+        days: Number of days to rebuild (default: ACTIVITY_FACT_REBUILD_DAYS)
+
+    Returns:
+        dict: Number of fact rows written
+    """
+    try:
+        from .activity_rollup import ActivityRollupService
+
+        rows = ActivityRollupService.rebuild_recent(days)
+        return {'rows': rows, 'status': 'success'}
+
+    except Exception as exc:
+        logger.error(f"Nightly activity fact rebuild failed: {exc}", exc_info=True)
+        raise self.retry(exc=exc, countdown=300)
+
+
+@shared_task(bind=True, max_retries=3)
+def snapshot_group_health(self):
+    """
+    Score every group and store today's health snapshots.
+
+    Runs daily at 4am via Celery Beat, after the nightly activity fact
+    rebuild.
+
+    Returns:
+        dict: Number of groups snapshotted
+    """
+    try:
+        from .group_health import GroupHealthService
+
+        groups = GroupHealthService.take_snapshot()
+        return {'groups': groups, 'status': 'success'}
+
+    except Exception as exc:
+        logger.error(f"Group health snapshot failed: {exc}", exc_info=True)
+        raise self.retry(exc=exc, countdown=300)
+
+
+@shared_task(bind=True, max_retries=3)
+def score_user_churn(self):
+    """
+    Score churn risk for every recently active user.
+
+    Runs daily at 4:30am via Celery Beat, after the nightly activity fact
+    rebuild.
+
+    Returns:
+        dict: Number of users scored
+    """
+    try:
+        from .churn_prediction import ChurnPredictionService
+
+        users = ChurnPredictionService.score_users()
+        return {'users': users, 'status': 'success'}
+
+    except Exception as exc:
+        logger.error(f"Churn scoring failed: {exc}", exc_info=True)
+        raise self.retry(exc=exc, countdown=300)
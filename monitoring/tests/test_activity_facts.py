@@ -0,0 +1,308 @@
+"""
+Tests for the activity fact rollup and the analytics answered from it.
+"""
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from group.models import Group
+from messaging.models import Comment, Discussion
+from monitoring.activity_rollup import ActivityRollupService
+from monitoring.models import DailyActivityFact
+from monitoring.user_engagement_views import UserEngagementAnalyticsService
+
+User = get_user_model()
+
+
+class ActivityFactTestCase(TestCase):
+    """Shared fixtures for activity fact tests."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user1 = User.objects.create_user(
+            username='user1',
+            email='user1@example.com',
+            password='testpass123'
+        )
+        self.user2 = User.objects.create_user(
+            username='user2',
+            email='user2@example.com',
+            password='testpass123'
+        )
+        self.group = Group.objects.create(
+            name='Test Group',
+            description='A test group',
+            location='Test Location',
+            leader=self.user1,
+        )
+        self.day = timezone.now().astimezone(dt_timezone.utc).date() - timedelta(days=2)
+        self.discussion = self.create_discussion(self.user1, hour=9)
+
+    def at(self, hour, day=None):
+        return datetime.combine(
+            day or self.day, datetime.min.time(), tzinfo=dt_timezone.utc
+        ) + timedelta(hours=hour, minutes=30)
+
+    def create_discussion(self, author, hour):
+        discussion = Discussion.objects.create(
+            group=self.group,
+            author=author,
+            title='Test Discussion',
+            content='Test discussion content',
+        )
+        # created_at is auto_now_add, so move it afterwards
+        Discussion.objects.filter(pk=discussion.pk).update(created_at=self.at(hour))
+        return discussion
+
+    def create_comment(self, author, hour, day=None):
+        comment = Comment.objects.create(
+            discussion=self.discussion,
+            group=self.group,
+            author=author,
+            content='Test comment',
+        )
+        Comment.objects.filter(pk=comment.pk).update(created_at=self.at(hour, day))
+        return comment
+
+
+class ActivityRollupServiceTest(ActivityFactTestCase):
+    """Test rebuilding activity facts from the content tables."""
+
+    def test_rebuild_day_counts_per_hour_user_and_event(self):
+        """Test facts count events per hour, user, group and type."""
+        self.create_comment(self.user1, hour=9)
+        self.create_comment(self.user1, hour=9)
+        self.create_comment(self.user2, hour=21)
+
+        ActivityRollupService.rebuild_day(self.day)
+
+        facts = {
+            (fact.hour, fact.user_id, fact.event_type): fact.count
+            for fact in DailyActivityFact.objects.filter(date=self.day)
+        }
+        self.assertEqual(facts, {
+            (9, self.user1.id, DailyActivityFact.EventType.DISCUSSION): 1,
+            (9, self.user1.id, DailyActivityFact.EventType.COMMENT): 2,
+            (21, self.user2.id, DailyActivityFact.EventType.COMMENT): 1,
+        })
+        self.assertTrue(all(
+            fact.group_id == self.group.id
+            for fact in DailyActivityFact.objects.all()
+        ))
+
+    def test_rebuild_is_idempotent_and_picks_up_deletions(self):
+        """Test rebuilding replaces a day's facts instead of adding to them."""
+        comment = self.create_comment(self.user2, hour=10)
+
+        ActivityRollupService.rebuild_day(self.day)
+        ActivityRollupService.rebuild_day(self.day)
+        self.assertEqual(DailyActivityFact.objects.count(), 2)
+
+        comment.delete()
+        ActivityRollupService.rebuild_day(self.day)
+
+        self.assertFalse(DailyActivityFact.objects.filter(user=self.user2).exists())
+
+    def test_rebuild_only_touches_its_day(self):
+        """Test content of other days is left to their own rebuild."""
+        self.create_comment(self.user2, hour=10, day=self.day - timedelta(days=1))
+
+        ActivityRollupService.rebuild_day(self.day)
+
+        self.assertEqual(
+            set(DailyActivityFact.objects.values_list('date', flat=True)), {self.day})
+
+    def test_earliest_activity_date(self):
+        """Test the backfill start is the day of the oldest content."""
+        self.create_comment(self.user2, hour=10, day=self.day - timedelta(days=5))
+
+        self.assertEqual(
+            ActivityRollupService.earliest_activity_date(),
+            self.day - timedelta(days=5))
+
+
+@override_settings(ACTIVITY_FACT_REFRESH_ON_READ=True)
+class EnsureFreshTest(ActivityFactTestCase):
+    """Test refreshing facts on read without Celery Beat."""
+
+    def setUp(self):
+        """Set up test data."""
+        super().setUp()
+        cache.clear()
+
+    def test_rebuilds_recent_days_when_never_refreshed(self):
+        """Test the first read rolls up the recent days."""
+        self.assertGreater(ActivityRollupService.ensure_fresh(), 0)
+
+        self.assertTrue(DailyActivityFact.objects.filter(date=self.day).exists())
+
+    def test_skips_refresh_within_max_age(self):
+        """Test reads after a recent refresh use the facts as they are."""
+        ActivityRollupService.refresh_today()
+        self.create_comment(self.user2, hour=10)
+
+        self.assertEqual(ActivityRollupService.ensure_fresh(), 0)
+        self.assertFalse(DailyActivityFact.objects.filter(user=self.user2).exists())
+
+    def test_rebuilds_days_since_stale_refresh(self):
+        """Test a stale refresh rebuilds from the day it last ran."""
+        cache.set(
+            ActivityRollupService.REFRESHED_KEY,
+            self.at(0) - timedelta(days=1))
+
+        ActivityRollupService.ensure_fresh()
+
+        self.assertTrue(DailyActivityFact.objects.filter(date=self.day).exists())
+
+    def test_backfill_command_rebuilds_everything_once(self):
+        """Test --backfill rolls up all history into an empty table only."""
+        self.create_comment(self.user2, hour=10, day=self.day - timedelta(days=30))
+
+        call_command('rebuild_activity_facts', '--backfill', stdout=StringIO())
+        self.assertEqual(DailyActivityFact.objects.count(), 2)
+
+        DailyActivityFact.objects.filter(date=self.day).delete()
+        call_command('rebuild_activity_facts', '--backfill', stdout=StringIO())
+        self.assertTrue(DailyActivityFact.objects.filter(date=self.day).exists())
+
+
+class FactBackedAnalyticsTest(ActivityFactTestCase):
+    """Test engagement analytics answered from the facts."""
+
+    def setUp(self):
+        """Set up test data."""
+        super().setUp()
+        self.create_comment(self.user1, hour=9)
+        self.create_comment(self.user2, hour=9)
+        self.create_comment(self.user2, hour=22)
+        ActivityRollupService.rebuild_recent(days=7)
+
+        self.service = UserEngagementAnalyticsService()
+        self.cutoff = timezone.now() - timedelta(days=7)
+
+    def test_daily_active_users(self):
+        """Test daily active users come from distinct users per day."""
+        daily = {
+            row['date']: row['active_users']
+            for row in self.service._calculate_daily_active_users(self.cutoff)
+        }
+
+        self.assertEqual(daily[self.day.isoformat()], 2)
+        self.assertEqual(sum(daily.values()), 2)
+
+    def test_hourly_patterns(self):
+        """Test hourly activity sums events per UTC hour."""
+        hourly = self.service._analyze_hourly_activity_patterns(self.cutoff)
+
+        distribution = {row['hour']: row['activity']
+                        for row in hourly['hourly_distribution']}
+        self.assertEqual(distribution[9], 3)
+        self.assertEqual(distribution[22], 1)
+        self.assertEqual(hourly['peak_hours'][0]['hour'], 9)
+
+    def test_weekday_patterns(self):
+        """Test weekday activity is keyed by the fact date."""
+        daily = self.service._analyze_daily_activity_patterns(self.cutoff)
+
+        distribution = {row['day']: row['activity']
+                        for row in daily['daily_distribution']}
+        self.assertEqual(distribution[self.day.strftime('%A')], 4)
+
+    def test_only_discussions_and_comments_make_users_active(self):
+        """Test other rolled-up content does not count towards engagement."""
+        reactor = User.objects.create_user(
+            username='reactor',
+            email='reactor@example.com',
+            password='testpass123'
+        )
+        for event_type in (
+            DailyActivityFact.EventType.REACTION,
+            DailyActivityFact.EventType.PRAYER_REQUEST,
+            DailyActivityFact.EventType.TESTIMONY,
+            DailyActivityFact.EventType.SCRIPTURE,
+        ):
+            DailyActivityFact.objects.create(
+                date=self.day, hour=9, user=reactor, group=self.group,
+                event_type=event_type, count=5)
+
+        overview = self.service._get_user_metrics_overview(self.cutoff)
+        hourly = self.service._analyze_hourly_activity_patterns(self.cutoff)
+
+        self.assertEqual(overview['active_users'], 2)
+        self.assertEqual(overview['engagement_levels']['inactive'], 1)
+        daily = {row['date']: row['active_users']
+                 for row in overview['daily_active_users']}
+        self.assertEqual(daily[self.day.isoformat()], 2)
+        distribution = {row['hour']: row['activity']
+                        for row in hourly['hourly_distribution']}
+        self.assertEqual(distribution[9], 3)
+
+    def test_time_patterns_do_not_scan_content(self):
+        """Test time patterns use one query each, whatever the volume."""
+        with CaptureQueriesContext(connection) as queries:
+            self.service._calculate_daily_active_users(self.cutoff)
+            self.service._analyze_hourly_activity_patterns(self.cutoff)
+            self.service._analyze_daily_activity_patterns(self.cutoff)
+
+        self.assertEqual(len(queries), 3)
+        for query in queries:
+            self.assertIn('monitoring_dailyactivityfact', query['sql'])
+
+
+class UserActivityAnalyticsViewTest(ActivityFactTestCase):
+    """Test the activity analytics endpoint."""
+
+    def setUp(self):
+        """Set up test data."""
+        super().setUp()
+        self.client = APIClient()
+        self.url = reverse('monitoring:user-activity-analytics')
+        ActivityRollupService.rebuild_recent(days=7)
+
+    def test_admin_gets_activity_analytics(self):
+        """Test admins get metrics and time patterns."""
+        admin = User.objects.create_user(
+            username='admin',
+            email='admin@test.com',
+            password='testpass123',
+            is_staff=True
+        )
+        self.client.force_authenticate(user=admin)
+
+        response = self.client.get(self.url, {'days': 7})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['period_days'], 7)
+        self.assertIn('hourly_activity', response.data['time_patterns'])
+
+    def test_rejects_invalid_days(self):
+        """Test a non-numeric period is a bad request."""
+        admin = User.objects.create_user(
+            username='admin',
+            email='admin@test.com',
+            password='testpass123',
+            is_staff=True
+        )
+        self.client.force_authenticate(user=admin)
+
+        response = self.client.get(self.url, {'days': 'week'})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_requires_admin(self):
+        """Test regular users cannot read engagement analytics."""
+        self.client.force_authenticate(user=self.user2)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 403)
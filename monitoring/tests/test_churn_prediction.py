@@ -0,0 +1,230 @@
+"""
+Tests for vectorized churn scoring and the endpoints reading the scores.
+"""
+
+from datetime import date, timedelta
+from unittest import mock
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from monitoring.churn_prediction import FEATURES, ChurnPredictionService
+from monitoring.models import DailyActivityFact, UserChurnScore
+
+User = get_user_model()
+
+TODAY = date(2025, 6, 30)
+
+
+def feature_row(**values):
+    """Build one feature matrix row, zero for unspecified features."""
+    return [values.get(name, 0) for name in FEATURES]
+
+
+class ChurnScoreTest(TestCase):
+    """Test scoring a feature matrix."""
+
+    def test_steady_user_is_low_risk(self):
+        """Test unchanged activity scores zero."""
+        scores, factors = ChurnPredictionService.score(np.array([feature_row(
+            recent_activity=7, prior_activity=14,
+            recent_active_days=4, prior_active_days=8,
+            recent_social=5, prior_social=10,
+            recent_posts=2, prior_posts=4,
+        )], dtype=float))
+
+        self.assertEqual(scores.tolist(), [0.0])
+        self.assertFalse(factors.any())
+
+    def test_factors_add_up(self):
+        """Test each factor adds its weight and the bands apply."""
+        features = np.array([
+            # Activity rate down 60%
+            feature_row(recent_activity=2, prior_activity=10),
+            # Activity rate down 30%, last seen 10 days ago
+            feature_row(recent_activity=7, prior_activity=20,
+                        days_since_activity=10),
+            # Gone quiet: nothing recent at all
+            feature_row(prior_activity=14, prior_active_days=10,
+                        prior_social=8, prior_posts=3,
+                        days_since_activity=15),
+        ], dtype=float)
+
+        scores, factors = ChurnPredictionService.score(features)
+
+        np.testing.assert_allclose(scores, [0.3, 0.3, 1.0])
+        self.assertEqual(factors[0].tolist(), [True, False, False, False, False])
+        self.assertEqual(factors[1].tolist(), [True, True, False, False, False])
+        self.assertTrue(factors[2].all())
+        self.assertEqual(
+            ChurnPredictionService.risk_levels(scores).tolist(),
+            ['low', 'low', 'high'])
+
+    def test_no_prior_activity(self):
+        """Test new users without a prior window are not penalized."""
+        scores, _ = ChurnPredictionService.score(np.array([
+            feature_row(recent_activity=3, recent_active_days=1),
+        ], dtype=float))
+
+        self.assertEqual(scores.tolist(), [0.0])
+
+
+class ChurnScoringPipelineTest(TestCase):
+    """Test feature collection and stored scores."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.steady = User.objects.create_user(
+            username='steady',
+            email='steady@example.com',
+            password='testpass123'
+        )
+        self.fading = User.objects.create_user(
+            username='fading',
+            email='fading@example.com',
+            password='testpass123'
+        )
+        self.gone = User.objects.create_user(
+            username='gone',
+            email='gone@example.com',
+            password='testpass123'
+        )
+        for days_ago in range(21):
+            self.fact(self.steady, days_ago, DailyActivityFact.EventType.COMMENT)
+        for days_ago in (16, 18, 20):
+            self.fact(self.fading, days_ago, DailyActivityFact.EventType.DISCUSSION, 2)
+            self.fact(self.fading, days_ago, DailyActivityFact.EventType.REACTION)
+        self.fact(self.gone, 90, DailyActivityFact.EventType.COMMENT)
+
+    def fact(self, user, days_ago, event_type, count=1):
+        DailyActivityFact.objects.create(
+            date=TODAY - timedelta(days=days_ago),
+            hour=12,
+            user=user,
+            event_type=event_type,
+            count=count,
+        )
+
+    def test_collect_features(self):
+        """Test one grouped query builds the matrix of active users."""
+        with CaptureQueriesContext(connection) as queries:
+            user_ids, last_dates, features = \
+                ChurnPredictionService.collect_features(TODAY, 60)
+
+        self.assertEqual(len(queries), 1)
+        rows = dict(zip(user_ids.tolist(), features.tolist()))
+        self.assertEqual(set(rows), {self.steady.id, self.fading.id})
+        self.assertEqual(rows[self.fading.id], feature_row(
+            prior_activity=9, prior_active_days=3,
+            prior_social=3, prior_posts=6, days_since_activity=16))
+        self.assertEqual(rows[self.steady.id][:4], [7, 14, 7, 14])
+
+    def test_score_users_replaces_scores(self):
+        """Test scores are stored per user and replaced on each run."""
+        self.assertEqual(ChurnPredictionService.score_users(TODAY), 2)
+        self.assertEqual(ChurnPredictionService.score_users(TODAY), 2)
+
+        fading = UserChurnScore.objects.get(user=self.fading)
+        self.assertEqual(fading.churn_score, 1.0)
+        self.assertEqual(fading.risk_level, UserChurnScore.RiskLevel.HIGH)
+        self.assertEqual(fading.risk_factors, [
+            'activity_decline', 'inactivity', 'engagement_decline',
+            'social_decline', 'posting_decline'])
+        self.assertEqual(fading.last_activity_date, TODAY - timedelta(days=16))
+
+        steady = UserChurnScore.objects.get(user=self.steady)
+        self.assertEqual(steady.risk_level, UserChurnScore.RiskLevel.LOW)
+        self.assertFalse(UserChurnScore.objects.filter(user=self.gone).exists())
+
+    def test_latest_scores_rescores_stale_scores(self):
+        """Test scores older than a day are recomputed on read."""
+        ChurnPredictionService.score_users(TODAY)
+        UserChurnScore.objects.update(
+            scored_at=timezone.now() - timedelta(days=2), risk_level='low')
+
+        scores = ChurnPredictionService.latest_scores()
+
+        self.assertTrue(all(
+            score.scored_at > timezone.now() - timedelta(hours=1) for score in scores))
+
+    def test_latest_scores_reuses_fresh_scores(self):
+        """Test scores from the last day are read as stored."""
+        ChurnPredictionService.score_users(TODAY)
+
+        with mock.patch.object(ChurnPredictionService, 'score_users') as score_users:
+            ChurnPredictionService.latest_scores()
+
+        score_users.assert_not_called()
+
+    def test_summarize(self):
+        """Test risk levels and factors are counted from stored scores."""
+        ChurnPredictionService.score_users(TODAY)
+
+        summary = ChurnPredictionService.summarize()
+
+        self.assertEqual(summary['total'], 2)
+        self.assertEqual(summary['levels'], {'high': 1, 'moderate': 0, 'low': 1})
+        self.assertEqual(summary['factors']['posting_decline'], 1)
+
+
+class ChurnPredictionViewsTest(TestCase):
+    """Test the churn and early warning endpoints."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            username='admin',
+            email='admin@test.com',
+            password='testpass123',
+            is_staff=True
+        )
+        self.client.force_authenticate(user=self.admin)
+        self.fading = User.objects.create_user(
+            username='fading',
+            email='fading@example.com',
+            password='testpass123'
+        )
+        UserChurnScore.objects.create(
+            user=self.fading,
+            churn_score=0.85,
+            risk_level=UserChurnScore.RiskLevel.HIGH,
+            risk_factors=['inactivity', 'engagement_decline'],
+            recent_activity=0,
+            prior_activity=6,
+            recent_active_days=0,
+            prior_active_days=3,
+            recent_social=0,
+            prior_social=6,
+            recent_posts=0,
+            prior_posts=0,
+            days_since_activity=16,
+            last_activity_date=TODAY,
+            scored_at=timezone.now(),
+        )
+
+    def test_churn_prediction(self):
+        """Test churn predictions are read from the stored scores."""
+        response = self.client.get(reverse('monitoring:churn-prediction'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_users_analyzed'], 1)
+        self.assertEqual(response.data['predicted_churn_rate_percent'], 100.0)
+        high_risk = response.data['churn_categories']['high_risk']
+        self.assertEqual(high_risk['users'][0]['username'], 'fading')
+        self.assertEqual(len(response.data['retention_recommendations']), 2)
+
+    def test_early_warning_alerts(self):
+        """Test churn and engagement alerts fire from the stored scores."""
+        response = self.client.get(reverse('monitoring:early-warning-alerts'))
+
+        self.assertEqual(response.status_code, 200)
+        alert_types = [alert['type'] for alert in response.data['alerts']]
+        self.assertIn('churn_risk', alert_types)
+        self.assertIn('engagement_decline', alert_types)
@@ -0,0 +1,158 @@
+"""
+Tests for the cached cohort retention matrix.
+"""
+
+from datetime import datetime, time, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from monitoring.cohort_retention import CohortRetentionService
+from monitoring.models import DailyActivityFact
+
+User = get_user_model()
+
+
+def month(offset):
+    """First day of the UTC month `offset` months from the current one."""
+    current = timezone.now().astimezone(dt_timezone.utc).date().replace(day=1)
+    index = current.year * 12 + current.month - 1 + offset
+    return current.replace(year=index // 12, month=index % 12 + 1)
+
+
+class CohortRetentionServiceTest(TestCase):
+    """Test the retention triangle built from activity facts."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        # Cohort of three users joining four months ago, one joining two
+        # months ago
+        self.early = [self.create_user(f'early{i}', month(-4)) for i in range(3)]
+        self.late = self.create_user('late', month(-2))
+
+        # Two early users active a month later, one of them twice
+        self.add_activity(self.early[0], month(-3))
+        self.add_activity(self.early[0], month(-3).replace(day=10))
+        self.add_activity(self.early[1], month(-3))
+        # One early user active three months later
+        self.add_activity(self.early[2], month(-1))
+        # The late user active a month later
+        self.add_activity(self.late, month(-1))
+
+    def create_user(self, username, joined):
+        user = User.objects.create_user(
+            username=username,
+            email=f'{username}@example.com',
+            password='testpass123'
+        )
+        User.objects.filter(pk=user.pk).update(date_joined=datetime.combine(
+            joined.replace(day=2), time(12), tzinfo=dt_timezone.utc))
+        return user
+
+    def add_activity(self, user, day):
+        DailyActivityFact.objects.create(
+            date=day,
+            hour=12,
+            user=user,
+            event_type=DailyActivityFact.EventType.COMMENT,
+            count=1,
+        )
+
+    def cohorts(self):
+        return {
+            cohort['cohort_month']: cohort
+            for cohort in CohortRetentionService.get_cohort_analysis()
+        }
+
+    def test_retention_triangle(self):
+        """Test each cohort counts distinct active users per month offset."""
+        cohorts = self.cohorts()
+
+        early = cohorts[month(-4).strftime('%Y-%m')]
+        self.assertEqual(early['cohort_size'], 3)
+        self.assertEqual(
+            [m['retained_users'] for m in early['retention_by_month']], [2, 0, 1, 0])
+        self.assertEqual(early['retention_by_month'][0]['retention_rate'], 66.67)
+
+        late = cohorts[month(-2).strftime('%Y-%m')]
+        self.assertEqual(late['cohort_size'], 1)
+        self.assertEqual(
+            [m['retained_users'] for m in late['retention_by_month']], [1, 0])
+
+    def test_closed_months_served_from_cache(self):
+        """Test a warm cache only queries the open months."""
+        self.cohorts()
+
+        with CaptureQueriesContext(connection) as queries:
+            self.cohorts()
+
+        # Cohort sizes and active users of the open months
+        self.assertEqual(len(queries), 2)
+
+    def test_cache_extended_when_months_close(self):
+        """Test an older cached matrix is extended to the same result."""
+        expected = CohortRetentionService.get_matrix()
+
+        cache.set(
+            CohortRetentionService.CACHE_KEY,
+            CohortRetentionService._count(until=month(-3)))
+
+        self.assertEqual(CohortRetentionService.get_matrix(), expected)
+        self.assertEqual(
+            cache.get(CohortRetentionService.CACHE_KEY)['boundary'],
+            CohortRetentionService.closed_boundary())
+
+    def test_open_months_are_live(self):
+        """Test activity in the open month shows up without invalidation."""
+        self.cohorts()
+        self.add_activity(self.late, month(0))
+
+        late = self.cohorts()[month(-2).strftime('%Y-%m')]
+
+        self.assertEqual(late['retention_by_month'][1]['retained_users'], 1)
+
+
+class UserCohortAnalyticsViewTest(TestCase):
+    """Test the cohort analytics endpoint."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('monitoring:user-cohort-analytics')
+
+    def test_admin_gets_cohorts(self):
+        """Test admins get cohorts and average retention."""
+        admin = User.objects.create_user(
+            username='admin',
+            email='admin@test.com',
+            password='testpass123',
+            is_staff=True
+        )
+        self.client.force_authenticate(user=admin)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['cohorts'][0]['cohort_size'], 1)
+        self.assertIn('average_retention_rates', response.data)
+
+    def test_requires_admin(self):
+        """Test regular users cannot read cohort analytics."""
+        user = User.objects.create_user(
+            username='member',
+            email='member@test.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,163 @@
+"""
+Tests for moderation analytics aggregated from stored risk scores.
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from group.models import Group, GroupMembership
+from messaging.models import Comment, Discussion
+from monitoring.content_moderation_views import ContentModerationService
+
+User = get_user_model()
+
+
+class ModerationTestCase(TestCase):
+    """Shared fixtures for moderation tests."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.leader = User.objects.create_user(
+            username='leader',
+            email='leader@example.com',
+            password='testpass123'
+        )
+        self.member = User.objects.create_user(
+            username='member',
+            email='member@example.com',
+            password='testpass123'
+        )
+        self.group = Group.objects.create(
+            name='Test Group',
+            description='A test group',
+            location='Test Location',
+            leader=self.leader,
+        )
+        GroupMembership.objects.create(
+            group=self.group, user=self.member, status='active')
+
+        self.discussion = Discussion.objects.create(
+            group=self.group,
+            author=self.leader,
+            title='Weekly check-in',
+            content='How has everyone been this week?',
+        )
+        # 0.3 crisis + 0.25 substance
+        self.risky = Comment.objects.create(
+            discussion=self.discussion,
+            author=self.member,
+            content='I have the pills, my dealer said so',
+        )
+        self.service = ContentModerationService()
+        self.cutoff = timezone.now() - timedelta(days=7)
+
+
+class ContentModerationServiceTest(ModerationTestCase):
+    """Test the dashboard sections read stored scores."""
+
+    def test_queue_lists_flagged_content(self):
+        """Test content above the review threshold is queued."""
+        queue = self.service._get_moderation_queue()
+
+        self.assertEqual(queue['pending_reviews'], 1)
+        self.assertEqual(queue['high_priority'], 0)
+        flagged = queue['flagged_comments'][0]
+        self.assertEqual(flagged['id'], self.risky.id)
+        self.assertEqual(flagged['discussion_title'], 'Weekly check-in')
+        self.assertEqual(
+            flagged['risk_categories'],
+            ['crisis_keywords', 'substance_abuse_triggers'])
+
+    def test_content_analysis(self):
+        """Test averages and category counts come from the stored columns."""
+        analysis = self.service._get_content_analysis(self.cutoff)
+
+        self.assertEqual(analysis['content_volume']['total_comments'], 1)
+        self.assertAlmostEqual(analysis['average_risk_score'], 0.275)
+        self.assertEqual(analysis['risk_categories'], {
+            'crisis_keywords': 1, 'substance_abuse_triggers': 1})
+
+    def test_high_risk_users_and_groups(self):
+        """Test users and groups are ranked by their average stored risk."""
+        users = self.service._identify_high_risk_users(self.cutoff)
+        self.assertEqual([u['username'] for u in users], ['member'])
+        self.assertEqual(users[0]['content_count'], 1)
+
+        Comment.objects.create(
+            discussion=self.discussion,
+            author=self.member,
+            content='Overdose and suicide',
+        )
+        groups = self.service._assess_group_risks(self.cutoff)
+        self.assertEqual(groups[0]['group_id'], self.group.id)
+        self.assertEqual(groups[0]['content_count'], 3)
+
+    def test_scans_do_not_load_content(self):
+        """Test adding content does not add queries or rescoring."""
+        Comment.objects.create(
+            discussion=self.discussion,
+            author=self.member,
+            content='Gun and bridge talk',
+        )
+        with CaptureQueriesContext(connection) as before:
+            self.service._get_risk_assessment(self.cutoff)
+
+        for i in range(10):
+            Comment.objects.create(
+                discussion=self.discussion,
+                author=self.member,
+                content=f'Gun and bridge talk {i}',
+            )
+        with CaptureQueriesContext(connection) as after:
+            self.service._get_risk_assessment(self.cutoff)
+
+        self.assertEqual(len(after), len(before))
+
+    def test_trends_count_flagged_content(self):
+        """Test daily trends count flagged content per day."""
+        trends = self.service._get_moderation_trends(self.cutoff)
+
+        today = trends['daily_trends'][-1]
+        self.assertEqual(today['content_volume'], 2)
+        self.assertEqual(today['flagged_content'], 1)
+
+
+class ContentModerationViewsTest(ModerationTestCase):
+    """Test the moderation endpoints."""
+
+    def setUp(self):
+        """Set up test data."""
+        super().setUp()
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            username='admin',
+            email='admin@test.com',
+            password='testpass123',
+            is_staff=True
+        )
+
+    def test_dashboard(self):
+        """Test admins get the full moderation dashboard."""
+        self.client.force_authenticate(user=self.admin)
+
+        response = self.client.get(reverse('monitoring:moderation-dashboard'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['moderation_queue']['pending_reviews'], 1)
+        self.assertEqual(
+            response.data['automated_actions']['crisis_interventions'], 1)
+
+    def test_queue_requires_admin(self):
+        """Test regular users cannot read the moderation queue."""
+        self.client.force_authenticate(user=self.member)
+
+        response = self.client.get(reverse('monitoring:moderation-queue'))
+
+        self.assertEqual(response.status_code, 403)
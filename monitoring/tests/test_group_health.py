@@ -0,0 +1,197 @@
+"""
+Tests for batch group health scoring and snapshots.
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from group.models import Group, GroupMembership
+from messaging.models import Comment, Discussion
+from monitoring.group_health import GroupHealthService
+from monitoring.group_health_views import GroupHealthAnalyticsService
+from monitoring.models import GroupHealthSnapshot
+
+User = get_user_model()
+
+
+class GroupHealthTestCase(TestCase):
+    """Shared fixtures for group health tests."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.leader = User.objects.create_user(
+            username='leader',
+            email='leader@example.com',
+            password='testpass123'
+        )
+        self.member = User.objects.create_user(
+            username='member',
+            email='member@example.com',
+            password='testpass123'
+        )
+        self.group = self.create_group('Active Group')
+        GroupMembership.objects.create(
+            group=self.group, user=self.leader, role='leader', status='active',
+            joined_at=timezone.now() - timedelta(days=60))
+        GroupMembership.objects.create(
+            group=self.group, user=self.member, role='member', status='active')
+
+        self.discussion = Discussion.objects.create(
+            group=self.group,
+            author=self.leader,
+            title='Weekly check-in',
+            content='x' * 300,
+        )
+        Comment.objects.create(
+            discussion=self.discussion,
+            author=self.member,
+            content='y' * 100,
+        )
+
+    def create_group(self, name):
+        return Group.objects.create(
+            name=name,
+            description='A test group',
+            location='Test Location',
+            leader=self.leader,
+        )
+
+
+class GroupHealthServiceTest(GroupHealthTestCase):
+    """Test feature aggregation and snapshots."""
+
+    def test_collect_features(self):
+        """Test features are aggregated per group in SQL."""
+        cutoff = timezone.now() - timedelta(days=30)
+
+        features = GroupHealthService.collect_features(cutoff)[self.group.id]
+
+        self.assertEqual(features['member_count'], 2)
+        self.assertEqual(features['members_at_start'], 1)
+        self.assertEqual(features['retained_members'], 1)
+        self.assertEqual(features['new_members'], 1)
+        self.assertEqual(features['activated_members'], 1)
+        self.assertEqual(features['discussion_count'], 1)
+        self.assertEqual(features['answered_discussions'], 1)
+        self.assertEqual(features['avg_discussion_length'], 300)
+        self.assertEqual(features['comment_count'], 1)
+        self.assertEqual(features['cross_member_comments'], 1)
+        self.assertEqual(features['avg_comment_length'], 100)
+        self.assertIsNotNone(features['avg_first_reply'])
+        self.assertEqual(sorted(features['activity_per_author']), [1, 1])
+
+    def test_query_count_independent_of_group_count(self):
+        """Test adding groups does not add queries."""
+        cutoff = timezone.now() - timedelta(days=30)
+        with CaptureQueriesContext(connection) as one_group:
+            GroupHealthService.collect_features(cutoff)
+
+        for i in range(5):
+            group = self.create_group(f'Group {i}')
+            Discussion.objects.create(
+                group=group,
+                author=self.leader,
+                title='Another discussion',
+                content='Another discussion body',
+            )
+        with CaptureQueriesContext(connection) as six_groups:
+            GroupHealthService.collect_features(cutoff)
+
+        self.assertEqual(len(six_groups), len(one_group))
+
+    def test_snapshot_covers_every_group(self):
+        """Test groups without members or content get a snapshot too."""
+        quiet = self.create_group('Quiet Group')
+
+        GroupHealthService.take_snapshot()
+        GroupHealthService.take_snapshot()
+
+        snapshots = {s.group_id: s for s in GroupHealthSnapshot.objects.all()}
+        self.assertEqual(set(snapshots), {self.group.id, quiet.id})
+        self.assertGreater(
+            snapshots[self.group.id].health_score, snapshots[quiet.id].health_score)
+        self.assertEqual(snapshots[self.group.id].member_count, 2)
+        self.assertEqual(snapshots[self.group.id].recent_activity, 2)
+
+    def test_latest_snapshots_replaces_stale_snapshot(self):
+        """Test reading snapshots takes today's when the latest is from an earlier day."""
+        today = timezone.now().date()
+        GroupHealthService.take_snapshot(today - timedelta(days=3))
+
+        snapshots = GroupHealthService.latest_snapshots()
+
+        self.assertEqual({s.date for s in snapshots}, {today})
+        self.assertEqual(GroupHealthSnapshot.objects.filter(date=today).count(), 1)
+
+    def test_live_score_matches_snapshot(self):
+        """Test the single-group score uses the same scoring."""
+        GroupHealthService.take_snapshot()
+        snapshot = GroupHealthSnapshot.objects.get(group=self.group)
+
+        score = GroupHealthAnalyticsService()._calculate_group_health_score(
+            self.group, timezone.now() - timedelta(days=snapshot.window_days))
+
+        self.assertAlmostEqual(score, snapshot.health_score, places=3)
+
+
+class GroupHealthViewsTest(GroupHealthTestCase):
+    """Test the snapshot-backed group health endpoints."""
+
+    def setUp(self):
+        """Set up test data."""
+        super().setUp()
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            username='admin',
+            email='admin@test.com',
+            password='testpass123',
+            is_staff=True
+        )
+        self.client.force_authenticate(user=self.admin)
+
+    def test_rankings_cover_all_groups(self):
+        """Test rankings are no longer capped at 20 groups."""
+        for i in range(25):
+            self.create_group(f'Group {i}')
+
+        response = self.client.get(reverse('monitoring:group-health-rankings'))
+
+        self.assertEqual(response.status_code, 200)
+        rankings = response.data['rankings']
+        self.assertEqual(len(rankings), 26)
+        self.assertEqual(rankings[0]['group_id'], self.group.id)
+
+    def test_at_risk_groups(self):
+        """Test groups without members are flagged as at risk."""
+        quiet = self.create_group('Quiet Group')
+
+        response = self.client.get(reverse('monitoring:group-health-at-risk'))
+
+        self.assertEqual(response.status_code, 200)
+        flagged = {g['group_id']: g for g in response.data['at_risk_groups']}
+        self.assertIn('very_small_group', flagged[quiet.id]['risk_factors'])
+
+    def test_trends_read_snapshots(self):
+        """Test weekly trends average the stored snapshots."""
+        GroupHealthService.take_snapshot()
+
+        trends = GroupHealthAnalyticsService()._analyze_group_health_trends(
+            timezone.now() - timedelta(days=14))
+
+        self.assertEqual(len(trends['weekly_trends']), 1)
+        self.assertEqual(trends['weekly_trends'][0]['active_groups_count'], 1)
+
+    def test_requires_admin(self):
+        """Test regular users cannot read group health."""
+        self.client.force_authenticate(user=self.member)
+
+        response = self.client.get(reverse('monitoring:group-health-at-risk'))
+
+        self.assertEqual(response.status_code, 403)
@@ -8,6 +8,14 @@ is implemented.
 
 from django.urls import path
 from . import views
+from .user_engagement_views import UserActivityAnalyticsView, UserCohortAnalyticsView
+from .group_health_views import GroupHealthRankingsView, GroupHealthAtRiskView
+from .content_moderation_views import (
+    ContentModerationDashboardView,
+    ModerationQueueView,
+    CommunityHealthView
+)
+from .predictive_analytics_views import ChurnPredictionView, EarlyWarningAlertsView
 
 app_name = 'monitoring'
 
@@ -22,5 +30,33 @@ urlpatterns = [
     path('metrics/', views.performance_metrics, name='performance-metrics'),
     path('metrics/endpoints/', views.endpoint_metrics, name='endpoint-metrics'),
     path('metrics/realtime/', views.real_time_metrics, name='realtime-metrics'),
+    path('metrics/circuit-breakers/', views.circuit_breaker_metrics,
+         name='circuit-breaker-metrics'),
     path('metrics/clear/', views.clear_metrics, name='clear-metrics'),
+
+    # User activity analytics from the activity fact table (admin only)
+    path('engagement/activity/', UserActivityAnalyticsView.as_view(),
+         name='user-activity-analytics'),
+    path('engagement/cohorts/', UserCohortAnalyticsView.as_view(),
+         name='user-cohort-analytics'),
+
+    # Group health from the daily snapshots (admin only)
+    path('groups/health/rankings/', GroupHealthRankingsView.as_view(),
+         name='group-health-rankings'),
+    path('groups/health/at-risk/', GroupHealthAtRiskView.as_view(),
+         name='group-health-at-risk'),
+
+    # Content moderation from stored risk scores (admin only)
+    path('moderation/dashboard/', ContentModerationDashboardView.as_view(),
+         name='moderation-dashboard'),
+    path('moderation/queue/', ModerationQueueView.as_view(),
+         name='moderation-queue'),
+    path('moderation/health/', CommunityHealthView.as_view(),
+         name='community-health'),
+
+    # Churn prediction from the stored churn scores (admin only)
+    path('predictive/churn/', ChurnPredictionView.as_view(),
+         name='churn-prediction'),
+    path('predictive/alerts/', EarlyWarningAlertsView.as_view(),
+         name='early-warning-alerts'),
 ]
\ No newline at end of file
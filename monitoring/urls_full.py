@@ -36,17 +36,21 @@ from .content_moderation_views import (
 )
 from .user_engagement_views import (
     UserEngagementDetailView,
+    UserActivityAnalyticsView,
+    UserCohortAnalyticsView,
     IndividualUserAnalyticsView,
     UserRetentionAnalyticsView
 )
 from .group_health_views import (
     GroupHealthDashboardView,
     IndividualGroupHealthView,
-    GroupHealthRankingsView
+    GroupHealthRankingsView,
+    GroupHealthAtRiskView
 )
 from .predictive_analytics_views import (
     PredictiveAnalyticsDashboardView,
     ChurnPredictionView,
+    EarlyWarningAlertsView,
     GrowthForecastView
 )
 
@@ -63,6 +67,8 @@ urlpatterns = [
     path('metrics/', views.performance_metrics, name='performance-metrics'),
     path('metrics/endpoints/', views.endpoint_metrics, name='endpoint-metrics'),
     path('metrics/realtime/', views.real_time_metrics, name='realtime-metrics'),
+    path('metrics/circuit-breakers/', views.circuit_breaker_metrics,
+         name='circuit-breaker-metrics'),
     path('metrics/clear/', views.clear_metrics, name='clear-metrics'),
 
     # Search performance monitoring (admin only)
@@ -104,6 +110,10 @@ urlpatterns = [
     # User engagement analytics (Phase 5)
     path('engagement/dashboard/', UserEngagementDetailView.as_view(),
          name='user-engagement-dashboard'),
+    path('engagement/activity/', UserActivityAnalyticsView.as_view(),
+         name='user-activity-analytics'),
+    path('engagement/cohorts/', UserCohortAnalyticsView.as_view(),
+         name='user-cohort-analytics'),
     path('engagement/users/<int:user_id>/', IndividualUserAnalyticsView.as_view(),
          name='individual-user-analytics'),
     path('engagement/retention/', UserRetentionAnalyticsView.as_view(),
@@ -116,12 +126,16 @@ urlpatterns = [
          name='individual-group-health'),
     path('groups/health/rankings/', GroupHealthRankingsView.as_view(),
          name='group-health-rankings'),
+    path('groups/health/at-risk/', GroupHealthAtRiskView.as_view(),
+         name='group-health-at-risk'),
 
     # Predictive analytics (Phase 5)
     path('predictive/dashboard/', PredictiveAnalyticsDashboardView.as_view(),
          name='predictive-analytics-dashboard'),
     path('predictive/churn/', ChurnPredictionView.as_view(),
          name='churn-prediction'),
+    path('predictive/alerts/', EarlyWarningAlertsView.as_view(),
+         name='early-warning-alerts'),
     path('predictive/growth/', GrowthForecastView.as_view(),
          name='growth-forecast'),
 ]
@@ -5,6 +5,7 @@ Provides endpoints for:
 - System health checks for container orchestration
 - Performance metrics and monitoring dashboards
 - Real-time application status
+- Shared circuit breaker state for external providers
 """
 
 import time
@@ -28,6 +29,7 @@ from rest_framework.response import Response
 from rest_framework import status
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 from core.api_tags import APITags, monitoring_schema
+from core.circuit_breaker import get_circuit_breaker_states
 
 from .models import HealthCheck, PerformanceMetric, EndpointMetrics, MetricType
 
@@ -376,7 +378,8 @@ def real_time_metrics(request):
             'system': {
                 'active_connections': getattr(connection, 'queries_count', 0),
                 'cache_status': 'healthy'  # Simplified
-            }
+            },
+            'circuit_breakers': get_circuit_breaker_states(),
         }
 
         return Response(real_time_data)
@@ -389,6 +392,31 @@ def real_time_metrics(request):
         )
 
 
+@monitoring_schema(
+    summary="Get Circuit Breaker State",
+    description="Retrieve the shared circuit breaker state of each external provider",
+    responses={
+        200: OpenApiResponse(description="Circuit breaker states"),
+        403: OpenApiResponse(description="Admin access required"),
+    }
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def circuit_breaker_metrics(request):
+    """
+    Get the state of the shared circuit breakers.
+
+    State is read from the cache, so it is the same for every worker.
+    """
+    breakers = get_circuit_breaker_states()
+    return Response({
+        'timestamp': timezone.now().isoformat(),
+        'open_count': sum(
+            1 for breaker in breakers if breaker['state'] != 'closed'),
+        'breakers': breakers,
+    })
+
+
 @monitoring_schema(
     summary="Clear Old Metrics",
     description="Clear old performance metrics to manage database size",
@@ -50,7 +50,7 @@ class LeadershipProfileSerializer(serializers.ModelSerializer):
 
         # Log leadership profile creation
         if request:
-            AuditLog.objects.create(
+            AuditLog.log_event(
                 user=request.user,
                 event_type='leadership_profile_created',
                 description='Leadership profile created during onboarding',
@@ -113,7 +113,7 @@ class OnboardingCompletionSerializer(serializers.Serializer):
             )
 
         # Log completion
-        AuditLog.objects.create(
+        AuditLog.log_event(
             user=user,
             event_type='onboarding_completed',
             description='User completed onboarding process',
@@ -213,7 +213,7 @@ class OnboardingStepSerializer(serializers.Serializer):
             progress.save()
 
         # Log step progress
-        AuditLog.objects.create(
+        AuditLog.log_event(
             user=user,
             event_type='onboarding_step_updated',
             description=f'Onboarding step updated to {new_step}',
@@ -291,7 +291,7 @@ class CommunityPreferencesSerializer(serializers.Serializer):
             pass
 
         # Log the preference update
-        AuditLog.objects.create(
+        AuditLog.log_event(
             user=user,
             event_type='community_preferences_updated',
             description='Community preferences updated during onboarding',
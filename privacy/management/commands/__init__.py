@@ -0,0 +1,3 @@
+"""
+Initialize the management commands package for privacy app.
+"""
@@ -0,0 +1,35 @@
+"""
+Django management command to generate GDPR exports left pending.
+
+Exports are generated in the web process after they are requested;
+exports whose process was killed before generating them stay pending
+until this runs. start.sh runs it at boot.
+
+Usage:
+    python manage.py process_pending_exports
+    python manage.py process_pending_exports --older-than-minutes 0
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from privacy.utils.gdpr import process_pending_exports
+
+
+class Command(BaseCommand):
+    help = 'Generate GDPR data exports still pending'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-minutes',
+            type=int,
+            default=5,
+            dest='older_than_minutes',
+            help='Only generate exports requested at least this many minutes ago (default: 5)',
+        )
+
+    def handle(self, *args, **options):
+        count = process_pending_exports(
+            older_than=timedelta(minutes=options['older_than_minutes']))
+        self.stdout.write(self.style.SUCCESS(f"Processed {count} pending exports"))
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-18 21:56
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('privacy', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataExportJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed'), ('expired', 'Expired')], default='pending', help_text='Export progress state', max_length=20)),
+                ('options', models.JSONField(blank=True, default=dict, help_text='Export options requested by the user')),
+                ('progress', models.PositiveSmallIntegerField(default=0, help_text='Percentage of data categories written')),
+                ('current_category', models.CharField(blank=True, help_text='Data category being written', max_length=50)),
+                ('file_name', models.CharField(blank=True, help_text='Export file name in private export storage', max_length=255)),
+                ('file_size', models.PositiveBigIntegerField(default=0, help_text='Export file size in bytes')),
+                ('row_count', models.PositiveIntegerField(default=0, help_text='Records written to the export')),
+                ('error', models.TextField(blank=True, help_text='Failure reason')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When the export was requested')),
+                ('started_at', models.DateTimeField(blank=True, help_text='When generation started', null=True)),
+                ('completed_at', models.DateTimeField(blank=True, help_text='When the export file was ready', null=True)),
+                ('expires_at', models.DateTimeField(blank=True, help_text='When the export file will be deleted', null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='data_export_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'privacy_data_export_job',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', '-created_at'], name='privacy_dat_user_id_19bbaf_idx'), models.Index(fields=['status', 'expires_at'], name='privacy_dat_status_b14cc3_idx')],
+            },
+        ),
+    ]
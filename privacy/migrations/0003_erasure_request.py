@@ -0,0 +1,44 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:01
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('privacy', '0002_data_export_job'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ErasureRequest',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('reason', models.CharField(help_text='Why the data is erased', max_length=255)),
+                ('retain_audit_logs', models.BooleanField(default=True, help_text='Keep audit logs, detached from the user, instead of deleting them')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', help_text='Erasure progress state', max_length=20)),
+                ('scheduled_for', models.DateTimeField(default=django.utils.timezone.now, help_text='When the erasure may start')),
+                ('anonymized_id', models.CharField(blank=True, help_text='Identifier that replaces the username and email', max_length=100)),
+                ('current_step', models.CharField(blank=True, help_text='Step being run', max_length=50)),
+                ('completed_steps', models.JSONField(blank=True, default=list, help_text='Steps already completed')),
+                ('counts', models.JSONField(blank=True, default=dict, help_text='Rows erased per step')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, help_text='Runs that failed')),
+                ('error', models.TextField(blank=True, help_text='Last failure reason')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When the erasure was requested')),
+                ('started_at', models.DateTimeField(blank=True, help_text='When the first step started', null=True)),
+                ('completed_at', models.DateTimeField(blank=True, help_text='When the last step completed', null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='erasure_requests', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'privacy_erasure_request',
+                'ordering': ['scheduled_for'],
+                'indexes': [models.Index(fields=['status', 'scheduled_for'], name='privacy_era_status_be43ec_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('status__in', ['pending', 'running'])), fields=('user',), name='privacy_one_open_erasure_per_user')],
+            },
+        ),
+    ]
@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils import timezone
@@ -500,3 +502,252 @@ class DataProcessingRecord(models.Model):
         """Check if retention period has expired."""
         expiry = self.retention_expires_at
         return expiry and expiry <= timezone.now()
+
+
+class DataExportJob(models.Model):
+    """
+    A GDPR data export (Article 20) generated in the background.
+
+    The export is written to private storage by run_data_export_job, on
+    the web process's export pool or in the generate_data_export task; the
+    job tracks its progress so clients can poll for it and
+    download the file once it is completed.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_EXPIRED = 'expired'
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+        (STATUS_EXPIRED, 'Expired'),
+    ]
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False
+    )
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='data_export_jobs'
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+        help_text="Export progress state"
+    )
+
+    options = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Export options requested by the user"
+    )
+
+    progress = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Percentage of data categories written"
+    )
+
+    current_category = models.CharField(
+        max_length=50,
+        blank=True,
+        help_text="Data category being written"
+    )
+
+    file_name = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text="Export file name in private export storage"
+    )
+
+    file_size = models.PositiveBigIntegerField(
+        default=0,
+        help_text="Export file size in bytes"
+    )
+
+    row_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Records written to the export"
+    )
+
+    error = models.TextField(
+        blank=True,
+        help_text="Failure reason"
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        help_text="When the export was requested"
+    )
+
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When generation started"
+    )
+
+    completed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the export file was ready"
+    )
+
+    expires_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the export file will be deleted"
+    )
+
+    class Meta:
+        db_table = 'privacy_data_export_job'
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['status', 'expires_at']),
+        ]
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.user.username} - export {self.status} ({self.progress}%)"
+
+    @property
+    def is_downloadable(self):
+        """Check if the export file can be downloaded."""
+        return (
+            self.status == self.STATUS_COMPLETED and
+            bool(self.file_name) and
+            (self.expires_at is None or self.expires_at > timezone.now())
+        )
+
+
+class ErasureRequest(models.Model):
+    """
+    A GDPR erasure (Article 17) carried out by the erasure engine.
+
+    Erasure runs as a sequence of steps, each a series of small batches
+    in their own transactions. Completed steps are recorded here so an
+    interrupted erasure resumes where it stopped on the next sweep.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    OPEN_STATUSES = [STATUS_PENDING, STATUS_RUNNING]
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False
+    )
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='erasure_requests'
+    )
+
+    reason = models.CharField(
+        max_length=255,
+        help_text="Why the data is erased"
+    )
+
+    retain_audit_logs = models.BooleanField(
+        default=True,
+        help_text="Keep audit logs, detached from the user, instead of deleting them"
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+        help_text="Erasure progress state"
+    )
+
+    scheduled_for = models.DateTimeField(
+        default=timezone.now,
+        help_text="When the erasure may start"
+    )
+
+    anonymized_id = models.CharField(
+        max_length=100,
+        blank=True,
+        help_text="Identifier that replaces the username and email"
+    )
+
+    current_step = models.CharField(
+        max_length=50,
+        blank=True,
+        help_text="Step being run"
+    )
+
+    completed_steps = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Steps already completed"
+    )
+
+    counts = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Rows erased per step"
+    )
+
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Runs that failed"
+    )
+
+    error = models.TextField(
+        blank=True,
+        help_text="Last failure reason"
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        help_text="When the erasure was requested"
+    )
+
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the first step started"
+    )
+
+    completed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the last step completed"
+    )
+
+    class Meta:
+        db_table = 'privacy_erasure_request'
+        indexes = [
+            models.Index(fields=['status', 'scheduled_for']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user'],
+                condition=models.Q(status__in=['pending', 'running']),
+                name='privacy_one_open_erasure_per_user',
+            ),
+        ]
+        ordering = ['scheduled_for']
+
+    def __str__(self):
+        return f"{self.user_id} - erasure {self.status}"
@@ -13,11 +13,12 @@ Phase 2: Clean architecture - only privacy concerns, no cross-app imports.
 
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ValidationError
 
-from .models import PrivacyProfile, ConsentLog, DataProcessingRecord
+from .models import PrivacyProfile, ConsentLog, DataProcessingRecord, DataExportJob
 
 User = get_user_model()
 
@@ -210,6 +211,32 @@ class GDPRDataExportSerializer(serializers.Serializer):
         return self.validated_data
 
 
+class DataExportJobSerializer(serializers.ModelSerializer):
+    """
+    Serializer for GDPR data export jobs.
+
+    Read-only; reports progress and the download link once completed.
+    """
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = DataExportJob
+        fields = (
+            'id', 'status', 'progress', 'current_category', 'file_size',
+            'row_count', 'error', 'created_at', 'started_at', 'completed_at',
+            'expires_at', 'download_url'
+        )
+        read_only_fields = fields
+
+    def get_download_url(self, obj):
+        """Get the download URL of a completed export."""
+        if not obj.is_downloadable:
+            return None
+        url = reverse('privacy:gdpr_data_export_download', args=[obj.id])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+
 class GDPRDataErasureSerializer(serializers.Serializer):
     """
     GDPR Article 17 - Right to be Forgotten.
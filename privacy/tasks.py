@@ -0,0 +1,115 @@
+"""
+Celery tasks for privacy app.
+
+Background tasks for:
+- Generating GDPR data exports
+- Deleting expired export files
+- Erasing users whose erasure is due
+"""
+
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3)
+def generate_data_export(self, job_id):
+    """
+    Generate a user's GDPR data export.
+
+    Queued when the user requests an export and GDPR_EXPORT_CELERY is on
+    (otherwise the web process generates it). Streams every data category
+    into a ZIP file in private export storage, recording progress on the
+    DataExportJob as it goes.
+
+    Args:
+        job_id: DataExportJob primary key
+
+    Returns:
+        dict: Export summary
+    """
+    try:
+        from .utils.gdpr import run_data_export_job
+
+        summary = run_data_export_job(job_id)
+
+        logger.info(
+            f"GDPR export {job_id} completed: "
+            f"{summary['total_records']} records"
+        )
+
+        return {
+            'job_id': str(job_id),
+            'total_records': summary['total_records'],
+            'status': 'success',
+        }
+
+    except Exception as exc:
+        logger.error(f"GDPR export {job_id} failed: {exc}", exc_info=True)
+        raise self.retry(exc=exc, countdown=60)
+
+
+@shared_task(bind=True, max_retries=3)
+def cleanup_expired_data_exports(self):
+    """
+    Delete GDPR export files that have expired.
+
+    Runs hourly via Celery Beat. Export files are kept for
+    GDPR_EXPORT_TTL_HOURS after they are generated. Exports that stalled
+    are marked failed.
+
+    Returns:
+        dict: Number of files deleted and jobs failed
+    """
+    try:
+        from .utils.gdpr import cleanup_expired_exports, fail_stale_export_jobs
+
+        deleted = cleanup_expired_exports()
+        failed = fail_stale_export_jobs()
+
+        if deleted:
+            logger.info(f"Deleted {deleted} expired GDPR export files")
+        if failed:
+            logger.warning(f"Marked {failed} stalled GDPR exports failed")
+
+        return {
+            'deleted': deleted,
+            'failed': failed,
+            'status': 'success',
+        }
+
+    except Exception as exc:
+        logger.error(f"GDPR export cleanup failed: {exc}", exc_info=True)
+        raise self.retry(exc=exc, countdown=300)
+
+
+@shared_task(bind=True, max_retries=3)
+def erase_pending_users(self):
+    """
+    Run due GDPR erasures.
+
+    Runs every 10 minutes via Celery Beat. Schedules account deletions
+    that have fallen due, then runs open erasure requests in small
+    batches for up to ERASURE_SWEEP_SECONDS; erasures it does not finish
+    are resumed by the next run.
+
+    Returns:
+        dict: Summary of the sweep
+    """
+    try:
+        from .utils.erasure import GDPRErasureEngine
+
+        summary = GDPRErasureEngine().sweep()
+
+        if summary['completed'] or summary['failed']:
+            logger.info(
+                f"GDPR erasure sweep: {summary['completed']} completed, "
+                f"{summary['failed']} failed, {summary['remaining']} remaining"
+            )
+
+        return {**summary, 'status': 'success'}
+
+    except Exception as exc:
+        logger.error(f"GDPR erasure sweep failed: {exc}", exc_info=True)
+        raise self.retry(exc=exc, countdown=300)
@@ -0,0 +1,309 @@
+"""
+Tests for streamed GDPR data exports.
+
+Covers:
+- Archive contents: JSON Lines per category, messaging content, no
+  activity cap
+- Export jobs: queueing on the web process's pool or on Celery when
+  GDPR_EXPORT_CELERY is on, inline fallback, progress, status and download
+- The sweep of exports left pending
+- Stalled pending or running jobs are failed instead of reused
+- Expiry of export files
+"""
+
+import io
+import json
+import shutil
+import tempfile
+import zipfile
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authentication.models import AuditLog
+from authentication.tests.factories import UserFactory, create_user_with_profile
+from group.models import Group, GroupMembership
+from messaging.models import Comment, Conversation, Discussion, PrivateMessage
+
+from ..models import DataExportJob
+from ..utils.gdpr import (
+    GDPRDataExporter, cleanup_expired_exports, fail_stale_export_jobs,
+    generate_data_export_job, get_export_storage, process_pending_exports,
+    run_data_export_job
+)
+
+
+def read_jsonl(archive, name):
+    """Read the rows of a JSON Lines archive member."""
+    with archive.open(name) as member:
+        return [json.loads(line) for line in member]
+
+
+class ExportStorageMixin:
+    """Write export files to a temporary directory."""
+
+    def setUp(self):
+        """Set up test data."""
+        super().setUp()
+        export_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, export_root, ignore_errors=True)
+        settings_override = override_settings(GDPR_EXPORT_ROOT=export_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+
+class GDPRDataExporterTest(TestCase):
+    """Test the streamed export archive."""
+
+    def setUp(self):
+        """Set up test data."""
+        # Without a basic profile: the feed signal handlers expect profile
+        # photo fields it no longer has
+        self.user = UserFactory()
+        self.other = UserFactory()
+        self.group = Group.objects.create(
+            name='Test Group',
+            description='A test group',
+            location='Test Location',
+            leader=self.user,
+        )
+        GroupMembership.objects.create(
+            group=self.group, user=self.user, role='leader', status='active')
+        self.discussion = Discussion.objects.create(
+            group=self.group,
+            author=self.user,
+            title='Weekly check-in',
+            content='How was everyone’s week?',
+        )
+        Comment.objects.create(
+            discussion=self.discussion, author=self.other, content='Good!')
+        conversation = Conversation.objects.create()
+        conversation.participants.add(self.user, self.other)
+        PrivateMessage.objects.create(
+            conversation=conversation, sender=self.user, content='Hello')
+        PrivateMessage.objects.create(
+            conversation=conversation, sender=self.other, content='Hi there')
+        AuditLog.objects.bulk_create([
+            AuditLog(user=self.user, event_type='token_refresh', success=True)
+            for _ in range(1200)
+        ])
+
+    def export(self, **kwargs):
+        exporter = GDPRDataExporter(self.user, chunk_size=100, **kwargs)
+        export_file, summary = exporter.create_export_file()
+        with export_file:
+            archive = zipfile.ZipFile(io.BytesIO(export_file.read()))
+        return archive, summary
+
+    def test_archive_contents(self):
+        """Test every category is written, collections as JSON Lines."""
+        archive, summary = self.export()
+
+        names = set(archive.namelist())
+        self.assertTrue({
+            'account.json', 'profile.json', 'privacy.json', 'activity.jsonl',
+            'discussions.jsonl', 'private_messages.jsonl',
+            'group_memberships.jsonl', 'export_summary.json',
+            'PRIVACY_NOTICE.txt',
+        } <= names)
+
+        account = json.loads(archive.read('account.json'))
+        self.assertEqual(account['email'], self.user.email)
+
+        # Activity is no longer capped at 1000 entries
+        self.assertEqual(len(read_jsonl(archive, 'activity.jsonl')), 1200)
+        self.assertEqual(summary['data_categories']['activity'], 1200)
+
+        discussions = read_jsonl(archive, 'discussions.jsonl')
+        self.assertEqual(discussions[0]['content'], 'How was everyone’s week?')
+        # Only the user's own messages and comments
+        messages = read_jsonl(archive, 'private_messages.jsonl')
+        self.assertEqual([m['content'] for m in messages], ['Hello'])
+        self.assertEqual(read_jsonl(archive, 'comments.jsonl'), [])
+        memberships = read_jsonl(archive, 'group_memberships.jsonl')
+        self.assertEqual(memberships[0]['group__name'], 'Test Group')
+
+    def test_optional_categories(self):
+        """Test consent history and processing records can be left out."""
+        archive, summary = self.export(
+            include_consent_history=False, include_processing_records=False)
+
+        self.assertNotIn('consent_history.jsonl', archive.namelist())
+        self.assertNotIn('processing_records', summary['data_categories'])
+
+    def test_progress(self):
+        """Test progress is reported per category and ends at 100."""
+        reports = []
+        GDPRDataExporter(self.user).create_export_file(
+            lambda category, percent: reports.append((category, percent)))[0].close()
+
+        percents = [percent for _, percent in reports]
+        self.assertEqual(reports[0], ('account', 0))
+        self.assertEqual(percents, sorted(percents))
+        self.assertEqual(reports[-1], ('', 100))
+
+
+class DataExportJobTest(ExportStorageMixin, TestCase):
+    """Test export jobs and their endpoints."""
+
+    def setUp(self):
+        """Set up test data."""
+        super().setUp()
+        self.client = APIClient()
+        self.user, self.profile = create_user_with_profile()
+        self.client.force_authenticate(user=self.user)
+        self.export_url = reverse('privacy:gdpr_data_export')
+        self.request_data = {
+            'export_format': 'json',
+            'include_consent_history': False,
+            'privacy_notice_acknowledged': True,
+        }
+
+    def test_request_queues_job(self):
+        """Test requesting an export returns 202 and queues it on the pool."""
+        with patch('privacy.utils.gdpr.get_export_pool') as get_pool, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                self.export_url, self.request_data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job = DataExportJob.objects.get(user=self.user)
+        get_pool.return_value.submit.assert_called_once_with(
+            generate_data_export_job, job.id)
+        self.assertEqual(response.data['status'], DataExportJob.STATUS_PENDING)
+        self.assertIsNone(response.data['download_url'])
+        self.assertEqual(job.options['include_consent_history'], False)
+
+        # A second request while the export is pending reuses it
+        with patch('privacy.utils.gdpr.get_export_pool') as get_pool, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                self.export_url, self.request_data, format='json')
+
+        self.assertEqual(response.data['id'], str(job.id))
+        get_pool.assert_not_called()
+
+    @override_settings(GDPR_EXPORT_CELERY=True)
+    def test_request_queues_task_when_enabled(self):
+        """Test the export goes to Celery only when a worker is deployed."""
+        with patch('privacy.tasks.generate_data_export.delay') as delay, \
+                patch('privacy.utils.gdpr.get_export_pool') as get_pool, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                self.export_url, self.request_data, format='json')
+
+        delay.assert_called_once_with(response.data['id'])
+        get_pool.assert_not_called()
+
+    def test_generated_without_pool_workers(self):
+        """Test a pool with no workers generates the export before returning."""
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                self.export_url, self.request_data, format='json')
+
+        job = DataExportJob.objects.get(pk=response.data['id'])
+        self.assertEqual(job.status, DataExportJob.STATUS_COMPLETED)
+        self.assertTrue(job.is_downloadable)
+
+    def test_sweep_generates_pending_exports(self):
+        """Test exports left pending are generated, recent requests are left alone."""
+        job = DataExportJob.objects.create(user=self.user)
+
+        self.assertEqual(process_pending_exports(), 0)
+
+        DataExportJob.objects.filter(pk=job.pk).update(
+            created_at=timezone.now() - timedelta(minutes=10))
+        self.assertEqual(process_pending_exports(), 1)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, DataExportJob.STATUS_COMPLETED)
+        self.assertEqual(process_pending_exports(older_than=timedelta(0)), 0)
+
+    def test_stalled_job_is_not_reused(self):
+        """Test a request after an export stalled starts a new one."""
+        old = timezone.now() - timedelta(hours=1)
+        stalled = DataExportJob.objects.create(user=self.user)
+        DataExportJob.objects.filter(pk=stalled.pk).update(created_at=old)
+        running = DataExportJob.objects.create(
+            user=self.user, status=DataExportJob.STATUS_RUNNING, started_at=old)
+
+        with patch('privacy.utils.gdpr.get_export_pool') as get_pool, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                self.export_url, self.request_data, format='json')
+
+        self.assertNotIn(response.data['id'], (str(stalled.id), str(running.id)))
+        get_pool.return_value.submit.assert_called_once()
+        for job in (stalled, running):
+            job.refresh_from_db()
+            self.assertEqual(job.status, DataExportJob.STATUS_FAILED)
+            self.assertIn('did not finish', job.error)
+
+    def test_recent_jobs_are_not_failed(self):
+        """Test exports still within the timeout are left alone."""
+        job = DataExportJob.objects.create(
+            user=self.user, status=DataExportJob.STATUS_RUNNING,
+            started_at=timezone.now())
+
+        self.assertEqual(fail_stale_export_jobs(), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, DataExportJob.STATUS_RUNNING)
+
+    @override_settings(GDPR_EXPORT_CELERY=True)
+    def test_generated_inline_without_celery(self):
+        """Test the export is generated inline and downloadable."""
+        with patch('privacy.tasks.generate_data_export.delay',
+                   side_effect=ConnectionError('broker down')), \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                self.export_url, self.request_data, format='json')
+
+        job_url = reverse('privacy:gdpr_data_export_status', args=[response.data['id']])
+        response = self.client.get(job_url)
+        self.assertEqual(response.data['status'], DataExportJob.STATUS_COMPLETED)
+        self.assertEqual(response.data['progress'], 100)
+        self.assertGreater(response.data['file_size'], 0)
+        self.assertTrue(response.data['download_url'].endswith('/download/'))
+
+        response = self.client.get(response.data['download_url'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment', response['Content-Disposition'])
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertNotIn('consent_history.jsonl', archive.namelist())
+        self.assertIn('account.json', archive.namelist())
+
+    def test_download_requires_completed_own_export(self):
+        """Test pending and other users' exports cannot be downloaded."""
+        job = DataExportJob.objects.create(user=self.user)
+        response = self.client.get(
+            reverse('privacy:gdpr_data_export_download', args=[job.id]))
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+        other_job = DataExportJob.objects.create(user=UserFactory())
+        response = self.client.get(
+            reverse('privacy:gdpr_data_export_status', args=[other_job.id]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_expired_exports_are_deleted(self):
+        """Test expired export files are removed from storage."""
+        job = DataExportJob.objects.create(user=self.user)
+        run_data_export_job(job.id)
+        job.refresh_from_db()
+        storage = get_export_storage()
+        self.assertTrue(storage.exists(job.file_name))
+
+        self.assertEqual(cleanup_expired_exports(), 0)
+        DataExportJob.objects.filter(pk=job.pk).update(
+            expires_at=timezone.now() - timedelta(minutes=1))
+        self.assertEqual(cleanup_expired_exports(), 1)
+
+        self.assertFalse(storage.exists(job.file_name))
+        job.refresh_from_db()
+        self.assertEqual(job.status, DataExportJob.STATUS_EXPIRED)
+        self.assertFalse(job.is_downloadable)
@@ -0,0 +1,218 @@
+"""
+Tests for the batched, resumable GDPR erasure engine.
+
+Covers:
+- Erasing account, profile, messaging content, memberships and
+  notification logs while other members' content is untouched
+- Resuming an interrupted erasure
+- Sweeping due erasures, including scheduled deletions and inactive
+  accounts
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from authentication.models import AuditLog, UserSession
+from authentication.tests.factories import UserFactory
+from group.models import Group, GroupMembership
+from messaging.models import (
+    Comment, Conversation, Discussion, NotificationLog, PrivateMessage
+)
+
+from ..models import ErasureRequest, PrivacyProfile
+from ..utils.erasure import ERASED_TEXT, SWEEP_LOCK_KEY, GDPRErasureEngine
+from ..utils.gdpr import GDPRDataEraser, GDPRDataRetentionManager
+
+
+class ErasureTestMixin:
+    """Create a user with content across the apps."""
+
+    def create_user_data(self, user):
+        group = Group.objects.create(
+            name=f'Group of {user.username}',
+            description='A test group',
+            location='Test Location',
+            leader=self.other,
+        )
+        GroupMembership.objects.create(
+            group=group, user=user, role='member', status='active')
+        discussion = Discussion.objects.create(
+            group=group,
+            author=user,
+            title='My story',
+            content='Personal details',
+        )
+        Comment.objects.create(
+            discussion=discussion, author=user, content='My comment')
+        Comment.objects.create(
+            discussion=discussion, author=self.other, content='Reply')
+        conversation = Conversation.objects.create()
+        conversation.participants.add(user, self.other)
+        PrivateMessage.objects.create(
+            conversation=conversation, sender=user, content='Private note')
+        NotificationLog.objects.create(
+            user=user,
+            notification_type='new_discussion',
+            status='sent',
+            to_email=user.email,
+            subject='New discussion',
+        )
+        UserSession.objects.create(
+            user=user,
+            session_key=f'session-{user.pk}',
+            ip_address='10.0.0.1',
+            expires_at=timezone.now() + timedelta(days=1),
+        )
+        AuditLog.log_event('login_success', user=user, ip_address='10.0.0.1')
+
+
+class GDPRErasureEngineTest(ErasureTestMixin, TestCase):
+    """Test erasing a single user."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = UserFactory()
+        self.other = UserFactory()
+        self.create_user_data(self.user)
+        self.engine = GDPRErasureEngine(batch_size=2, pause=0)
+
+    def test_erases_user_data(self):
+        """Test every kind of data is deleted or scrubbed."""
+        request = self.engine.schedule(self.user, 'User request')
+
+        self.assertTrue(self.engine.run(request))
+
+        request.refresh_from_db()
+        self.assertEqual(request.status, ErasureRequest.STATUS_COMPLETED)
+        self.assertEqual(request.counts['group_memberships'], 1)
+        self.assertEqual(request.counts['comments'], 1)
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.username, request.anonymized_id)
+        self.assertFalse(self.user.is_active)
+        self.assertFalse(self.user.has_usable_password())
+
+        self.assertFalse(GroupMembership.objects.filter(user=self.user).exists())
+        self.assertFalse(NotificationLog.objects.filter(user=self.user).exists())
+        self.assertFalse(UserSession.objects.filter(user=self.user).exists())
+        discussion = Discussion.objects.get(author=self.user)
+        self.assertEqual(discussion.content, ERASED_TEXT)
+        self.assertTrue(discussion.is_deleted)
+        self.assertEqual(
+            PrivateMessage.objects.get(sender=self.user).content, ERASED_TEXT)
+        self.assertEqual(
+            Comment.objects.get(author=self.user).content, ERASED_TEXT)
+
+        # Other members' content is untouched
+        self.assertEqual(Comment.objects.get(author=self.other).content, 'Reply')
+
+        # Audit logs are kept, detached from the user
+        login = AuditLog.objects.get(event_type='login_success')
+        self.assertIsNone(login.user_id)
+        self.assertIsNone(login.ip_address)
+
+    def test_interrupted_erasure_resumes(self):
+        """Test a failed run resumes after its completed steps."""
+        request = self.engine.schedule(self.user, 'User request')
+
+        with patch.object(GDPRErasureEngine, '_anonymize_account',
+                          side_effect=ConnectionError('connection lost')):
+            with self.assertRaises(ConnectionError):
+                self.engine.run(request)
+
+        request.refresh_from_db()
+        self.assertEqual(request.status, ErasureRequest.STATUS_RUNNING)
+        self.assertEqual(request.attempts, 1)
+        self.assertEqual(request.current_step, 'account')
+        self.assertIn('private_messages', request.completed_steps)
+
+        with patch.object(GDPRErasureEngine, '_run') as run_step:
+            self.assertTrue(self.engine.run(request))
+        # Only the account step was left
+        run_step.assert_not_called()
+        self.assertEqual(request.status, ErasureRequest.STATUS_COMPLETED)
+
+    def test_deadline_leaves_request_open(self):
+        """Test a run out of time stops between batches."""
+        request = self.engine.schedule(self.user, 'User request')
+
+        self.assertFalse(self.engine.run(request, deadline=0))
+
+        request.refresh_from_db()
+        self.assertEqual(request.status, ErasureRequest.STATUS_RUNNING)
+        self.assertEqual(request.completed_steps, [])
+        self.assertTrue(GroupMembership.objects.filter(user=self.user).exists())
+
+    def test_data_eraser_summary(self):
+        """Test GDPRDataEraser erases immediately and reports counts."""
+        username = self.user.username
+
+        summary = GDPRDataEraser(self.user).initiate_erasure(reason='withdraw_consent')
+
+        self.assertEqual(summary['username'], username)
+        self.assertEqual(summary['erased_data']['notification_logs'], 1)
+        self.assertTrue(summary['anonymized_id'].startswith('deleted_'))
+
+
+class ErasureSweepTest(ErasureTestMixin, TestCase):
+    """Test scheduled erasure sweeps."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.delete(SWEEP_LOCK_KEY)
+        self.other = UserFactory()
+        self.users = [UserFactory() for _ in range(3)]
+        for user in self.users:
+            self.create_user_data(user)
+        self.engine = GDPRErasureEngine(batch_size=100, pause=0)
+
+    def test_sweep_erases_due_users(self):
+        """Test one sweep erases every due user and skips future ones."""
+        due, later, _ = self.users
+        PrivacyProfile.objects.create(
+            user=due,
+            deletion_requested=True,
+            deletion_scheduled_for=timezone.now() - timedelta(hours=1),
+        )
+        PrivacyProfile.objects.create(
+            user=later,
+            deletion_requested=True,
+            deletion_scheduled_for=timezone.now() + timedelta(days=10),
+        )
+        self.engine.schedule(self.users[2], 'User request')
+
+        summary = self.engine.sweep(time_budget=60)
+
+        self.assertEqual(summary['scheduled'], 1)
+        self.assertEqual(summary['completed'], 2)
+        self.assertEqual(summary['remaining'], 0)
+        self.assertFalse(GroupMembership.objects.filter(user=due).exists())
+        self.assertTrue(GroupMembership.objects.filter(user=later).exists())
+
+        # Users are scheduled only once
+        self.assertEqual(self.engine.sweep(time_budget=60)['scheduled'], 0)
+
+    def test_sweep_runs_once_at_a_time(self):
+        """Test a sweep is skipped while another holds the lock."""
+        self.engine.schedule(self.users[0], 'User request')
+        cache.add(SWEEP_LOCK_KEY, True, 60)
+
+        self.assertEqual(self.engine.sweep(time_budget=60)['completed'], 0)
+        self.assertTrue(ErasureRequest.objects.filter(
+            status=ErasureRequest.STATUS_PENDING).exists())
+
+    def test_inactive_accounts_are_scheduled(self):
+        """Test the retention policy schedules inactive accounts."""
+        inactive = self.users[0]
+        inactive.is_active = False
+        inactive.last_login = timezone.now() - timedelta(days=1200)
+        inactive.save()
+
+        summary = GDPRDataRetentionManager()._cleanup_inactive_accounts()
+
+        self.assertEqual(summary['scheduled_count'], 1)
+        self.assertEqual(ErasureRequest.objects.get().user, inactive)
@@ -45,7 +45,8 @@ class TestGDPRViewSet(APITestCase):
         }
 
         response = self.client.post(self.export_data_url, data, format='json')
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Exports are generated in the background
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
 
     def test_erase_user_data_success(self):
         """Test successful data erasure."""
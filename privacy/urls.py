@@ -6,6 +6,8 @@ GDPR compliance and data privacy endpoints.
 from django.urls import path
 from .views import (
     GDPRDataExportView,
+    GDPRDataExportStatusView,
+    GDPRDataExportDownloadView,
     GDPRDataErasureView,
     GDPRConsentView,
     GDPRPrivacyDashboardView,
@@ -18,6 +20,10 @@ app_name = 'privacy'
 urlpatterns = [
     # GDPR Data Export (Article 20 - Right to Data Portability)
     path('gdpr/export/', GDPRDataExportView.as_view(), name='gdpr_data_export'),
+    path('gdpr/export/<uuid:job_id>/', GDPRDataExportStatusView.as_view(),
+         name='gdpr_data_export_status'),
+    path('gdpr/export/<uuid:job_id>/download/', GDPRDataExportDownloadView.as_view(),
+         name='gdpr_data_export_download'),
 
     # GDPR Data Erasure (Article 17 - Right to be Forgotten)
     path('gdpr/erasure/', GDPRDataErasureView.as_view(), name='gdpr_data_erasure'),
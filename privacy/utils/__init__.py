@@ -3,6 +3,7 @@ Privacy utilities package.
 
 This package contains utility modules for privacy and GDPR compliance:
 - gdpr.py: GDPR data export, erasure, and compliance utilities
+- erasure.py: Batched, resumable erasure engine
 """
 
 # Import GDPR utilities
@@ -10,12 +11,30 @@ from .gdpr import (
     GDPRDataExporter,
     GDPRDataEraser,
     GDPRDataRetentionManager,
-    GDPRConsentManager
+    GDPRConsentManager,
+    get_export_storage,
+    run_data_export_job,
+    get_export_pool,
+    queue_data_export_job,
+    generate_data_export_job,
+    process_pending_exports,
+    fail_stale_export_jobs,
+    cleanup_expired_exports
 )
+from .erasure import GDPRErasureEngine
 
 __all__ = [
     'GDPRDataExporter',
     'GDPRDataEraser',
     'GDPRDataRetentionManager',
-    'GDPRConsentManager'
+    'GDPRConsentManager',
+    'get_export_storage',
+    'run_data_export_job',
+    'get_export_pool',
+    'queue_data_export_job',
+    'generate_data_export_job',
+    'process_pending_exports',
+    'fail_stale_export_jobs',
+    'cleanup_expired_exports',
+    'GDPRErasureEngine'
 ]
\ No newline at end of file
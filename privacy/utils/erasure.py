@@ -0,0 +1,389 @@
+"""
+Batched, resumable GDPR erasure engine.
+
+Erasing a user (Article 17) is split into steps, one per kind of data.
+Each step deletes or anonymizes the user's rows with core.batching's
+keyset-chunked DELETE/UPDATE batches, so no step loads the user's data
+into memory or holds locks on hot tables (messaging, memberships,
+sessions, audit logs) for longer than one small batch.
+
+Progress is stored on an ErasureRequest:
+- completed steps are skipped when a request runs again
+- every step only matches rows it has not handled yet, so a step cut
+  off halfway resumes with the remaining rows
+
+Erasure requests are created when users delete their account, when a
+scheduled deletion (PrivacyProfile.request_deletion) falls due and by
+the inactive account retention policy. The erase_pending_users Celery
+task sweeps them: it runs as many open requests as fit in
+ERASURE_SWEEP_SECONDS and leaves the rest for the next sweep.
+
+Messaging content is scrubbed rather than deleted, so other members'
+replies and reactions keep their threads.
+"""
+
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from authentication.models import (
+    AuditLog, EmailVerificationToken, PasswordHistory, PasswordResetToken,
+    UserSession
+)
+from core.batching import run_in_batches
+from privacy.models import (
+    ConsentLog, DataExportJob, ErasureRequest, PrivacyProfile
+)
+from profiles.models import ProfilePhoto, UserProfileBasic
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+# Replaces erased titles and message bodies
+ERASED_TEXT = '[deleted]'
+
+SWEEP_LOCK_KEY = 'privacy:erasure_sweep'
+
+
+class GDPRErasureEngine:
+    """Erase users step by step in small, resumable batches."""
+
+    def __init__(self, batch_size: Optional[int] = None, pause: Optional[float] = None):
+        self.batch_size = batch_size
+        self.pause = pause
+
+    @staticmethod
+    def schedule(
+        user,
+        reason: str,
+        retain_audit_logs: bool = True,
+        scheduled_for=None,
+    ) -> ErasureRequest:
+        """
+        Get the user's open erasure request, creating it if needed.
+
+        Args:
+            user: User to erase
+            reason: Reason for erasure (for audit purposes)
+            retain_audit_logs: Keep anonymized audit logs
+            scheduled_for: When the erasure may start (default: now)
+
+        Returns:
+            The open ErasureRequest
+        """
+        request, _ = ErasureRequest.objects.get_or_create(
+            user=user,
+            status__in=ErasureRequest.OPEN_STATUSES,
+            defaults={
+                'status': ErasureRequest.STATUS_PENDING,
+                'reason': reason,
+                'retain_audit_logs': retain_audit_logs,
+                'scheduled_for': scheduled_for or timezone.now(),
+            }
+        )
+        return request
+
+    @staticmethod
+    def schedule_users(user_ids, reason: str) -> int:
+        """
+        Create erasure requests for users that have never had one.
+
+        Args:
+            user_ids: Queryset or list of user IDs
+            reason: Reason for erasure
+
+        Returns:
+            Number of requests created
+        """
+        user_ids = User.objects.filter(pk__in=user_ids).exclude(
+            erasure_requests__isnull=False
+        ).values_list('pk', flat=True)
+        created = ErasureRequest.objects.bulk_create(
+            [ErasureRequest(user_id=user_id, reason=reason) for user_id in user_ids],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+        return len(created)
+
+    @classmethod
+    def schedule_due_deletions(cls) -> int:
+        """
+        Create erasure requests for scheduled account deletions that are due.
+
+        Returns:
+            Number of requests created
+        """
+        due = PrivacyProfile.objects.filter(
+            deletion_requested=True,
+            deletion_scheduled_for__lte=timezone.now(),
+        ).values('user_id')
+        return cls.schedule_users(due, 'Scheduled account deletion')
+
+    def steps(self, request: ErasureRequest) -> List[Tuple[str, Callable]]:
+        """
+        List the erasure steps of a request, in order.
+
+        Returns:
+            List of (step name, callable taking a deadline and returning
+            (rows handled, finished))
+        """
+        from group.models import Group, GroupMembership
+        from messaging.models import (
+            Comment, CommentHistory, ContentReport, Discussion, FeedItem,
+            FeedItemView, InboxEntry, NotificationLog, NotificationPreference,
+            PrayerRequest, PrivateMessage, Scripture, Testimony
+        )
+
+        user = request.user
+        now = timezone.now()
+
+        def delete(queryset, before_batch=None):
+            return lambda deadline: self._run(
+                queryset, deadline=deadline, before_batch=before_batch)
+
+        def scrub(queryset, **values):
+            return lambda deadline: self._run(queryset, values, deadline=deadline)
+
+        steps = [
+            ('export_files', delete(
+                DataExportJob.objects.filter(user=user),
+                before_batch=self._delete_export_files)),
+            ('sessions', delete(UserSession.objects.filter(user=user))),
+            ('password_reset_tokens', delete(
+                PasswordResetToken.objects.filter(user=user))),
+            ('email_verification_tokens', delete(
+                EmailVerificationToken.objects.filter(user=user))),
+            ('password_history', delete(PasswordHistory.objects.filter(user=user))),
+            ('notification_logs', delete(NotificationLog.objects.filter(user=user))),
+            ('notification_preferences', delete(
+                NotificationPreference.objects.filter(user=user))),
+            ('group_memberships', delete(GroupMembership.objects.filter(user=user))),
+            ('group_co_leaders', delete(
+                Group.co_leaders.through.objects.filter(user=user))),
+            ('inbox_entries', delete(InboxEntry.objects.filter(user=user))),
+            ('inbox_previews', scrub(
+                InboxEntry.objects.filter(last_message_sender=user).exclude(
+                    last_message_preview=ERASED_TEXT),
+                last_message_preview=ERASED_TEXT)),
+            ('private_messages', scrub(
+                PrivateMessage.objects.filter(sender=user).exclude(
+                    content=ERASED_TEXT),
+                content=ERASED_TEXT)),
+            ('discussions', scrub(
+                Discussion.objects.filter(author=user).exclude(
+                    title=ERASED_TEXT, content=ERASED_TEXT),
+                title=ERASED_TEXT, content=ERASED_TEXT, is_deleted=True,
+                deleted_at=now)),
+            ('comment_history', delete(
+                CommentHistory.objects.filter(comment__author=user))),
+            ('comments', scrub(
+                Comment.objects.filter(author=user).exclude(content=ERASED_TEXT),
+                content=ERASED_TEXT, is_deleted=True, deleted_at=now)),
+            ('prayer_requests', scrub(
+                PrayerRequest.objects.filter(author=user).exclude(
+                    title=ERASED_TEXT, content=ERASED_TEXT),
+                title=ERASED_TEXT, content=ERASED_TEXT, answer_description='')),
+            ('testimonies', scrub(
+                Testimony.objects.filter(author=user).exclude(
+                    title=ERASED_TEXT, content=ERASED_TEXT),
+                title=ERASED_TEXT, content=ERASED_TEXT, is_public=False)),
+            ('scriptures', scrub(
+                Scripture.objects.filter(author=user).exclude(personal_reflection=''),
+                personal_reflection='')),
+            ('feed_items', scrub(
+                FeedItem.objects.filter(author=user).exclude(
+                    title=ERASED_TEXT, preview=ERASED_TEXT),
+                title=ERASED_TEXT, preview=ERASED_TEXT, is_deleted=True)),
+            ('feed_views', delete(FeedItemView.objects.filter(user=user))),
+            ('content_reports', scrub(
+                ContentReport.objects.filter(reporter=user).exclude(details=''),
+                details='')),
+            ('profile_photos', delete(
+                ProfilePhoto.objects.filter(user=user),
+                before_batch=self._delete_photo_files)),
+            ('profile', scrub(
+                UserProfileBasic.objects.filter(user=user),
+                display_name='', first_name='', last_name='', bio='',
+                location='', post_code='', leadership_info={},
+                profile_visibility='private')),
+            ('privacy_profile', delete(PrivacyProfile.objects.filter(user=user))),
+            ('consent_logs', scrub(
+                ConsentLog.objects.filter(user=user).filter(
+                    Q(ip_address__isnull=False) | ~Q(user_agent='')),
+                ip_address=None, user_agent='')),
+        ]
+
+        if request.retain_audit_logs:
+            steps.append(('audit_logs', scrub(
+                AuditLog.objects.filter(user=user),
+                user=None, ip_address=None, user_agent='')))
+        else:
+            steps.append(('audit_logs', delete(AuditLog.objects.filter(user=user))))
+
+        steps.append(('account', lambda deadline: self._anonymize_account(request)))
+        return steps
+
+    def run(self, request: ErasureRequest, deadline: Optional[float] = None) -> bool:
+        """
+        Run or resume an erasure request.
+
+        Args:
+            request: ErasureRequest to run
+            deadline: time.monotonic() value after which no new batch starts
+
+        Returns:
+            Whether the erasure completed (False if the deadline cut it short)
+        """
+        if request.status == ErasureRequest.STATUS_COMPLETED:
+            return True
+
+        if request.started_at is None:
+            request.started_at = timezone.now()
+            request.anonymized_id = (
+                f"deleted_{request.user_id}_{int(request.started_at.timestamp())}")
+            self._log_initiated(request)
+        request.status = ErasureRequest.STATUS_RUNNING
+        request.save(update_fields=['status', 'started_at', 'anonymized_id'])
+
+        try:
+            for name, step in self.steps(request):
+                if name in request.completed_steps:
+                    continue
+
+                request.current_step = name
+                request.save(update_fields=['current_step'])
+
+                count, finished = step(deadline)
+                request.counts[name] = request.counts.get(name, 0) + count
+                if finished:
+                    request.completed_steps.append(name)
+                request.save(update_fields=['counts', 'completed_steps'])
+
+                if not finished:
+                    return False
+        except Exception as e:
+            request.attempts += 1
+            request.error = str(e)
+            if request.attempts >= getattr(settings, 'ERASURE_MAX_ATTEMPTS', 3):
+                request.status = ErasureRequest.STATUS_FAILED
+            request.save(update_fields=['attempts', 'error', 'status'])
+            raise
+
+        request.status = ErasureRequest.STATUS_COMPLETED
+        request.current_step = ''
+        request.completed_at = timezone.now()
+        request.save(update_fields=['status', 'current_step', 'completed_at'])
+
+        logger.info(
+            f"GDPR erasure {request.id} completed: "
+            f"{sum(request.counts.values())} rows erased")
+        return True
+
+    def sweep(self, time_budget: Optional[float] = None) -> Dict[str, int]:
+        """
+        Run due erasure requests until the time budget is used up.
+
+        Only one sweep runs at a time; requests it does not finish are
+        resumed by the next sweep.
+
+        Args:
+            time_budget: Seconds to spend (default ERASURE_SWEEP_SECONDS)
+
+        Returns:
+            Dict with 'scheduled', 'completed', 'remaining' and 'failed' counts
+        """
+        if time_budget is None:
+            time_budget = getattr(settings, 'ERASURE_SWEEP_SECONDS', 240)
+        if not cache.add(SWEEP_LOCK_KEY, True, int(time_budget) + 60):
+            logger.info("GDPR erasure sweep already running, skipping")
+            return {'scheduled': 0, 'completed': 0, 'remaining': 0, 'failed': 0}
+
+        try:
+            deadline = time.monotonic() + time_budget
+            summary = {
+                'scheduled': self.schedule_due_deletions(),
+                'completed': 0,
+                'failed': 0,
+            }
+
+            due = list(ErasureRequest.objects.filter(
+                status__in=ErasureRequest.OPEN_STATUSES,
+                scheduled_for__lte=timezone.now(),
+            ).select_related('user').order_by('scheduled_for'))
+
+            for request in due:
+                if time.monotonic() >= deadline:
+                    break
+                try:
+                    if self.run(request, deadline):
+                        summary['completed'] += 1
+                except Exception as e:
+                    logger.error(
+                        f"GDPR erasure {request.id} failed: {e}", exc_info=True)
+                    summary['failed'] += 1
+
+            summary['remaining'] = ErasureRequest.objects.filter(
+                status__in=ErasureRequest.OPEN_STATUSES).count()
+            return summary
+        finally:
+            cache.delete(SWEEP_LOCK_KEY)
+
+    def _run(self, queryset, values=None, deadline=None, before_batch=None):
+        return run_in_batches(
+            queryset, values, batch_size=self.batch_size, pause=self.pause,
+            deadline=deadline, before_batch=before_batch)
+
+    @staticmethod
+    def _delete_export_files(pks):
+        """Delete the export files of a batch of DataExportJobs."""
+        from .gdpr import get_export_storage
+
+        storage = get_export_storage()
+        for file_name in DataExportJob.objects.filter(
+                pk__in=pks).exclude(file_name='').values_list('file_name', flat=True):
+            storage.delete(file_name)
+
+    @staticmethod
+    def _delete_photo_files(pks):
+        """Delete the image files of a batch of ProfilePhotos."""
+        for photo in ProfilePhoto.objects.filter(pk__in=pks).only('photo', 'thumbnail'):
+            for image in (photo.photo, photo.thumbnail):
+                if image:
+                    image.delete(save=False)
+
+    @staticmethod
+    def _log_initiated(request: ErasureRequest):
+        """Create audit log for erasure initiation."""
+        AuditLog.log_event(
+            user=request.user,
+            event_type='gdpr_erasure_initiated',
+            ip_address='127.0.0.1',  # System initiated
+            user_agent='GDPR Compliance System',
+            metadata={
+                'reason': request.reason,
+                'erasure_request_id': str(request.id),
+                'anonymized_id': request.anonymized_id,
+                'gdpr_article': 'Article 17 - Right to Erasure',
+            }
+        )
+
+    @staticmethod
+    def _anonymize_account(request: ErasureRequest) -> Tuple[int, bool]:
+        """Anonymize the user account itself."""
+        updated = User.objects.filter(pk=request.user_id).update(
+            username=request.anonymized_id,
+            email=f"{request.anonymized_id}@deleted.local",
+            first_name='',
+            last_name='',
+            password='!',
+            is_active=False,
+            email_verified=False,
+            updated_at=timezone.now(),
+        )
+        return updated, True
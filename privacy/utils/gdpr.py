@@ -2,11 +2,8 @@
 GDPR Compliance Utilities for Vineyard Group Fellowship Authentication
 
 This module provides comprehensive GDPR compliance features including:
-- Data export (Right to Data Portability            'failed_login_attempts': AuditLog.objects.filter(
-                user=self.user,
-                action='login_failed',
-                created_at__gte=timezone.now() - timedelta(days=30)
-            ).count(),ata erasure (Right to be Forgotten)
+- Data export (Right to Data Portability)
+- Data erasure (Right to be Forgotten)
 - Consent management
 - Privacy controls
 - Data retention policies
@@ -16,416 +13,609 @@ Created: October 2025
 """
 
 import json
-import zipfile
-import tempfile
+import logging
 import os
+import tempfile
+import zipfile
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
-from io import BytesIO
+from typing import Callable, Dict, Iterable, Iterator, List, Any, Optional, Tuple
 from django.conf import settings
-from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
-from django.db import transaction
 from django.contrib.auth import get_user_model
-from django.core.serializers import serialize
-from django.apps import apps
 
-from authentication.models import User, AuditLog, PasswordHistory
+from authentication.models import User, AuditLog, PasswordHistory, UserSession
+from core.background import BackgroundPool
+from core.batching import run_in_batches
 from profiles.models import UserProfileBasic
-from privacy.models import PrivacyProfile, ConsentLog
+from privacy.models import PrivacyProfile, ConsentLog, DataProcessingRecord
 
 User = get_user_model()
 
+logger = logging.getLogger(__name__)
+
+# Rows fetched per database round trip while exporting
+EXPORT_CHUNK_SIZE = 2000
+
+# Bytes buffered before writing to the compressed archive member
+EXPORT_WRITE_BUFFER = 64 * 1024
+
+# Archives up to this size stay in memory before spilling to disk
+EXPORT_SPOOL_SIZE = 5 * 1024 * 1024
+
+PRIVACY_NOTICE = """
+GDPR Data Export - Privacy Notice
+
+This export contains all personal data we hold about you in accordance with
+Article 20 of the General Data Protection Regulation (GDPR) - Right to Data Portability.
+
+The data is provided in machine-readable formats: single records as JSON
+(.json) and collections as JSON Lines (.jsonl, one JSON object per line).
+It includes:
+- Account information and profile data
+- Session history and device information
+- Privacy settings and consent records
+- Activity logs and security information
+- Group memberships
+- Discussions, comments, prayer requests, testimonies, scriptures and
+  reactions you posted, private messages you sent and reports you filed
+- Notification preferences and the notifications we sent you
+
+This export was generated on: {export_time}
+
+For questions about this export or your privacy rights, please contact our
+Data Protection Officer at: privacy@Vineyard Group Fellowship.app
+
+Your rights under GDPR include:
+- Right of access (Article 15)
+- Right to rectification (Article 16)
+- Right to erasure (Article 17)
+- Right to restrict processing (Article 18)
+- Right to data portability (Article 20)
+- Right to object (Article 21)
+"""
+
+
+def get_export_storage():
+    """
+    Get the storage GDPR export files are written to.
+
+    Exports are never written to the public media directory: on S3 the
+    bucket is private with signed URLs, otherwise files go to
+    GDPR_EXPORT_ROOT (default: <BASE_DIR>/private).
+    """
+    if getattr(settings, 'USE_S3_STORAGE', False):
+        return default_storage
+    return FileSystemStorage(location=getattr(
+        settings, 'GDPR_EXPORT_ROOT', os.path.join(settings.BASE_DIR, 'private')))
+
 
 class GDPRDataExporter:
     """
     Handles GDPR Article 20 - Right to Data Portability
 
-    Exports all user data in machine-readable JSON format with:
-    - User account information
-    - Profile data and preferences
-    - Session history
-    - Activity logs
-    - Privacy settings
+    Streams all user data into a ZIP archive, one member per data
+    category:
+    - single records (account, profile, privacy settings) as JSON
+    - collections (sessions, activity, consent history, memberships,
+      messaging content, notifications) as JSON Lines, read from the
+      database with .iterator() in chunks of EXPORT_CHUNK_SIZE rows
+
+    Rows are written to the archive as they are read and the archive is
+    spooled to a temporary file, so memory use stays flat however much
+    data the user has.
     """
 
-    def __init__(self, user: User):
+    def __init__(
+        self,
+        user: User,
+        include_consent_history: bool = True,
+        include_processing_records: bool = True,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+    ):
         self.user = user
+        self.include_consent_history = include_consent_history
+        self.include_processing_records = include_processing_records
+        self.chunk_size = chunk_size
         self.export_timestamp = timezone.now()
+        self.encoder = DjangoJSONEncoder(ensure_ascii=False)
 
-    def export_user_data(self) -> Dict[str, Any]:
+    def categories(self) -> List[Tuple[str, str, Callable[[], Any]]]:
         """
-        Export comprehensive user data for GDPR compliance.
+        List the data categories to export, in archive order.
 
         Returns:
-            Dict containing all user data in structured format
+            List of (category name, 'json' or 'jsonl', callable returning
+            a dict or an iterable of row dicts)
         """
-        data = {
-            'export_metadata': {
-                'exported_at': self.export_timestamp.isoformat(),
-                'export_format': 'JSON',
-                'gdpr_article': 'Article 20 - Right to Data Portability',
-                'user_id': str(self.user.id),
-                'username': self.user.username,
-            },
-            'account_data': self._export_account_data(),
-            'profile_data': self._export_profile_data(),
-            'session_data': self._export_session_data(),
-            'privacy_data': self._export_privacy_data(),
-            'activity_data': self._export_activity_data(),
-            'security_data': self._export_security_data(),
-        }
+        from group.models import GroupMembership
+        from messaging.models import (
+            Comment, ContentReport, Discussion, NotificationLog,
+            NotificationPreference, PrayerRequest, PrivateMessage, Reaction,
+            Scripture, Testimony
+        )
 
-        return data
+        user = self.user
+
+        def rows(queryset, *fields):
+            return lambda: queryset.order_by('created_at').values(*fields)
+
+        categories = [
+            ('account', 'json', self._export_account_data),
+            ('profile', 'json', self._export_profile_data),
+            ('privacy', 'json', self._export_privacy_data),
+            ('sessions', 'jsonl', rows(
+                UserSession.objects.filter(user=user),
+                'id', 'device_name', 'user_agent', 'ip_address', 'city',
+                'country', 'is_active', 'created_at', 'last_activity_at',
+                'expires_at')),
+            ('activity', 'jsonl', lambda: AuditLog.objects.filter(
+                user=user).order_by('timestamp').values(
+                'event_type', 'description', 'ip_address', 'user_agent',
+                'timestamp', 'success', 'metadata')),
+            ('password_changes', 'jsonl', rows(
+                PasswordHistory.objects.filter(user=user), 'created_at')),
+        ]
+
+        if self.include_consent_history:
+            categories.append(('consent_history', 'jsonl', rows(
+                ConsentLog.objects.filter(user=user),
+                'consent_type', 'action', 'consent_given', 'version',
+                'ip_address', 'user_agent', 'reason', 'expires_at',
+                'created_at')))
+
+        if self.include_processing_records:
+            categories.append(('processing_records', 'jsonl', lambda: (
+                DataProcessingRecord.objects.filter(user=user).order_by(
+                    'started_at').values(
+                    'purpose', 'data_categories', 'legal_basis',
+                    'retention_period_days', 'started_at', 'ended_at',
+                    'is_active', 'notes'))))
+
+        categories += [
+            ('group_memberships', 'jsonl', rows(
+                GroupMembership.objects.filter(user=user),
+                'group_id', 'group__name', 'role', 'status', 'joined_at',
+                'left_at', 'created_at')),
+            ('discussions', 'jsonl', rows(
+                Discussion.objects.filter(author=user),
+                'id', 'group_id', 'title', 'content', 'category',
+                'is_deleted', 'created_at', 'updated_at', 'deleted_at')),
+            ('comments', 'jsonl', rows(
+                Comment.objects.filter(author=user),
+                'id', 'group_id', 'discussion_id', 'content_type__model',
+                'content_id', 'parent_id', 'content', 'is_edited',
+                'is_deleted', 'created_at', 'updated_at', 'deleted_at')),
+            ('prayer_requests', 'jsonl', rows(
+                PrayerRequest.objects.filter(author=user),
+                'id', 'group_id', 'title', 'content', 'category', 'urgency',
+                'is_answered', 'answered_at', 'answer_description',
+                'created_at', 'updated_at')),
+            ('testimonies', 'jsonl', rows(
+                Testimony.objects.filter(author=user),
+                'id', 'group_id', 'title', 'content', 'answered_prayer_id',
+                'is_public', 'public_shared_at', 'created_at', 'updated_at')),
+            ('scriptures', 'jsonl', rows(
+                Scripture.objects.filter(author=user),
+                'id', 'group_id', 'reference', 'verse_text', 'translation',
+                'personal_reflection', 'source', 'created_at', 'updated_at')),
+            ('reactions', 'jsonl', rows(
+                Reaction.objects.filter(user=user),
+                'id', 'reaction_type', 'content_type__model', 'object_id',
+                'group_id', 'created_at')),
+            # Only messages the user sent: received messages are the
+            # sender's personal data
+            ('private_messages', 'jsonl', rows(
+                PrivateMessage.objects.filter(sender=user),
+                'id', 'conversation_id', 'content', 'created_at')),
+            ('content_reports', 'jsonl', rows(
+                ContentReport.objects.filter(reporter=user),
+                'id', 'content_type__model', 'object_id', 'reason',
+                'details', 'status', 'created_at')),
+            ('notification_preferences', 'json', lambda: (
+                NotificationPreference.objects.filter(user=user).values(
+                    *[field.attname for field in
+                      NotificationPreference._meta.concrete_fields
+                      if field.attname not in ('id', 'user_id', 'unsubscribe_token')]
+                ).first() or {})),
+            ('notifications', 'jsonl', rows(
+                NotificationLog.objects.filter(user=user),
+                'notification_type', 'status', 'to_email', 'subject',
+                'created_at')),
+        ]
+        return categories
 
     def _export_account_data(self) -> Dict[str, Any]:
         """Export basic account information."""
         return {
+            'user_id': str(self.user.id),
             'username': self.user.username,
             'email': self.user.email,
             'first_name': self.user.first_name,
             'last_name': self.user.last_name,
-            'date_joined': self.user.date_joined.isoformat(),
-            'last_login': self.user.last_login.isoformat() if self.user.last_login else None,
+            'date_joined': self.user.date_joined,
+            'last_login': self.user.last_login,
             'is_active': self.user.is_active,
             'email_verified': self.user.email_verified,
-            'email_verified_at': self.user.email_verified_at.isoformat() if self.user.email_verified_at else None,
+            'email_verified_at': self.user.email_verified_at,
         }
 
     def _export_profile_data(self) -> Dict[str, Any]:
         """Export user profile and preferences."""
-        try:
-            profile = self.user.basic_profile
-            return {
-                'display_name': profile.display_name,
-                'bio': profile.bio,
-                'timezone': profile.timezone,
-                'profile_visibility': profile.profile_visibility,
-                'show_activity_status': profile.show_activity_status,
-                'allow_direct_messages': profile.allow_direct_messages,
-                'email_notifications': profile.email_notifications,
-                'push_notifications': profile.push_notifications,
-                'community_notifications': profile.community_notifications,
-                'emergency_notifications': profile.emergency_notifications,
-                'created_at': profile.created_at.isoformat(),
-                'updated_at': profile.updated_at.isoformat(),
-            }
-        except UserProfileBasic.DoesNotExist:
-            return {}
-
-    def _export_session_data(self) -> List[Dict[str, Any]]:
-        """Export session history and device information."""
-        sessions = UserSession.objects.filter(
-            user=self.user).order_by('-created_at')
-        return [
-            {
-                'session_id': str(session.id),
-                'device_name': session.device_name,
-                'ip_address': session.ip_address,
-                'user_agent': session.user_agent,
-                'location': session.city,
-                'is_active': session.is_active,
-                'created_at': session.created_at.isoformat(),
-                'last_activity': session.last_activity_at.isoformat(),
-                'expires_at': session.expires_at.isoformat() if session.expires_at else None,
-            }
-            for session in sessions
-        ]
+        return UserProfileBasic.objects.filter(user=self.user).values(
+            'display_name', 'first_name', 'last_name', 'bio', 'location',
+            'post_code', 'timezone', 'profile_visibility', 'leadership_info',
+            'created_at', 'updated_at',
+        ).first() or {}
 
     def _export_privacy_data(self) -> Dict[str, Any]:
-        """Export privacy settings and consent records."""
-        try:
-            privacy_profile = PrivacyProfile.objects.get(user=self.user)
-            return {
-                'marketing_consent': privacy_profile.marketing_consent,
-                'analytics_consent': getattr(privacy_profile, 'analytics_consent', False),
-                'marketing_consent_date': privacy_profile.marketing_consent_at.isoformat() if privacy_profile.marketing_consent_at else None,
-                'analytics_consent_date': getattr(privacy_profile, 'analytics_consent_at', None),
-                'data_retention_preference': privacy_profile.data_retention_preference,
-                'last_privacy_update': privacy_profile.updated_at.isoformat() if hasattr(privacy_profile, 'updated_at') and privacy_profile.updated_at else None,
-                'privacy_policy_version': privacy_profile.privacy_policy_version,
-                'terms_accepted_date': privacy_profile.terms_of_service_accepted_at.isoformat() if privacy_profile.terms_of_service_accepted_at else None,
-            }
-        except PrivacyProfile.DoesNotExist:
-            return {}
-
-    def _export_activity_data(self) -> List[Dict[str, Any]]:
-        """Export user activity and audit logs."""
-        logs = AuditLog.objects.filter(user=self.user).order_by(
-            '-created_at')[:1000]  # Last 1000 activities
-        return [
-            {
-                'action': log.action,
-                'timestamp': log.created_at.isoformat(),
-                'ip_address': log.ip_address,
-                'user_agent': log.user_agent,
-                'details': log.details,
-                'session_key': log.session_key,
-            }
-            for log in logs
-        ]
-
-    def _export_security_data(self) -> Dict[str, Any]:
-        """Export security-related information."""
-        password_history = PasswordHistory.objects.filter(
-            user=self.user).order_by('-created_at')[:10]
-
-        return {
-            'password_history': [
-                {
-                    'created_at': ph.created_at.isoformat(),
-                    'password_strength': ph.password_strength,
-                    'was_breached': ph.was_breached,
-                }
-                for ph in password_history
-            ],
-            'two_factor_enabled': getattr(self.user, 'totpdevice_set', None) is not None,
-            'failed_login_attempts': AuditLog.objects.filter(
-                user=self.user,
-                action='login_failed',
-                created_at__gte=timezone.now() - timedelta(days=30)
-            ).count(),
-        }
-
-    def create_export_file(self) -> BytesIO:
+        """Export privacy settings and consent state."""
+        return PrivacyProfile.objects.filter(user=self.user).values(
+            *[field.attname for field in PrivacyProfile._meta.concrete_fields
+              if field.attname not in ('id', 'user_id')]
+        ).first() or {}
+
+    def _encode_lines(self, rows: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+        """Encode rows as JSON Lines, yielding buffers of about EXPORT_WRITE_BUFFER bytes."""
+        buffer = []
+        size = 0
+        for row in rows:
+            line = (self.encoder.encode(row) + '\n').encode('utf-8')
+            buffer.append(line)
+            size += len(line)
+            if size >= EXPORT_WRITE_BUFFER:
+                yield b''.join(buffer)
+                buffer = []
+                size = 0
+        if buffer:
+            yield b''.join(buffer)
+
+    def write_export(
+        self,
+        fileobj,
+        progress: Optional[Callable[[str, int], None]] = None,
+    ) -> Dict[str, Any]:
         """
-        Create a ZIP file containing the user's data export.
+        Write the export archive to a file object.
+
+        Args:
+            fileobj: Seekable binary file to write the ZIP archive to
+            progress: Called with (category, percent done) before each
+                category is written
 
         Returns:
-            BytesIO object containing the ZIP file
+            Export summary with the record count per category
         """
-        data = self.export_user_data()
-
-        # Create ZIP file in memory
-        zip_buffer = BytesIO()
-
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            # Add main data export
-            zip_file.writestr(
-                'user_data_export.json',
-                json.dumps(data, indent=2, ensure_ascii=False)
-            )
+        categories = self.categories()
+        counts = {}
+
+        with zipfile.ZipFile(fileobj, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for index, (name, kind, source) in enumerate(categories):
+                if progress:
+                    progress(name, index * 100 // len(categories))
+
+                if kind == 'json':
+                    archive.writestr(f'{name}.json', json.dumps(
+                        source(), cls=DjangoJSONEncoder, indent=2,
+                        ensure_ascii=False))
+                    counts[name] = 1
+                    continue
+
+                count = 0
+
+                def counted(queryset):
+                    nonlocal count
+                    for row in queryset.iterator(chunk_size=self.chunk_size):
+                        count += 1
+                        yield row
+
+                with archive.open(f'{name}.jsonl', 'w', force_zip64=True) as member:
+                    for chunk in self._encode_lines(counted(source())):
+                        member.write(chunk)
+                counts[name] = count
 
-            # Add export summary
             summary = {
                 'export_summary': {
                     'user': self.user.username,
-                    'exported_at': self.export_timestamp.isoformat(),
-                    'total_sessions': len(data['session_data']),
-                    'total_activities': len(data['activity_data']),
-                    'data_categories': list(data.keys()),
+                    'exported_at': self.export_timestamp,
+                    'gdpr_article': 'Article 20 - Right to Data Portability',
+                    'data_categories': counts,
+                    'total_records': sum(counts.values()),
                 }
             }
-            zip_file.writestr(
-                'export_summary.json',
-                json.dumps(summary, indent=2, ensure_ascii=False)
-            )
+            archive.writestr('export_summary.json', json.dumps(
+                summary, cls=DjangoJSONEncoder, indent=2, ensure_ascii=False))
+            archive.writestr('PRIVACY_NOTICE.txt', PRIVACY_NOTICE.format(
+                export_time=self.export_timestamp.isoformat()))
 
-            # Add privacy notice
-            privacy_notice = """
-GDPR Data Export - Privacy Notice
+        if progress:
+            progress('', 100)
+        return summary['export_summary']
 
-This export contains all personal data we hold about you in accordance with
-Article 20 of the General Data Protection Regulation (GDPR) - Right to Data Portability.
+    def create_export_file(self, progress: Optional[Callable[[str, int], None]] = None):
+        """
+        Create a ZIP file containing the user's data export.
 
-The data is provided in machine-readable JSON format and includes:
-- Account information and profile data
-- Session history and device information
-- Privacy settings and consent records
-- Activity logs and security information
+        The archive is kept in memory up to EXPORT_SPOOL_SIZE and spills
+        to a temporary file beyond that.
 
-This export was generated on: {export_time}
+        Args:
+            progress: Progress callback, see write_export()
 
-For questions about this export or your privacy rights, please contact our
-Data Protection Officer at: privacy@Vineyard Group Fellowship.app
+        Returns:
+            Tuple of (temporary file positioned at the start, export summary)
+        """
+        export_file = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_SIZE)
+        try:
+            summary = self.write_export(export_file, progress)
+        except Exception:
+            export_file.close()
+            raise
+        export_file.seek(0)
+        return export_file, summary
 
-Your rights under GDPR include:
-- Right of access (Article 15)
-- Right to rectification (Article 16)
-- Right to erasure (Article 17)
-- Right to restrict processing (Article 18)
-- Right to data portability (Article 20)
-- Right to object (Article 21)
-            """.format(export_time=self.export_timestamp.isoformat())
 
-            zip_file.writestr('PRIVACY_NOTICE.txt', privacy_notice)
+def run_data_export_job(job_id) -> Dict[str, Any]:
+    """
+    Generate the export file of a DataExportJob.
 
-        zip_buffer.seek(0)
-        return zip_buffer
+    Writes the archive to a spooled temporary file, saves it to the export
+    storage and records progress on the job after each data category.
 
+    Args:
+        job_id: DataExportJob primary key
 
-class GDPRDataEraser:
+    Returns:
+        Export summary
     """
-    Handles GDPR Article 17 - Right to Erasure (Right to be Forgotten)
+    from privacy.models import DataExportJob
+
+    job = DataExportJob.objects.select_related('user').get(pk=job_id)
+    job.status = DataExportJob.STATUS_RUNNING
+    job.started_at = timezone.now()
+    job.progress = 0
+    job.error = ''
+    job.save(update_fields=['status', 'started_at', 'progress', 'error'])
+
+    def progress(category, percent):
+        job.current_category = category
+        job.progress = percent
+        job.save(update_fields=['current_category', 'progress'])
+
+    exporter = GDPRDataExporter(
+        job.user,
+        include_consent_history=job.options.get('include_consent_history', True),
+        include_processing_records=job.options.get('include_processing_records', True),
+    )
+
+    try:
+        export_file, summary = exporter.create_export_file(progress)
+        with export_file:
+            storage = get_export_storage()
+            file_name = storage.save(f'gdpr_exports/{job.id}.zip', export_file)
+    except Exception as e:
+        job.status = DataExportJob.STATUS_FAILED
+        job.error = str(e)
+        job.save(update_fields=['status', 'error'])
+        raise
+
+    completed_at = timezone.now()
+    job.status = DataExportJob.STATUS_COMPLETED
+    job.file_name = file_name
+    job.file_size = storage.size(file_name)
+    job.row_count = summary['total_records']
+    job.completed_at = completed_at
+    job.expires_at = completed_at + timedelta(
+        hours=getattr(settings, 'GDPR_EXPORT_TTL_HOURS', 72))
+    job.save(update_fields=[
+        'status', 'file_name', 'file_size', 'row_count', 'completed_at',
+        'expires_at'])
+
+    AuditLog.log_event(
+        user=job.user,
+        event_type='gdpr_data_export_completed',
+        metadata={
+            'export_job_id': str(job.id),
+            'file_size': job.file_size,
+            'total_records': job.row_count,
+            **job.options,
+        },
+        risk_level='medium'
+    )
+    return summary
+
+
+_export_pool = None
+
+
+def get_export_pool() -> BackgroundPool:
+    """The process-wide pool that generates exports, configured from settings."""
+    global _export_pool
+    if _export_pool is None:
+        _export_pool = BackgroundPool(
+            'gdpr-export',
+            workers=getattr(settings, 'GDPR_EXPORT_WORKERS', 1),
+            capacity=getattr(settings, 'GDPR_EXPORT_CAPACITY', 20),
+        )
+    return _export_pool
 
-    Provides comprehensive data deletion with:
-    - User data anonymization
-    - Related data cleanup
-    - Audit trail preservation
-    - Cascading deletion handling
+
+def queue_data_export_job(job) -> None:
     """
+    Generate a DataExportJob in the background.
 
-    def __init__(self, user: User):
-        self.user = user
-        self.erasure_timestamp = timezone.now()
-        self.anonymized_id = f"deleted_{self.user.id}_{int(self.erasure_timestamp.timestamp())}"
+    Queued on Celery when GDPR_EXPORT_CELERY is on (only where a worker
+    runs), otherwise on this process's export pool; generated inline if
+    Celery is unavailable or the pool is full.
+    """
+    if getattr(settings, 'GDPR_EXPORT_CELERY', False):
+        try:
+            from privacy.tasks import generate_data_export
+            generate_data_export.delay(str(job.id))
+            return
+        except Exception as e:
+            logger.warning(
+                f"Failed to queue GDPR export {job.id} (Celery unavailable), "
+                f"generating inline: {e}")
+        generate_data_export_job(job.id)
+        return
+
+    get_export_pool().submit(generate_data_export_job, job.id)
+
+
+def generate_data_export_job(job_id) -> None:
+    """Generate a DataExportJob, logging and auditing a failure instead of raising."""
+    from privacy.models import DataExportJob
+
+    try:
+        run_data_export_job(job_id)
+    except Exception as e:
+        job = DataExportJob.objects.select_related('user').get(pk=job_id)
+        logger.error(f"GDPR export failed for user {job.user_id}: {str(e)}")
+
+        AuditLog.log_event(
+            user=job.user,
+            event_type='gdpr_data_export_failed',
+            metadata={'export_job_id': str(job.id), 'error': str(e)},
+            success=False,
+            risk_level='high'
+        )
 
-    def initiate_erasure(self, reason: str = "User request", retain_audit: bool = True) -> Dict[str, Any]:
-        """
-        Initiate comprehensive data erasure process.
 
-        Args:
-            reason: Reason for erasure (for audit purposes)
-            retain_audit: Whether to retain anonymized audit logs
+def process_pending_exports(older_than=timedelta(minutes=5)) -> int:
+    """
+    Generate exports left pending.
 
-        Returns:
-            Dict containing erasure summary
-        """
-        with transaction.atomic():
-            # Create erasure audit log first
-            self._create_erasure_audit(reason)
-
-            # Perform data erasure
-            erasure_summary = {
-                'user_id': str(self.user.id),
-                'username': self.user.username,
-                'erasure_initiated_at': self.erasure_timestamp.isoformat(),
-                'reason': reason,
-                'retain_audit_logs': retain_audit,
-                'anonymized_id': self.anonymized_id,
-                'erased_data': {},
-            }
+    Exports queued in a process that was killed before generating them
+    stay pending; this sweep picks them up.
 
-            # Erase profile data
-            erasure_summary['erased_data']['profile'] = self._erase_profile_data()
+    Args:
+        older_than: Only exports requested at least this long ago
 
-            # Erase session data
-            erasure_summary['erased_data']['sessions'] = self._erase_session_data()
+    Returns:
+        Number of exports generated or failed
+    """
+    from privacy.models import DataExportJob
 
-            # Erase sensitive data
-            erasure_summary['erased_data']['sensitive_data'] = self._erase_sensitive_data(
-            )
+    job_ids = list(DataExportJob.objects.filter(
+        status=DataExportJob.STATUS_PENDING,
+        created_at__lte=timezone.now() - older_than,
+    ).order_by('created_at').values_list('pk', flat=True))
 
-            # Erase security data
-            erasure_summary['erased_data']['security'] = self._erase_security_data()
+    for job_id in job_ids:
+        generate_data_export_job(job_id)
 
-            # Handle audit logs
-            if retain_audit:
-                erasure_summary['erased_data']['audit_logs'] = self._anonymize_audit_logs(
-                )
-            else:
-                erasure_summary['erased_data']['audit_logs'] = self._erase_audit_logs(
-                )
+    if job_ids:
+        logger.info(f"Processed {len(job_ids)} pending GDPR exports")
+    return len(job_ids)
 
-            # Finally, anonymize user account
-            erasure_summary['erased_data']['account'] = self._anonymize_user_account()
 
-            return erasure_summary
+def fail_stale_export_jobs(user=None) -> int:
+    """
+    Mark exports that never finished as failed.
 
-    def _create_erasure_audit(self, reason: str):
-        """Create audit log for erasure initiation."""
-        AuditLog.objects.create(
-            user=self.user,
-            action='gdpr_erasure_initiated',
-            ip_address='127.0.0.1',  # System initiated
-            user_agent='GDPR Compliance System',
-            details={
-                'reason': reason,
-                'erasure_timestamp': self.erasure_timestamp.isoformat(),
-                'anonymized_id': self.anonymized_id,
-                'gdpr_article': 'Article 17 - Right to Erasure',
-            }
-        )
+    A job stays pending when its task is never picked up and running
+    when its worker dies; either way it would be reused for every later
+    request. Jobs pending since, or running since, more than
+    GDPR_EXPORT_STALE_MINUTES ago are failed so a new export is started.
 
-    def _erase_profile_data(self) -> Dict[str, Any]:
-        """Erase user profile data."""
-        try:
-            profile = self.user.basic_profile
+    Args:
+        user: Only this user's jobs (default: all users)
 
-            erased_fields = {
-                'display_name': profile.display_name,
-                'bio': profile.bio,
-            }
+    Returns:
+        Number of jobs marked failed
+    """
+    from django.db.models import Q
+    from privacy.models import DataExportJob
 
-            # Clear profile data
-            profile.display_name = ""
-            profile.bio = ""
-            profile.profile_visibility = 'private'
-            profile.save()
+    stale_minutes = getattr(settings, 'GDPR_EXPORT_STALE_MINUTES', 30)
+    cutoff = timezone.now() - timedelta(minutes=stale_minutes)
+    stale = DataExportJob.objects.filter(
+        Q(status=DataExportJob.STATUS_PENDING, created_at__lte=cutoff) |
+        Q(status=DataExportJob.STATUS_RUNNING, started_at__lte=cutoff)
+    )
+    if user is not None:
+        stale = stale.filter(user=user)
 
-            return {'status': 'erased', 'fields_cleared': list(erased_fields.keys())}
-        except UserProfileBasic.DoesNotExist:
-            return {'status': 'no_profile_found'}
+    return stale.update(
+        status=DataExportJob.STATUS_FAILED,
+        error=f'Export did not finish within {stale_minutes} minutes',
+    )
 
-    def _erase_session_data(self) -> Dict[str, Any]:
-        """Erase user session data."""
-        sessions = UserSession.objects.filter(user=self.user)
-        session_count = sessions.count()
 
-        # Delete all sessions
-        sessions.delete()
+def cleanup_expired_exports() -> int:
+    """
+    Delete export files past their expiry and mark their jobs expired.
 
-        return {'status': 'erased', 'sessions_deleted': session_count}
+    Returns:
+        Number of export files deleted
+    """
+    from privacy.models import DataExportJob
 
-    def _erase_sensitive_data(self) -> Dict[str, Any]:
-        """Erase sensitive user data."""
-        try:
-            privacy_profile = PrivacyProfile.objects.get(user=self.user)
-            privacy_profile.delete()
-            return {'status': 'erased'}
-        except PrivacyProfile.DoesNotExist:
-            return {'status': 'no_sensitive_data_found'}
+    storage = get_export_storage()
+    expired = DataExportJob.objects.filter(
+        status=DataExportJob.STATUS_COMPLETED,
+        expires_at__lte=timezone.now(),
+    )
 
-    def _erase_security_data(self) -> Dict[str, Any]:
-        """Erase security-related data."""
-        password_history = PasswordHistory.objects.filter(user=self.user)
-        history_count = password_history.count()
+    deleted = 0
+    for job in expired.only('id', 'file_name').iterator():
+        if job.file_name and storage.exists(job.file_name):
+            storage.delete(job.file_name)
+            deleted += 1
+        DataExportJob.objects.filter(pk=job.pk).update(
+            status=DataExportJob.STATUS_EXPIRED, file_name='')
 
-        # Delete password history
-        password_history.delete()
+    return deleted
 
-        return {'status': 'erased', 'password_history_deleted': history_count}
 
-    def _anonymize_audit_logs(self) -> Dict[str, Any]:
-        """Anonymize audit logs while retaining for compliance."""
-        logs = AuditLog.objects.filter(user=self.user)
-        log_count = logs.count()
+class GDPRDataEraser:
+    """
+    Handles GDPR Article 17 - Right to Erasure (Right to be Forgotten)
 
-        # Update logs to remove user reference but keep anonymized record
-        logs.update(
-            user=None,
-            details=f"[ANONYMIZED] Original user: {self.anonymized_id}"
-        )
+    Provides comprehensive data deletion with:
+    - User data anonymization
+    - Messaging content, memberships and notification cleanup
+    - Audit trail preservation
+    - Batched, resumable deletes (see GDPRErasureEngine)
+    """
 
-        return {'status': 'anonymized', 'logs_anonymized': log_count}
+    def __init__(self, user: User):
+        self.user = user
 
-    def _erase_audit_logs(self) -> Dict[str, Any]:
-        """Completely erase audit logs."""
-        logs = AuditLog.objects.filter(user=self.user)
-        log_count = logs.count()
+    def initiate_erasure(self, reason: str = "User request", retain_audit: bool = True) -> Dict[str, Any]:
+        """
+        Erase the user's data now.
 
-        logs.delete()
+        Runs every erasure step in small batches, each in its own
+        transaction. If the run is interrupted, the erasure request stays
+        open and the next erase_pending_users sweep resumes it.
 
-        return {'status': 'erased', 'logs_deleted': log_count}
+        Args:
+            reason: Reason for erasure (for audit purposes)
+            retain_audit: Whether to retain anonymized audit logs
 
-    def _anonymize_user_account(self) -> Dict[str, Any]:
-        """Anonymize the user account itself."""
-        original_data = {
-            'username': self.user.username,
-            'email': self.user.email,
-            'first_name': self.user.first_name,
-            'last_name': self.user.last_name,
-        }
+        Returns:
+            Dict containing erasure summary
+        """
+        from .erasure import GDPRErasureEngine
 
-        # Anonymize account data
-        self.user.username = self.anonymized_id
-        self.user.email = f"{self.anonymized_id}@deleted.local"
-        self.user.first_name = ""
-        self.user.last_name = ""
-        self.user.is_active = False
-        self.user.save()
+        username = self.user.username
+        engine = GDPRErasureEngine()
+        request = engine.schedule(self.user, reason, retain_audit_logs=retain_audit)
+        request.user = self.user
+        engine.run(request)
 
-        return {'status': 'anonymized', 'original_username': original_data['username']}
+        return {
+            'user_id': str(self.user.id),
+            'username': username,
+            'erasure_initiated_at': request.started_at.isoformat(),
+            'reason': reason,
+            'retain_audit_logs': request.retain_audit_logs,
+            'anonymized_id': request.anonymized_id,
+            'erased_data': request.counts,
+        }
 
 
 class GDPRConsentManager:
@@ -488,10 +678,10 @@ class GDPRConsentManager:
         privacy_profile.save()
 
         # Create audit log
-        AuditLog.objects.create(
+        AuditLog.log_event(
             user=self.user,
-            action=f'consent_{consent_type}_{"granted" if granted else "withdrawn"}',
-            details=consent_record
+            event_type=f'consent_{consent_type}_{"granted" if granted else "withdrawn"}',
+            metadata=consent_record
         )
 
         return consent_record
@@ -525,10 +715,10 @@ class GDPRConsentManager:
                 )
 
             # Create audit log
-            AuditLog.objects.create(
+            AuditLog.log_event(
                 user=self.user,
-                action='consent_all_withdrawn',
-                details={
+                event_type='consent_all_withdrawn',
+                metadata={
                     'withdrawn_consents': withdrawn_consents,
                     'withdrawal_timestamp': timezone.now().isoformat(),
                 }
@@ -622,16 +812,13 @@ class GDPRDataRetentionManager:
         cutoff_date = timezone.now() - \
             timedelta(days=self.retention_periods['user_sessions'])
 
-        old_sessions = UserSession.objects.filter(
+        deleted_count, _ = run_in_batches(UserSession.objects.filter(
             last_activity_at__lt=cutoff_date,
             is_active=False
-        )
-
-        session_count = old_sessions.count()
-        old_sessions.delete()
+        ))
 
         return {
-            'deleted_count': session_count,
+            'deleted_count': deleted_count,
             'cutoff_date': cutoff_date.isoformat(),
         }
 
@@ -640,13 +827,11 @@ class GDPRDataRetentionManager:
         cutoff_date = timezone.now() - \
             timedelta(days=self.retention_periods['audit_logs'])
 
-        old_logs = AuditLog.objects.filter(created_at__lt=cutoff_date)
-
-        log_count = old_logs.count()
-        old_logs.delete()
+        deleted_count, _ = run_in_batches(
+            AuditLog.objects.filter(timestamp__lt=cutoff_date))
 
         return {
-            'deleted_count': log_count,
+            'deleted_count': deleted_count,
             'cutoff_date': cutoff_date.isoformat(),
         }
 
@@ -655,38 +840,35 @@ class GDPRDataRetentionManager:
         cutoff_date = timezone.now() - \
             timedelta(days=self.retention_periods['password_history'])
 
-        old_passwords = PasswordHistory.objects.filter(
-            created_at__lt=cutoff_date)
-
-        password_count = old_passwords.count()
-        old_passwords.delete()
+        deleted_count, _ = run_in_batches(
+            PasswordHistory.objects.filter(created_at__lt=cutoff_date))
 
         return {
-            'deleted_count': password_count,
+            'deleted_count': deleted_count,
             'cutoff_date': cutoff_date.isoformat(),
         }
 
     def _cleanup_inactive_accounts(self) -> Dict[str, Any]:
-        """Clean up inactive user accounts."""
+        """
+        Schedule erasure of inactive user accounts.
+
+        Accounts are anonymized rather than deleted, by the
+        erase_pending_users sweep.
+        """
+        from .erasure import GDPRErasureEngine
+
         cutoff_date = timezone.now() - \
             timedelta(days=self.retention_periods['inactive_accounts'])
 
-        inactive_users = User.objects.filter(
-            last_login__lt=cutoff_date,
-            is_active=False
+        scheduled_count = GDPRErasureEngine.schedule_users(
+            User.objects.filter(
+                last_login__lt=cutoff_date,
+                is_active=False
+            ).values('pk'),
+            "Automatic cleanup - inactive account"
         )
 
-        user_count = inactive_users.count()
-
-        # For inactive accounts, we anonymize rather than delete
-        anonymized_count = 0
-        for user in inactive_users:
-            eraser = GDPRDataEraser(user)
-            eraser.initiate_erasure(
-                reason="Automatic cleanup - inactive account")
-            anonymized_count += 1
-
         return {
-            'anonymized_count': anonymized_count,
+            'scheduled_count': scheduled_count,
             'cutoff_date': cutoff_date.isoformat(),
         }
@@ -0,0 +1,421 @@
+"""
+Profile completeness engine.
+
+Each section score of ProfileCompletenessTracker is declared once, in
+SECTIONS, as the model it is computed from and the rules that award its
+points. Every rule condition can be evaluated two ways:
+- in Python against a model instance, used when a single user's profile,
+  photo or account is saved
+- as a SQL expression, used to score every user in one query
+
+Incremental updates: when a UserProfileBasic, ProfilePhoto or User is
+saved (see profiles.signals), only the sections computed from that model
+are rescored, from the instance being saved, and only if one of the
+fields they read is among update_fields (when given). The other section
+scores are taken from the tracker, so a save costs one SELECT of the
+tracker and, if anything changed, one UPDATE. Only existing trackers are
+updated; a tracker is created, fully calculated, on first use.
+
+Bulk mode: refresh_all() scores users in keyset batches with one
+annotated query per batch and writes back only the trackers that
+changed, with bulk_update.
+"""
+
+from functools import reduce
+from operator import and_
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from django.contrib.auth import get_user_model
+from django.db.models import Case, F, Func, IntegerField, Q, Value, When
+from django.db.models.functions import Least, Length
+from django.db.models.lookups import GreaterThanOrEqual
+
+from .models import ProfileCompletenessTracker, ProfilePhoto, UserProfileBasic
+
+User = get_user_model()
+
+# Characters str.strip() removes that matter in practice
+WHITESPACE = ' \t\n\r\x0b\x0c'
+
+
+class StripChars(Func):
+    """Strip a set of characters from both ends of a string (BTRIM)."""
+
+    function = 'BTRIM'
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(compiler, connection, function='TRIM', **extra_context)
+
+
+class Filled:
+    """A text field that is set and not empty."""
+
+    def __init__(self, field):
+        self.field = field
+        self.fields = {field}
+
+    def test(self, obj):
+        return bool(getattr(obj, self.field))
+
+    def expression(self, prefix):
+        path = prefix + self.field
+        return Q(**{f'{path}__isnull': False}) & ~Q(**{path: ''})
+
+
+class NotBlank:
+    """A text field with at least min_length characters besides surrounding whitespace."""
+
+    def __init__(self, field, min_length=1):
+        self.field = field
+        self.min_length = min_length
+        self.fields = {field}
+
+    def test(self, obj):
+        return len((getattr(obj, self.field) or '').strip(WHITESPACE)) >= self.min_length
+
+    def expression(self, prefix):
+        stripped = StripChars(F(prefix + self.field), Value(WHITESPACE))
+        return Q(GreaterThanOrEqual(Length(stripped), self.min_length))
+
+
+class IsTrue:
+    """A boolean field that is true."""
+
+    def __init__(self, field):
+        self.field = field
+        self.fields = {field}
+
+    def test(self, obj):
+        return bool(getattr(obj, self.field))
+
+    def expression(self, prefix):
+        return Q(**{prefix + self.field: True})
+
+
+class IsSet:
+    """A field that is not null."""
+
+    def __init__(self, field):
+        self.field = field
+        self.fields = {field}
+
+    def test(self, obj):
+        return getattr(obj, self.field) is not None
+
+    def expression(self, prefix):
+        return Q(**{f'{prefix}{self.field}__isnull': False})
+
+
+class Equals:
+    """A field equal to a value (or, negated, different from it)."""
+
+    def __init__(self, field, value, negate=False):
+        self.field = field
+        self.value = value
+        self.negate = negate
+        self.fields = {field}
+
+    def test(self, obj):
+        return (getattr(obj, self.field) == self.value) != self.negate
+
+    def expression(self, prefix):
+        condition = Q(**{prefix + self.field: self.value})
+        return ~condition if self.negate else condition
+
+
+class All:
+    """Every condition holds."""
+
+    def __init__(self, *conditions):
+        self.conditions = conditions
+        self.fields = set().union(*(condition.fields for condition in conditions))
+
+    def test(self, obj):
+        return all(condition.test(obj) for condition in self.conditions)
+
+    def expression(self, prefix):
+        return reduce(and_, (condition.expression(prefix) for condition in self.conditions))
+
+
+class HasRecord:
+    """The source record exists (always true for an instance being scored)."""
+
+    fields = set()
+
+    def test(self, obj):
+        return True
+
+    def expression(self, prefix):
+        return Q(pk__isnull=False)
+
+
+class Section(NamedTuple):
+    """
+    A tracker section score.
+
+    rules: Each rule is a tuple of (points, condition) tiers; a rule awards
+    the points of its first tier whose condition holds.
+    """
+    name: str
+    weight: float
+    source: type
+    rules: Tuple[Tuple[Tuple[int, object], ...], ...]
+
+    @property
+    def field(self) -> str:
+        """Tracker field holding the score."""
+        return f'{self.name}_score'
+
+    @property
+    def fields(self) -> set:
+        """Source model fields the score depends on."""
+        return set().union(*(
+            condition.fields for rule in self.rules for _, condition in rule))
+
+
+SECTIONS = (
+    Section('basic_info', 0.3, UserProfileBasic, (
+        ((30, NotBlank('display_name')),),
+        ((40, NotBlank('bio', 50)), (20, NotBlank('bio'))),
+        ((15, All(Filled('timezone'), Equals('timezone', 'UTC', negate=True))),),
+        ((15, Equals('profile_visibility', 'private', negate=True)),),
+    )),
+    Section('contact_info', 0.2, User, (
+        ((70, IsTrue('email_verified')),),
+        ((30, Filled('email')),),
+    )),
+    Section('recovery_info', 0.2, UserProfileBasic, (
+        ((25, HasRecord()),),
+        ((25, NotBlank('bio', 100)),),
+    )),
+    Section('preferences', 0.15, UserProfileBasic, (
+        ((40, Filled('profile_visibility')),),
+        ((30, All(Filled('timezone'), Equals('timezone', 'UTC', negate=True))),),
+        ((30, IsSet('created_at')),),
+    )),
+    Section('profile_media', 0.15, ProfilePhoto, (
+        ((60, Filled('photo')),),
+        ((40, All(Filled('photo'), Equals('photo_moderation_status', 'approved'))),),
+    )),
+)
+
+SOURCES = (User, UserProfileBasic, ProfilePhoto)
+
+# Lookup path from User to each source model
+SOURCE_PREFIXES = {
+    User: '',
+    UserProfileBasic: 'basic_profile__',
+    ProfilePhoto: 'profile_photo__',
+}
+
+COMPLETION_LEVELS = (
+    (90, 'complete'),
+    (70, 'comprehensive'),
+    (50, 'standard'),
+    (25, 'basic'),
+)
+
+# Tracker fields written by apply_scores()
+DERIVED_FIELDS = (
+    'overall_completion_percentage', 'completion_level',
+    'has_basic_profile_badge', 'has_verified_email_badge',
+    'has_recovery_goals_badge', 'has_comprehensive_profile_badge',
+)
+TRACKER_FIELDS = tuple(section.field for section in SECTIONS) + DERIVED_FIELDS
+
+
+def score_section(section: Section, instance) -> int:
+    """Score one section from its source instance (None if it does not exist)."""
+    if instance is None:
+        return 0
+    score = 0
+    for rule in section.rules:
+        for points, condition in rule:
+            if condition.test(instance):
+                score += points
+                break
+    return min(score, 100)
+
+
+def section_expression(section: Section):
+    """SQL expression for a section score, evaluated on a User queryset."""
+    prefix = SOURCE_PREFIXES[section.source]
+    exists = Q() if section.source is User else Q(**{f'{prefix}pk__isnull': False})
+    score = sum(
+        Case(
+            *(When(exists & condition.expression(prefix), then=Value(points))
+              for points, condition in rule),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        for rule in section.rules
+    )
+    return Least(score, Value(100), output_field=IntegerField())
+
+
+def affected_sections(source: type, update_fields: Optional[Iterable[str]] = None) -> List[Section]:
+    """Sections computed from a model, limited to those reading update_fields."""
+    sections = [section for section in SECTIONS if section.source is source]
+    if update_fields is not None:
+        update_fields = set(update_fields)
+        sections = [
+            section for section in sections
+            if not section.fields or section.fields & update_fields
+        ]
+    return sections
+
+
+def apply_scores(tracker, scores: Dict[str, int], email_verified: Optional[bool] = None) -> List[str]:
+    """
+    Set section scores on a tracker and recompute the overall score,
+    level and badges.
+
+    Args:
+        tracker: ProfileCompletenessTracker
+        scores: Section name to score, for the sections to change
+        email_verified: The user's email_verified, if known
+
+    Returns:
+        Names of the tracker fields that changed
+    """
+    before = {field: getattr(tracker, field) for field in TRACKER_FIELDS}
+
+    for section in SECTIONS:
+        if section.name in scores:
+            setattr(tracker, section.field, scores[section.name])
+
+    overall = sum(getattr(tracker, section.field) * section.weight for section in SECTIONS)
+    tracker.overall_completion_percentage = int(overall)
+    tracker.completion_level = next(
+        (level for threshold, level in COMPLETION_LEVELS if overall >= threshold), 'minimal')
+    tracker.has_basic_profile_badge = tracker.basic_info_score >= 75
+    tracker.has_recovery_goals_badge = tracker.recovery_info_score >= 50
+    tracker.has_comprehensive_profile_badge = overall >= 80
+    if email_verified is not None:
+        tracker.has_verified_email_badge = email_verified
+
+    return [field for field in TRACKER_FIELDS if getattr(tracker, field) != before[field]]
+
+
+def calculate(user, tracker=None):
+    """
+    Score every section of a user and save the tracker.
+
+    Returns:
+        The saved ProfileCompletenessTracker
+    """
+    instances = {
+        User: user,
+        UserProfileBasic: UserProfileBasic.objects.filter(user=user).first(),
+        ProfilePhoto: ProfilePhoto.objects.filter(user=user).only(
+            'pk', 'user_id', 'photo', 'photo_moderation_status').first(),
+    }
+    if tracker is None:
+        tracker, _ = ProfileCompletenessTracker.objects.get_or_create(user=user)
+
+    apply_scores(tracker, {
+        section.name: score_section(section, instances[section.source])
+        for section in SECTIONS
+    }, email_verified=user.email_verified)
+    tracker.save()
+    return tracker
+
+
+def update_for_instance(instance, update_fields=None, deleted=False) -> bool:
+    """
+    Rescore the sections computed from a saved or deleted source instance.
+
+    Args:
+        instance: User, UserProfileBasic or ProfilePhoto
+        update_fields: The save's update_fields, if any
+        deleted: Whether the instance was deleted
+
+    Returns:
+        Whether the user's tracker changed
+    """
+    source = type(instance)
+    sections = affected_sections(source, update_fields)
+    touches_badge = source is User and (
+        update_fields is None or 'email_verified' in update_fields)
+    if not sections and not touches_badge:
+        return False
+
+    user_id = instance.pk if source is User else instance.user_id
+    tracker = ProfileCompletenessTracker.objects.filter(user_id=user_id).first()
+    if tracker is None:
+        return False
+
+    scores = {
+        section.name: score_section(section, None if deleted else instance)
+        for section in sections
+    }
+    email_verified = instance.email_verified if touches_badge and not deleted else None
+    changed = apply_scores(tracker, scores, email_verified=email_verified)
+    if changed:
+        tracker.save(update_fields=changed + ['last_calculated_at'])
+    return bool(changed)
+
+
+def refresh_all(users=None, batch_size: int = 5000) -> Tuple[int, int]:
+    """
+    Recalculate completeness for many users with set-based queries.
+
+    Scores each batch of users in one annotated query, bulk-creates
+    missing trackers and bulk-updates the trackers whose values changed.
+
+    Args:
+        users: User queryset (default: all users)
+        batch_size: Users per query
+
+    Returns:
+        Tuple of (users processed, trackers created or updated)
+    """
+    from django.utils import timezone
+
+    if users is None:
+        users = User.objects.all()
+    users = users.order_by('pk')
+    annotations = {f'_{section.name}': section_expression(section) for section in SECTIONS}
+
+    processed = updated = 0
+    last_pk = None
+    while True:
+        page = users if last_pk is None else users.filter(pk__gt=last_pk)
+        rows = list(page.annotate(**annotations).values_list(
+            'pk', 'email_verified', *annotations)[:batch_size])
+        if not rows:
+            break
+        last_pk = rows[-1][0]
+
+        trackers = {
+            tracker.user_id: tracker
+            for tracker in ProfileCompletenessTracker.objects.filter(
+                user_id__in=[row[0] for row in rows])
+        }
+
+        now = timezone.now()
+        created = []
+        changed = []
+        for user_id, email_verified, *section_scores in rows:
+            scores = {section.name: score for section, score in zip(SECTIONS, section_scores)}
+            tracker = trackers.get(user_id)
+            if tracker is None:
+                # Missing trackers are inserted already scored
+                tracker = ProfileCompletenessTracker(user_id=user_id)
+                apply_scores(tracker, scores, email_verified=email_verified)
+                created.append(tracker)
+            elif apply_scores(tracker, scores, email_verified=email_verified):
+                tracker.last_calculated_at = now
+                changed.append(tracker)
+
+        ProfileCompletenessTracker.objects.bulk_create(
+            created, batch_size=1000, ignore_conflicts=True)
+        ProfileCompletenessTracker.objects.bulk_update(
+            changed, TRACKER_FIELDS + ('last_calculated_at',), batch_size=500)
+        processed += len(rows)
+        updated += len(created) + len(changed)
+
+        if len(rows) < batch_size:
+            break
+
+    return processed, updated
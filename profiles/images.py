@@ -0,0 +1,101 @@
+"""
+Profile photo renditions.
+
+Uploads are stored as-is and the renditions clients display are built
+afterwards by a Celery worker (profiles.tasks.process_profile_photo),
+so an upload request never decodes or resizes the image.
+
+Renditions are square center crops stored as Base64 data URLs, like the
+original photo. They are built from one decode of the original:
+- JPEG sources are decoded with Image.draft(), which lets libjpeg scale
+  the image down by 1/2, 1/4 or 1/8 while decoding, to the smallest
+  size that still covers the largest rendition. A 12 MP phone photo is
+  decoded at about 1000 px instead of 4000 px.
+- ImageOps.exif_transpose() applies the EXIF orientation, so portrait
+  phone photos are not rendered sideways.
+- Each size is resized from the next larger one, largest first.
+"""
+
+import base64
+from io import BytesIO
+from typing import Dict, Tuple
+
+from PIL import Image, ImageOps
+
+# (ProfilePhoto field, square size in px, format, quality)
+RENDITIONS = (
+    ('medium', 400, 'JPEG', 85),
+    ('medium_webp', 400, 'WEBP', 80),
+    ('thumbnail', 150, 'JPEG', 85),
+    ('thumbnail_webp', 150, 'WEBP', 80),
+)
+
+RENDITION_FIELDS = tuple(field for field, _, _, _ in RENDITIONS)
+
+CONTENT_TYPES = {
+    'JPEG': 'image/jpeg',
+    'WEBP': 'image/webp',
+}
+
+
+def to_data_url(data: bytes, content_type: str) -> str:
+    """Encode image bytes as a Base64 data URL."""
+    return f"data:{content_type};base64,{base64.b64encode(data).decode('ascii')}"
+
+
+def from_data_url(data_url: str) -> Tuple[str, bytes]:
+    """
+    Decode a Base64 data URL.
+
+    Returns:
+        Tuple of (content type, image bytes)
+    """
+    header, _, encoded = data_url.partition(',')
+    content_type = header[len('data:'):].split(';')[0]
+    return content_type, base64.b64decode(encoded)
+
+
+def open_for_size(data: bytes, size: int) -> Image.Image:
+    """
+    Decode an image at the smallest scale covering a size x size square.
+
+    Args:
+        data: Encoded image
+        size: Largest square edge that will be rendered from the image
+
+    Returns:
+        The upright RGB image
+    """
+    image = Image.open(BytesIO(data))
+    # Only JPEG supports draft mode; for other formats this is a no-op
+    image.draft('RGB', (size, size))
+    image = ImageOps.exif_transpose(image)
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    return image
+
+
+def render_renditions(data: bytes) -> Dict[str, str]:
+    """
+    Build every rendition of a photo.
+
+    Args:
+        data: Encoded original image
+
+    Returns:
+        Dict of ProfilePhoto field name to data URL
+    """
+    sizes = sorted({size for _, size, _, _ in RENDITIONS}, reverse=True)
+    image = open_for_size(data, sizes[0])
+
+    squares = {}
+    for size in sizes:
+        image = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        squares[size] = image
+
+    renditions = {}
+    for field, size, image_format, quality in RENDITIONS:
+        buffer = BytesIO()
+        squares[size].save(buffer, format=image_format, quality=quality)
+        renditions[field] = to_data_url(buffer.getvalue(), CONTENT_TYPES[image_format])
+    return renditions
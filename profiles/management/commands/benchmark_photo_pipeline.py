@@ -0,0 +1,118 @@
+"""
+Management command to benchmark profile photo processing.
+
+Generates a corpus of large phone-style JPEGs (12 MP by default, with
+noise so they compress like camera output, and EXIF orientation 6 like
+a portrait shot) and times per photo:
+- legacy request: what PhotoService.upload_photo used to do inside the
+  request (Base64 encode, full decode, LANCZOS thumbnail, JPEG encode)
+- legacy optimized sizes: ProfilePhoto.generate_optimized_sizes (full
+  decode, crop, LANCZOS resize to 400px), whose result was discarded
+- request: what the upload request does now (Base64 encode only)
+- renditions: the Celery task's work (drafted decode, exif_transpose,
+  thumbnail and medium sizes as JPEG and WebP)
+
+No database access is involved.
+
+Usage:
+    python manage.py benchmark_photo_pipeline
+    python manage.py benchmark_photo_pipeline --photos 50 --width 3000 --height 4000
+"""
+import base64
+import time
+from io import BytesIO
+
+from django.core.management.base import BaseCommand
+from PIL import Image, ImageOps
+
+from profiles.images import render_renditions, to_data_url
+
+
+class Command(BaseCommand):
+    help = 'Benchmark in-request vs background profile photo processing'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--photos',
+            type=int,
+            default=20,
+            help='Photos in the corpus'
+        )
+        parser.add_argument(
+            '--width',
+            type=int,
+            default=4032,
+            help='Photo width in pixels'
+        )
+        parser.add_argument(
+            '--height',
+            type=int,
+            default=3024,
+            help='Photo height in pixels'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        corpus = [
+            self.make_photo(options['width'], options['height'], seed)
+            for seed in range(options['photos'])
+        ]
+        average_mb = sum(len(photo) for photo in corpus) / len(corpus) / (1024 * 1024)
+        self.stdout.write(self.style.SUCCESS(
+            f'🚀 Generated {len(corpus)} photos of {options["width"]}x{options["height"]} '
+            f'(avg {average_mb:.1f} MB, {time.perf_counter() - started:.1f}s)'))
+
+        self.stdout.write(
+            f"\n{'Step':<28} {'ms/photo':>10} {'photos/s':>10}")
+        self.stdout.write('-' * 50)
+
+        self.measure('legacy request', corpus, self.legacy_request)
+        self.measure('legacy optimized sizes', corpus, self.legacy_optimized_sizes)
+        self.measure('request (store original)', corpus,
+                     lambda data: to_data_url(data, 'image/jpeg'))
+        self.measure('renditions (task)', corpus, render_renditions)
+
+    def measure(self, label, corpus, func):
+        """Run func over the corpus, printing time per photo and throughput."""
+        start = time.perf_counter()
+        for data in corpus:
+            func(data)
+        elapsed = time.perf_counter() - start
+        per_photo = elapsed * 1000 / len(corpus)
+        self.stdout.write(
+            f"{label:<28} {per_photo:>10.1f} {len(corpus) / elapsed:>10.1f}")
+
+    @staticmethod
+    def make_photo(width, height, seed):
+        """A noisy gradient JPEG with a portrait EXIF orientation."""
+        noise = Image.effect_noise((width // 4, height // 4), 40 + seed)
+        image = Image.merge('RGB', (
+            noise,
+            Image.linear_gradient('L').resize(noise.size),
+            noise.transpose(Image.Transpose.FLIP_LEFT_RIGHT),
+        )).resize((width, height), Image.Resampling.BILINEAR)
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        buffer = BytesIO()
+        image.save(buffer, format='JPEG', quality=90, exif=exif)
+        return buffer.getvalue()
+
+    @staticmethod
+    def legacy_request(data):
+        """The thumbnail the upload request used to build."""
+        base64.b64encode(data).decode('utf-8')
+        image = Image.open(BytesIO(data))
+        image.thumbnail((150, 150), Image.Resampling.LANCZOS)
+        if image.mode in ('RGBA', 'P'):
+            image = image.convert('RGB')
+        thumbnail_io = BytesIO()
+        image.save(thumbnail_io, format='JPEG', quality=85)
+        base64.b64encode(thumbnail_io.getvalue()).decode('utf-8')
+
+    @staticmethod
+    def legacy_optimized_sizes(data):
+        """The discarded 400px variant from generate_optimized_sizes."""
+        image = Image.open(BytesIO(data))
+        image.load()
+        medium = ImageOps.fit(image, (400, 400), Image.Resampling.LANCZOS)
+        medium.save(BytesIO(), format='JPEG', quality=85, optimize=True)
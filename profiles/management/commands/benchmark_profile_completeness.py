@@ -0,0 +1,167 @@
+"""
+Management command to benchmark profile completeness calculation.
+
+Seeds synthetic users (100k by default) with profiles of varying
+completeness, a photo for half of them and no trackers, then times:
+- per-user: completeness.calculate() for a sample of users, one user at
+  a time (the shape of the old refresh command), extrapolated to all
+- bulk: refresh_all() creating and scoring every tracker
+- bulk again: refresh_all() when nothing changed (read only)
+- save (full): a profile save followed by a full recalculation, as
+  ProfileService.update_profile used to do
+- save (incremental): a profile save rescoring only its own sections
+
+Everything runs in a transaction that is rolled back at the end unless
+--keep is given.
+
+Usage:
+    python manage.py benchmark_profile_completeness
+    python manage.py benchmark_profile_completeness --users 20000 --sample 200
+"""
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from profiles import completeness
+from profiles.models import ProfilePhoto, UserProfileBasic
+
+User = get_user_model()
+
+
+class Rollback(Exception):
+    """Raised to discard the seeded data."""
+
+
+class Command(BaseCommand):
+    help = 'Benchmark per-user vs bulk and incremental profile completeness'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=100_000,
+            help='Users to seed'
+        )
+        parser.add_argument(
+            '--sample',
+            type=int,
+            default=500,
+            help='Users to time the per-user and save paths on'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Users per refresh_all query and rows per INSERT while seeding'
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the seeded data and trackers'
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        try:
+            with transaction.atomic():
+                users = self.seed()
+                self.run(users)
+                if not options['keep']:
+                    raise Rollback()
+        except Rollback:
+            self.stdout.write('\nSeeded data rolled back')
+
+    def seed(self):
+        """Create users with profiles and photos, and return them as a queryset."""
+        options = self.options
+        batch_size = options['batch_size']
+        started = time.perf_counter()
+        tag = f"bench{int(time.time())}"
+
+        User.objects.bulk_create([
+            User(username=f'{tag}-{i}', email=f'{tag}-{i}@example.com', password='!',
+                 email_verified=i % 3 != 0)
+            for i in range(options['users'])
+        ], batch_size=batch_size)
+        users = User.objects.filter(username__startswith=f'{tag}-')
+        user_ids = list(users.values_list('id', flat=True))
+
+        UserProfileBasic.objects.bulk_create([
+            UserProfileBasic(
+                user_id=user_id,
+                display_name=random.choice(['', '  ', 'Member']),
+                bio='b' * random.choice([0, 20, 60, 150]),
+                timezone=random.choice(['UTC', 'Europe/Amsterdam']),
+                profile_visibility=random.choice(['private', 'community', 'public']),
+            )
+            for user_id in user_ids
+        ], batch_size=batch_size)
+
+        ProfilePhoto.objects.bulk_create([
+            ProfilePhoto(
+                user_id=user_id,
+                photo='data:image/jpeg;base64,AA==',
+                photo_moderation_status=random.choice(['pending', 'approved']),
+            )
+            for user_id in user_ids[::2]
+        ], batch_size=batch_size)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'🚀 Seeded {len(user_ids)} users with profiles '
+            f'({time.perf_counter() - started:.1f}s)'))
+        return users
+
+    def run(self, users):
+        """Time the per-user, bulk and save paths."""
+        sample = list(users.order_by('?')[:self.options['sample']])
+        total = users.count()
+
+        self.stdout.write(
+            f"\n{'Step':<34} {'Queries':>8} {'Time (ms)':>11} {'ms/user':>9}")
+        self.stdout.write('-' * 65)
+
+        elapsed = self.measure(
+            'per-user (sample)', len(sample),
+            lambda: [completeness.calculate(user) for user in sample])
+        self.stdout.write(
+            f"{'per-user (all, extrapolated)':<34} {'':>8} "
+            f"{elapsed / len(sample) * total:>11.1f}")
+
+        batch_size = self.options['batch_size']
+        self.measure('bulk', total, lambda: completeness.refresh_all(users, batch_size))
+        self.measure('bulk again (no changes)', total,
+                     lambda: completeness.refresh_all(users, batch_size))
+        self.stdout.write('')
+
+        profiles = list(UserProfileBasic.objects.filter(
+            user__in=[user.pk for user in sample]).select_related('user'))
+        for profile in profiles:
+            profile.bio = 'b' * 120
+
+        self.measure('save (full)', len(profiles), lambda: [
+            self.save_full(profile) for profile in profiles])
+        for profile in profiles:
+            profile.display_name = 'Updated'
+        self.measure('save (incremental)', len(profiles), lambda: [
+            profile.save() for profile in profiles])
+
+    @staticmethod
+    def save_full(profile):
+        """Save and recalculate everything, as the service used to."""
+        profile.save()
+        completeness.calculate(profile.user)
+
+    def measure(self, label, count, func):
+        """Run one step, printing its query count and duration."""
+        connection.queries_log.clear()
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            func()
+            elapsed = (time.perf_counter() - start) * 1000
+        self.stdout.write(
+            f"{label:<34} {len(queries):>8} {elapsed:>11.1f} {elapsed / max(count, 1):>9.3f}")
+        return elapsed
@@ -0,0 +1,35 @@
+"""
+Django management command to build renditions of photos left pending.
+
+Photo processing is queued in the web process after upload; photos whose
+process was killed before processing them stay pending until this runs.
+start.sh runs it at boot.
+
+Usage:
+    python manage.py process_pending_photos
+    python manage.py process_pending_photos --older-than-minutes 0
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from profiles.services import PhotoService
+
+
+class Command(BaseCommand):
+    help = 'Build renditions of profile photos still pending processing'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-minutes',
+            type=int,
+            default=5,
+            dest='older_than_minutes',
+            help='Only process photos uploaded at least this many minutes ago (default: 5)',
+        )
+
+    def handle(self, *args, **options):
+        count = PhotoService.process_pending(
+            older_than=timedelta(minutes=options['older_than_minutes']))
+        self.stdout.write(self.style.SUCCESS(f"Processed {count} pending photos"))
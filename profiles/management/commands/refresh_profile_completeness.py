@@ -4,34 +4,39 @@ Django management command to refresh profile completeness calculations.
 Recalculates profile completeness for all users or specific users.
 Useful for updating completeness after changing completion criteria.
 
+Users are scored in batches with one set-based query each; missing
+trackers are bulk-created and only changed trackers are written.
+
 Usage:
     python manage.py refresh_profile_completeness
-    python manage.py refresh_profile_completeness --user-id 123
+    python manage.py refresh_profile_completeness --user-id <uuid>
     python manage.py refresh_profile_completeness --incomplete-only
     python manage.py refresh_profile_completeness --reset-all
 """
 
+import time
+
 from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth import get_user_model
 from django.db import transaction
-from django.utils import timezone
 
-from profiles.models import (
-    UserProfileBasic,
-    ProfileCompletenessTracker
-)
+from profiles.models import ProfileCompletenessTracker
 from profiles.services import ProfileCompletenessService
 
 User = get_user_model()
 
 
+class DryRun(Exception):
+    """Raised to roll back a dry run."""
+
+
 class Command(BaseCommand):
     help = 'Refresh profile completeness calculations for users'
 
     def add_arguments(self, parser):
         parser.add_argument(
             '--user-id',
-            type=int,
+            type=str,
             dest='user_id',
             help='Refresh completeness for specific user ID only',
         )
@@ -56,9 +61,9 @@ class Command(BaseCommand):
         parser.add_argument(
             '--batch-size',
             type=int,
-            default=100,
+            default=5000,
             dest='batch_size',
-            help='Process users in batches of this size (default: 100)',
+            help='Users scored per query (default: 5000)',
         )
         parser.add_argument(
             '--dry-run',
@@ -68,46 +73,37 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
-        self.dry_run = options['dry_run']
-        self.batch_size = options['batch_size']
+        dry_run = options['dry_run']
 
         self.stdout.write(
             self.style.SUCCESS(
                 f"Starting profile completeness refresh "
-                f"{'(DRY RUN)' if self.dry_run else ''}"
+                f"{'(DRY RUN)' if dry_run else ''}"
             )
         )
 
-        # Reset trackers if requested
-        if options['reset_all']:
-            self._reset_completeness_trackers()
-
-        # Get users to process
         users_queryset = self._get_users_queryset(options)
-        total_users = users_queryset.count()
-
-        self.stdout.write(f"Processing {total_users} users...")
-
-        processed_count = 0
-        updated_count = 0
+        started = time.perf_counter()
 
-        # Process users in batches
-        for i in range(0, total_users, self.batch_size):
-            batch = users_queryset[i:i + self.batch_size]
+        try:
+            with transaction.atomic():
+                if options['reset_all']:
+                    count = ProfileCompletenessTracker.objects.all().delete()[0]
+                    self.stdout.write(f"Reset {count} completeness trackers")
 
-            for user in batch:
-                if self._refresh_user_completeness(user):
-                    updated_count += 1
-                processed_count += 1
+                processed, updated = ProfileCompletenessService.refresh_all(
+                    users_queryset, batch_size=options['batch_size'])
 
-                if processed_count % 50 == 0:
-                    self.stdout.write(
-                        f"Processed {processed_count}/{total_users} users...")
+                if dry_run:
+                    raise DryRun()
+        except DryRun:
+            pass
 
-        action = "Would update" if self.dry_run else "Updated"
+        action = "Would update" if dry_run else "Updated"
         self.stdout.write(
             self.style.SUCCESS(
-                f"{action} completeness for {updated_count}/{processed_count} users"
+                f"{action} completeness for {updated}/{processed} users "
+                f"({time.perf_counter() - started:.1f}s)"
             )
         )
 
@@ -117,85 +113,24 @@ class Command(BaseCommand):
 
         # Filter by specific user
         if options['user_id']:
-            try:
-                user = User.objects.get(id=options['user_id'])
-                return User.objects.filter(id=user.id)
-            except User.DoesNotExist:
+            queryset = queryset.filter(id=options['user_id'])
+            if not queryset.exists():
                 raise CommandError(
                     f"User with ID {options['user_id']} does not exist")
+            return queryset
 
         if options['email']:
-            try:
-                user = User.objects.get(email=options['email'])
-                return User.objects.filter(id=user.id)
-            except User.DoesNotExist:
+            queryset = queryset.filter(email=options['email'])
+            if not queryset.exists():
                 raise CommandError(
                     f"User with email {options['email']} does not exist")
+            return queryset
 
-        # Filter by incomplete profiles only
+        # Filter by incomplete profiles only (users without a tracker included)
         if options['incomplete_only']:
-            incomplete_tracker_ids = ProfileCompletenessTracker.objects.filter(
-                current_percentage__lt=100
-            ).values_list('user_id', flat=True)
-
-            queryset = queryset.filter(
-                id__in=incomplete_tracker_ids
+            queryset = queryset.exclude(
+                profile_completeness__overall_completion_percentage__gte=100
             )
 
         # Only include users who have profiles
-        queryset = queryset.filter(
-            userprofilebasic__isnull=False
-        ).select_related('userprofilebasic')
-
-        return queryset
-
-    def _reset_completeness_trackers(self):
-        """Reset all completeness trackers."""
-        if self.dry_run:
-            count = ProfileCompletenessTracker.objects.count()
-            self.stdout.write(
-                f"[DRY RUN] Would reset {count} completeness trackers")
-        else:
-            with transaction.atomic():
-                count = ProfileCompletenessTracker.objects.all().delete()[0]
-                self.stdout.write(f"Reset {count} completeness trackers")
-
-    def _refresh_user_completeness(self, user):
-        """Refresh completeness for a single user."""
-        try:
-            # Calculate new completeness
-            old_completeness = self._get_current_completeness(user)
-            new_completeness = ProfileCompletenessService.calculate_completeness(
-                user)
-
-            # Check if update is needed
-            if old_completeness and old_completeness == new_completeness['overall_percentage']:
-                return False  # No change needed
-
-            if not self.dry_run:
-                # Update the tracker
-                ProfileCompletenessService.update_completeness_tracker(user)
-
-            self.stdout.write(
-                f"{'[DRY RUN] Would update' if self.dry_run else 'Updated'} "
-                f"user {user.email}: "
-                f"{old_completeness or 0}% → {new_completeness['overall_percentage']}%"
-            )
-
-            return True
-
-        except Exception as e:
-            self.stdout.write(
-                self.style.ERROR(
-                    f"Error refreshing completeness for user {user.email}: {e}"
-                )
-            )
-            return False
-
-    def _get_current_completeness(self, user):
-        """Get current completeness percentage for user."""
-        try:
-            tracker = ProfileCompletenessTracker.objects.get(user=user)
-            return tracker.current_percentage
-        except ProfileCompletenessTracker.DoesNotExist:
-            return None
+        return queryset.filter(basic_profile__isnull=False)
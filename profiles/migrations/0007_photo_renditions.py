@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-18 22:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0006_change_photo_to_base64'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profilephoto',
+            name='medium',
+            field=models.TextField(blank=True, help_text='Medium size stored as Base64 data URL (400x400)', null=True),
+        ),
+        migrations.AddField(
+            model_name='profilephoto',
+            name='medium_webp',
+            field=models.TextField(blank=True, help_text='WebP medium size stored as Base64 data URL (400x400)', null=True),
+        ),
+        migrations.AddField(
+            model_name='profilephoto',
+            name='processed_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='processed at'),
+        ),
+        migrations.AddField(
+            model_name='profilephoto',
+            name='processing_status',
+            field=models.CharField(choices=[('pending', 'Renditions pending'), ('ready', 'Renditions ready'), ('failed', 'Processing failed')], default='ready', max_length=20, verbose_name='processing status'),
+        ),
+        migrations.AddField(
+            model_name='profilephoto',
+            name='thumbnail_webp',
+            field=models.TextField(blank=True, help_text='WebP thumbnail stored as Base64 data URL (150x150)', null=True),
+        ),
+    ]
@@ -5,15 +5,11 @@ This provides essential profile functionality with efficient photo processing
 and thumbnail generation, replacing base64 storage.
 """
 
-import os
-from io import BytesIO
-from PIL import Image, ExifTags
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.contrib.gis.db import models as gis_models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from django.core.files.base import ContentFile
-from django.core.files.storage import default_storage
 
 User = get_user_model()
 
@@ -245,6 +241,38 @@ class ProfilePhoto(models.Model):
         help_text=_('Thumbnail stored as Base64 data URL (150x150)')
     )
 
+    # Renditions built in the background after upload (see profiles.images)
+    thumbnail_webp = models.TextField(
+        null=True,
+        blank=True,
+        help_text=_('WebP thumbnail stored as Base64 data URL (150x150)')
+    )
+
+    medium = models.TextField(
+        null=True,
+        blank=True,
+        help_text=_('Medium size stored as Base64 data URL (400x400)')
+    )
+
+    medium_webp = models.TextField(
+        null=True,
+        blank=True,
+        help_text=_('WebP medium size stored as Base64 data URL (400x400)')
+    )
+
+    processing_status = models.CharField(
+        _('processing status'),
+        max_length=20,
+        choices=[
+            ('pending', _('Renditions pending')),
+            ('ready', _('Renditions ready')),
+            ('failed', _('Processing failed')),
+        ],
+        default='ready'
+    )
+
+    processed_at = models.DateTimeField(_('processed at'), null=True, blank=True)
+
     # Photo metadata
     photo_filename = models.CharField(
         _('original filename'),
@@ -316,6 +344,11 @@ class ProfilePhoto(models.Model):
         """Delete photo data and reset metadata."""
         self.photo = None
         self.thumbnail = None
+        self.thumbnail_webp = None
+        self.medium = None
+        self.medium_webp = None
+        self.processing_status = 'ready'
+        self.processed_at = None
         self.photo_filename = ''
         self.photo_content_type = ''
         self.photo_size_bytes = None
@@ -324,121 +357,40 @@ class ProfilePhoto(models.Model):
         self.save()
 
     def save(self, *args, **kwargs):
-        """Save profile photo (thumbnail generation handled in serializer)."""
+        """Save profile photo (renditions are generated by a Celery task)."""
         super().save(*args, **kwargs)
 
-    def generate_thumbnail(self):
-        """Generate optimized thumbnail (150x150) from uploaded photo."""
-        if not self.photo:
-            return
-
-        try:
-            # Open the uploaded image
-            image = Image.open(self.photo.path)
-
-            # Handle EXIF orientation
-            image = self._fix_orientation(image)
-
-            # Convert to RGB if necessary (handles RGBA, P mode images)
-            if image.mode in ('RGBA', 'P'):
-                image = image.convert('RGB')
-
-            # Create thumbnail with smart cropping
-            thumbnail = self._create_smart_thumbnail(image, (150, 150))
-
-            # Save thumbnail to memory
-            thumbnail_io = BytesIO()
-            thumbnail.save(thumbnail_io, format='JPEG',
-                           quality=90, optimize=True)
-
-            # Generate thumbnail filename
-            base_name = os.path.splitext(os.path.basename(self.photo.name))[0]
-            thumbnail_name = f"{base_name}_thumb.jpg"
+    def generate_renditions(self) -> bool:
+        """
+        Build the display renditions (see profiles.images) from the photo.
 
-            # Save thumbnail to storage
-            self.thumbnail.save(
-                thumbnail_name,
-                ContentFile(thumbnail_io.getvalue()),
-                save=False
-            )
+        They are only saved if the photo has not been replaced since this
+        instance was loaded; the task queued for the new photo renders it.
 
-            # Update model without triggering save recursion
-            ProfilePhoto.objects.filter(pk=self.pk).update(
-                thumbnail=self.thumbnail.name
-            )
+        Returns:
+            Whether the renditions were saved
+        """
+        from .images import from_data_url, render_renditions
 
-        except Exception as e:
-            # Log error but don't break the save process
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(
-                f"Failed to generate thumbnail for user {self.user.id}: {e}")
-
-    def _fix_orientation(self, image):
-        """Fix image orientation based on EXIF data."""
-        try:
-            exif = image._getexif()
-            if exif is not None:
-                for tag, value in exif.items():
-                    if tag in ExifTags.TAGS and ExifTags.TAGS[tag] == 'Orientation':
-                        if value == 3:
-                            image = image.rotate(180, expand=True)
-                        elif value == 6:
-                            image = image.rotate(270, expand=True)
-                        elif value == 8:
-                            image = image.rotate(90, expand=True)
-                        break
-        except (AttributeError, KeyError, TypeError):
-            # No EXIF data or unsupported format, return as is
-            pass
-        return image
-
-    def _create_smart_thumbnail(self, image, size):
-        """Create thumbnail with smart center cropping."""
-        # Calculate aspect ratios
-        target_ratio = size[0] / size[1]
-        image_ratio = image.width / image.height
-
-        if image_ratio > target_ratio:
-            # Image is wider than target - crop width
-            new_width = int(image.height * target_ratio)
-            left = (image.width - new_width) // 2
-            crop_box = (left, 0, left + new_width, image.height)
-        else:
-            # Image is taller than target - crop height
-            new_height = int(image.width / target_ratio)
-            top = (image.height - new_height) // 2
-            crop_box = (0, top, image.width, top + new_height)
-
-        # Crop and resize
-        cropped = image.crop(crop_box)
-        return cropped.resize(size, Image.Resampling.LANCZOS)
-
-    def generate_optimized_sizes(self):
-        """Generate multiple optimized sizes for different use cases."""
         if not self.photo:
-            return
-
-        try:
-            image = Image.open(self.photo.path)
-            image = self._fix_orientation(image)
-
-            if image.mode in ('RGBA', 'P'):
-                image = image.convert('RGB')
-
-            # Generate medium size (400x400) for profile pages
-            medium = self._create_smart_thumbnail(image, (400, 400))
-            medium_io = BytesIO()
-            medium.save(medium_io, format='JPEG', quality=85, optimize=True)
-
-            # Could save medium size to a separate field if needed
-            # For now, we'll focus on the essential thumbnail
-
-        except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(
-                f"Failed to generate optimized sizes for user {self.user.id}: {e}")
+            return False
+
+        _, data = from_data_url(self.photo)
+        renditions = render_renditions(data)
+
+        now = timezone.now()
+        fields = dict(
+            renditions,
+            processing_status='ready',
+            processed_at=now,
+            updated_at=now,
+        )
+        updated = ProfilePhoto.objects.filter(
+            pk=self.pk, updated_at=self.updated_at).update(**fields)
+        if updated:
+            for name, value in fields.items():
+                setattr(self, name, value)
+        return bool(updated)
 
 
 class ProfileCompletenessTracker(models.Model):
@@ -421,6 +421,9 @@ class ProfilePhotoSerializer(serializers.ModelSerializer):
     # URLs for accessing photos
     photo_url = serializers.SerializerMethodField()
     thumbnail_url = serializers.SerializerMethodField()
+    thumbnail_webp_url = serializers.SerializerMethodField()
+    medium_url = serializers.SerializerMethodField()
+    medium_webp_url = serializers.SerializerMethodField()
 
     class Meta:
         model = ProfilePhoto
@@ -429,6 +432,10 @@ class ProfilePhotoSerializer(serializers.ModelSerializer):
             'thumbnail',
             'photo_url',
             'thumbnail_url',
+            'thumbnail_webp_url',
+            'medium_url',
+            'medium_webp_url',
+            'processing_status',
             'photo_filename',
             'photo_content_type',
             'photo_size_bytes',
@@ -443,6 +450,10 @@ class ProfilePhotoSerializer(serializers.ModelSerializer):
             'thumbnail',
             'photo_url',
             'thumbnail_url',
+            'thumbnail_webp_url',
+            'medium_url',
+            'medium_webp_url',
+            'processing_status',
             'photo_filename',
             'photo_content_type',
             'photo_size_bytes',
@@ -467,6 +478,21 @@ class ProfilePhotoSerializer(serializers.ModelSerializer):
             return obj.thumbnail
         return None
 
+    @extend_schema_field(serializers.CharField(allow_null=True))
+    def get_thumbnail_webp_url(self, obj):
+        """Get the Base64 data URL for the WebP thumbnail."""
+        return obj.thumbnail_webp or None
+
+    @extend_schema_field(serializers.CharField(allow_null=True))
+    def get_medium_url(self, obj):
+        """Get the Base64 data URL for the medium size."""
+        return obj.medium or None
+
+    @extend_schema_field(serializers.CharField(allow_null=True))
+    def get_medium_webp_url(self, obj):
+        """Get the Base64 data URL for the WebP medium size."""
+        return obj.medium_webp or None
+
     def validate_photo(self, value):
         """Validate Base64 photo data."""
         import base64
@@ -518,15 +544,21 @@ class ProfilePhotoSerializer(serializers.ModelSerializer):
         return value
 
     def update(self, instance, validated_data):
-        """Handle Base64 photo upload and thumbnail generation."""
-        import base64
+        """Handle Base64 photo upload; renditions are built in the background."""
         import re
+        from django.db import transaction
+        from .services import PhotoService
 
         photo = validated_data.get('photo')
 
         if photo:
-            # Delete old thumbnail data
+            # Drop the old renditions until the new ones are built
             instance.thumbnail = None
+            instance.thumbnail_webp = None
+            instance.medium = None
+            instance.medium_webp = None
+            instance.processing_status = 'pending'
+            instance.processed_at = None
 
             # Extract metadata from Base64 string
             match = re.match(
@@ -536,27 +568,12 @@ class ProfilePhotoSerializer(serializers.ModelSerializer):
                 instance.photo_content_type = f'image/{image_format}'
                 instance.photo_size_bytes = len(base64_data)
 
-                # Generate thumbnail
-                try:
-                    image_data = base64.b64decode(base64_data)
-                    img = Image.open(BytesIO(image_data))
-
-                    # Create thumbnail (150x150)
-                    img.thumbnail((150, 150), Image.Resampling.LANCZOS)
-
-                    # Save thumbnail as Base64
-                    thumbnail_io = BytesIO()
-                    img.save(thumbnail_io, format='JPEG', quality=85)
-                    thumbnail_data = base64.b64encode(
-                        thumbnail_io.getvalue()).decode('utf-8')
-                    instance.thumbnail = f'data:image/jpeg;base64,{thumbnail_data}'
-                except Exception:
-                    # If thumbnail generation fails, continue without it
-                    instance.thumbnail = None
-
             # Auto-approve uploaded photos (no moderation required)
             instance.photo_moderation_status = 'approved'
 
+            transaction.on_commit(
+                lambda: PhotoService.queue_processing(instance.pk))
+
         return super().update(instance, validated_data)
 
 
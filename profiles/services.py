@@ -2,14 +2,37 @@
 Profiles app business logic services.
 """
 
+from datetime import timedelta
+
+from django.conf import settings
 from django.db import transaction
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ObjectDoesNotExist
+from django.utils import timezone
 import structlog
 
+from core.background import BackgroundPool
+
+from . import completeness
 from .models import UserProfileBasic, ProfilePhoto, ProfileCompletenessTracker
 
 logger = structlog.get_logger(__name__)
+
+_photo_pool = None
+
+
+def get_photo_pool():
+    """The process-wide pool that builds photo renditions, configured from settings."""
+    global _photo_pool
+    if _photo_pool is None:
+        _photo_pool = BackgroundPool(
+            'photo-processing',
+            workers=getattr(settings, 'PHOTO_PROCESSING_WORKERS', 2),
+            capacity=getattr(settings, 'PHOTO_PROCESSING_CAPACITY', 100),
+        )
+    return _photo_pool
+
+
 User = get_user_model()
 
 
@@ -60,7 +83,7 @@ class ProfileService:
         try:
             tracker = ProfileCompletenessTracker.objects.get(user=user)
         except ProfileCompletenessTracker.DoesNotExist:
-            tracker = ProfileCompletenessTracker.objects.create(user=user)
+            tracker = completeness.calculate(user)
             logger.info(
                 "Created completeness tracker for user",
                 user_id=str(user.id),
@@ -106,9 +129,6 @@ class ProfileService:
                 changes=changes
             )
 
-        # Trigger completeness recalculation
-        ProfileCompletenessService.calculate_completeness(user)
-
         return profile
 
     @staticmethod
@@ -143,11 +163,13 @@ class PhotoService:
     @transaction.atomic
     def upload_photo(user, photo_file):
         """
-        Upload and process a new profile photo (converts to Base64).
+        Store a new profile photo (as Base64) and queue its processing.
+
+        The original is saved as uploaded; the thumbnail and other
+        renditions are built by a Celery task after the transaction
+        commits, so the request never decodes the image.
         """
-        import base64
-        from PIL import Image
-        from io import BytesIO
+        from .images import to_data_url
 
         logger.info(
             "PhotoService.upload_photo called",
@@ -158,105 +180,110 @@ class PhotoService:
         )
 
         photo_profile = ProfileService.get_or_create_photo_profile(user)
-
-        logger.info(
-            "Got photo profile",
-            photo_profile_id=photo_profile.id,
-            has_existing_photo=photo_profile.has_photo
-        )
-
-        # Delete existing photo if present
-        if photo_profile.has_photo:
-            old_filename = photo_profile.photo_filename
-            photo_profile.delete_photo()
-            logger.info(
-                "Deleted old profile photo",
-                user_id=str(user.id),
-                old_filename=old_filename
-            )
-
-        # Convert uploaded file to Base64
-        logger.info("Converting photo to Base64")
+        old_filename = photo_profile.photo_filename if photo_profile.has_photo else None
 
         # Read file data
         photo_file.seek(0)
-        file_data = photo_file.read()
-
-        # Encode to Base64
-        base64_data = base64.b64encode(file_data).decode('utf-8')
-
-        # Determine image format from content type
-        content_type_map = {
-            'image/jpeg': 'jpeg',
-            'image/jpg': 'jpeg',
-            'image/png': 'png',
-            'image/webp': 'webp'
-        }
-        image_format = content_type_map.get(photo_file.content_type, 'jpeg')
-
-        # Create data URL
-        photo_data_url = f'data:{photo_file.content_type};base64,{base64_data}'
+        photo_data_url = to_data_url(photo_file.read(), photo_file.content_type)
 
-        # Generate thumbnail
-        try:
-            image = Image.open(BytesIO(file_data))
-            image.thumbnail((150, 150), Image.Resampling.LANCZOS)
-
-            # Convert to RGB if necessary
-            if image.mode in ('RGBA', 'P'):
-                image = image.convert('RGB')
-
-            # Save thumbnail as Base64
-            thumbnail_io = BytesIO()
-            image.save(thumbnail_io, format='JPEG', quality=85)
-            thumbnail_data = base64.b64encode(
-                thumbnail_io.getvalue()).decode('utf-8')
-            thumbnail_url = f'data:image/jpeg;base64,{thumbnail_data}'
-        except Exception as e:
-            logger.warning(f"Failed to generate thumbnail: {e}")
-            thumbnail_url = None
-
-        # Save new photo as Base64
-        logger.info("Saving Base64 photo to photo_profile")
+        # Save new photo as Base64, replacing the old one and its renditions
         photo_profile.photo = photo_data_url
-        photo_profile.thumbnail = thumbnail_url
+        photo_profile.thumbnail = None
+        photo_profile.thumbnail_webp = None
+        photo_profile.medium = None
+        photo_profile.medium_webp = None
+        photo_profile.processing_status = 'pending'
+        photo_profile.processed_at = None
         photo_profile.photo_filename = photo_file.name
         photo_profile.photo_content_type = photo_file.content_type
-        photo_profile.photo_size_bytes = len(base64_data)
+        photo_profile.photo_size_bytes = len(photo_data_url)
         # Auto-approve uploaded photos (no moderation required)
         photo_profile.photo_moderation_status = 'approved'
-
-        logger.info(
-            "About to save photo_profile",
-            photo_data_length=len(photo_data_url),
-            has_thumbnail=bool(thumbnail_url)
-        )
-
         photo_profile.save()
 
-        # Refresh from DB to verify save
-        photo_profile.refresh_from_db()
-
-        logger.info(
-            "Photo profile saved and refreshed",
-            has_photo_after_save=photo_profile.has_photo,
-            photo_data_length=len(
-                photo_profile.photo) if photo_profile.photo else 0
-        )
-
         logger.info(
             "Uploaded new profile photo",
             user_id=str(user.id),
             filename=photo_file.name,
+            replaced=old_filename,
             size_bytes=photo_file.size,
             content_type=photo_file.content_type
         )
 
-        # Trigger completeness recalculation
-        ProfileCompletenessService.calculate_completeness(user)
+        # Renditions are built by a task once the upload is committed
+        transaction.on_commit(
+            lambda: PhotoService.queue_processing(photo_profile.pk))
 
         return photo_profile
 
+    @staticmethod
+    def queue_processing(photo_id):
+        """
+        Build a photo's renditions in the background.
+
+        Queued on Celery when PHOTO_PROCESSING_CELERY is on (only where a
+        worker runs), otherwise on this process's photo pool; processed
+        inline if Celery is unavailable or the pool is full.
+        """
+        from .tasks import process_profile_photo
+
+        if getattr(settings, 'PHOTO_PROCESSING_CELERY', False):
+            try:
+                process_profile_photo.delay(photo_id)
+                return
+            except Exception as e:
+                logger.warning(
+                    "Failed to queue profile photo processing (Celery unavailable), "
+                    "processing inline",
+                    photo_id=photo_id,
+                    error=str(e)
+                )
+            PhotoService.process_photo(photo_id)
+            return
+
+        get_photo_pool().submit(PhotoService.process_photo, photo_id)
+
+    @staticmethod
+    def process_photo(photo_id):
+        """Build a photo's renditions in this thread."""
+        from .tasks import process_profile_photo
+
+        try:
+            process_profile_photo.apply(args=[photo_id])
+        except Exception as e:
+            logger.error(
+                "Profile photo processing failed",
+                photo_id=photo_id,
+                error=str(e)
+            )
+
+    @staticmethod
+    def process_pending(older_than=timedelta(minutes=5)):
+        """
+        Build the renditions of photos left pending.
+
+        Photos queued in a process that was killed before processing them
+        stay pending; this sweep picks them up.
+
+        Args:
+            older_than: Only photos uploaded at least this long ago
+
+        Returns:
+            Number of photos processed
+        """
+        cutoff = timezone.now() - older_than
+        photo_ids = list(ProfilePhoto.objects.filter(
+            processing_status='pending',
+            updated_at__lte=cutoff
+        ).values_list('pk', flat=True))
+
+        for photo_id in photo_ids:
+            PhotoService.process_photo(photo_id)
+
+        if photo_ids:
+            logger.info("Processed pending profile photos", count=len(photo_ids))
+        return len(photo_ids)
+
     @staticmethod
     @transaction.atomic
     def delete_photo(user):
@@ -275,9 +302,6 @@ class PhotoService:
                     filename=filename
                 )
 
-                # Trigger completeness recalculation
-                ProfileCompletenessService.calculate_completeness(user)
-
                 return True
         except ProfilePhoto.DoesNotExist:
             pass
@@ -313,66 +337,12 @@ class ProfileCompletenessService:
     def calculate_completeness(user):
         """
         Calculate overall profile completeness and update tracker.
-        """
-        tracker = ProfileService.get_or_create_completeness_tracker(user)
-
-        # Calculate section scores
-        basic_info_score = ProfileCompletenessService._calculate_basic_info_score(
-            user)
-        contact_info_score = ProfileCompletenessService._calculate_contact_info_score(
-            user)
-        recovery_info_score = ProfileCompletenessService._calculate_recovery_info_score(
-            user)
-        preferences_score = ProfileCompletenessService._calculate_preferences_score(
-            user)
-        profile_media_score = ProfileCompletenessService._calculate_profile_media_score(
-            user)
-
-        # Update section scores
-        tracker.basic_info_score = basic_info_score
-        tracker.contact_info_score = contact_info_score
-        tracker.recovery_info_score = recovery_info_score
-        tracker.preferences_score = preferences_score
-        tracker.profile_media_score = profile_media_score
-
-        # Calculate overall completion (weighted average)
-        weights = {
-            'basic_info': 0.3,
-            'contact_info': 0.2,
-            'recovery_info': 0.2,
-            'preferences': 0.15,
-            'profile_media': 0.15,
-        }
-
-        overall_score = (
-            basic_info_score * weights['basic_info'] +
-            contact_info_score * weights['contact_info'] +
-            recovery_info_score * weights['recovery_info'] +
-            preferences_score * weights['preferences'] +
-            profile_media_score * weights['profile_media']
-        )
-
-        tracker.overall_completion_percentage = int(overall_score)
 
-        # Determine completion level
-        if overall_score >= 90:
-            tracker.completion_level = 'complete'
-        elif overall_score >= 70:
-            tracker.completion_level = 'comprehensive'
-        elif overall_score >= 50:
-            tracker.completion_level = 'standard'
-        elif overall_score >= 25:
-            tracker.completion_level = 'basic'
-        else:
-            tracker.completion_level = 'minimal'
-
-        # Update badges
-        tracker.has_basic_profile_badge = basic_info_score >= 75
-        tracker.has_verified_email_badge = user.email_verified
-        tracker.has_recovery_goals_badge = recovery_info_score >= 50
-        tracker.has_comprehensive_profile_badge = overall_score >= 80
-
-        tracker.save()
+        Saves of the profile, photo and user keep the tracker up to date
+        incrementally (see profiles.completeness); this scores every
+        section from scratch.
+        """
+        tracker = completeness.calculate(user)
 
         logger.info(
             "Profile completeness calculated",
@@ -380,128 +350,22 @@ class ProfileCompletenessService:
             overall_score=tracker.overall_completion_percentage,
             completion_level=tracker.completion_level,
             section_scores={
-                'basic_info': basic_info_score,
-                'contact_info': contact_info_score,
-                'recovery_info': recovery_info_score,
-                'preferences': preferences_score,
-                'profile_media': profile_media_score,
+                section.name: getattr(tracker, section.field)
+                for section in completeness.SECTIONS
             }
         )
 
         return tracker
 
     @staticmethod
-    def _calculate_basic_info_score(user):
-        """Calculate basic info completeness score (0-100)."""
-        score = 0
-
-        try:
-            profile = UserProfileBasic.objects.get(user=user)
-
-            # Display name (30 points)
-            if profile.display_name and profile.display_name.strip():
-                score += 30
-
-            # Bio (40 points)
-            if profile.bio and len(profile.bio.strip()) >= 50:
-                score += 40
-            elif profile.bio and profile.bio.strip():
-                score += 20  # Partial points for short bio
-
-            # Timezone (15 points)
-            if profile.timezone and profile.timezone != 'UTC':
-                score += 15
-
-            # Profile visibility set (15 points)
-            if profile.profile_visibility != 'private':
-                score += 15
-
-        except UserProfileBasic.DoesNotExist:
-            pass
-
-        return min(score, 100)
-
-    @staticmethod
-    def _calculate_contact_info_score(user):
-        """Calculate contact info completeness score (0-100)."""
-        score = 0
-
-        # Email verification (70 points)
-        if user.email_verified:
-            score += 70
-
-        # Email present (30 points)
-        if user.email:
-            score += 30
-
-        return min(score, 100)
-
-    @staticmethod
-    def _calculate_recovery_info_score(user):
-        """Calculate recovery info completeness score (0-100)."""
-        # This would connect to recovery-related models when available
-        # For now, return partial score based on profile completion
-        score = 0
-
-        try:
-            profile = UserProfileBasic.objects.get(user=user)
-            # Basic profile exists
-            score += 25
-
-            # Has bio that might indicate recovery journey
-            if profile.bio and len(profile.bio.strip()) >= 100:
-                score += 25
-
-        except UserProfileBasic.DoesNotExist:
-            pass
-
-        return min(score, 100)
-
-    @staticmethod
-    def _calculate_preferences_score(user):
-        """Calculate preferences completeness score (0-100)."""
-        score = 0
-
-        try:
-            profile = UserProfileBasic.objects.get(user=user)
-
-            # Privacy settings configured (40 points)
-            if profile.profile_visibility:
-                score += 40
-
-            # Timezone set (30 points)
-            if profile.timezone and profile.timezone != 'UTC':
-                score += 30
-
-            # Account age indicates engagement (30 points)
-            if profile.created_at:
-                score += 30
-
-        except UserProfileBasic.DoesNotExist:
-            pass
-
-        return min(score, 100)
-
-    @staticmethod
-    def _calculate_profile_media_score(user):
-        """Calculate profile media completeness score (0-100)."""
-        score = 0
-
-        try:
-            photo = ProfilePhoto.objects.get(user=user)
-
-            # Has uploaded photo (60 points)
-            if photo.has_photo:
-                score += 60
-
-                # Photo is approved (40 points)
-                if photo.is_approved:
-                    score += 40
-
-        except ProfilePhoto.DoesNotExist:
-            pass
+    def refresh_all(users=None, batch_size=5000):
+        """
+        Recalculate completeness for many users with set-based queries.
 
-        return min(score, 100)
+        Returns:
+            Tuple of (users processed, trackers created or updated)
+        """
+        return completeness.refresh_all(users, batch_size=batch_size)
 
 
 class PrivacyService:
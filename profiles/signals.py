@@ -0,0 +1,46 @@
+"""
+Signals for profiles app.
+
+Keeps profile completeness trackers up to date as the models they are
+computed from are saved or deleted (see profiles.completeness).
+"""
+
+import logging
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+
+from .completeness import SOURCES, update_for_instance
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+
+def update_completeness_on_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Rescore the completeness sections computed from the saved instance."""
+    if raw:
+        return
+    try:
+        update_for_instance(instance, update_fields)
+    except Exception as e:
+        logger.warning(f"Completeness update failed for {sender.__name__} {instance.pk}: {e}")
+
+
+def update_completeness_on_delete(sender, instance, **kwargs):
+    """Zero the completeness sections computed from the deleted instance."""
+    if sender is User:
+        # The tracker is deleted with the user
+        return
+    try:
+        update_for_instance(instance, deleted=True)
+    except Exception as e:
+        logger.warning(f"Completeness update failed for {sender.__name__} {instance.pk}: {e}")
+
+
+for source in SOURCES:
+    post_save.connect(
+        update_completeness_on_save, sender=source,
+        dispatch_uid=f'profile_completeness_save_{source._meta.label_lower}')
+    post_delete.connect(
+        update_completeness_on_delete, sender=source,
+        dispatch_uid=f'profile_completeness_delete_{source._meta.label_lower}')
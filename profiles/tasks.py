@@ -0,0 +1,55 @@
+"""
+Celery tasks for profiles app.
+
+Background tasks for:
+- Building profile photo renditions after upload
+"""
+
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3)
+def process_profile_photo(self, photo_id):
+    """
+    Build the renditions of an uploaded profile photo.
+
+    Queued by PhotoService.upload_photo once the upload is committed.
+    Decodes the original once, writes the thumbnail and medium sizes as
+    JPEG and WebP.
+
+    Args:
+        photo_id: ProfilePhoto primary key
+
+    Returns:
+        dict: Processing summary
+    """
+    from PIL import Image, UnidentifiedImageError
+
+    from .models import ProfilePhoto
+
+    try:
+        photo = ProfilePhoto.objects.get(pk=photo_id)
+    except ProfilePhoto.DoesNotExist:
+        return {'photo_id': photo_id, 'status': 'skipped'}
+
+    try:
+        saved = photo.generate_renditions()
+    except (UnidentifiedImageError, Image.DecompressionBombError,
+            OSError, ValueError, SyntaxError) as exc:
+        # Not a decodable image: retrying will not help
+        logger.warning(f"Profile photo {photo_id} could not be processed: {exc}")
+        ProfilePhoto.objects.filter(
+            pk=photo_id, updated_at=photo.updated_at).update(processing_status='failed')
+        return {'photo_id': photo_id, 'status': 'failed'}
+    except Exception as exc:
+        logger.error(f"Profile photo {photo_id} processing failed: {exc}", exc_info=True)
+        raise self.retry(exc=exc, countdown=30)
+
+    if not saved:
+        # Replaced while we were rendering; its own task handles it
+        return {'photo_id': photo_id, 'status': 'superseded'}
+
+    return {'photo_id': photo_id, 'status': 'success'}
@@ -0,0 +1,153 @@
+"""
+Tests for the profile completeness engine.
+
+Covers:
+- Python and SQL scoring of the declared sections agree
+- Saves rescore only the sections computed from the saved model
+- Bulk refresh creates missing trackers and writes only changes
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from profiles.completeness import SECTIONS, calculate, refresh_all, section_expression
+from profiles.models import ProfileCompletenessTracker, ProfilePhoto, UserProfileBasic
+from profiles.services import ProfileCompletenessService
+
+from .factories import UserFactory
+
+User = get_user_model()
+
+
+class CompletenessScoringTest(TestCase):
+    """Test section scores."""
+
+    def setUp(self):
+        """Set up users covering each scoring rule."""
+        self.no_profile = UserFactory(email_verified=False)
+
+        self.empty = UserFactory()
+        UserProfileBasic.objects.create(user=self.empty)
+
+        self.whitespace = UserFactory()
+        UserProfileBasic.objects.create(
+            user=self.whitespace, display_name='  ', bio=' \n' + 'x' * 30 + '\n ',
+            timezone='UTC', profile_visibility='community')
+
+        self.complete = UserFactory()
+        UserProfileBasic.objects.create(
+            user=self.complete, display_name='Grace', bio='b' * 120,
+            timezone='Europe/Amsterdam', profile_visibility='public')
+        ProfilePhoto.objects.create(
+            user=self.complete, photo='data:image/jpeg;base64,AA==',
+            photo_moderation_status='approved')
+
+        self.pending_photo = UserFactory()
+        ProfilePhoto.objects.create(
+            user=self.pending_photo, photo='data:image/jpeg;base64,AA==',
+            photo_moderation_status='pending')
+
+    def test_python_and_sql_scores_agree(self):
+        """Test each section scores the same in Python and in SQL."""
+        annotations = {section.name: section_expression(section) for section in SECTIONS}
+        sql_scores = {
+            row['pk']: row for row in User.objects.annotate(**annotations).values(
+                'pk', *annotations)
+        }
+
+        for user in User.objects.all():
+            tracker = calculate(user)
+            for section in SECTIONS:
+                self.assertEqual(
+                    getattr(tracker, section.field), sql_scores[user.pk][section.name],
+                    f'{section.name} for {user.username}')
+
+    def test_section_scores(self):
+        """Test the declared rules award the expected points."""
+        complete = calculate(self.complete)
+        self.assertEqual(complete.basic_info_score, 100)
+        self.assertEqual(complete.recovery_info_score, 50)
+        self.assertEqual(complete.profile_media_score, 100)
+        self.assertEqual(complete.completion_level, 'complete')
+        self.assertTrue(complete.has_comprehensive_profile_badge)
+
+        # Short bio gets partial points; whitespace-only name and UTC get none
+        self.assertEqual(calculate(self.whitespace).basic_info_score, 35)
+        self.assertEqual(calculate(self.pending_photo).profile_media_score, 60)
+        self.assertEqual(calculate(self.no_profile).overall_completion_percentage, 6)
+
+
+class IncrementalCompletenessTest(TestCase):
+    """Test saves keep existing trackers current."""
+
+    def setUp(self):
+        """Set up a user with a profile and a calculated tracker."""
+        self.user = UserFactory()
+        self.profile = UserProfileBasic.objects.create(user=self.user)
+        self.tracker = ProfileCompletenessService.calculate_completeness(self.user)
+
+    def test_profile_save_rescores_from_instance(self):
+        """Test a profile save costs one tracker read and one write."""
+        self.profile.display_name = 'Grace'
+        self.profile.bio = 'b' * 60
+
+        with CaptureQueriesContext(connection) as queries:
+            self.profile.save()
+
+        # Profile UPDATE, tracker SELECT, tracker UPDATE
+        self.assertEqual(len(queries), 3)
+        self.tracker.refresh_from_db()
+        self.assertEqual(self.tracker.basic_info_score, 70)
+        self.assertEqual(self.tracker.contact_info_score, 100)
+
+    def test_unrelated_update_fields_are_ignored(self):
+        """Test saves of fields no section reads do not touch the tracker."""
+        with CaptureQueriesContext(connection) as queries:
+            self.profile.save(update_fields=['location'])
+            self.user.save(update_fields=['last_login'])
+
+        self.assertEqual(len(queries), 2)
+
+    def test_email_verification_updates_contact_section(self):
+        """Test user saves rescore the contact section and badge."""
+        self.user.email_verified = False
+        self.user.save(update_fields=['email_verified'])
+
+        self.tracker.refresh_from_db()
+        self.assertEqual(self.tracker.contact_info_score, 30)
+        self.assertFalse(self.tracker.has_verified_email_badge)
+
+    def test_photo_delete_zeroes_media_section(self):
+        """Test deleting the photo record resets its section."""
+        photo = ProfilePhoto.objects.create(
+            user=self.user, photo='data:image/jpeg;base64,AA==')
+        self.tracker.refresh_from_db()
+        self.assertEqual(self.tracker.profile_media_score, 100)
+
+        photo.delete()
+
+        self.tracker.refresh_from_db()
+        self.assertEqual(self.tracker.profile_media_score, 0)
+
+
+class BulkRefreshTest(TestCase):
+    """Test set-based refresh of many users."""
+
+    def test_refresh_all(self):
+        """Test trackers are created, then only changed ones written."""
+        users = UserFactory.create_batch(5)
+        for user in users[:3]:
+            UserProfileBasic.objects.create(user=user, display_name=user.username)
+
+        self.assertEqual(refresh_all(batch_size=2), (5, 5))
+        self.assertEqual(ProfileCompletenessTracker.objects.count(), 5)
+        for user in users:
+            tracker = ProfileCompletenessTracker.objects.get(user=user)
+            expected = calculate(User.objects.get(pk=user.pk), tracker=tracker)
+            self.assertEqual(tracker.overall_completion_percentage,
+                             expected.overall_completion_percentage)
+
+        UserProfileBasic.objects.filter(user=users[0]).update(bio='b' * 200)
+        self.assertEqual(refresh_all(batch_size=2), (5, 1))
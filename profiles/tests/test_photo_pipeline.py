@@ -0,0 +1,182 @@
+"""
+Tests for the background profile photo pipeline.
+
+Covers:
+- Renditions built from one drafted, EXIF-transposed decode
+- Uploads stored as-is and processed after commit, on the web process's
+  pool or on Celery when PHOTO_PROCESSING_CELERY is on
+- The sweep of photos left pending
+- The processing task, including replaced and undecodable photos
+"""
+
+from datetime import timedelta
+from io import BytesIO
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+
+from profiles.images import from_data_url, open_for_size, render_renditions, to_data_url
+from profiles.models import ProfilePhoto
+from profiles.services import PhotoService
+from profiles.tasks import process_profile_photo
+
+from .factories import UserFactory
+
+
+def make_jpeg(size=(800, 400), orientation=None):
+    """A JPEG whose left half is red and right half blue."""
+    image = Image.new('RGB', size, 'red')
+    image.paste('blue', (size[0] // 2, 0, size[0], size[1]))
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    buffer = BytesIO()
+    image.save(buffer, format='JPEG', exif=exif)
+    return buffer.getvalue()
+
+
+class RenditionsTest(TestCase):
+    """Test rendition generation."""
+
+    def test_renditions_sizes_and_formats(self):
+        """Test every rendition is a square of its size in its format."""
+        renditions = render_renditions(make_jpeg())
+
+        expected = {
+            'thumbnail': ('image/jpeg', 'JPEG', 150),
+            'thumbnail_webp': ('image/webp', 'WEBP', 150),
+            'medium': ('image/jpeg', 'JPEG', 400),
+            'medium_webp': ('image/webp', 'WEBP', 400),
+        }
+        self.assertEqual(set(renditions), set(expected))
+        for field, (content_type, image_format, size) in expected.items():
+            decoded_type, data = from_data_url(renditions[field])
+            image = Image.open(BytesIO(data))
+            self.assertEqual(decoded_type, content_type)
+            self.assertEqual(image.format, image_format)
+            self.assertEqual(image.size, (size, size))
+
+    def test_exif_orientation_is_applied(self):
+        """Test a rotated phone photo is rendered upright."""
+        # Orientation 6: the stored image is displayed rotated 90° clockwise,
+        # so its left (red) half ends up on top
+        renditions = render_renditions(make_jpeg(orientation=6))
+
+        medium = Image.open(BytesIO(from_data_url(renditions['medium'])[1]))
+        top = medium.getpixel((200, 20))
+        bottom = medium.getpixel((200, 380))
+        self.assertGreater(top[0], top[2])
+        self.assertGreater(bottom[2], bottom[0])
+
+    def test_large_jpeg_is_drafted(self):
+        """Test JPEGs are decoded at a reduced scale that still covers the size."""
+        image = open_for_size(make_jpeg(size=(4000, 3000)), 400)
+
+        self.assertLess(image.width, 4000)
+        self.assertGreaterEqual(min(image.size), 400)
+
+
+class PhotoUploadPipelineTest(TestCase):
+    """Test uploads are stored immediately and processed in the background."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = UserFactory()
+
+    def upload(self, data):
+        photo_file = SimpleUploadedFile('phone.jpg', data, content_type='image/jpeg')
+        with patch('profiles.services.get_photo_pool') as get_pool:
+            with self.captureOnCommitCallbacks(execute=True):
+                photo = PhotoService.upload_photo(self.user, photo_file)
+        return photo, get_pool.return_value
+
+    def test_upload_stores_original_and_queues_processing(self):
+        """Test the request only stores the original."""
+        data = make_jpeg(orientation=6)
+
+        photo, pool = self.upload(data)
+
+        photo.refresh_from_db()
+        self.assertEqual(from_data_url(photo.photo), ('image/jpeg', data))
+        self.assertEqual(photo.processing_status, 'pending')
+        self.assertIsNone(photo.thumbnail)
+        pool.submit.assert_called_once_with(PhotoService.process_photo, photo.pk)
+
+    @override_settings(PHOTO_PROCESSING_CELERY=True)
+    def test_upload_queues_on_celery_when_enabled(self):
+        """Test processing goes to Celery only when a worker is deployed."""
+        photo_file = SimpleUploadedFile('phone.jpg', make_jpeg(), content_type='image/jpeg')
+        with patch('profiles.tasks.process_profile_photo.delay') as delay, \
+                patch('profiles.services.get_photo_pool') as get_pool:
+            with self.captureOnCommitCallbacks(execute=True):
+                photo = PhotoService.upload_photo(self.user, photo_file)
+
+        delay.assert_called_once_with(photo.pk)
+        get_pool.assert_not_called()
+
+    def test_upload_without_workers_processes_inline(self):
+        """Test a pool with no workers builds the renditions before returning."""
+        photo_file = SimpleUploadedFile('phone.jpg', make_jpeg(), content_type='image/jpeg')
+        with self.captureOnCommitCallbacks(execute=True):
+            photo = PhotoService.upload_photo(self.user, photo_file)
+
+        photo.refresh_from_db()
+        self.assertEqual(photo.processing_status, 'ready')
+        self.assertIsNotNone(photo.medium)
+
+    def test_sweep_processes_stale_pending_photos(self):
+        """Test photos left pending are processed, recent uploads are left alone."""
+        photo, _ = self.upload(make_jpeg())
+
+        self.assertEqual(PhotoService.process_pending(), 0)
+
+        ProfilePhoto.objects.filter(pk=photo.pk).update(
+            updated_at=timezone.now() - timedelta(minutes=10))
+        self.assertEqual(PhotoService.process_pending(), 1)
+
+        photo.refresh_from_db()
+        self.assertEqual(photo.processing_status, 'ready')
+        self.assertEqual(PhotoService.process_pending(older_than=timedelta(0)), 0)
+
+    def test_task_builds_renditions(self):
+        """Test the task fills every rendition."""
+        photo, _ = self.upload(make_jpeg())
+
+        result = process_profile_photo.apply(args=[photo.pk]).get()
+
+        photo.refresh_from_db()
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(photo.processing_status, 'ready')
+        self.assertIsNotNone(photo.processed_at)
+        for field in ('thumbnail', 'thumbnail_webp', 'medium', 'medium_webp'):
+            self.assertTrue(getattr(photo, field).startswith('data:image/'))
+
+    def test_replaced_photo_is_not_overwritten(self):
+        """Test renditions of a replaced photo are discarded."""
+        photo, _ = self.upload(make_jpeg())
+        stale = ProfilePhoto.objects.get(pk=photo.pk)
+        self.upload(make_jpeg(size=(600, 600)))
+
+        self.assertFalse(stale.generate_renditions())
+
+        photo.refresh_from_db()
+        self.assertEqual(photo.processing_status, 'pending')
+        self.assertIsNone(photo.medium)
+
+    def test_undecodable_photo_is_marked_failed(self):
+        """Test a corrupt upload fails without retrying."""
+        photo, _ = self.upload(b'not an image')
+
+        result = process_profile_photo.apply(args=[photo.pk]).get()
+
+        photo.refresh_from_db()
+        self.assertEqual(result['status'], 'failed')
+        self.assertEqual(photo.processing_status, 'failed')
+
+    def test_data_url_round_trip(self):
+        """Test data URL helpers are inverse."""
+        self.assertEqual(from_data_url(to_data_url(b'\x89PNG', 'image/png')),
+                         ('image/png', b'\x89PNG'))
@@ -13,6 +13,7 @@ from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, inline_serializer, OpenApiResponse
 from drf_spectacular.openapi import OpenApiTypes
 from core.api_tags import APITags, profile_schema, session_schema, security_schema
+from core.security.headers import pii_safe
 import structlog
 
 from .models import UserProfileBasic, ProfilePhoto, ProfileCompletenessTracker
@@ -120,9 +121,12 @@ class UserProfileViewSet(RetrieveModelMixin, UpdateModelMixin, GenericViewSet):
         return self.update(request, *args, **kwargs)
 
 
+@pii_safe
 class ProfilePhotoViewSet(GenericViewSet):
     """
     ViewSet for managing profile photos.
+
+    Responses carry the user's own Base64 photo, so they skip PII scrubbing.
     """
 
     serializer_class = ProfilePhotoSerializer
@@ -536,12 +540,12 @@ class DeviceManagementViewSet(ListModelMixin,
                 f"Failed to blacklist token {session.refresh_token_jti}: {e}")
 
         # Create comprehensive audit log
-        AuditLog.objects.create(
+        AuditLog.log_event(
             user=request.user,
-            action='session_terminated',
+            event_type='session_terminated',
             ip_address=request.META.get('REMOTE_ADDR'),
             user_agent=request.META.get('HTTP_USER_AGENT', ''),
-            details={
+            metadata={
                 'terminated_session': session_info,
                 'termination_method': 'manual_user_action'
             },
@@ -618,6 +622,10 @@ class DeviceManagementViewSet(ListModelMixin,
         # Deactivate sessions
         sessions_to_terminate.update(is_active=False)
 
+        # Bulk updates bypass signals, so drop the cached session profile
+        from authentication.utils.sessions import session_profile_store
+        session_profile_store.invalidate(request.user.id)
+
         # Try to blacklist all refresh tokens
         for session in sessions_to_terminate:
             try:
@@ -629,12 +637,12 @@ class DeviceManagementViewSet(ListModelMixin,
                     f"Failed to blacklist token {session.refresh_token_jti}: {e}")
 
         # Create comprehensive audit log
-        AuditLog.objects.create(
+        AuditLog.log_event(
             user=request.user,
-            action='all_sessions_terminated',
+            event_type='all_sessions_terminated',
             ip_address=request.META.get('REMOTE_ADDR'),
             user_agent=request.META.get('HTTP_USER_AGENT', ''),
-            details={
+            metadata={
                 'terminated_sessions_count': terminated_count,
                 # Limit log size
                 'terminated_sessions': terminated_sessions[:10],
@@ -726,12 +734,12 @@ class DeviceManagementViewSet(ListModelMixin,
                 pass
 
         # Log the action
-        AuditLog.objects.create(
+        AuditLog.log_event(
             user=request.user,
-            action='suspicious_sessions_terminated',
+            event_type='suspicious_sessions_terminated',
             ip_address=request.META.get('REMOTE_ADDR'),
             user_agent=request.META.get('HTTP_USER_AGENT', ''),
-            details={
+            metadata={
                 'terminated_count': terminated_count,
                 'criteria': 'high_risk_suspicious_user_agents'
             },
@@ -878,12 +886,12 @@ class DeviceManagementViewSet(ListModelMixin,
         old_sessions.delete()
 
         # Log cleanup
-        AuditLog.objects.create(
+        AuditLog.log_event(
             user=request.user,
-            action='old_sessions_cleaned',
+            event_type='old_sessions_cleaned',
             ip_address=request.META.get('REMOTE_ADDR'),
             user_agent=request.META.get('HTTP_USER_AGENT', ''),
-            details={
+            metadata={
                 'cleaned_sessions_count': cleaned_count,
                 'cutoff_date': cutoff_date.isoformat()
             },
@@ -11,5 +11,13 @@ else
     echo "⚠️  ADMIN_EMAIL and ADMIN_PASSWORD not set, skipping admin user creation"
 fi
 
+# Backfill denormalized groups on comments and reactions (no-op once complete)
+echo "🔁 Backfilling comment and reaction groups..."
+python manage.py backfill_content_groups
+
+# Roll up activity facts: all history on first deploy, then recent days
+echo "📊 Rebuilding activity facts..."
+python manage.py rebuild_activity_facts --backfill
+
 # Run any other post-migration tasks here
 echo "✅ Post-migration setup completed"
\ No newline at end of file
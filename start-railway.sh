@@ -117,6 +117,14 @@ fi
 echo -e "${BLUE}🗃️  Setting up cache tables...${NC}"
 python manage.py createcachetable 2>/dev/null || echo -e "${YELLOW}⚠️  Cache table setup skipped (may already exist)${NC}"
 
+# Photos whose processing was lost with the previous processes
+echo -e "${BLUE}🖼️  Processing pending profile photos...${NC}"
+python manage.py process_pending_photos --older-than-minutes 0 || echo -e "${YELLOW}⚠️  Pending photo processing failed (continuing anyway)${NC}"
+
+# GDPR exports whose generation was lost with the previous processes
+echo -e "${BLUE}📦 Generating pending GDPR exports...${NC}"
+python manage.py process_pending_exports --older-than-minutes 0 || echo -e "${YELLOW}⚠️  Pending export generation failed (continuing anyway)${NC}"
+
 # System health check
 echo -e "${BLUE}🔍 Running system health checks...${NC}"
 if python manage.py check --deploy --fail-level WARNING; then
@@ -150,9 +158,10 @@ echo "================================================"
 
 # Use gunicorn for production, runserver for development
 if [ "$DJANGO_ENVIRONMENT" = "production" ]; then
-    # Production: Use Gunicorn with optimized settings
+    # Production: Use Gunicorn with uvicorn workers so the ASGI app serves
+    # both HTTP and the websocket routes
     # Run as django user for security after directory setup
-    echo -e "${BLUE}🏭 Starting Gunicorn (production mode) as django user...${NC}"
+    echo -e "${BLUE}🏭 Starting Gunicorn with uvicorn workers (production mode) as django user...${NC}"
 
     # Check if we're running as root (for Railway volume permissions)
     if [ "$(id -u)" = "0" ]; then
@@ -164,11 +173,10 @@ if [ "$DJANGO_ENVIRONMENT" = "production" ]; then
         echo -e "${GREEN}✅ Media directory permissions set${NC}"
 
         # Run gunicorn as django user using runuser (more reliable than su)
-        exec runuser -u django -- gunicorn vineyard_group_fellowship.wsgi:application \
+        exec runuser -u django -- gunicorn vineyard_group_fellowship.asgi:application \
             --bind 0.0.0.0:$PORT \
             --workers 2 \
-            --threads 4 \
-            --worker-class gthread \
+            --worker-class uvicorn.workers.UvicornWorker \
             --worker-connections 1000 \
             --max-requests 1000 \
             --max-requests-jitter 100 \
@@ -181,11 +189,10 @@ if [ "$DJANGO_ENVIRONMENT" = "production" ]; then
             --capture-output &
     else
         # Already running as non-root user
-        exec gunicorn vineyard_group_fellowship.wsgi:application \
+        exec gunicorn vineyard_group_fellowship.asgi:application \
             --bind 0.0.0.0:$PORT \
             --workers 2 \
-            --threads 4 \
-            --worker-class gthread \
+            --worker-class uvicorn.workers.UvicornWorker \
             --worker-connections 1000 \
             --max-requests 1000 \
             --max-requests-jitter 100 \
@@ -160,6 +160,14 @@ fi
 echo -e "${BLUE}🗃️  Setting up cache tables...${NC}"
 $PYTHON manage.py createcachetable 2>/dev/null || echo -e "${YELLOW}⚠️  Cache table setup skipped (may already exist)${NC}"
 
+# Photos whose processing was lost with the previous processes
+echo -e "${BLUE}🖼️  Processing pending profile photos...${NC}"
+$PYTHON manage.py process_pending_photos --older-than-minutes 0 || echo -e "${YELLOW}⚠️  Pending photo processing failed (continuing anyway)${NC}"
+
+# GDPR exports whose generation was lost with the previous processes
+echo -e "${BLUE}📦 Generating pending GDPR exports...${NC}"
+$PYTHON manage.py process_pending_exports --older-than-minutes 0 || echo -e "${YELLOW}⚠️  Pending export generation failed (continuing anyway)${NC}"
+
 # Health checks
 echo -e "${BLUE}🔍 Running system health checks...${NC}"
 if $PYTHON manage.py check --deploy --fail-level WARNING; then
@@ -195,7 +203,7 @@ echo -e "${GREEN}🎉 Starting Django server on port ${PORT}...${NC}"
 echo "================================================"
 
 if [ "$DJANGO_ENVIRONMENT" = "production" ]; then
-    echo -e "${BLUE}🏭 Starting Gunicorn (production mode) as django user...${NC}"
+    echo -e "${BLUE}🏭 Starting Gunicorn with uvicorn workers (production mode) as django user...${NC}"
 
     if [ "$(id -u)" = "0" ]; then
         echo -e "${YELLOW}Running as root - will drop to django user${NC}"
@@ -204,11 +212,10 @@ if [ "$DJANGO_ENVIRONMENT" = "production" ]; then
         chmod -R 755 /app/media
         echo -e "${GREEN}✅ Media directory permissions set${NC}"
 
-        exec runuser -u django -- gunicorn vineyard_group_fellowship.wsgi:application \
+        exec runuser -u django -- gunicorn vineyard_group_fellowship.asgi:application \
             --bind 0.0.0.0:$PORT \
             --workers 2 \
-            --threads 4 \
-            --worker-class gthread \
+            --worker-class uvicorn.workers.UvicornWorker \
             --worker-connections 1000 \
             --max-requests 1000 \
             --max-requests-jitter 100 \
@@ -220,11 +227,10 @@ if [ "$DJANGO_ENVIRONMENT" = "production" ]; then
             --error-logfile - \
             --capture-output &
     else
-        exec gunicorn vineyard_group_fellowship.wsgi:application \
+        exec gunicorn vineyard_group_fellowship.asgi:application \
             --bind 0.0.0.0:$PORT \
             --workers 2 \
-            --threads 4 \
-            --worker-class gthread \
+            --worker-class uvicorn.workers.UvicornWorker \
             --worker-connections 1000 \
             --max-requests 1000 \
             --max-requests-jitter 100 \
@@ -2,6 +2,8 @@
 ASGI config for vineyard_group_fellowship project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP requests are served by Django; websocket connections are
+authenticated with JWT and routed to the messaging consumers.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -13,4 +15,18 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vineyard_group_fellowship.settings')
 
-application = get_asgi_application()
+# Initialize Django before importing code that uses models
+django_asgi_app = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+from channels.security.websocket import AllowedHostsOriginValidator  # noqa: E402
+
+from core.middleware.websocket import JWTAuthMiddleware  # noqa: E402
+from messaging.routing import websocket_urlpatterns  # noqa: E402
+
+application = ProtocolTypeRouter({
+    'http': django_asgi_app,
+    'websocket': AllowedHostsOriginValidator(
+        JWTAuthMiddleware(URLRouter(websocket_urlpatterns))
+    ),
+})
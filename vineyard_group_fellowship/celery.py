@@ -8,9 +8,11 @@ This module configures Celery for background task processing including:
 - Cache management
 """
 
+import logging
 import os
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_shutdown
 
 # Set default Django settings module
 os.environ.setdefault('DJANGO_SETTINGS_MODULE',
@@ -28,6 +30,13 @@ app.autodiscover_tasks()
 
 # Celery Beat schedule for periodic tasks
 app.conf.beat_schedule = {
+    # Write queued audit log events (every 5 seconds)
+    'flush-audit-log': {
+        'task': 'authentication.tasks.flush_audit_log',
+        'schedule': 5.0,
+        'options': {'expires': 30},
+    },
+
     # Daily cleanup of soft-deleted content (2am)
     'cleanup-soft-deleted-content': {
         'task': 'messaging.tasks.cleanup_soft_deleted_content',
@@ -50,6 +59,48 @@ app.conf.beat_schedule = {
         'options': {'expires': 7200},  # 2 hours
     },
 
+    # Incremental activity fact rollup (every 15 minutes)
+    'refresh-activity-facts': {
+        'task': 'monitoring.tasks.refresh_activity_facts',
+        'schedule': crontab(minute='*/15'),
+        'options': {'expires': 600},
+    },
+
+    # Nightly rebuild of recent activity facts (3:30am)
+    'rebuild-recent-activity-facts': {
+        'task': 'monitoring.tasks.rebuild_recent_activity_facts',
+        'schedule': crontab(hour=3, minute=30),
+        'options': {'expires': 3600},
+    },
+
+    # Daily group health snapshots (4am)
+    'snapshot-group-health': {
+        'task': 'monitoring.tasks.snapshot_group_health',
+        'schedule': crontab(hour=4, minute=0),
+        'options': {'expires': 3600},
+    },
+
+    # Daily churn scores (4:30am)
+    'score-user-churn': {
+        'task': 'monitoring.tasks.score_user_churn',
+        'schedule': crontab(hour=4, minute=30),
+        'options': {'expires': 3600},
+    },
+
+    # Due GDPR erasures, in batches (every 10 minutes)
+    'erase-pending-users': {
+        'task': 'privacy.tasks.erase_pending_users',
+        'schedule': crontab(minute='*/10'),
+        'options': {'expires': 540},
+    },
+
+    # Hourly cleanup of expired GDPR export files
+    'cleanup-expired-data-exports': {
+        'task': 'privacy.tasks.cleanup_expired_data_exports',
+        'schedule': crontab(minute=15),
+        'options': {'expires': 1800},
+    },
+
     # Daily cleanup of expired tokens (1am)
     'cleanup-expired-tokens': {
         'task': 'authentication.tasks.cleanup_expired_tokens',
@@ -86,6 +137,18 @@ app.conf.update(
 )
 
 
+@worker_shutdown.connect
+def flush_audit_log_on_shutdown(**kwargs):
+    """Write any queued audit log events before the worker exits."""
+    try:
+        from authentication.audit import audit_writer
+
+        audit_writer.flush()
+    except Exception as e:
+        logging.getLogger(__name__).error(
+            f"Audit log flush on shutdown failed: {e}")
+
+
 @app.task(bind=True, ignore_result=True)
 def debug_task(self):
     """Debug task to test Celery is working."""
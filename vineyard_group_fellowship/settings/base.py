@@ -408,6 +408,24 @@ CACHES = {
     }
 }
 
+# ============================================================================
+# CHANNELS (WEBSOCKETS)
+# ============================================================================
+
+# Websocket consumers push inbox and feed events (see messaging/consumers.py)
+ASGI_APPLICATION = 'vineyard_group_fellowship.asgi.application'
+
+CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': 'channels_redis.core.RedisChannelLayer',
+        'CONFIG': {
+            'hosts': [config('REDIS_URL', default='redis://127.0.0.1:6379/1')],
+            'capacity': 1500,  # Messages buffered per channel
+            'expiry': 10,  # Seconds before undelivered messages are dropped
+        },
+    }
+}
+
 # ============================================================================
 # PROFILE PHOTO SETTINGS
 # ============================================================================
@@ -161,6 +161,21 @@ else:
         }
     }
 
+# Channel layer for websocket events (in-memory without Redis)
+if CACHE_URL:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.core.RedisChannelLayer',
+            'CONFIG': {'hosts': [CACHE_URL]},
+        }
+    }
+else:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        }
+    }
+
 # ============================================================================
 # LOGGING - Development
 # ============================================================================
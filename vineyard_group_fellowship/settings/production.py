@@ -65,6 +65,12 @@ MIDDLEWARE.insert(
     'core.middleware.media.MediaSecurityMiddleware',
 )
 
+# Stream media files with conditional GET and Range support
+MIDDLEWARE.insert(
+    MIDDLEWARE.index('core.middleware.media.MediaSecurityMiddleware') + 1,
+    'core.middleware.media.ProductionMediaMiddleware',
+)
+
 # Performance Monitoring Middleware (Production)
 MIDDLEWARE.append(
     'core.middleware.performance.PerformanceMonitoringMiddleware')
@@ -216,6 +222,29 @@ SUPPORT_EMAIL = config(
 NOREPLY_EMAIL = config(
     'NOREPLY_EMAIL', default='noreply@vineyardgroupfellowship.org')
 
+# Send transactional email from a bounded worker pool per process, each
+# worker keeping its connection open (see core.email_dispatch)
+EMAIL_DISPATCH_ASYNC = config('EMAIL_DISPATCH_ASYNC', default=True, cast=bool)
+EMAIL_DISPATCH_WORKERS = config('EMAIL_DISPATCH_WORKERS', default=2, cast=int)
+EMAIL_DISPATCH_CAPACITY = config('EMAIL_DISPATCH_CAPACITY', default=500, cast=int)
+EMAIL_DISPATCH_MAX_RETRIES = config('EMAIL_DISPATCH_MAX_RETRIES', default=3, cast=int)
+
+# Build profile photo renditions on a pool in each web process; set
+# PHOTO_PROCESSING_CELERY only where a Celery worker consumes the queue
+PHOTO_PROCESSING_CELERY = config('PHOTO_PROCESSING_CELERY', default=False, cast=bool)
+PHOTO_PROCESSING_WORKERS = config('PHOTO_PROCESSING_WORKERS', default=2, cast=int)
+PHOTO_PROCESSING_CAPACITY = config('PHOTO_PROCESSING_CAPACITY', default=100, cast=int)
+
+# Generate GDPR exports on a pool in each web process; set
+# GDPR_EXPORT_CELERY only where a Celery worker consumes the queue
+GDPR_EXPORT_CELERY = config('GDPR_EXPORT_CELERY', default=False, cast=bool)
+GDPR_EXPORT_WORKERS = config('GDPR_EXPORT_WORKERS', default=1, cast=int)
+GDPR_EXPORT_CAPACITY = config('GDPR_EXPORT_CAPACITY', default=20, cast=int)
+
+# Rebuild stale activity facts when analytics read them; may be turned off
+# where Celery Beat runs refresh_activity_facts
+ACTIVITY_FACT_REFRESH_ON_READ = config('ACTIVITY_FACT_REFRESH_ON_READ', default=True, cast=bool)
+
 # Alternative: Use django-anymail (uncomment to switch)
 # EMAIL_BACKEND = 'anymail.backends.sendgrid.EmailBackend'
 # ANYMAIL = {
@@ -382,6 +411,26 @@ else:
     }
     SESSION_ENGINE = 'django.contrib.sessions.backends.db'
 
+# Channel layer for websocket events: Redis is required to fan out across
+# processes, the in-memory layer only reaches clients of the same process
+if REDIS_URL:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.core.RedisChannelLayer',
+            'CONFIG': {
+                'hosts': [REDIS_URL],
+                'capacity': 1500,
+                'expiry': 10,
+            },
+        }
+    }
+else:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        }
+    }
+
 # ============================================================================
 # LOGGING - Production
 # ============================================================================
@@ -435,6 +484,16 @@ LOGGING['loggers'] = {
     },
 }
 
+# Queue audit log events in Redis for the flush_audit_log beat task; only
+# turn on where a Celery worker and beat are deployed (see authentication.audit)
+AUDIT_LOG_ASYNC = config('AUDIT_LOG_ASYNC', default=False, cast=bool)
+
+# Format and write log records from a background thread, so request
+# latency does not depend on stdout throughput (see core.logging.shipping)
+LOG_QUEUE_ENABLED = config('LOG_QUEUE_ENABLED', default=True, cast=bool)
+LOG_QUEUE_CAPACITY = config('LOG_QUEUE_CAPACITY', default=10000, cast=int)
+LOG_QUEUE_BATCH_SIZE = config('LOG_QUEUE_BATCH_SIZE', default=500, cast=int)
+
 # ============================================================================
 # MONITORING - Sentry
 # ============================================================================
@@ -586,6 +645,13 @@ MEDIA_FILE_STORAGE = 'django.core.files.storage.FileSystemStorage'
 SERVE_MEDIA_IN_PRODUCTION = config(
     'SERVE_MEDIA_IN_PRODUCTION', default=True, cast=bool)
 
+# Let the front proxy send media files: 'X-Accel-Redirect' (nginx, with an
+# internal location at MEDIA_ACCEL_REDIRECT_PREFIX aliased to MEDIA_ROOT)
+# or 'X-Sendfile' (Apache/lighttpd). Unset, Django streams them itself.
+MEDIA_SENDFILE_HEADER = config('MEDIA_SENDFILE_HEADER', default='') or None
+MEDIA_ACCEL_REDIRECT_PREFIX = config(
+    'MEDIA_ACCEL_REDIRECT_PREFIX', default='/protected-media/')
+
 # Security headers for media files
 MEDIA_FILE_SECURITY_HEADERS = {
     'Cache-Control': 'public, max-age=86400',  # 24 hours
@@ -650,5 +716,6 @@ print(
 print(f"🗄️  Database: PostgreSQL ({config('PGHOST', default='Unknown')})")
 print(f"📊 Monitoring: {'Sentry enabled' if SENTRY_DSN else 'No monitoring'}")
 print(f"🎯 Cache backend: {'Redis' if REDIS_URL else 'Database'}")
+print(f"🔌 Channel layer: {'Redis' if REDIS_URL else 'In-memory (single process)'}")
 print(f"📁 Media storage: {'S3' if USE_S3_STORAGE else 'File System'}")
 print(f"🌐 CDN: {'CloudFlare' if USE_CLOUDFLARE_CDN else 'Direct serving'}")
@@ -35,6 +35,18 @@ EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
 DEFAULT_FROM_EMAIL = 'test@Vineyard Group Fellowship.test'
 SERVER_EMAIL = DEFAULT_FROM_EMAIL
 
+# Send inline so tests can inspect mail.outbox right away
+EMAIL_DISPATCH_ASYNC = False
+
+# Build photo renditions and GDPR exports inline; pool threads cannot
+# see the test database
+PHOTO_PROCESSING_WORKERS = 0
+GDPR_EXPORT_WORKERS = 0
+
+# Tests write activity facts directly; a refresh would rebuild them from
+# the (empty) content tables
+ACTIVITY_FACT_REFRESH_ON_READ = False
+
 # For testing SendGrid integration specifically, set SENDGRID_API_KEY
 # This will use the Web API backend instead
 SENDGRID_API_KEY = config('SENDGRID_API_KEY', default='')
@@ -63,6 +75,13 @@ CACHES = {
     }
 }
 
+# Use in-memory channel layer for websocket tests
+CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': 'channels.layers.InMemoryChannelLayer',
+    }
+}
+
 # ============================================================================
 # LOGGING - Testing
 # ============================================================================